@@ -0,0 +1,50 @@
+"""Add NOTIFY triggers on raw_game_data for the populate daemon
+
+Revision ID: 8f4d2a6c1e59
+Revises: 6e2b9f4d8a15
+Create Date: 2025-10-01 14:27:09.615382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4d2a6c1e59'
+down_revision: Union[str, None] = '6e2b9f4d8a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notify the 'raw_game_data' channel with the game_id of every inserted
+    # game and every game whose JSON changed; delivered when the transaction commits
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_raw_game_data() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('raw_game_data', NEW.game_id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER raw_game_data_notify_insert
+        AFTER INSERT ON raw_game_data
+        FOR EACH ROW EXECUTE FUNCTION notify_raw_game_data()
+    """)
+    op.execute("""
+        CREATE TRIGGER raw_game_data_notify_update
+        AFTER UPDATE OF game_data ON raw_game_data
+        FOR EACH ROW WHEN (OLD.game_data IS DISTINCT FROM NEW.game_data)
+        EXECUTE FUNCTION notify_raw_game_data()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS raw_game_data_notify_update ON raw_game_data")
+    op.execute("DROP TRIGGER IF EXISTS raw_game_data_notify_insert ON raw_game_data")
+    op.execute("DROP FUNCTION IF EXISTS notify_raw_game_data()")
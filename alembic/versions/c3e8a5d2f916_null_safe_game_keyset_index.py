@@ -0,0 +1,35 @@
+"""Index the NULL-safe game keyset order
+
+Revision ID: c3e8a5d2f916
+Revises: b6d1f3a8c247
+Create Date: 2025-10-07 09:42:18.605117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a5d2f916'
+down_revision: Union[str, None] = 'b6d1f3a8c247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Game listings order by season and tip-off time with stand-ins for NULLs
+    op.drop_index('ix_game_season_game_et', table_name='game')
+    op.create_index('ix_game_season_game_et', 'game', [
+        sa.text('coalesce(season, 0)'),
+        sa.text("coalesce(game_et, '1900-01-01 00:00:00')"),
+        'game_id',
+    ], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_game_season_game_et', table_name='game')
+    op.create_index('ix_game_season_game_et', 'game', ['season', 'game_et', 'game_id'], unique=False)
@@ -0,0 +1,24 @@
+"""Vectorized analytics derived from populated game tables."""
+
+from .play_arrays import PlayArrays, load_play_arrays
+from .possessions import PossessionService, segment_possessions
+from .lineups import LineupService, reconstruct_stints
+from .game_state import GameSummaryService, summarize_games, game_timeline
+from .shot_charts import ShotChartService, bin_shots
+from .season_stats import SeasonStatsService, season_averages
+
+__all__ = [
+    "PlayArrays",
+    "load_play_arrays",
+    "PossessionService",
+    "segment_possessions",
+    "LineupService",
+    "reconstruct_stints",
+    "GameSummaryService",
+    "summarize_games",
+    "game_timeline",
+    "ShotChartService",
+    "bin_shots",
+    "SeasonStatsService",
+    "season_averages"
+]
@@ -0,0 +1,241 @@
+"""
+Game-state timelines and summary metrics.
+
+Each game's score series is taken from the columnar play arrays (elapsed
+seconds, running home/away score, period) and reduced with vectorized
+operations into margin, lead changes, ties, runs and largest leads. The
+per-game results are cached in the game_summary table.
+"""
+
+import logging
+from typing import List, Dict, Optional
+
+import numpy as np
+from sqlalchemy import select, delete, exists, insert
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, GameSummary
+from .play_arrays import PlayArrays, load_play_arrays, SIDE_HOME, SIDE_AWAY
+
+logger = logging.getLogger(__name__)
+
+
+SECONDS_FIELDS = ('home_seconds_leading', 'away_seconds_leading', 'seconds_tied')
+
+SUMMARY_FIELDS = (
+    'home_score', 'away_score', 'lead_changes', 'times_tied',
+    'home_largest_lead', 'away_largest_lead', 'home_largest_run', 'away_largest_run',
+) + SECONDS_FIELDS
+
+
+def game_timeline(arrays: PlayArrays, game_index: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Score timeline for one game, one entry per play.
+
+    Args:
+        arrays: Plays for one or more games
+        game_index: Index of the game block within arrays
+
+    Returns:
+        Dictionary of arrays: elapsed, period, home_score, away_score, margin
+        (home minus away)
+    """
+    start = arrays.game_starts[game_index]
+    stop = arrays.game_starts[game_index + 1] if game_index + 1 < len(arrays.game_starts) else len(arrays)
+    window = slice(start, stop)
+    home = arrays.score_home[window].astype(np.int32)
+    away = arrays.score_away[window].astype(np.int32)
+    return {
+        'elapsed': arrays.elapsed[window],
+        'period': arrays.period[window],
+        'home_score': home,
+        'away_score': away,
+        'margin': home - away,
+    }
+
+
+def summarize_games(arrays: PlayArrays) -> Dict[str, np.ndarray]:
+    """
+    Compute summary metrics for every game in the arrays.
+
+    Args:
+        arrays: Plays for one or more games
+
+    Returns:
+        Dictionary of per-game arrays keyed by game_id plus SUMMARY_FIELDS
+    """
+    n = len(arrays)
+    games = len(arrays.game_starts)
+    if n == 0:
+        return {key: np.zeros(0, dtype=np.int64) for key in ('game_id',) + SUMMARY_FIELDS}
+
+    starts = arrays.game_starts
+    game_of_row = np.repeat(np.arange(games), np.diff(np.append(starts, n)))
+    last_rows = np.append(starts[1:], n) - 1
+
+    home = arrays.score_home.astype(np.int32)
+    away = arrays.score_away.astype(np.int32)
+    margin = home - away
+    sign = np.sign(margin)
+
+    # Largest leads: extremes of the margin within each game
+    home_largest_lead = np.maximum(np.maximum.reduceat(margin, starts), 0)
+    away_largest_lead = np.maximum(-np.minimum.reduceat(margin, starts), 0)
+
+    # Lead changes: consecutive non-zero leads of opposite sign within a game
+    leading = np.flatnonzero(sign != 0)
+    flips = (sign[leading][1:] != sign[leading][:-1]) & (game_of_row[leading][1:] == game_of_row[leading][:-1])
+    lead_changes = np.bincount(game_of_row[leading][1:][flips], minlength=games)
+
+    # Ties: score becomes level after one side led
+    previous_sign = np.concatenate(([0], sign[:-1]))
+    previous_sign[starts] = 0
+    tied = (sign == 0) & (previous_sign != 0)
+    times_tied = np.bincount(game_of_row[tied], minlength=games)
+
+    # Time spent in each state: each play's state lasts until the next play
+    duration = np.zeros(n, dtype=np.float64)
+    duration[:-1] = np.diff(arrays.elapsed.astype(np.float64))
+    duration[last_rows] = 0.0
+    duration = np.maximum(duration, 0.0)
+    home_seconds = np.bincount(game_of_row, weights=duration * (sign > 0), minlength=games)
+    away_seconds = np.bincount(game_of_row, weights=duration * (sign < 0), minlength=games)
+    tied_seconds = np.bincount(game_of_row, weights=duration * (sign == 0), minlength=games)
+
+    # Runs: unanswered points, from score increments attributed to each side
+    home_delta = np.diff(home, prepend=0)
+    away_delta = np.diff(away, prepend=0)
+    home_delta[starts] = home[starts]
+    away_delta[starts] = away[starts]
+    scoring = np.flatnonzero((home_delta > 0) | (away_delta > 0))
+    home_largest_run = np.zeros(games, dtype=np.int64)
+    away_largest_run = np.zeros(games, dtype=np.int64)
+    if len(scoring):
+        scorer = np.where(home_delta[scoring] > 0, SIDE_HOME, SIDE_AWAY)
+        points = np.where(scorer == SIDE_HOME, home_delta[scoring], away_delta[scoring])
+        scoring_game = game_of_row[scoring]
+        new_run = np.ones(len(scoring), dtype=bool)
+        new_run[1:] = (scorer[1:] != scorer[:-1]) | (scoring_game[1:] != scoring_game[:-1])
+        run_starts = np.flatnonzero(new_run)
+        run_points = np.add.reduceat(points, run_starts)
+        run_side = scorer[run_starts]
+        run_game = scoring_game[run_starts]
+        is_home = run_side == SIDE_HOME
+        np.maximum.at(home_largest_run, run_game[is_home], run_points[is_home])
+        np.maximum.at(away_largest_run, run_game[~is_home], run_points[~is_home])
+
+    return {
+        'game_id': arrays.game_ids,
+        'home_score': home[last_rows],
+        'away_score': away[last_rows],
+        'lead_changes': lead_changes,
+        'times_tied': times_tied,
+        'home_largest_lead': home_largest_lead,
+        'away_largest_lead': away_largest_lead,
+        'home_largest_run': home_largest_run,
+        'away_largest_run': away_largest_run,
+        'home_seconds_leading': home_seconds,
+        'away_seconds_leading': away_seconds,
+        'seconds_tied': tied_seconds,
+    }
+
+
+class GameSummaryService:
+    """Builds and serves the cached game_summary table"""
+
+    def __init__(self, session: Session, batch_size: int = 250):
+        self.session = session
+        self.batch_size = batch_size
+
+    def build_games(self, game_ids: List[int]) -> int:
+        """
+        Recompute summaries for the given games.
+
+        Args:
+            game_ids: Games to process
+
+        Returns:
+            Number of summaries written
+        """
+        if not game_ids:
+            return 0
+
+        try:
+            self.session.execute(delete(GameSummary).where(GameSummary.game_id.in_(game_ids)))
+
+            arrays = load_play_arrays(self.session, game_ids)
+            summary = summarize_games(arrays)
+            records = []
+            for i, game_id in enumerate(summary['game_id'].tolist()):
+                record = {
+                    'game_id': game_id,
+                    'home_team_id': int(arrays.home_team_ids[i]) or None,
+                    'away_team_id': int(arrays.away_team_ids[i]) or None,
+                }
+                for field in SUMMARY_FIELDS:
+                    value = summary[field][i]
+                    record[field] = round(float(value), 2) if field in SECONDS_FIELDS else int(value)
+                records.append(record)
+
+            if records:
+                self.session.execute(insert(GameSummary), records)
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error building game summaries: {e}")
+            raise
+
+    def get_summary(self, game_id: int) -> Optional[GameSummary]:
+        """
+        Return the cached summary for a game, computing it on a miss.
+
+        Args:
+            game_id: Game to summarize
+
+        Returns:
+            GameSummary or None if the game has no plays
+        """
+        summary = self.session.get(GameSummary, game_id)
+        if summary is None and self.build_games([game_id]):
+            summary = self.session.get(GameSummary, game_id)
+        return summary
+
+    def pending_game_ids(self, seasons: Optional[List[int]] = None) -> List[int]:
+        """
+        Find games that have plays but no cached summary.
+
+        Args:
+            seasons: Optional season filter
+
+        Returns:
+            Sorted list of game IDs
+        """
+        query = (
+            select(Game.game_id)
+            .where(exists().where(Play.game_id == Game.game_id))
+            .where(~exists().where(GameSummary.game_id == Game.game_id))
+            .order_by(Game.game_id)
+        )
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(self.session.scalars(query))
+
+    def build(self, game_ids: List[int], commit: bool = True) -> Dict[str, int]:
+        """
+        Build summaries for many games in batches.
+
+        Args:
+            game_ids: Games to process
+            commit: Commit after each batch
+
+        Returns:
+            Dictionary with 'games' and 'summaries' counts
+        """
+        stats = {'games': 0, 'summaries': 0}
+        for i in range(0, len(game_ids), self.batch_size):
+            batch = game_ids[i:i + self.batch_size]
+            stats['summaries'] += self.build_games(batch)
+            stats['games'] += len(batch)
+            if commit:
+                self.session.commit()
+            logger.info(f"Game summaries: {stats['games']}/{len(game_ids)} games processed")
+        return stats
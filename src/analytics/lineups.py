@@ -0,0 +1,427 @@
+"""
+Lineup and stint reconstruction from substitution events.
+
+The five players on court for each team are rebuilt at every play by
+starting from each period's starters and applying substitutions in feed
+order. Period 1 starters come from Boxscore when the starter flag is
+available; later periods (and older games) are inferred from players who
+act or are substituted out before being substituted in.
+
+A stint is an interval during which neither team changes its lineup.
+Lineups are stored once as sorted person-id tuples so that stints can be
+grouped by lineup with a plain integer key.
+"""
+
+import re
+import logging
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, delete, exists, insert, tuple_
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, Boxscore, Person, Lineup, Stint
+from .play_arrays import (
+    PlayArrays, load_play_arrays, ACTION_SUBSTITUTION, SIDE_HOME, SIDE_AWAY
+)
+
+logger = logging.getLogger(__name__)
+
+
+LINEUP_SIZE = 5
+
+_SUBSTITUTION_PATTERN = re.compile(r'SUB:\s*(.+?)\s+FOR\s+(.+?)\s*$')
+
+
+class Roster:
+    """Players available to one team in one game, with name lookups"""
+
+    def __init__(self):
+        self.person_ids: List[int] = []
+        self.starters: List[int] = []
+        # Lookups in priority order: family name, initial name, full name, first name
+        self._lookups: List[Dict[str, List[int]]] = [defaultdict(list) for _ in range(4)]
+
+    def add(self, person_id: int, starter: Optional[bool] = None,
+            family_name: Optional[str] = None, name_i: Optional[str] = None,
+            full_name: Optional[str] = None, first_name: Optional[str] = None):
+        """Register a player and the names they may appear under"""
+        if person_id in self.person_ids:
+            return
+        self.person_ids.append(person_id)
+        if starter:
+            self.starters.append(person_id)
+        for lookup, name in zip(self._lookups, (family_name, name_i, full_name, first_name)):
+            if name:
+                lookup[name.strip().lower()].append(person_id)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Resolve a name as written in play descriptions to a person id"""
+        key = name.strip().lower()
+        for lookup in self._lookups:
+            matches = lookup.get(key, [])
+            if len(matches) == 1:
+                return matches[0]
+        return None
+
+
+def load_rosters(session: Session, game_ids: List[int]) -> Dict[Tuple[int, int], Roster]:
+    """
+    Load per-game rosters for both teams from Boxscore player rows.
+
+    Args:
+        session: Database session
+        game_ids: Games to load
+
+    Returns:
+        Mapping of (game_id, side) to Roster
+    """
+    rows = session.execute(
+        select(Boxscore.game_id, Boxscore.home_away_team, Boxscore.person_id,
+               Boxscore.starter, Person.person_lname, Person.person_iname,
+               Person.person_name, Person.person_fname)
+        .outerjoin(Person, Person.id == Boxscore.person_internal_id)
+        .where(Boxscore.game_id.in_(game_ids))
+        .where(Boxscore.box_type == 'player')
+        .where(Boxscore.person_id.isnot(None))
+        .order_by(Boxscore.game_id, Boxscore.boxscore_id)
+    ).all()
+
+    rosters: Dict[Tuple[int, int], Roster] = defaultdict(Roster)
+    for row in rows:
+        side = SIDE_HOME if row.home_away_team == 'h' else SIDE_AWAY
+        rosters[(row.game_id, side)].add(
+            row.person_id, row.starter, row.person_lname, row.person_iname,
+            row.person_name, row.person_fname
+        )
+    return rosters
+
+
+def _parse_substitutions(arrays: PlayArrays, rows: np.ndarray, descriptions: Dict[int, str],
+                         rosters: Dict[int, Roster]) -> List[Tuple[int, int, int, int]]:
+    """
+    Resolve substitution rows into (row, side, out_id, in_id).
+
+    The play's person is the player leaving; the entering player only
+    appears by name in the description and is resolved against the roster.
+    Unresolvable players are returned as 0.
+    """
+    substitutions = []
+    for row in rows.tolist():
+        side = int(arrays.side[row])
+        roster = rosters.get(side)
+        if roster is None:
+            continue
+        out_id = int(arrays.person_id[row])
+        in_id = 0
+        match = _SUBSTITUTION_PATTERN.match(descriptions.get(int(arrays.play_id[row]), '') or '')
+        if match:
+            in_id = roster.resolve(match.group(1)) or 0
+            if not out_id:
+                out_id = roster.resolve(match.group(2)) or 0
+        substitutions.append((row, side, out_id, in_id))
+    return substitutions
+
+
+def _infer_period_starters(arrays: PlayArrays, first_row: int, last_row: int,
+                           substitutions: List[Tuple[int, int, int, int]], roster: Roster,
+                           side: int, previous: List[int]) -> List[int]:
+    """
+    Infer the players on court at the start of a period for one team.
+
+    A player started the period if they were substituted out, or recorded
+    any action, before being substituted in. Players substituted out are
+    preferred; missing players are filled from the previous period's
+    closing lineup.
+    """
+    members = np.array(roster.person_ids, dtype=np.int64)
+    window = slice(first_row, last_row + 1)
+    acted = (np.isin(arrays.person_id[window], members)
+             & (arrays.action_code[window] != ACTION_SUBSTITUTION))
+    persons, first_index = np.unique(arrays.person_id[window][acted], return_index=True)
+    first_action = dict(zip(persons.tolist(),
+                            (np.flatnonzero(acted)[first_index] + first_row).tolist()))
+
+    first_in: Dict[int, int] = {}
+    first_out: Dict[int, int] = {}
+    for row, sub_side, out_id, in_id in substitutions:
+        if sub_side != side:
+            continue
+        if out_id:
+            first_out.setdefault(out_id, row)
+        if in_id:
+            first_in.setdefault(in_id, row)
+
+    entered_at = lambda person_id: first_in.get(person_id, last_row + 1)
+    subbed_out = [p for p, row in first_out.items() if row < entered_at(p)]
+    active = [p for p, row in first_action.items()
+              if row < entered_at(p) and p not in first_out]
+    active.sort(key=first_action.get)
+
+    starters = (subbed_out + active)[:LINEUP_SIZE]
+    for person_id in previous:
+        if len(starters) >= LINEUP_SIZE:
+            break
+        if person_id not in starters and person_id not in first_in:
+            starters.append(person_id)
+    return starters
+
+
+def reconstruct_stints(arrays: PlayArrays, game_index: int,
+                       descriptions: Dict[int, str],
+                       rosters: Dict[int, Roster]) -> List[Dict[str, Any]]:
+    """
+    Rebuild lineups and stints for one game.
+
+    Args:
+        arrays: Plays for a batch of games
+        game_index: Index of the game block within arrays
+        descriptions: Substitution descriptions keyed by play_id
+        rosters: Roster per side for this game
+
+    Returns:
+        List of stints with period, start/end elapsed seconds, home/away
+        points and sorted home/away lineup tuples (None when incomplete)
+    """
+    start = int(arrays.game_starts[game_index])
+    stop = int(arrays.game_starts[game_index + 1]) if game_index + 1 < len(arrays.game_starts) else len(arrays)
+    if start >= stop:
+        return []
+
+    game_rows = np.arange(start, stop)
+    substitutions = _parse_substitutions(
+        arrays, game_rows[arrays.action_code[start:stop] == ACTION_SUBSTITUTION],
+        descriptions, rosters
+    )
+
+    # Cumulative points per side, offset so cum[i - start] is points before row i
+    home_cum = np.concatenate(([0], np.cumsum(np.where(arrays.side[start:stop] == SIDE_HOME,
+                                                       arrays.points[start:stop], 0))))
+    away_cum = np.concatenate(([0], np.cumsum(np.where(arrays.side[start:stop] == SIDE_AWAY,
+                                                       arrays.points[start:stop], 0))))
+
+    period_starts = arrays.period_starts
+    period_starts = period_starts[(period_starts >= start) & (period_starts < stop)]
+    period_ends = np.append(period_starts[1:], stop) - 1
+
+    stints = []
+    closing = {SIDE_HOME: [], SIDE_AWAY: []}
+    for first_row, last_row in zip(period_starts.tolist(), period_ends.tolist()):
+        period_subs = [s for s in substitutions if first_row <= s[0] <= last_row]
+        period = int(arrays.period[first_row])
+
+        lineups = {}
+        for side in (SIDE_HOME, SIDE_AWAY):
+            roster = rosters.get(side, Roster())
+            if period == 1 and len(roster.starters) == LINEUP_SIZE:
+                lineups[side] = list(roster.starters)
+            else:
+                lineups[side] = _infer_period_starters(
+                    arrays, first_row, last_row, period_subs, roster, side, closing[side]
+                )
+
+        boundaries = [first_row]
+        states = [(_lineup_key(lineups[SIDE_HOME]), _lineup_key(lineups[SIDE_AWAY]))]
+        for row, side, out_id, in_id in period_subs:
+            current = lineups[side]
+            if out_id in current:
+                current.remove(out_id)
+            if in_id and in_id not in current:
+                current.append(in_id)
+            boundaries.append(row)
+            states.append((_lineup_key(lineups[SIDE_HOME]), _lineup_key(lineups[SIDE_AWAY])))
+        closing = {side: list(lineup) for side, lineup in lineups.items()}
+
+        stint_starts = np.array(boundaries)
+        stint_ends = np.append(stint_starts[1:], last_row + 1)
+        period_end_seconds = float(arrays.elapsed[last_row] + arrays.clock[last_row])
+        start_seconds = arrays.elapsed[stint_starts]
+        end_seconds = np.where(stint_ends <= last_row,
+                               arrays.elapsed[np.minimum(stint_ends, last_row)],
+                               period_end_seconds)
+        home_points = home_cum[stint_ends - start] - home_cum[stint_starts - start]
+        away_points = away_cum[stint_ends - start] - away_cum[stint_starts - start]
+
+        # Back-to-back substitutions produce empty stints; keep those with time or points
+        keep = (end_seconds > start_seconds) | (home_points + away_points > 0)
+        for i in np.flatnonzero(keep).tolist():
+            stints.append({
+                'period': period,
+                'start_seconds': round(float(start_seconds[i]), 2),
+                'end_seconds': round(float(end_seconds[i]), 2),
+                'home_points': int(home_points[i]),
+                'away_points': int(away_points[i]),
+                'home_lineup': states[i][0],
+                'away_lineup': states[i][1],
+            })
+    return stints
+
+
+def _lineup_key(person_ids: List[int]) -> Optional[Tuple[int, ...]]:
+    """Sorted tuple of exactly five person ids, or None for an incomplete lineup"""
+    if len(person_ids) != LINEUP_SIZE or 0 in person_ids:
+        return None
+    return tuple(sorted(person_ids))
+
+
+class LineupService:
+    """Builds lineup and stint tables from play-by-play and boxscore data"""
+
+    def __init__(self, session: Session, batch_size: int = 250):
+        self.session = session
+        self.batch_size = batch_size
+
+    def build_games(self, game_ids: List[int]) -> Dict[str, int]:
+        """
+        Rebuild stints for the given games, creating any new lineups.
+
+        Args:
+            game_ids: Games to process
+
+        Returns:
+            Dictionary with 'stints', 'lineups' (new) and 'incomplete' counts
+        """
+        counts = {'stints': 0, 'lineups': 0, 'incomplete': 0}
+        if not game_ids:
+            return counts
+
+        try:
+            self.session.execute(delete(Stint).where(Stint.game_id.in_(game_ids)))
+
+            arrays = load_play_arrays(self.session, game_ids)
+            rosters = load_rosters(self.session, game_ids)
+            descriptions = dict(self.session.execute(
+                select(Play.play_id, Play.description)
+                .where(Play.game_id.in_(game_ids))
+                .where(Play.action_type == 'Substitution')
+            ).all())
+
+            game_stints = []
+            for index, game_id in enumerate(arrays.game_ids.tolist()):
+                game_rosters = {side: rosters[(game_id, side)] for side in (SIDE_HOME, SIDE_AWAY)
+                                if (game_id, side) in rosters}
+                stints = reconstruct_stints(arrays, index, descriptions, game_rosters)
+                game_stints.append((index, game_id, stints))
+
+            # Resolve lineup ids for every distinct (team, players) key in the batch
+            keys = set()
+            for index, _, stints in game_stints:
+                home, away = int(arrays.home_team_ids[index]), int(arrays.away_team_ids[index])
+                for stint in stints:
+                    if stint['home_lineup']:
+                        keys.add((home,) + stint['home_lineup'])
+                    if stint['away_lineup']:
+                        keys.add((away,) + stint['away_lineup'])
+            lineup_ids, counts['lineups'] = self._get_or_create_lineups(keys)
+
+            records = []
+            for index, game_id, stints in game_stints:
+                home, away = int(arrays.home_team_ids[index]), int(arrays.away_team_ids[index])
+                for number, stint in enumerate(stints, 1):
+                    home_id = lineup_ids.get((home,) + stint['home_lineup']) if stint['home_lineup'] else None
+                    away_id = lineup_ids.get((away,) + stint['away_lineup']) if stint['away_lineup'] else None
+                    if home_id is None or away_id is None:
+                        counts['incomplete'] += 1
+                    for team_id, lineup_id, opponent_id, points_for, points_against in (
+                        (home, home_id, away_id, stint['home_points'], stint['away_points']),
+                        (away, away_id, home_id, stint['away_points'], stint['home_points']),
+                    ):
+                        if lineup_id is None:
+                            continue
+                        records.append({
+                            'game_id': game_id,
+                            'stint_number': number,
+                            'period': stint['period'],
+                            'team_id': team_id,
+                            'lineup_id': lineup_id,
+                            'opponent_lineup_id': opponent_id,
+                            'start_seconds': stint['start_seconds'],
+                            'end_seconds': stint['end_seconds'],
+                            'points_for': points_for,
+                            'points_against': points_against,
+                        })
+
+            if records:
+                self.session.execute(insert(Stint), records)
+            counts['stints'] = len(records)
+
+            if counts['incomplete']:
+                logger.warning(f"{counts['incomplete']} stints had an incomplete lineup "
+                               f"for games {game_ids[0]}..{game_ids[-1]}")
+            return counts
+        except Exception as e:
+            logger.error(f"Error building stints: {e}")
+            raise
+
+    def _get_or_create_lineups(self, keys: set) -> Tuple[Dict[Tuple[int, ...], int], int]:
+        """Map (team_id, p1..p5) keys to lineup ids, inserting missing lineups"""
+        if not keys:
+            return {}, 0
+
+        columns = (Lineup.team_id, Lineup.person_1, Lineup.person_2,
+                   Lineup.person_3, Lineup.person_4, Lineup.person_5)
+
+        def fetch(wanted):
+            found = {}
+            wanted = list(wanted)
+            for i in range(0, len(wanted), 500):
+                chunk = wanted[i:i + 500]
+                rows = self.session.execute(
+                    select(Lineup.lineup_id, *columns).where(tuple_(*columns).in_(chunk))
+                ).all()
+                found.update({tuple(row[1:]): row[0] for row in rows})
+            return found
+
+        lineup_ids = fetch(keys)
+        missing = [key for key in keys if key not in lineup_ids]
+        if missing:
+            self.session.execute(insert(Lineup), [
+                dict(zip(('team_id', 'person_1', 'person_2', 'person_3', 'person_4', 'person_5'), key))
+                for key in sorted(missing)
+            ])
+            lineup_ids.update(fetch(missing))
+        return lineup_ids, len(missing)
+
+    def pending_game_ids(self, seasons: Optional[List[int]] = None) -> List[int]:
+        """
+        Find games that have plays but no stints yet.
+
+        Args:
+            seasons: Optional season filter
+
+        Returns:
+            Sorted list of game IDs
+        """
+        query = (
+            select(Game.game_id)
+            .where(exists().where(Play.game_id == Game.game_id))
+            .where(~exists().where(Stint.game_id == Game.game_id))
+            .order_by(Game.game_id)
+        )
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(self.session.scalars(query))
+
+    def build(self, game_ids: List[int], commit: bool = True) -> Dict[str, int]:
+        """
+        Build stints for many games in batches.
+
+        Args:
+            game_ids: Games to process
+            commit: Commit after each batch
+
+        Returns:
+            Dictionary with 'games', 'stints', 'lineups' and 'incomplete' counts
+        """
+        stats = {'games': 0, 'stints': 0, 'lineups': 0, 'incomplete': 0}
+        for i in range(0, len(game_ids), self.batch_size):
+            batch = game_ids[i:i + self.batch_size]
+            counts = self.build_games(batch)
+            for key, value in counts.items():
+                stats[key] += value
+            stats['games'] += len(batch)
+            if commit:
+                self.session.commit()
+            logger.info(f"Stints: {stats['games']}/{len(game_ids)} games processed")
+        return stats
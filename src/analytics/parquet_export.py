@@ -0,0 +1,277 @@
+"""
+Parquet export of game tables into a season / game type partitioned layout.
+
+Tables are written under a Hive-style directory tree that pandas, pyarrow
+and query engines read as one dataset:
+
+    <root>/<table>/season=<season>/game_type=<game_type>/part-0.parquet
+
+Low-cardinality strings (action types, box types, ...) are dictionary
+encoded and read back as categoricals, and the text clocks and scores of
+plays and boxscores get typed numeric companions. Each partition's contents
+are fingerprinted from its primary keys and its games' population times;
+incremental runs compare the fingerprints with the manifest of the previous
+export and rewrite only the partitions that changed.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, func, inspect, Integer, BigInteger, Float, Boolean, DateTime
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, Boxscore, Possession, Stint, Lineup
+from .play_arrays import parse_clock
+from .season_stats import parse_minutes
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_FILE = '_manifest.json'
+MANIFEST_VERSION = 2
+PARTITION_COLUMNS = ('season', 'game_type')
+UNKNOWN_PARTITION = 'unknown'
+
+
+def _score(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
+
+
+# table -> (model, sort columns, dictionary encoded columns, derived columns)
+# Derived columns are (name, arrow type, source column, converter)
+PARQUET_TABLES: Dict[str, Tuple[Any, tuple, Tuple[str, ...], tuple]] = {
+    'game': (Game, (Game.game_id,), ('game_label',), ()),
+    'play': (
+        Play, (Play.game_id, Play.action_number, Play.play_id),
+        ('action_type', 'sub_type', 'shot_result', 'location', 'clock'),
+        (
+            ('clock_seconds', pa.float32(), 'clock', parse_clock),
+            ('score_home_value', pa.int16(), 'score_home', _score),
+            ('score_away_value', pa.int16(), 'score_away', _score),
+        ),
+    ),
+    'boxscore': (
+        Boxscore, (Boxscore.game_id, Boxscore.boxscore_id),
+        ('home_away_team', 'box_type', 'position'),
+        (('minutes', pa.float32(), 'min', parse_minutes),),
+    ),
+    'possession': (Possession, (Possession.game_id, Possession.possession_number),
+                   ('location', 'end_reason'), ()),
+    'stint': (Stint, (Stint.game_id, Stint.stint_id), (), ()),
+}
+
+# Tables without a game are written whole whenever any partition changes
+UNPARTITIONED_TABLES = {'lineup': (Lineup, (Lineup.lineup_id,), (), ())}
+
+
+def arrow_type(column) -> pa.DataType:
+    """Arrow type for a SQLAlchemy column"""
+    column_type = column.type
+    if isinstance(column_type, BigInteger):
+        return pa.int64()
+    if isinstance(column_type, Integer):
+        return pa.int32()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+    return pa.string()
+
+
+def partition_path(root: Path, table: str, season: Optional[int], game_type: Optional[str]) -> Path:
+    """Directory of one table partition"""
+    season_value = UNKNOWN_PARTITION if season is None else season
+    game_type_value = game_type or UNKNOWN_PARTITION
+    return root / table / f'season={season_value}' / f'game_type={game_type_value}'
+
+
+class ParquetExporter:
+    """Writes game tables to a partitioned Parquet dataset"""
+
+    def __init__(self, session: Session, root: str, batch_size: int = 50000,
+                 tables: Optional[Sequence[str]] = None):
+        """
+        Args:
+            session: Database session
+            root: Dataset root directory
+            batch_size: Rows fetched and written per record batch
+            tables: Tables to export (default: every table that exists)
+        """
+        self.session = session
+        self.root = Path(root)
+        self.batch_size = batch_size
+        available = set(inspect(session.get_bind()).get_table_names())
+        wanted = list(tables) if tables else list(PARQUET_TABLES) + list(UNPARTITIONED_TABLES)
+        self.tables = [t for t in wanted if t in available and (t in PARQUET_TABLES or t in UNPARTITIONED_TABLES)]
+
+    def _schema(self, table: str) -> Tuple[pa.Schema, List[str], list]:
+        """Arrow schema, selected column names and derived column specs for a table"""
+        model, _, dictionary_columns, derived = PARQUET_TABLES.get(table) or UNPARTITIONED_TABLES[table]
+        names, fields = [], []
+        for column in model.__table__.columns:
+            # Partition values live in the directory names
+            if model is Game and column.key in PARTITION_COLUMNS:
+                continue
+            names.append(column.key)
+            if column.key in dictionary_columns:
+                fields.append(pa.field(column.key, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(column.key, arrow_type(column)))
+        for name, data_type, _, _ in derived:
+            fields.append(pa.field(name, data_type))
+        return pa.schema(fields), names, derived
+
+    def partition_fingerprints(self, seasons: Optional[Sequence[int]] = None) -> Dict[str, list]:
+        """
+        Fingerprint every (season, game_type) partition from primary keys
+        and the newest populated_at of its games.
+
+        A game repopulated by deleting and reinserting its rows takes new
+        keys from the PostgreSQL sequences, which changes the partition's
+        count, key range or key sum. Rows updated in place keep their keys,
+        but population stamps the game's populated_at whenever it writes
+        them.
+
+        Returns:
+            Dictionary of 'season/game_type' -> fingerprint values
+        """
+        fingerprints: Dict[str, list] = {}
+        for table in self.tables:
+            if table not in PARQUET_TABLES:
+                continue
+            model = PARQUET_TABLES[table][0]
+            key = model.__table__.primary_key.columns.values()[0]
+            query = select(Game.season, Game.game_type, func.max(Game.populated_at),
+                           func.count(key), func.min(key), func.max(key), func.sum(key))
+            if model is not Game:
+                query = query.select_from(model).join(Game, Game.game_id == model.game_id)
+            if seasons:
+                query = query.where(Game.season.in_(seasons))
+            query = query.group_by(Game.season, Game.game_type)
+            for season, game_type, populated_at, *stats in self.session.execute(query):
+                partition = f'{season}/{game_type}'
+                fingerprints.setdefault(partition, []).append(
+                    [table, str(populated_at or '')] + [int(v or 0) for v in stats]
+                )
+        for values in fingerprints.values():
+            values.sort()
+        return fingerprints
+
+    def _write(self, table: str, path: Path, query) -> int:
+        """Stream query rows into one Parquet file, replacing it atomically"""
+        schema, names, derived = self._schema(table)
+        positions = {name: i for i, name in enumerate(names)}
+        path.mkdir(parents=True, exist_ok=True)
+        target = path / 'part-0.parquet'
+        partial = path / 'part-0.parquet.tmp'
+
+        rows = 0
+        with pq.ParquetWriter(partial, schema, compression='zstd', use_dictionary=True) as writer:
+            result = self.session.execute(query.execution_options(yield_per=self.batch_size))
+            for partition in result.partitions():
+                columns = list(zip(*partition))
+                arrays = [pa.array(columns[i], type=schema.field(i).type) for i in range(len(names))]
+                for name, data_type, source, convert in derived:
+                    values = [convert(v) for v in columns[positions[source]]]
+                    arrays.append(pa.array(values, type=data_type))
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+                rows += len(partition)
+        os.replace(partial, target)
+        return rows
+
+    def write_partition(self, table: str, season: Optional[int], game_type: Optional[str]) -> int:
+        """
+        Write one table partition.
+
+        Returns:
+            Number of rows written
+        """
+        model, order, _, _ = PARQUET_TABLES[table]
+        _, names, _ = self._schema(table)
+        columns = [model.__table__.columns[name] for name in names]
+        query = select(*columns).order_by(*order)
+        if model is not Game:
+            query = query.join(Game, Game.game_id == model.game_id)
+        query = query.where(Game.season.is_(None) if season is None else Game.season == season)
+        query = query.where(Game.game_type.is_(None) if game_type is None else Game.game_type == game_type)
+        return self._write(table, partition_path(self.root, table, season, game_type), query)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return {}
+        manifest = json.loads(path.read_text())
+        return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+    def export(self, incremental: bool = True, seasons: Optional[Sequence[int]] = None,
+               progress: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+        """
+        Export all partitions, or only those that changed since the last run.
+
+        Args:
+            incremental: Skip partitions whose fingerprint matches the manifest
+            seasons: Restrict to these seasons
+            progress: Called with each partition name as it is written
+
+        Returns:
+            Dictionary with 'partitions', 'skipped', 'removed' and 'rows' counts
+        """
+        stats = {'partitions': 0, 'skipped': 0, 'removed': 0, 'rows': 0}
+        manifest = self._read_manifest()
+        previous = manifest.get('partitions', {}) if incremental and manifest.get('tables') == self.tables else {}
+        current = self.partition_fingerprints(seasons)
+
+        for partition, fingerprint in sorted(current.items()):
+            if previous.get(partition) == fingerprint:
+                stats['skipped'] += 1
+                continue
+            season_text, game_type = partition.split('/', 1)
+            season = None if season_text == 'None' else int(season_text)
+            game_type = None if game_type == 'None' else game_type
+            for table in self.tables:
+                if table in PARQUET_TABLES:
+                    stats['rows'] += self.write_partition(table, season, game_type)
+            stats['partitions'] += 1
+            if progress:
+                progress(partition)
+
+        # Partitions whose games are gone from the database
+        for partition in set(manifest.get('partitions', {})) - set(current):
+            season_text, game_type = partition.split('/', 1)
+            if seasons and season_text not in {str(s) for s in seasons}:
+                continue
+            for table in self.tables:
+                if table in PARQUET_TABLES:
+                    path = partition_path(self.root, table, None if season_text == 'None' else int(season_text),
+                                          None if game_type == 'None' else game_type)
+                    for file in path.glob('*.parquet'):
+                        file.unlink()
+            stats['removed'] += 1
+
+        if stats['partitions'] or stats['removed'] or not incremental:
+            for table, (model, order, _, _) in UNPARTITIONED_TABLES.items():
+                if table in self.tables:
+                    _, names, _ = self._schema(table)
+                    columns = [model.__table__.columns[name] for name in names]
+                    stats['rows'] += self._write(table, self.root / table, select(*columns).order_by(*order))
+
+        # Keep fingerprints of partitions outside a season filter
+        partitions = dict(manifest.get('partitions', {})) if seasons else {}
+        for partition in set(partitions) - set(current):
+            if partition.split('/', 1)[0] in {str(s) for s in seasons or ()}:
+                del partitions[partition]
+        partitions.update(current)
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / MANIFEST_FILE).write_text(json.dumps(
+            {'version': MANIFEST_VERSION, 'tables': self.tables, 'partitions': partitions}, indent=2, sort_keys=True
+        ))
+        logger.info(f"Parquet export: {stats['partitions']} partitions written, "
+                    f"{stats['skipped']} unchanged, {stats['removed']} removed")
+        return stats
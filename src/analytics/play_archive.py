@@ -0,0 +1,234 @@
+"""
+Memory-mapped binary archive of play-by-play arrays.
+
+The archive is a directory of fixed-width little-endian column files, one
+per PlayArrays field, plus a per-game offset index and a JSON manifest
+holding the row count, column dtypes and the sub type string dictionary:
+
+    manifest.json
+    play_id.bin, game_id.bin, ..., score_away.bin     one value per play
+    game_ids.bin, home_team_ids.bin, away_team_ids.bin one value per game
+    game_offsets.bin                                   games + 1 row offsets
+
+Plays are stored in the same game order and with the same parsed values
+that load_play_arrays produces, so the analytics functions accept archive
+views directly. Opening an archive maps the files with numpy.memmap without
+reading them; a single game or the whole archive is a zero-copy slice.
+"""
+
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, exists
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play
+from .play_arrays import PlayArrays, load_play_arrays
+
+logger = logging.getLogger(__name__)
+
+
+ARCHIVE_FORMAT = 'wnba-play-archive'
+ARCHIVE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+# Per-play columns and their on-disk dtypes
+PLAY_COLUMNS: Dict[str, str] = {
+    'play_id': '<i4',
+    'game_id': '<i4',
+    'action_number': '<i4',
+    'period': '<i2',
+    'clock': '<f4',
+    'elapsed': '<f4',
+    'action_code': '<i1',
+    'sub_type': '<i4',
+    'side': '<i1',
+    'team_id': '<i4',
+    'person_id': '<i4',
+    'shot_value': '<i1',
+    'is_miss': '|b1',
+    'points': '<i1',
+    'score_home': '<i2',
+    'score_away': '<i2',
+}
+
+# Per-game index columns
+GAME_COLUMNS: Dict[str, str] = {
+    'game_ids': '<i4',
+    'home_team_ids': '<i4',
+    'away_team_ids': '<i4',
+}
+OFFSETS_COLUMN = 'game_offsets'
+
+
+def build_play_archive(session: Session, path: str, game_ids: Optional[Sequence[int]] = None,
+                       seasons: Optional[Sequence[int]] = None, batch_size: int = 250) -> Dict[str, int]:
+    """
+    Build an archive from the play table, one batch of games at a time.
+
+    The archive is written to a sibling temporary directory and moved into
+    place when complete, replacing any previous archive at path.
+
+    Args:
+        session: Database session
+        path: Archive directory
+        game_ids: Restrict to these games
+        seasons: Restrict to these seasons
+        batch_size: Games loaded per batch
+
+    Returns:
+        Dictionary with 'games' and 'plays' counts
+    """
+    query = (
+        select(Game.game_id)
+        .where(exists().where(Play.game_id == Game.game_id))
+        .order_by(Game.game_id)
+    )
+    if game_ids:
+        query = query.where(Game.game_id.in_(game_ids))
+    if seasons:
+        query = query.where(Game.season.in_(seasons))
+    targets = list(session.scalars(query))
+
+    target = Path(path)
+    staging = target.with_name(target.name + '.tmp')
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    files = {name: open(staging / f'{name}.bin', 'wb') for name in list(PLAY_COLUMNS) + list(GAME_COLUMNS)}
+    sub_type_codes: Dict[str, int] = {}
+    offsets = [0]
+    try:
+        for i in range(0, len(targets), batch_size):
+            arrays = load_play_arrays(session, targets[i:i + batch_size])
+
+            # Re-code the batch's sub types into the archive-wide dictionary
+            mapping = np.array([sub_type_codes.setdefault(s, len(sub_type_codes)) for s in arrays.sub_types],
+                               dtype=np.int32)
+            columns = {name: getattr(arrays, name) for name in PLAY_COLUMNS}
+            columns['sub_type'] = mapping[arrays.sub_type] if len(mapping) else arrays.sub_type
+            for name, dtype in PLAY_COLUMNS.items():
+                files[name].write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+            for name, dtype in GAME_COLUMNS.items():
+                files[name].write(np.ascontiguousarray(getattr(arrays, name), dtype=dtype).tobytes())
+
+            ends = np.append(arrays.game_starts[1:], len(arrays)) if len(arrays) else np.zeros(0, dtype=np.int64)
+            offsets.extend((ends + offsets[-1]).tolist())
+            logger.info(f"Play archive: {min(i + batch_size, len(targets))}/{len(targets)} games written")
+    finally:
+        for f in files.values():
+            f.close()
+
+    np.asarray(offsets, dtype='<i8').tofile(staging / f'{OFFSETS_COLUMN}.bin')
+    manifest = {
+        'format': ARCHIVE_FORMAT,
+        'version': ARCHIVE_VERSION,
+        'plays': offsets[-1],
+        'games': len(offsets) - 1,
+        'play_columns': PLAY_COLUMNS,
+        'game_columns': GAME_COLUMNS,
+        'sub_types': list(sub_type_codes),
+    }
+    (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+    if target.exists():
+        shutil.rmtree(target)
+    staging.rename(target)
+    logger.info(f"Play archive written to {target}: {manifest['games']} games, {manifest['plays']} plays")
+    return {'games': manifest['games'], 'plays': manifest['plays']}
+
+
+class PlayArchive:
+    """Read-only, memory-mapped view of a play archive"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Archive directory written by build_play_archive
+
+        Raises:
+            ValueError: If the directory is not a compatible archive
+        """
+        self.path = Path(path)
+        manifest = json.loads((self.path / MANIFEST_FILE).read_text())
+        if manifest.get('format') != ARCHIVE_FORMAT or manifest.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"{self.path} is not a version {ARCHIVE_VERSION} play archive")
+        self.manifest = manifest
+        self.sub_types = np.array(manifest['sub_types'], dtype=object)
+
+        self.columns = {
+            name: self._map(name, dtype, manifest['plays'])
+            for name, dtype in manifest['play_columns'].items()
+        }
+        self.games = {
+            name: self._map(name, dtype, manifest['games'])
+            for name, dtype in manifest['game_columns'].items()
+        }
+        self.offsets = self._map(OFFSETS_COLUMN, '<i8', manifest['games'] + 1)
+        self._positions = {game_id: i for i, game_id in enumerate(self.games['game_ids'].tolist())}
+
+    def _map(self, name: str, dtype: str, count: int) -> np.ndarray:
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.path / f'{name}.bin', dtype=dtype, mode='r', shape=(count,))
+
+    def __len__(self) -> int:
+        return self.manifest['plays']
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._positions
+
+    @property
+    def game_ids(self) -> np.ndarray:
+        """Archived game ids in storage order"""
+        return self.games['game_ids']
+
+    def _view(self, start: int, stop: int, first_game: int, last_game: int) -> PlayArrays:
+        """Zero-copy PlayArrays over a contiguous run of games"""
+        window = slice(start, stop)
+        games = slice(first_game, last_game)
+        return PlayArrays(
+            **{name: column[window] for name, column in self.columns.items()},
+            sub_types=self.sub_types,
+            game_starts=np.asarray(self.offsets[games]) - start,
+            **{name: column[games] for name, column in self.games.items()},
+        )
+
+    def game(self, game_id: int) -> PlayArrays:
+        """
+        Plays of one game, located through the offset index in O(1).
+
+        Raises:
+            KeyError: If the game is not archived
+        """
+        i = self._positions[game_id]
+        return self._view(int(self.offsets[i]), int(self.offsets[i + 1]), i, i + 1)
+
+    def all(self) -> PlayArrays:
+        """Every archived play as one zero-copy view"""
+        return self._view(0, len(self), 0, len(self.game_ids))
+
+    def select(self, game_ids: List[int]) -> PlayArrays:
+        """
+        Plays of several games, in the order given (copied into memory).
+
+        Raises:
+            KeyError: If a game is not archived
+        """
+        positions = np.array([self._positions[game_id] for game_id in game_ids], dtype=np.int64)
+        starts = np.asarray(self.offsets)[positions]
+        stops = np.asarray(self.offsets)[positions + 1]
+        lengths = stops - starts
+        output_starts = np.cumsum(lengths) - lengths
+        rows = np.arange(lengths.sum()) + np.repeat(starts - output_starts, lengths)
+        return PlayArrays(
+            **{name: np.asarray(column)[rows] for name, column in self.columns.items()},
+            sub_types=self.sub_types,
+            game_starts=output_starts.astype(np.int64),
+            **{name: np.asarray(column)[positions] for name, column in self.games.items()},
+        )
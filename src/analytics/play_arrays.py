@@ -0,0 +1,317 @@
+"""
+Columnar loading of play-by-play data into NumPy arrays.
+
+Plays are fetched once per batch of games and converted into a struct of
+arrays in feed order: by game, period and insertion order. Action numbers
+are not strictly chronological in the source feed, so they are not used
+for ordering. Low-cardinality string columns
+(action type, sub type, clock) are factorized so that parsing happens once
+per distinct value instead of once per row.
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Iterable
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play
+
+logger = logging.getLogger(__name__)
+
+
+# Integer codes for play action types
+ACTION_OTHER = 0
+ACTION_PERIOD = 1
+ACTION_JUMP_BALL = 2
+ACTION_MADE_SHOT = 3
+ACTION_MISSED_SHOT = 4
+ACTION_FREE_THROW = 5
+ACTION_REBOUND = 6
+ACTION_TURNOVER = 7
+ACTION_FOUL = 8
+ACTION_SUBSTITUTION = 9
+ACTION_TIMEOUT = 10
+ACTION_VIOLATION = 11
+
+ACTION_CODES = {
+    'period': ACTION_PERIOD,
+    'Jump Ball': ACTION_JUMP_BALL,
+    'Made Shot': ACTION_MADE_SHOT,
+    'Missed Shot': ACTION_MISSED_SHOT,
+    'Free Throw': ACTION_FREE_THROW,
+    'Rebound': ACTION_REBOUND,
+    'Turnover': ACTION_TURNOVER,
+    'Foul': ACTION_FOUL,
+    'Substitution': ACTION_SUBSTITUTION,
+    'Timeout': ACTION_TIMEOUT,
+    'Violation': ACTION_VIOLATION,
+}
+
+# Side codes derived from play location ('h' = home, 'v' = visitor)
+SIDE_HOME = 1
+SIDE_AWAY = -1
+SIDE_NONE = 0
+
+_CLOCK_PATTERN = re.compile(r'PT(\d+)M([\d.]+)S')
+
+
+def parse_clock(clock: str) -> float:
+    """
+    Parse an ISO-8601 style game clock ('PT09M34.00S') into seconds remaining.
+
+    Args:
+        clock: Clock string from play-by-play data
+
+    Returns:
+        Seconds remaining in the period, or 0.0 if the clock is malformed
+    """
+    if not clock:
+        return 0.0
+    match = _CLOCK_PATTERN.match(clock)
+    if not match:
+        return 0.0
+    return int(match.group(1)) * 60 + float(match.group(2))
+
+
+def factorize(values: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode a sequence of strings as integer codes plus the distinct values.
+
+    None is treated as an empty string.
+
+    Returns:
+        Tuple of (codes, categories) where categories[codes] reproduces the input
+    """
+    arr = np.array(['' if v is None else v for v in values], dtype=object)
+    if len(arr) == 0:
+        return np.zeros(0, dtype=np.int32), np.array([], dtype=object)
+    categories, codes = np.unique(arr, return_inverse=True)
+    return codes.astype(np.int32), categories
+
+
+def forward_fill(values: np.ndarray, valid: np.ndarray, group_starts: np.ndarray,
+                 default=0) -> np.ndarray:
+    """
+    Forward fill values where valid is False, restarting at each group start.
+
+    Rows before the first valid value in a group receive the default.
+    """
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    filled = np.where(valid, values, default)
+    anchor = valid.copy()
+    anchor[group_starts] = True
+    idx = np.where(anchor, np.arange(n), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return filled[idx]
+
+
+@dataclass
+class PlayArrays:
+    """Struct-of-arrays view of play-by-play rows for a set of games"""
+    play_id: np.ndarray         # int64
+    game_id: np.ndarray         # int64
+    action_number: np.ndarray   # int32
+    period: np.ndarray          # int16
+    clock: np.ndarray           # float32, seconds remaining in period
+    elapsed: np.ndarray         # float32, seconds since tip-off
+    action_code: np.ndarray     # int8, see ACTION_CODES
+    sub_type: np.ndarray        # int32 codes into sub_types
+    sub_types: np.ndarray       # object, distinct sub type strings
+    side: np.ndarray            # int8, SIDE_HOME / SIDE_AWAY / SIDE_NONE
+    team_id: np.ndarray         # int64, API team id for the side (0 if unknown)
+    person_id: np.ndarray       # int64, API person id (0 if none)
+    shot_value: np.ndarray      # int8
+    is_miss: np.ndarray         # bool, description starts with MISS
+    points: np.ndarray          # int8, points scored on the play
+    score_home: np.ndarray      # int16, running home score
+    score_away: np.ndarray      # int16, running away score
+    game_starts: np.ndarray     # int64, row index where each game begins
+    game_ids: np.ndarray        # int64, game id of each game block
+    home_team_ids: np.ndarray   # int64, home API team id of each game block
+    away_team_ids: np.ndarray   # int64, away API team id of each game block
+
+    def __len__(self) -> int:
+        return len(self.game_id)
+
+    @property
+    def period_starts(self) -> np.ndarray:
+        """Row indices where a new (game, period) segment begins"""
+        n = len(self.game_id)
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        boundary = np.ones(n, dtype=bool)
+        boundary[1:] = (self.game_id[1:] != self.game_id[:-1]) | (self.period[1:] != self.period[:-1])
+        return np.flatnonzero(boundary)
+
+    def game_index(self, rows: np.ndarray) -> np.ndarray:
+        """Map row indices to the index of their game block"""
+        return np.searchsorted(self.game_starts, rows, side='right') - 1
+
+
+def build_play_arrays(rows: List[Tuple], home_away: Dict[int, Tuple[int, int]]) -> PlayArrays:
+    """
+    Build PlayArrays from raw play rows.
+
+    Args:
+        rows: Tuples of (game_id, action_number, period, clock, action_type,
+              sub_type, location, person_id, shot_value, description,
+              score_home, score_away, play_id), in feed order per game
+        home_away: Mapping of game_id to (home_team_id, away_team_id) API ids
+
+    Returns:
+        PlayArrays for the supplied rows
+    """
+    n = len(rows)
+    columns = list(zip(*rows)) if n else [()] * 13
+
+    game_id = np.array(columns[0], dtype=np.int64)
+    action_number = np.array([v or 0 for v in columns[1]], dtype=np.int32)
+    period = np.array([v or 0 for v in columns[2]], dtype=np.int16)
+
+    # Clock: parse each distinct value once
+    clock_codes, clock_values = factorize(columns[3])
+    clock_seconds = np.array([parse_clock(c) for c in clock_values], dtype=np.float32)
+    clock = clock_seconds[clock_codes]
+
+    action_codes_idx, action_types = factorize(columns[4])
+    action_lookup = np.array([ACTION_CODES.get(t, ACTION_OTHER) for t in action_types], dtype=np.int8)
+    action_code = action_lookup[action_codes_idx]
+
+    sub_type, sub_types = factorize(columns[5])
+
+    location_codes, locations = factorize(columns[6])
+    side_lookup = np.array([
+        SIDE_HOME if loc == 'h' else SIDE_AWAY if loc == 'v' else SIDE_NONE
+        for loc in locations
+    ], dtype=np.int8)
+    side = side_lookup[location_codes]
+
+    person_id = np.array([v or 0 for v in columns[7]], dtype=np.int64)
+    shot_value = np.array([v or 0 for v in columns[8]], dtype=np.int8)
+    description = np.array(['' if v is None else v for v in columns[9]], dtype=str)
+    is_miss = np.char.startswith(description, 'MISS')
+
+    points = np.where(action_code == ACTION_MADE_SHOT, shot_value, 0).astype(np.int8)
+    points += ((action_code == ACTION_FREE_THROW) & ~is_miss).astype(np.int8)
+
+    # Game blocks
+    if n:
+        game_boundary = np.ones(n, dtype=bool)
+        game_boundary[1:] = game_id[1:] != game_id[:-1]
+        game_starts = np.flatnonzero(game_boundary)
+    else:
+        game_starts = np.zeros(0, dtype=np.int64)
+    game_ids = game_id[game_starts]
+
+    # Scores are only present on scoring plays; carry them forward
+    score_home, score_away = _parse_scores(columns[10], columns[11], game_starts)
+
+    # Team ids from the game's home/away teams
+    home_ids = np.array([home_away.get(int(g), (0, 0))[0] or 0 for g in game_ids], dtype=np.int64)
+    away_ids = np.array([home_away.get(int(g), (0, 0))[1] or 0 for g in game_ids], dtype=np.int64)
+    game_index = np.repeat(np.arange(len(game_starts)), np.diff(np.append(game_starts, n)))
+    team_id = np.where(side == SIDE_HOME, home_ids[game_index],
+                       np.where(side == SIDE_AWAY, away_ids[game_index], 0)).astype(np.int64)
+
+    play_id = np.array(columns[12], dtype=np.int64)
+
+    arrays = PlayArrays(
+        play_id=play_id, game_id=game_id, action_number=action_number, period=period,
+        clock=clock, elapsed=np.zeros(n, dtype=np.float32),
+        action_code=action_code, sub_type=sub_type, sub_types=sub_types,
+        side=side, team_id=team_id, person_id=person_id, shot_value=shot_value,
+        is_miss=is_miss, points=points, score_home=score_home, score_away=score_away,
+        game_starts=game_starts, game_ids=game_ids,
+        home_team_ids=home_ids, away_team_ids=away_ids
+    )
+    arrays.elapsed = _elapsed_seconds(arrays)
+    return arrays
+
+
+def _parse_scores(home_values: Tuple, away_values: Tuple,
+                  game_starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert sparse score strings into forward-filled int16 home/away arrays.
+
+    Non-scoring plays carry blank scores in recent feeds but '0'/'0' in older
+    ones, so a pair is only taken as a score update when both sides parse and
+    at least one is non-zero.
+    """
+    if len(home_values) == 0:
+        return np.zeros(0, dtype=np.int16), np.zeros(0, dtype=np.int16)
+    home = _parse_score_column(home_values)
+    away = _parse_score_column(away_values)
+    valid = (home >= 0) & (away >= 0) & ((home > 0) | (away > 0))
+    return (forward_fill(home, valid, game_starts).astype(np.int16),
+            forward_fill(away, valid, game_starts).astype(np.int16))
+
+
+def _parse_score_column(values: Tuple) -> np.ndarray:
+    """Parse score strings to int32, with -1 for blanks"""
+    codes, categories = factorize(values)
+    parsed = np.array([int(c) if str(c).strip().isdigit() else -1 for c in categories], dtype=np.int32)
+    return parsed[codes]
+
+
+def _elapsed_seconds(arrays: PlayArrays) -> np.ndarray:
+    """
+    Compute elapsed game seconds for every play.
+
+    Period length is taken from the largest clock value observed in that
+    period, which handles 20-minute halves, 10-minute quarters and overtime.
+    """
+    n = len(arrays)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    seg_starts = arrays.period_starts
+    marker = np.zeros(n, dtype=np.int64)
+    marker[seg_starts] = 1
+    seg_id = np.cumsum(marker) - 1
+    seg_len = np.maximum.reduceat(arrays.clock, seg_starts).astype(np.float64)
+
+    # Offset of each period within its game
+    seg_game_start = np.searchsorted(arrays.game_starts, seg_starts, side='right') - 1
+    first_seg_of_game = np.searchsorted(seg_starts, arrays.game_starts)[seg_game_start]
+    cum = np.cumsum(seg_len) - seg_len
+    seg_offset = cum - cum[first_seg_of_game]
+
+    return (seg_offset[seg_id] + seg_len[seg_id] - arrays.clock).astype(np.float32)
+
+
+def load_play_arrays(session: Session, game_ids: List[int]) -> PlayArrays:
+    """
+    Load plays for the given games into columnar arrays.
+
+    Args:
+        session: Database session
+        game_ids: Games to load
+
+    Returns:
+        PlayArrays in feed order
+    """
+    stmt = (
+        select(Play.game_id, Play.action_number, Play.period, Play.clock,
+               Play.action_type, Play.sub_type, Play.location, Play.person_id,
+               Play.shot_value, Play.description, Play.score_home, Play.score_away,
+               Play.play_id)
+        .where(Play.game_id.in_(game_ids))
+        .order_by(Play.game_id, Play.period, Play.play_id)
+    )
+    rows = session.execute(stmt).all()
+
+    home_away = {
+        row.game_id: (row.home_team_id, row.away_team_id)
+        for row in session.execute(
+            select(Game.game_id, Game.home_team_id, Game.away_team_id)
+            .where(Game.game_id.in_(game_ids))
+        )
+    }
+
+    logger.debug(f"Loaded {len(rows)} plays for {len(game_ids)} games")
+    return build_play_arrays(rows, home_away)
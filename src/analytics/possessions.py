@@ -0,0 +1,315 @@
+"""
+Possession tracking over play-by-play data.
+
+Possessions are segmented with vectorized NumPy operations over the action
+codes of a whole batch of games at once. A possession ends on:
+- a made field goal (unless an and-one free throw follows)
+- the last made free throw of a trip
+- a defensive rebound of a live miss
+- a turnover
+- the end of a period
+"""
+
+import re
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from sqlalchemy import select, delete, exists, insert
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, Possession
+from .play_arrays import (
+    PlayArrays, load_play_arrays, forward_fill,
+    ACTION_MADE_SHOT, ACTION_MISSED_SHOT, ACTION_FREE_THROW,
+    ACTION_REBOUND, ACTION_TURNOVER, SIDE_HOME, SIDE_AWAY, SIDE_NONE
+)
+
+logger = logging.getLogger(__name__)
+
+
+# End reason codes stored on each possession
+END_MADE_SHOT = 0
+END_FREE_THROW = 1
+END_DEFENSIVE_REBOUND = 2
+END_TURNOVER = 3
+END_OF_PERIOD = 4
+
+END_REASONS = {
+    END_MADE_SHOT: 'made_shot',
+    END_FREE_THROW: 'free_throw',
+    END_DEFENSIVE_REBOUND: 'defensive_rebound',
+    END_TURNOVER: 'turnover',
+    END_OF_PERIOD: 'end_of_period',
+}
+
+_FREE_THROW_PATTERN = re.compile(r'(\d+) of (\d+)')
+
+
+def _free_throw_features(sub_types: np.ndarray) -> Dict[str, np.ndarray]:
+    """Parse free throw trip position and flags from distinct sub types"""
+    number = np.zeros(len(sub_types), dtype=np.int8)
+    total = np.zeros(len(sub_types), dtype=np.int8)
+    technical = np.zeros(len(sub_types), dtype=bool)
+    keeps_ball = np.zeros(len(sub_types), dtype=bool)
+    no_turnover = np.zeros(len(sub_types), dtype=bool)
+
+    for i, sub_type in enumerate(sub_types):
+        match = _FREE_THROW_PATTERN.search(sub_type)
+        if match:
+            number[i], total[i] = int(match.group(1)), int(match.group(2))
+        technical[i] = 'Technical' in sub_type
+        # Flagrant and clear path fouls award free throws plus possession
+        keeps_ball[i] = 'Flagrant' in sub_type or 'Clear Path' in sub_type
+        no_turnover[i] = sub_type == 'No Turnover'
+
+    return {
+        'number': number, 'total': total, 'technical': technical,
+        'keeps_ball': keeps_ball, 'no_turnover': no_turnover
+    }
+
+
+def segment_possessions(arrays: PlayArrays) -> Dict[str, np.ndarray]:
+    """
+    Split play-by-play arrays into possessions.
+
+    Args:
+        arrays: Plays for one or more games in feed order
+
+    Returns:
+        Dictionary of equal-length arrays, one entry per possession:
+        game_id, possession_number, period, side, team_id,
+        start_action_number, end_action_number, start_clock, end_clock,
+        end_reason, points
+    """
+    n = len(arrays)
+    if n == 0:
+        return {key: np.zeros(0, dtype=np.int64) for key in (
+            'game_id', 'possession_number', 'period', 'side', 'team_id',
+            'start_action_number', 'end_action_number', 'start_clock',
+            'end_clock', 'end_reason', 'points'
+        )}
+
+    rows = np.arange(n)
+    code = arrays.action_code
+    side = arrays.side
+
+    features = _free_throw_features(arrays.sub_types)
+    ft_number = features['number'][arrays.sub_type]
+    ft_total = features['total'][arrays.sub_type]
+    technical = features['technical'][arrays.sub_type]
+    keeps_ball = features['keeps_ball'][arrays.sub_type]
+    no_turnover = features['no_turnover'][arrays.sub_type]
+
+    # Period segments
+    seg_starts = arrays.period_starts
+    seg_ends = np.append(seg_starts[1:], n) - 1
+    marker = np.zeros(n, dtype=np.int64)
+    marker[seg_starts] = 1
+    seg_id = np.cumsum(marker) - 1
+    seg_length = np.maximum.reduceat(arrays.clock, seg_starts)
+
+    made_fg = code == ACTION_MADE_SHOT
+    missed_fg = code == ACTION_MISSED_SHOT
+    free_throw = code == ACTION_FREE_THROW
+    ft_made = free_throw & ~arrays.is_miss
+    ft_last = (free_throw & (ft_total > 0) & (ft_number == ft_total)
+               & ~technical & ~keeps_ball)
+
+    # And-one: a made field goal followed by a single free throw by the same
+    # side at the same clock does not end the possession; the free throw does
+    single_ft = free_throw & (ft_total == 1) & ~technical & ~keeps_ball
+    key = ((seg_id.astype(np.int64) * 10_000_000
+            + np.round(arrays.clock * 100).astype(np.int64)) * 4 + (side + 1))
+    and_one = made_fg & np.isin(key, key[single_ft])
+
+    # Rebounds end the possession when they are the first rebound after a
+    # live miss and belong to the other side
+    shot_event = made_fg | missed_fg | free_throw
+    live_miss = missed_fg | (ft_last & ~ft_made)
+    rebound = code == ACTION_REBOUND
+    last_shot = forward_fill(rows, shot_event, seg_starts, default=-1)
+    last_rebound = forward_fill(rows, rebound, seg_starts, default=-1)
+    prev_rebound = np.concatenate(([-1], last_rebound[:-1]))
+    shot_row = np.maximum(last_shot, 0)
+    defensive_rebound = (
+        rebound & (last_shot >= 0) & live_miss[shot_row] & (prev_rebound < last_shot)
+        & (side != SIDE_NONE) & (side[shot_row] != SIDE_NONE) & (side != side[shot_row])
+    )
+
+    turnover = (code == ACTION_TURNOVER) & (side != SIDE_NONE) & ~no_turnover
+
+    reason = np.full(n, -1, dtype=np.int8)
+    reason[made_fg & ~and_one & (side != SIDE_NONE)] = END_MADE_SHOT
+    reason[ft_last & ft_made & (side != SIDE_NONE)] = END_FREE_THROW
+    reason[defensive_rebound] = END_DEFENSIVE_REBOUND
+    reason[turnover] = END_TURNOVER
+
+    offense_row = np.where(reason == END_DEFENSIVE_REBOUND, -side, side)
+
+    # Event ends followed by one end-of-period marker per segment
+    event_ends = np.flatnonzero(reason >= 0)
+    end_rows = np.concatenate((event_ends, seg_ends))
+    end_reason = np.concatenate((reason[event_ends],
+                                 np.full(len(seg_ends), END_OF_PERIOD, dtype=np.int8)))
+    order = np.lexsort((end_reason == END_OF_PERIOD, end_rows))
+    end_rows = end_rows[order]
+    end_reason = end_reason[order]
+
+    # Previous end within the same segment determines where each possession starts
+    end_seg = seg_id[end_rows]
+    prev = np.concatenate(([-1], end_rows[:-1]))
+    same_segment = np.concatenate(([False], end_seg[1:] == end_seg[:-1]))
+    start_rows = np.where(same_segment, prev + 1, seg_starts[end_seg])
+    start_clock = np.where(same_segment, arrays.clock[np.maximum(prev, 0)], seg_length[end_seg])
+    end_clock = arrays.clock[end_rows]
+
+    # Offensive side: explicit for event ends; for end-of-period use the last
+    # offensive action in the possession, else alternate from the previous one
+    offense = np.where(end_reason == END_OF_PERIOD, SIDE_NONE, offense_row[end_rows]).astype(np.int8)
+    is_period_end = end_reason == END_OF_PERIOD
+    offensive_action = (shot_event | turnover) & (side != SIDE_NONE)
+    last_action = forward_fill(rows, offensive_action, seg_starts, default=-1)[end_rows]
+    has_action = is_period_end & (last_action >= start_rows)
+    offense[has_action] = side[last_action[has_action]]
+    prev_offense = np.concatenate(([SIDE_NONE], offense[:-1]))
+    alternate = is_period_end & ~has_action & same_segment
+    offense[alternate] = -prev_offense[alternate]
+
+    # Points scored by the offense within the possession's rows
+    home_points = np.cumsum(np.where(side == SIDE_HOME, arrays.points, 0))
+    away_points = np.cumsum(np.where(side == SIDE_AWAY, arrays.points, 0))
+    before = start_rows - 1
+    home_total = home_points[end_rows] - np.where(before >= 0, home_points[np.maximum(before, 0)], 0)
+    away_total = away_points[end_rows] - np.where(before >= 0, away_points[np.maximum(before, 0)], 0)
+    points = np.where(offense == SIDE_HOME, home_total,
+                      np.where(offense == SIDE_AWAY, away_total, 0))
+
+    # Drop empty possessions (e.g. period ends right after a made basket)
+    keep = (start_rows <= end_rows) & ~(is_period_end & (start_clock == end_clock) & (points == 0))
+    end_rows, start_rows = end_rows[keep], start_rows[keep]
+    end_reason, offense, points = end_reason[keep], offense[keep], points[keep]
+    start_clock, end_clock = start_clock[keep], end_clock[keep]
+
+    game_index = arrays.game_index(end_rows)
+    first_of_game = np.searchsorted(game_index, game_index, side='left')
+    possession_number = np.arange(len(end_rows)) - first_of_game + 1
+    team_id = np.where(offense == SIDE_HOME, arrays.home_team_ids[game_index],
+                       np.where(offense == SIDE_AWAY, arrays.away_team_ids[game_index], 0))
+
+    return {
+        'game_id': arrays.game_id[end_rows],
+        'possession_number': possession_number,
+        'period': arrays.period[end_rows],
+        'side': offense,
+        'team_id': team_id,
+        'start_action_number': arrays.action_number[start_rows],
+        'end_action_number': arrays.action_number[end_rows],
+        'start_clock': start_clock,
+        'end_clock': end_clock,
+        'end_reason': end_reason,
+        'points': points,
+    }
+
+
+def possession_records(segments: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Convert possession arrays into row dictionaries for insertion"""
+    location = {SIDE_HOME: 'h', SIDE_AWAY: 'v'}
+    return [
+        {
+            'game_id': int(game_id),
+            'possession_number': int(number),
+            'period': int(period),
+            'team_id': int(team_id) or None,
+            'location': location.get(int(side)),
+            'start_action_number': int(start_action),
+            'end_action_number': int(end_action),
+            'start_clock': round(float(start_clock), 2),
+            'end_clock': round(float(end_clock), 2),
+            'end_reason': END_REASONS[int(reason)],
+            'points': int(points),
+        }
+        for game_id, number, period, team_id, side, start_action, end_action,
+            start_clock, end_clock, reason, points in zip(
+            segments['game_id'], segments['possession_number'], segments['period'],
+            segments['team_id'], segments['side'], segments['start_action_number'],
+            segments['end_action_number'], segments['start_clock'],
+            segments['end_clock'], segments['end_reason'], segments['points']
+        )
+    ]
+
+
+class PossessionService:
+    """Builds and refreshes the possession table from play-by-play data"""
+
+    def __init__(self, session: Session, batch_size: int = 250):
+        self.session = session
+        self.batch_size = batch_size
+
+    def build_games(self, game_ids: List[int]) -> int:
+        """
+        Rebuild possessions for the given games.
+
+        Args:
+            game_ids: Games to process
+
+        Returns:
+            Number of possessions inserted
+        """
+        if not game_ids:
+            return 0
+
+        try:
+            self.session.execute(delete(Possession).where(Possession.game_id.in_(game_ids)))
+
+            arrays = load_play_arrays(self.session, game_ids)
+            records = possession_records(segment_possessions(arrays))
+            if records:
+                self.session.execute(insert(Possession), records)
+
+            logger.debug(f"Built {len(records)} possessions for {len(game_ids)} games")
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error building possessions: {e}")
+            raise
+
+    def pending_game_ids(self, seasons: Optional[List[int]] = None) -> List[int]:
+        """
+        Find games that have plays but no possessions yet.
+
+        Args:
+            seasons: Optional season filter
+
+        Returns:
+            Sorted list of game IDs
+        """
+        query = (
+            select(Game.game_id)
+            .where(exists().where(Play.game_id == Game.game_id))
+            .where(~exists().where(Possession.game_id == Game.game_id))
+            .order_by(Game.game_id)
+        )
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(self.session.scalars(query))
+
+    def build(self, game_ids: List[int], commit: bool = True) -> Dict[str, int]:
+        """
+        Build possessions for many games in batches.
+
+        Args:
+            game_ids: Games to process
+            commit: Commit after each batch
+
+        Returns:
+            Dictionary with 'games' and 'possessions' counts
+        """
+        stats = {'games': 0, 'possessions': 0}
+        for i in range(0, len(game_ids), self.batch_size):
+            batch = game_ids[i:i + self.batch_size]
+            stats['possessions'] += self.build_games(batch)
+            stats['games'] += len(batch)
+            if commit:
+                self.session.commit()
+            logger.info(f"Possessions: {stats['games']}/{len(game_ids)} games processed")
+        return stats
@@ -0,0 +1,231 @@
+"""
+Reconciliation of boxscore totals against play-by-play.
+
+Each play is turned into a row of stat increments (a made three adds one
+to fgm, fga, tpm and tpa and three to pts, and so on). Increments are summed
+per (game, player) and per (game, team) with grouped NumPy reductions and
+diffed against the player and team totals boxscore rows. Every non-zero
+difference is a discrepancy for one game, entity and stat.
+
+Only stats the play feed records against a person can be reconciled.
+Assists appear solely as names inside shot descriptions and steals and
+blocks are not recorded as plays, so ast, stl, blk and the offensive /
+defensive rebound split are not checked. Technical fouls are excluded from
+pf, as in the boxscore.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, case, exists
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, Boxscore
+from .play_arrays import (PlayArrays, load_play_arrays, ACTION_MADE_SHOT, ACTION_MISSED_SHOT,
+                          ACTION_FREE_THROW, ACTION_REBOUND, ACTION_TURNOVER, ACTION_FOUL)
+from .season_stats import group_sum
+
+logger = logging.getLogger(__name__)
+
+
+RECONCILED_STATS = ('pts', 'fgm', 'fga', 'tpm', 'tpa', 'ftm', 'fta', 'reb', 'to', 'pf')
+
+# Foul sub types charged as technicals rather than personal fouls
+TECHNICAL_FOUL_SUB_TYPES = {'Technical', 'Double Technical', 'Defense 3 Second', 'Delay Technical',
+                            'Hanging Technical', 'Non-Unsportsmanlike'}
+
+LEVEL_PLAYER = 'player'
+LEVEL_TEAM = 'team'
+
+
+def play_stat_increments(arrays: PlayArrays) -> np.ndarray:
+    """
+    Stat increments contributed by every play.
+
+    Returns:
+        int64 array of shape (plays, len(RECONCILED_STATS))
+    """
+    if len(arrays) == 0:
+        return np.zeros((0, len(RECONCILED_STATS)), dtype=np.int64)
+    code = arrays.action_code
+    field_goal = (code == ACTION_MADE_SHOT) | (code == ACTION_MISSED_SHOT)
+    made = code == ACTION_MADE_SHOT
+    three = arrays.shot_value == 3
+    free_throw = code == ACTION_FREE_THROW
+    technical = np.array([s in TECHNICAL_FOUL_SUB_TYPES for s in arrays.sub_types], dtype=bool)
+
+    columns = {
+        'pts': arrays.points,
+        'fgm': made,
+        'fga': field_goal,
+        'tpm': made & three,
+        'tpa': field_goal & three,
+        'ftm': free_throw & ~arrays.is_miss,
+        'fta': free_throw,
+        'reb': code == ACTION_REBOUND,
+        'to': code == ACTION_TURNOVER,
+        'pf': (code == ACTION_FOUL) & ~technical[arrays.sub_type],
+    }
+    return np.column_stack([np.asarray(columns[stat], dtype=np.int64) for stat in RECONCILED_STATS])
+
+
+def play_totals(arrays: PlayArrays) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Per-player and per-team stat totals implied by the plays.
+
+    Only plays credited to a person count, so team rebounds and team
+    turnovers are left out of both levels.
+
+    Returns:
+        Dictionary of level -> (key rows of (game_id, entity id), totals)
+    """
+    increments = play_stat_increments(arrays)
+    credited = (arrays.person_id != 0) & increments.any(axis=1)
+    game_id = arrays.game_id[credited]
+    return {
+        LEVEL_PLAYER: group_sum(np.column_stack([game_id, arrays.person_id[credited]]), increments[credited]),
+        LEVEL_TEAM: group_sum(np.column_stack([game_id, arrays.team_id[credited]]), increments[credited]),
+    }
+
+
+def diff_totals(box_keys: np.ndarray, box_values: np.ndarray, play_keys: np.ndarray,
+                play_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align two keyed stat matrices and return the cells that differ.
+
+    Keys missing on one side count as all-zero rows there.
+
+    Returns:
+        Tuple of (key rows, stat column indices, boxscore values, play values),
+        one entry per differing cell
+    """
+    width = len(RECONCILED_STATS)
+    keys = np.concatenate([box_keys.reshape(-1, 2), play_keys.reshape(-1, 2)]).astype(np.int64)
+    if len(keys) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros((0, 2), dtype=np.int64), empty, empty, empty
+    distinct, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    box = np.zeros((len(distinct), width), dtype=np.int64)
+    plays = np.zeros((len(distinct), width), dtype=np.int64)
+    np.add.at(box, inverse[:len(box_keys)], box_values.reshape(-1, width).astype(np.int64))
+    np.add.at(plays, inverse[len(box_keys):], play_values.reshape(-1, width).astype(np.int64))
+    rows, stats = np.nonzero(box != plays)
+    return distinct[rows], stats, box[rows, stats], plays[rows, stats]
+
+
+def reconcile(arrays: PlayArrays, boxscores: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> List[Dict[str, Any]]:
+    """
+    Diff play-implied totals against boxscore totals.
+
+    Args:
+        arrays: Plays of the games being reconciled
+        boxscores: Dictionary of level -> (key rows of (game_id, entity id), totals)
+            in RECONCILED_STATS column order
+
+    Returns:
+        One discrepancy per game, entity and stat, ordered by game
+    """
+    discrepancies = []
+    for level, (play_keys, play_values) in play_totals(arrays).items():
+        box_keys, box_values = boxscores[level]
+        keys, stats, box, plays = diff_totals(box_keys, box_values, play_keys, play_values)
+        entity = 'person_id' if level == LEVEL_PLAYER else 'team_id'
+        for (game_id, entity_id), stat, box_value, play_value in zip(keys.tolist(), stats.tolist(),
+                                                                     box.tolist(), plays.tolist()):
+            discrepancies.append({
+                'game_id': game_id,
+                'level': level,
+                entity: entity_id,
+                'stat': RECONCILED_STATS[stat],
+                'boxscore': box_value,
+                'plays': play_value,
+                'difference': box_value - play_value,
+            })
+    discrepancies.sort(key=lambda d: (d['game_id'], d['level'], d.get('person_id', d.get('team_id')), d['stat']))
+    return discrepancies
+
+
+class ReconciliationService:
+    """Reconciles stored boxscores with the play-by-play of the same games"""
+
+    def __init__(self, session: Session, batch_size: int = 250):
+        self.session = session
+        self.batch_size = batch_size
+
+    def reconcilable_game_ids(self, game_ids: Optional[Sequence[int]] = None,
+                              seasons: Optional[Sequence[int]] = None) -> List[int]:
+        """Games that have both plays and boxscore rows"""
+        query = (
+            select(Game.game_id)
+            .where(exists().where(Play.game_id == Game.game_id))
+            .where(exists().where(Boxscore.game_id == Game.game_id))
+            .order_by(Game.game_id)
+        )
+        if game_ids is not None:
+            query = query.where(Game.game_id.in_(game_ids))
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(self.session.scalars(query))
+
+    def load_boxscore_totals(self, game_ids: List[int]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Player and team totals boxscore rows as keyed stat matrices"""
+        stat_columns = [getattr(Boxscore, stat) for stat in RECONCILED_STATS]
+        stmt = (
+            select(Boxscore.game_id, Boxscore.box_type, Boxscore.person_id,
+                   case((Boxscore.home_away_team == 'h', Game.home_team_id),
+                        else_=Game.away_team_id).label('team_id'),
+                   *stat_columns)
+            .join(Game, Game.game_id == Boxscore.game_id)
+            .where(Boxscore.box_type.in_(('player', 'totals')))
+            .where(Boxscore.game_id.in_(game_ids))
+        )
+        rows = self.session.execute(stmt).all()
+        width = len(RECONCILED_STATS)
+        game_id = np.array([r[0] for r in rows], dtype=np.int64)
+        is_player = np.array([r[1] == 'player' for r in rows], dtype=bool)
+        person_id = np.array([r[2] or 0 for r in rows], dtype=np.int64)
+        team_id = np.array([r[3] or 0 for r in rows], dtype=np.int64)
+        values = np.array([[v or 0 for v in r[4:]] for r in rows], dtype=np.int64).reshape(len(rows), width)
+        return {
+            LEVEL_PLAYER: (np.column_stack([game_id[is_player], person_id[is_player]]), values[is_player]),
+            LEVEL_TEAM: (np.column_stack([game_id[~is_player], team_id[~is_player]]), values[~is_player]),
+        }
+
+    def reconcile_games(self, game_ids: Optional[Sequence[int]] = None,
+                        seasons: Optional[Sequence[int]] = None,
+                        progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Reconcile games in batches.
+
+        Args:
+            game_ids: Restrict to these games
+            seasons: Restrict to these seasons
+            progress: Called with (games done, games total) after each batch
+
+        Returns:
+            Dictionary with 'games' reconciled, 'games_with_discrepancies',
+            per-stat discrepancy counts under 'by_stat' and the
+            'discrepancies' themselves
+        """
+        targets = self.reconcilable_game_ids(game_ids, seasons)
+        discrepancies: List[Dict[str, Any]] = []
+        for i in range(0, len(targets), self.batch_size):
+            batch = targets[i:i + self.batch_size]
+            discrepancies.extend(reconcile(load_play_arrays(self.session, batch), self.load_boxscore_totals(batch)))
+            if progress:
+                progress(min(i + self.batch_size, len(targets)), len(targets))
+
+        by_stat = {stat: 0 for stat in RECONCILED_STATS}
+        for discrepancy in discrepancies:
+            by_stat[discrepancy['stat']] += 1
+        result = {
+            'games': len(targets),
+            'games_with_discrepancies': len({d['game_id'] for d in discrepancies}),
+            'by_stat': by_stat,
+            'discrepancies': discrepancies,
+        }
+        logger.info(f"Reconciled {result['games']} games: {len(discrepancies)} discrepancies "
+                    f"in {result['games_with_discrepancies']} games")
+        return result
@@ -0,0 +1,374 @@
+"""
+Materialized season aggregates from boxscore rows.
+
+Player rows are summed per (person, team, season, game_type) and team
+totals rows per (team, season, game_type) with NumPy group sums. The unit
+of refresh is a team-season: when a game is populated, both teams' seasons
+are recomputed from their boxscores, which keeps the aggregates exact when
+games are repopulated or cleared.
+"""
+
+import re
+import logging
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select, delete, insert, tuple_, or_, case, func
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Boxscore, PlayerSeasonStats, TeamSeasonStats
+from .play_arrays import factorize
+
+logger = logging.getLogger(__name__)
+
+
+STAT_COLUMNS = ('pts', 'reb', 'ast', 'stl', 'blk', 'fgm', 'fga', 'tpm', 'tpa',
+                'ftm', 'fta', 'to', 'pf', 'orebs', 'drebs')
+
+_MINUTES_PATTERN = re.compile(r'^(\d+):(\d{1,2})(?:\.\d+)?$')
+_ISO_MINUTES_PATTERN = re.compile(r'^PT(\d+)M([\d.]+)S$')
+
+TeamSeason = Tuple[int, int, str]
+
+
+def parse_minutes(value: Optional[str]) -> float:
+    """
+    Parse a boxscore minutes string ('25:30' or 'PT25M30.00S') into minutes.
+
+    Returns:
+        Minutes played, or 0.0 for blank or malformed values
+    """
+    if not value:
+        return 0.0
+    value = str(value).strip()
+    match = _MINUTES_PATTERN.match(value) or _ISO_MINUTES_PATTERN.match(value)
+    if not match:
+        return 0.0
+    return int(match.group(1)) + float(match.group(2)) / 60
+
+
+def group_sum(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum value columns over distinct key rows.
+
+    Args:
+        keys: 2-D integer array of grouping columns
+        values: 2-D array with one column per summed value
+
+    Returns:
+        Tuple of (distinct key rows, summed values per group)
+    """
+    if len(keys) == 0:
+        return keys, np.zeros((0, values.shape[1]))
+    distinct, inverse = np.unique(keys, axis=0, return_inverse=True)
+    sums = np.zeros((len(distinct), values.shape[1]))
+    np.add.at(sums, inverse.reshape(-1), values)
+    return distinct, sums
+
+
+def season_averages(stats: Any) -> Dict[str, Optional[float]]:
+    """
+    Per-game averages and shooting percentages for a season stats row.
+
+    Args:
+        stats: PlayerSeasonStats or TeamSeasonStats
+
+    Returns:
+        Dictionary of averages, with None where the denominator is zero
+    """
+    def ratio(numerator, denominator, digits=3):
+        return round(numerator / denominator, digits) if denominator else None
+
+    games = stats.games or 0
+    averages = {'games': games, 'mpg': ratio(stats.minutes or 0.0, games, 1)}
+    for column in ('pts', 'reb', 'ast', 'stl', 'blk', 'to'):
+        averages[f'{column}_per_game'] = ratio(getattr(stats, column) or 0, games, 1)
+    averages['fg_pct'] = ratio(stats.fgm or 0, stats.fga or 0)
+    averages['tp_pct'] = ratio(stats.tpm or 0, stats.tpa or 0)
+    averages['ft_pct'] = ratio(stats.ftm or 0, stats.fta or 0)
+    return averages
+
+
+class SeasonStatsService:
+    """Maintains the player_season_stats and team_season_stats tables"""
+
+    def __init__(self, session: Session, batch_size: int = 250):
+        self.session = session
+        self.batch_size = batch_size
+
+    def _load_rows(self, *conditions) -> Dict[str, np.ndarray]:
+        """Load player and team totals boxscore rows with their game context into arrays"""
+        stat_columns = [getattr(Boxscore, column) for column in STAT_COLUMNS]
+        stmt = (
+            select(Boxscore.game_id, Boxscore.person_id, Boxscore.box_type, Boxscore.starter,
+                   Boxscore.min, Boxscore.pm, *stat_columns,
+                   Game.season, Game.game_type,
+                   case((Boxscore.home_away_team == 'h', Game.home_team_id),
+                        else_=Game.away_team_id).label('team_id'),
+                   case((Boxscore.home_away_team == 'h', Game.away_team_id),
+                        else_=Game.home_team_id).label('opponent_team_id'))
+            .join(Game, Game.game_id == Boxscore.game_id)
+            .where(Boxscore.box_type.in_(('player', 'totals')))
+            .where(Game.season.is_not(None), Game.game_type.is_not(None))
+            .where(*conditions)
+        )
+        rows = self.session.execute(stmt).all()
+        columns = list(zip(*rows)) if rows else [()] * (len(STAT_COLUMNS) + 10)
+
+        minute_codes, minute_values = factorize(columns[4])
+        parsed_minutes = np.array([parse_minutes(v) for v in minute_values], dtype=np.float64)
+        game_type_codes, game_types = factorize(columns[7 + len(STAT_COLUMNS)])
+
+        offset = 6 + len(STAT_COLUMNS)
+        return {
+            'game_id': np.array(columns[0], dtype=np.int64),
+            'person_id': np.array([p or 0 for p in columns[1]], dtype=np.int64),
+            'is_player': np.array([t == 'player' for t in columns[2]], dtype=bool),
+            'starter': np.array([bool(s) for s in columns[3]], dtype=bool),
+            'minutes': parsed_minutes[minute_codes] if len(minute_codes) else np.zeros(0),
+            'pm': np.array([v or 0 for v in columns[5]], dtype=np.int64),
+            'stats': np.array([[v or 0 for v in row[6:offset]] for row in rows],
+                              dtype=np.int64).reshape(len(rows), len(STAT_COLUMNS)),
+            'season': np.array(columns[offset], dtype=np.int64),
+            'game_type': game_type_codes,
+            'game_types': game_types,
+            'team_id': np.array([t or 0 for t in columns[offset + 2]], dtype=np.int64),
+            'opponent_team_id': np.array([t or 0 for t in columns[offset + 3]], dtype=np.int64),
+        }
+
+    @staticmethod
+    def _filter(rows: Dict[str, np.ndarray], keep: np.ndarray) -> Dict[str, np.ndarray]:
+        return {key: (value if key == 'game_types' else value[keep]) for key, value in rows.items()}
+
+    @staticmethod
+    def player_records(rows: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Aggregate player boxscore rows into player_season_stats records"""
+        rows = SeasonStatsService._filter(rows, rows['is_player'] & (rows['person_id'] > 0))
+        # A game counts when the player logged minutes or any box score stat
+        played = (rows['minutes'] > 0) | (rows['stats'] != 0).any(axis=1)
+        keys = np.column_stack((rows['person_id'], rows['team_id'], rows['season'], rows['game_type']))
+        values = np.column_stack((played, played & rows['starter'], rows['minutes'],
+                                  rows['stats'], rows['pm']))
+        distinct, sums = group_sum(keys, values)
+
+        records = []
+        for (person_id, team_id, season, game_type), total in zip(distinct.tolist(), sums):
+            record = {
+                'person_id': person_id,
+                'team_id': team_id,
+                'season': season,
+                'game_type': str(rows['game_types'][game_type]),
+                'games': int(total[0]),
+                'games_started': int(total[1]),
+                'minutes': round(float(total[2]), 2),
+                'pm': int(total[-1]),
+            }
+            record.update({column: int(total[3 + i]) for i, column in enumerate(STAT_COLUMNS)})
+            records.append(record)
+        return records
+
+    @staticmethod
+    def team_records(rows: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Aggregate team totals rows into team_season_stats records"""
+        rows = SeasonStatsService._filter(rows, ~rows['is_player'] & (rows['team_id'] > 0))
+        points = rows['stats'][:, STAT_COLUMNS.index('pts')]
+
+        # Opponent points come from the other totals row of the same game
+        points_by_side = {(g, t): p for g, t, p in zip(rows['game_id'].tolist(),
+                                                         rows['team_id'].tolist(), points.tolist())}
+        opp_points = np.array([points_by_side.get((g, o), 0) for g, o in
+                               zip(rows['game_id'].tolist(), rows['opponent_team_id'].tolist())],
+                              dtype=np.int64)
+
+        keys = np.column_stack((rows['team_id'], rows['season'], rows['game_type']))
+        values = np.column_stack((np.ones(len(points)), points > opp_points, points < opp_points,
+                                  rows['minutes'], rows['stats'], opp_points))
+        distinct, sums = group_sum(keys, values)
+
+        records = []
+        for (team_id, season, game_type), total in zip(distinct.tolist(), sums):
+            record = {
+                'team_id': team_id,
+                'season': season,
+                'game_type': str(rows['game_types'][game_type]),
+                'games': int(total[0]),
+                'wins': int(total[1]),
+                'losses': int(total[2]),
+                'minutes': round(float(total[3]), 2),
+                'opp_pts': int(total[-1]),
+            }
+            record.update({column: int(total[4 + i]) for i, column in enumerate(STAT_COLUMNS)})
+            records.append(record)
+        return records
+
+    def team_seasons_for_games(self, game_ids: List[int]) -> Set[TeamSeason]:
+        """
+        Team-seasons touched by the given games.
+
+        Returns:
+            Set of (team_id, season, game_type) tuples for both teams of each game
+        """
+        keys = set()
+        for i in range(0, len(game_ids), self.batch_size):
+            batch = game_ids[i:i + self.batch_size]
+            for home, away, season, game_type in self.session.execute(
+                select(Game.home_team_id, Game.away_team_id, Game.season, Game.game_type)
+                .where(Game.game_id.in_(batch))
+                .where(Game.season.is_not(None), Game.game_type.is_not(None))
+            ):
+                keys.update({(home, season, game_type), (away, season, game_type)})
+        return keys
+
+    def refresh_team_seasons(self, keys: Set[TeamSeason]) -> Dict[str, int]:
+        """
+        Recompute aggregates for the given team-seasons from boxscores.
+
+        Args:
+            keys: (team_id, season, game_type) tuples
+
+        Returns:
+            Dictionary with 'players' and 'teams' row counts written
+        """
+        if not keys:
+            return {'players': 0, 'teams': 0}
+
+        try:
+            keys = sorted(keys)
+            self.session.execute(delete(PlayerSeasonStats).where(
+                tuple_(PlayerSeasonStats.team_id, PlayerSeasonStats.season,
+                       PlayerSeasonStats.game_type).in_(keys)))
+            self.session.execute(delete(TeamSeasonStats).where(
+                tuple_(TeamSeasonStats.team_id, TeamSeasonStats.season,
+                       TeamSeasonStats.game_type).in_(keys)))
+
+            teams = {k[0] for k in keys}
+            rows = self._load_rows(
+                Game.season.in_({k[1] for k in keys}),
+                Game.game_type.in_({k[2] for k in keys}),
+                or_(Game.home_team_id.in_(teams), Game.away_team_id.in_(teams))
+            )
+            wanted = set(keys)
+            game_types = rows['game_types']
+            keep = np.array([
+                (team, season, str(game_types[code])) in wanted
+                for team, season, code in zip(rows['team_id'].tolist(), rows['season'].tolist(),
+                                              rows['game_type'].tolist())
+            ], dtype=bool)
+            rows = self._filter(rows, keep)
+
+            players = self.player_records(rows)
+            teams = self.team_records(rows)
+            if players:
+                self.session.execute(insert(PlayerSeasonStats), players)
+            if teams:
+                self.session.execute(insert(TeamSeasonStats), teams)
+            return {'players': len(players), 'teams': len(teams)}
+        except Exception as e:
+            logger.error(f"Error refreshing season stats: {e}")
+            raise
+
+    def refresh_games(self, game_ids: List[int]) -> Dict[str, int]:
+        """Recompute the team-seasons of the given games"""
+        return self.refresh_team_seasons(self.team_seasons_for_games(game_ids))
+
+    def pending_game_ids(self, seasons: Optional[List[int]] = None) -> List[int]:
+        """
+        Find games in team-seasons whose stored game count is out of date.
+
+        Args:
+            seasons: Optional season filter
+
+        Returns:
+            Sorted list of game IDs
+        """
+        team_id = case((Boxscore.home_away_team == 'h', Game.home_team_id), else_=Game.away_team_id)
+        query = (
+            select(team_id, Game.season, Game.game_type, func.count(func.distinct(Game.game_id)))
+            .select_from(Boxscore)
+            .join(Game, Game.game_id == Boxscore.game_id)
+            .where(Boxscore.box_type == 'totals')
+            .where(Game.season.is_not(None), Game.game_type.is_not(None))
+            .group_by(team_id, Game.season, Game.game_type)
+        )
+        stored_query = select(TeamSeasonStats.team_id, TeamSeasonStats.season,
+                              TeamSeasonStats.game_type, TeamSeasonStats.games)
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+            stored_query = stored_query.where(TeamSeasonStats.season.in_(seasons))
+
+        stored = {(t, s, g): n for t, s, g, n in self.session.execute(stored_query)}
+        stale = [(t, s, g) for t, s, g, n in self.session.execute(query) if stored.get((t, s, g)) != n]
+        if not stale:
+            return []
+
+        game_ids = set()
+        for team, season, game_type in stale:
+            game_ids.update(self.session.scalars(
+                select(Game.game_id)
+                .where(Game.season == season, Game.game_type == game_type)
+                .where(or_(Game.home_team_id == team, Game.away_team_id == team))
+            ))
+        return sorted(game_ids)
+
+    def build(self, game_ids: List[int], commit: bool = True) -> Dict[str, int]:
+        """
+        Refresh the team-seasons of many games in batches.
+
+        Args:
+            game_ids: Games whose team-seasons should be recomputed
+            commit: Commit after each batch
+
+        Returns:
+            Dictionary with 'games', 'team_seasons', 'players' and 'teams' counts
+        """
+        keys = sorted(self.team_seasons_for_games(game_ids))
+        stats = {'games': len(game_ids), 'team_seasons': 0, 'players': 0, 'teams': 0}
+        for i in range(0, len(keys), self.batch_size):
+            batch = set(keys[i:i + self.batch_size])
+            counts = self.refresh_team_seasons(batch)
+            stats['team_seasons'] += len(batch)
+            stats['players'] += counts['players']
+            stats['teams'] += counts['teams']
+            if commit:
+                self.session.commit()
+            logger.info(f"Season stats: {stats['team_seasons']}/{len(keys)} team-seasons refreshed")
+        return stats
+
+    def rebuild(self, seasons: Optional[List[int]] = None, commit: bool = True) -> Dict[str, int]:
+        """
+        Drop and recompute aggregates, one season at a time.
+
+        Args:
+            seasons: Seasons to rebuild; all seasons when omitted
+            commit: Commit after each season
+
+        Returns:
+            Dictionary with 'seasons', 'team_seasons', 'players' and 'teams' counts
+        """
+        player_delete = delete(PlayerSeasonStats)
+        team_delete = delete(TeamSeasonStats)
+        season_query = select(Game.season).where(Game.season.is_not(None)).distinct().order_by(Game.season)
+        if seasons:
+            player_delete = player_delete.where(PlayerSeasonStats.season.in_(seasons))
+            team_delete = team_delete.where(TeamSeasonStats.season.in_(seasons))
+            season_query = season_query.where(Game.season.in_(seasons))
+        self.session.execute(player_delete)
+        self.session.execute(team_delete)
+
+        stats = {'seasons': 0, 'team_seasons': 0, 'players': 0, 'teams': 0}
+        for season in list(self.session.scalars(season_query)):
+            keys = set()
+            for home, away, game_type in self.session.execute(
+                select(Game.home_team_id, Game.away_team_id, Game.game_type)
+                .where(Game.season == season, Game.game_type.is_not(None)).distinct()
+            ):
+                keys.update({(home, season, game_type), (away, season, game_type)})
+            counts = self.refresh_team_seasons(keys)
+            stats['seasons'] += 1
+            stats['team_seasons'] += len(keys)
+            stats['players'] += counts['players']
+            stats['teams'] += counts['teams']
+            if commit:
+                self.session.commit()
+            logger.info(f"Season stats: rebuilt season {season} ({len(keys)} team-seasons)")
+        return stats
@@ -0,0 +1,361 @@
+"""
+Shot chart aggregation over field-goal attempts.
+
+Shot locations come from the legacy play coordinates (tenths of a foot with
+the basket at the origin). Attempts are assigned to hexagonal or square bins
+with vectorized NumPy arithmetic and counted per game, shooter and bin with
+bincount over the distinct keys. The per-game bins are stored in the
+shot_chart_bin table so charts for a player, team, opponent or season are a
+small indexed SUM instead of a scan over every play.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, delete, exists, insert, func
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, ShotChartBin
+
+logger = logging.getLogger(__name__)
+
+
+# Half court in legacy units: sideline to sideline, baseline to half-court line
+COURT_X_MIN, COURT_X_MAX = -250, 250
+COURT_Y_MIN, COURT_Y_MAX = -52, 418
+
+GRID_HEX = 'hex'
+GRID_SQUARE = 'square'
+
+# (grid, bin_size) pairs precomputed by default
+DEFAULT_GRIDS = ((GRID_HEX, 15), (GRID_SQUARE, 20))
+
+_SQRT3 = np.sqrt(3.0)
+
+
+def clip_to_half_court(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Clamp coordinates onto the offensive half court (long heaves land on half court)"""
+    return (np.clip(x, COURT_X_MIN, COURT_X_MAX).astype(np.float64),
+            np.clip(y, COURT_Y_MIN, COURT_Y_MAX).astype(np.float64))
+
+
+def square_bins(x: np.ndarray, y: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign points to a square grid anchored at the court corner.
+
+    Args:
+        x, y: Legacy court coordinates
+        size: Side length of each square
+
+    Returns:
+        Tuple of (column, row) integer arrays
+    """
+    x, y = clip_to_half_court(x, y)
+    bx = np.floor((x - COURT_X_MIN) / size).astype(np.int32)
+    by = np.floor((y - COURT_Y_MIN) / size).astype(np.int32)
+    # Points on the far edges belong to the last bin
+    bx = np.minimum(bx, (COURT_X_MAX - COURT_X_MIN - 1) // size)
+    by = np.minimum(by, (COURT_Y_MAX - COURT_Y_MIN - 1) // size)
+    return bx, by
+
+
+def hex_bins(x: np.ndarray, y: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign points to a pointy-top hexagonal grid centred on the basket.
+
+    Args:
+        x, y: Legacy court coordinates
+        size: Hexagon circumradius
+
+    Returns:
+        Tuple of axial (q, r) integer arrays
+    """
+    x, y = clip_to_half_court(x, y)
+    q = (_SQRT3 / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+    s = -q - r
+
+    # Cube rounding: round each axis, then fix the one with the largest error
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int32), rr.astype(np.int32)
+
+
+def bin_shots(x: np.ndarray, y: np.ndarray, grid: str, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign shot locations to bins of the requested grid.
+
+    Raises:
+        ValueError: If the grid type or size is not supported
+    """
+    if size <= 0:
+        raise ValueError(f"Bin size must be positive, got {size}")
+    if grid == GRID_HEX:
+        return hex_bins(x, y, size)
+    if grid == GRID_SQUARE:
+        return square_bins(x, y, size)
+    raise ValueError(f"Unknown shot chart grid: {grid}")
+
+
+def bin_centers(bin_x: np.ndarray, bin_y: np.ndarray, grid: str, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Legacy court coordinates of bin centres, for plotting"""
+    bin_x = np.asarray(bin_x, dtype=np.float64)
+    bin_y = np.asarray(bin_y, dtype=np.float64)
+    if grid == GRID_HEX:
+        return size * _SQRT3 * (bin_x + bin_y / 2), size * 1.5 * bin_y
+    if grid == GRID_SQUARE:
+        return COURT_X_MIN + (bin_x + 0.5) * size, COURT_Y_MIN + (bin_y + 0.5) * size
+    raise ValueError(f"Unknown shot chart grid: {grid}")
+
+
+def aggregate_bins(keys: np.ndarray, made: np.ndarray, points: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Count attempts, makes and points for each distinct key row.
+
+    Args:
+        keys: 2-D integer array, one row per shot (grouping columns plus bin)
+        made: Boolean array of makes
+        points: Points scored per shot
+
+    Returns:
+        Dictionary with 'keys' (distinct rows), 'first' (index of a
+        representative shot), 'attempts', 'made' and 'points'
+    """
+    if len(keys) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {'keys': keys, 'first': empty, 'attempts': empty, 'made': empty, 'points': empty}
+    distinct, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    groups = len(distinct)
+    return {
+        'keys': distinct,
+        'first': first,
+        'attempts': np.bincount(inverse, minlength=groups),
+        'made': np.bincount(inverse, weights=made, minlength=groups).astype(np.int64),
+        'points': np.bincount(inverse, weights=points, minlength=groups).astype(np.int64),
+    }
+
+
+class ShotChartService:
+    """Builds the shot_chart_bin table and serves shot charts from it"""
+
+    def __init__(self, session: Session, grids: Tuple[Tuple[str, int], ...] = DEFAULT_GRIDS,
+                 batch_size: int = 250):
+        self.session = session
+        self.grids = tuple(grids)
+        self.batch_size = batch_size
+
+    def _load_shots(self, *conditions) -> Dict[str, np.ndarray]:
+        """Load located field-goal attempts matching the given conditions into arrays"""
+        stmt = (
+            select(Play.game_id, Game.season, Play.person_id, Play.location,
+                   Game.home_team_id, Game.away_team_id,
+                   Play.x_legacy, Play.y_legacy, Play.shot_result, Play.shot_value)
+            .join(Game, Game.game_id == Play.game_id)
+            .where(Play.is_field_goal.is_(True))
+            .where(Play.x_legacy.is_not(None), Play.y_legacy.is_not(None))
+            .where(*conditions)
+        )
+        rows = self.session.execute(stmt).all()
+
+        n = len(rows)
+        columns = list(zip(*rows)) if n else [()] * 10
+        is_home = np.array([loc == 'h' for loc in columns[3]], dtype=bool)
+        home = np.array(columns[4], dtype=np.int64)
+        away = np.array(columns[5], dtype=np.int64)
+        made = np.array([result == 'Made' for result in columns[8]], dtype=bool)
+        shot_value = np.array([value or 0 for value in columns[9]], dtype=np.int64)
+        return {
+            'game_id': np.array(columns[0], dtype=np.int64),
+            'season': np.array([season or 0 for season in columns[1]], dtype=np.int64),
+            'person_id': np.array([person or 0 for person in columns[2]], dtype=np.int64),
+            'team_id': np.where(is_home, home, away) if n else np.zeros(0, dtype=np.int64),
+            'opponent_team_id': np.where(is_home, away, home) if n else np.zeros(0, dtype=np.int64),
+            'x': np.array(columns[6], dtype=np.float64),
+            'y': np.array(columns[7], dtype=np.float64),
+            'made': made,
+            'points': np.where(made, shot_value, 0),
+        }
+
+    def build_games(self, game_ids: List[int]) -> int:
+        """
+        Recompute shot chart bins for the given games.
+
+        Args:
+            game_ids: Games to process
+
+        Returns:
+            Number of bin rows written
+        """
+        if not game_ids:
+            return 0
+
+        try:
+            self.session.execute(delete(ShotChartBin).where(ShotChartBin.game_id.in_(game_ids)))
+
+            shots = self._load_shots(Play.game_id.in_(game_ids))
+            records = []
+            for grid, size in self.grids:
+                bx, by = bin_shots(shots['x'], shots['y'], grid, size)
+                keys = np.column_stack((shots['game_id'], shots['person_id'], shots['team_id'], bx, by))
+                bins = aggregate_bins(keys, shots['made'], shots['points'])
+                first = bins['first']
+                for i, (game_id, person_id, team_id, bin_x, bin_y) in enumerate(bins['keys'].tolist()):
+                    records.append({
+                        'game_id': game_id,
+                        'season': int(shots['season'][first[i]]) or None,
+                        'person_id': person_id or None,
+                        'team_id': team_id,
+                        'opponent_team_id': int(shots['opponent_team_id'][first[i]]),
+                        'grid': grid,
+                        'bin_size': size,
+                        'bin_x': bin_x,
+                        'bin_y': bin_y,
+                        'attempts': int(bins['attempts'][i]),
+                        'made': int(bins['made'][i]),
+                        'points': int(bins['points'][i]),
+                    })
+
+            if records:
+                self.session.execute(insert(ShotChartBin), records)
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error building shot chart bins: {e}")
+            raise
+
+    def get_chart(self, grid: str = GRID_HEX, bin_size: int = 15,
+                  person_id: Optional[int] = None, team_id: Optional[int] = None,
+                  opponent_team_id: Optional[int] = None,
+                  seasons: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Shot chart for a player, team, opponent and/or seasons.
+
+        Precomputed grids are summed from shot_chart_bin; any other grid is
+        binned on the fly from the play table.
+
+        Args:
+            grid: 'hex' or 'square'
+            bin_size: Bin size in legacy court units
+            person_id: Shooter (API person id)
+            team_id: Shooting team (API team id)
+            opponent_team_id: Defending team (API team id)
+            seasons: Restrict to these seasons
+
+        Returns:
+            List of bins with bin_x, bin_y, x, y (bin centre), attempts, made, points
+        """
+        if (grid, bin_size) not in self.grids:
+            return self.compute_chart(grid, bin_size, person_id, team_id, opponent_team_id, seasons)
+
+        stmt = (
+            select(ShotChartBin.bin_x, ShotChartBin.bin_y,
+                   func.sum(ShotChartBin.attempts), func.sum(ShotChartBin.made),
+                   func.sum(ShotChartBin.points))
+            .where(ShotChartBin.grid == grid, ShotChartBin.bin_size == bin_size)
+            .group_by(ShotChartBin.bin_x, ShotChartBin.bin_y)
+            .order_by(ShotChartBin.bin_x, ShotChartBin.bin_y)
+        )
+        if person_id is not None:
+            stmt = stmt.where(ShotChartBin.person_id == person_id)
+        if team_id is not None:
+            stmt = stmt.where(ShotChartBin.team_id == team_id)
+        if opponent_team_id is not None:
+            stmt = stmt.where(ShotChartBin.opponent_team_id == opponent_team_id)
+        if seasons:
+            stmt = stmt.where(ShotChartBin.season.in_(seasons))
+
+        rows = self.session.execute(stmt).all()
+        return self._chart_records(rows, grid, bin_size)
+
+    def compute_chart(self, grid: str, bin_size: int, person_id: Optional[int] = None,
+                      team_id: Optional[int] = None, opponent_team_id: Optional[int] = None,
+                      seasons: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Shot chart binned directly from plays, for grids that are not precomputed"""
+        conditions = []
+        if person_id is not None:
+            conditions.append(Play.person_id == person_id)
+        if seasons:
+            conditions.append(Game.season.in_(seasons))
+        shots = self._load_shots(*conditions)
+
+        keep = np.ones(len(shots['x']), dtype=bool)
+        if team_id is not None:
+            keep &= shots['team_id'] == team_id
+        if opponent_team_id is not None:
+            keep &= shots['opponent_team_id'] == opponent_team_id
+
+        bx, by = bin_shots(shots['x'][keep], shots['y'][keep], grid, bin_size)
+        bins = aggregate_bins(np.column_stack((bx, by)), shots['made'][keep], shots['points'][keep])
+        rows = [
+            (bin_x, bin_y, attempts, made, points)
+            for (bin_x, bin_y), attempts, made, points
+            in zip(bins['keys'].tolist(), bins['attempts'].tolist(),
+                   bins['made'].tolist(), bins['points'].tolist())
+        ]
+        return self._chart_records(rows, grid, bin_size)
+
+    @staticmethod
+    def _chart_records(rows: List[Tuple], grid: str, bin_size: int) -> List[Dict[str, Any]]:
+        """Attach bin centres to (bin_x, bin_y, attempts, made, points) rows"""
+        if not rows:
+            return []
+        bin_x, bin_y = np.array([r[0] for r in rows]), np.array([r[1] for r in rows])
+        x, y = bin_centers(bin_x, bin_y, grid, bin_size)
+        return [
+            {
+                'bin_x': int(row[0]),
+                'bin_y': int(row[1]),
+                'x': round(float(x[i]), 1),
+                'y': round(float(y[i]), 1),
+                'attempts': int(row[2]),
+                'made': int(row[3]),
+                'points': int(row[4]),
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    def pending_game_ids(self, seasons: Optional[List[int]] = None) -> List[int]:
+        """
+        Find games that have field-goal attempts but no shot chart bins.
+
+        Args:
+            seasons: Optional season filter
+
+        Returns:
+            Sorted list of game IDs
+        """
+        query = (
+            select(Game.game_id)
+            .where(exists().where(Play.game_id == Game.game_id, Play.is_field_goal.is_(True)))
+            .where(~exists().where(ShotChartBin.game_id == Game.game_id))
+            .order_by(Game.game_id)
+        )
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(self.session.scalars(query))
+
+    def build(self, game_ids: List[int], commit: bool = True) -> Dict[str, int]:
+        """
+        Build shot chart bins for many games in batches.
+
+        Args:
+            game_ids: Games to process
+            commit: Commit after each batch
+
+        Returns:
+            Dictionary with 'games' and 'bins' counts
+        """
+        stats = {'games': 0, 'bins': 0}
+        for i in range(0, len(game_ids), self.batch_size):
+            batch = game_ids[i:i + self.batch_size]
+            stats['bins'] += self.build_games(batch)
+            stats['games'] += len(batch)
+            if commit:
+                self.session.commit()
+            logger.info(f"Shot charts: {stats['games']}/{len(game_ids)} games processed")
+        return stats
@@ -0,0 +1,10 @@
+"""Read-only HTTP API over the normalized game tables."""
+
+from .app import create_app, Database
+from .cache import ResponseCache
+
+__all__ = [
+    "create_app",
+    "Database",
+    "ResponseCache"
+]
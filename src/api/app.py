@@ -0,0 +1,327 @@
+"""
+Read-only HTTP API over the normalized game tables.
+
+Requests are served by aiohttp. Database work runs on a bounded thread pool
+that shares the SQLAlchemy engine's connection pool, so the event loop never
+blocks on a query and the number of concurrent connections is capped by the
+worker count. Serialized responses are kept in an in-process LRU cache:
+responses for finished games never change and are cached without expiry
+with a strong ETag, everything else expires after a TTL. Listings are paged
+with opaque keyset cursors (see pagination.py). Table exports are streamed
+uncached, chunk by chunk, from a server-side cursor.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Tuple
+
+from aiohttp import web
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, Session
+
+from ..database.export import EXPORT_TABLES, EXPORT_FORMATS, iter_export
+from . import queries
+from .cache import ResponseCache, CachedResponse
+from .pagination import InvalidCursor
+
+logger = logging.getLogger(__name__)
+
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+MAX_LIST_LIMIT = 1000
+DEFAULT_GAME_LIMIT = 100
+DEFAULT_PLAY_LIMIT = 1000
+
+
+class Database:
+    """Runs blocking session work on a bounded thread pool"""
+
+    def __init__(self, engine: Engine, max_workers: int = 8):
+        self.engine = engine
+        self.Session = sessionmaker(bind=engine)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='api-db')
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Call fn(session, *args) in a worker thread with a fresh session"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call, fn, args)
+
+    def _call(self, fn: Callable[..., Any], args: tuple) -> Any:
+        with self.Session() as session:
+            return fn(session, *args)
+
+    async def stream(self, fn: Callable[..., Iterator[Any]], *args, buffer: int = 4) -> AsyncIterator[Any]:
+        """
+        Iterate fn(session, *args) in a worker thread, yielding its items.
+
+        At most `buffer` items are held between the worker and the consumer,
+        so a slow client throttles the database cursor instead of growing
+        memory. The worker stops when the consumer goes away.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        stopped = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+                try:
+                    future.result(timeout=1.0)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+            return False
+
+        def produce():
+            try:
+                with self.Session() as session:
+                    for item in fn(session, *args):
+                        if not put(item):
+                            return
+                put(done)
+            except Exception as e:
+                put(e)
+
+        worker = loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            await worker
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+DATABASE = web.AppKey('database', Database)
+CACHE = web.AppKey('cache', ResponseCache)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong entity tag derived from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(request: web.Request, etag: str) -> bool:
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({'error': message}, status=status)
+
+
+def _int_param(request: web.Request, name: str, source: str = 'match') -> Optional[int]:
+    """Parse an integer path or query parameter, raising 400 when malformed"""
+    values = request.match_info if source == 'match' else request.query
+    raw = values.get(name)
+    if raw is None:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': f"{name} must be an integer"}),
+                                 content_type='application/json')
+
+
+def _limit_param(request: web.Request, default: int) -> int:
+    """Page size from the query string, raising 400 when out of range"""
+    limit = _int_param(request, 'limit', source='query')
+    if limit is None:
+        return default
+    if not 0 < limit <= MAX_LIST_LIMIT:
+        raise web.HTTPBadRequest(text=json.dumps({'error': f"limit must be between 1 and {MAX_LIST_LIMIT}"}),
+                                 content_type='application/json')
+    return limit
+
+
+def _cached_response(request: web.Request, entry: CachedResponse) -> web.Response:
+    cache = request.app[CACHE]
+    if entry.immutable:
+        cache_control = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        cache_control = f'public, max-age={int(cache.default_ttl or 0)}'
+    headers = {'ETag': entry.etag, 'Cache-Control': cache_control}
+
+    if _etag_matches(request, entry.etag):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=entry.body, content_type='application/json', headers=headers)
+
+
+async def respond(request: web.Request, loader: Callable[[Session], Tuple[Any, bool]]) -> web.Response:
+    """
+    Serve a JSON resource through the response cache.
+
+    Args:
+        request: Incoming request; path and query string form the cache key
+        loader: Called with a session, returns (payload, immutable); a None
+            payload means the resource does not exist
+    """
+    cache = request.app[CACHE]
+    key = request.path_qs
+    entry = cache.get(key)
+    if entry is None:
+        try:
+            payload, immutable = await request.app[DATABASE].run(loader)
+        except InvalidCursor as e:
+            return _error(400, str(e))
+        if payload is None:
+            return _error(404, 'Not found')
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        entry = cache.set(key, body, make_etag(body), immutable=immutable)
+    return _cached_response(request, entry)
+
+
+async def export_table(request: web.Request) -> web.StreamResponse:
+    table = request.match_info['table']
+    if table not in EXPORT_TABLES:
+        return _error(404, 'Not found')
+    fmt = request.query.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return _error(400, f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    filters = {}
+    for name, key in (('season', 'seasons'), ('team_id', 'team_ids'), ('game_id', 'game_ids')):
+        value = _int_param(request, name, source='query')
+        if value is not None:
+            filters[key] = [value]
+    if request.query.get('game_type'):
+        filters['game_types'] = [request.query['game_type']]
+
+    content_type = 'application/x-ndjson' if fmt == 'ndjson' else 'text/csv'
+    response = web.StreamResponse(headers={
+        'Content-Type': f'{content_type}; charset=utf-8',
+        'Content-Disposition': f'attachment; filename="{table}.{fmt}"',
+    })
+    # Gzip on the fly when the client accepts it
+    response.enable_compression()
+    await response.prepare(request)
+    chunks = request.app[DATABASE].stream(lambda session: iter_export(session, table, fmt=fmt, **filters))
+    try:
+        async for chunk in chunks:
+            await response.write(chunk.encode('utf-8'))
+    finally:
+        await chunks.aclose()
+    await response.write_eof()
+    return response
+
+
+def _game_resource(game_id: int, fetch: Callable[[Session, int], Any]) -> Callable[[Session], Tuple[Any, bool]]:
+    """Loader for a resource scoped to one game; immutable once the game is final"""
+    def load(session: Session):
+        if queries.get_game(session, game_id) is None:
+            return None, False
+        return fetch(session, game_id), queries.is_finished(session, game_id)
+    return load
+
+
+async def health(request: web.Request) -> web.Response:
+    await request.app[DATABASE].run(lambda session: session.execute(text('SELECT 1')))
+    return web.json_response({'status': 'ok', 'cache_entries': len(request.app[CACHE])})
+
+
+async def list_games(request: web.Request) -> web.Response:
+    season = _int_param(request, 'season', source='query')
+    team_id = _int_param(request, 'team_id', source='query')
+    limit = _limit_param(request, DEFAULT_GAME_LIMIT)
+    game_type = request.query.get('game_type')
+    cursor = request.query.get('cursor')
+    return await respond(request, lambda session: (
+        queries.list_games(session, season=season, game_type=game_type, team_id=team_id,
+                           limit=limit, cursor=cursor),
+        False
+    ))
+
+
+async def get_game(request: web.Request) -> web.Response:
+    game_id = _int_param(request, 'game_id')
+    return await respond(request, _game_resource(game_id, queries.get_game))
+
+
+async def get_plays(request: web.Request) -> web.Response:
+    game_id = _int_param(request, 'game_id')
+    limit = _limit_param(request, DEFAULT_PLAY_LIMIT)
+    cursor = request.query.get('cursor')
+    return await respond(request, _game_resource(
+        game_id, lambda session, game_id: queries.get_plays(session, game_id, limit=limit, cursor=cursor)
+    ))
+
+
+async def list_season_plays(request: web.Request) -> web.Response:
+    season = _int_param(request, 'season')
+    limit = _limit_param(request, DEFAULT_PLAY_LIMIT)
+    game_type = request.query.get('game_type')
+    cursor = request.query.get('cursor')
+    return await respond(request, lambda session: (
+        queries.list_season_plays(session, season, game_type=game_type, limit=limit, cursor=cursor),
+        False
+    ))
+
+
+async def get_boxscores(request: web.Request) -> web.Response:
+    game_id = _int_param(request, 'game_id')
+    return await respond(request, _game_resource(game_id, queries.get_boxscores))
+
+
+async def get_person(request: web.Request) -> web.Response:
+    person_id = _int_param(request, 'person_id')
+    return await respond(request, lambda session: (queries.get_person(session, person_id), False))
+
+
+async def list_teams(request: web.Request) -> web.Response:
+    return await respond(request, lambda session: (queries.list_teams(session), False))
+
+
+async def get_team(request: web.Request) -> web.Response:
+    team_id = _int_param(request, 'team_id')
+    return await respond(request, lambda session: (queries.get_team(session, team_id), False))
+
+
+def create_app(engine: Engine, cache: Optional[ResponseCache] = None, max_workers: int = 8) -> web.Application:
+    """
+    Build the API application.
+
+    Args:
+        engine: SQLAlchemy engine; its pool should allow max_workers connections
+        cache: Response cache (defaults to 1024 entries, 60 second TTL)
+        max_workers: Concurrent database workers
+
+    Returns:
+        aiohttp application
+    """
+    app = web.Application()
+    app[DATABASE] = Database(engine, max_workers=max_workers)
+    app[CACHE] = cache if cache is not None else ResponseCache()
+
+    app.router.add_get('/health', health)
+    app.router.add_get('/games', list_games)
+    app.router.add_get('/games/{game_id}', get_game)
+    app.router.add_get('/games/{game_id}/plays', get_plays)
+    app.router.add_get('/games/{game_id}/boxscores', get_boxscores)
+    app.router.add_get('/seasons/{season}/plays', list_season_plays)
+    app.router.add_get('/persons/{person_id}', get_person)
+    app.router.add_get('/teams', list_teams)
+    app.router.add_get('/teams/{team_id}', get_team)
+    app.router.add_get('/export/{table}', export_table)
+
+    async def close_database(app: web.Application):
+        app[DATABASE].close()
+
+    app.on_cleanup.append(close_database)
+    return app
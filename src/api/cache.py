@@ -0,0 +1,83 @@
+"""
+In-process response cache with LRU eviction and per-entry TTL.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Hashable
+
+
+@dataclass
+class CachedResponse:
+    """Serialized response body with its validator"""
+    body: bytes
+    etag: str
+    immutable: bool = False
+    expires_at: Optional[float] = None  # Monotonic deadline, None for no expiry
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized responses.
+
+    Entries stored with ttl=None never expire and are only dropped when the
+    cache is full; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = 60.0,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return a live entry and mark it recently used, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: Hashable, body: bytes, etag: str, immutable: bool = False,
+            ttl: Optional[float] = None) -> CachedResponse:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key (normally the request path and query string)
+            body: Serialized response body
+            etag: Entity tag for the body
+            immutable: Cache without expiry (finished games)
+            ttl: Seconds to keep a mutable entry; defaults to default_ttl
+        """
+        if immutable:
+            expires_at = None
+        else:
+            ttl = self.default_ttl if ttl is None else ttl
+            expires_at = self._clock() + ttl if ttl is not None else None
+        entry = CachedResponse(body=body, etag=etag, immutable=immutable, expires_at=expires_at)
+
+        if self.max_entries <= 0:
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Drop every entry (e.g. after games are repopulated with --override)"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,56 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row on a page, tagged with the
+listing it belongs to. The next page is fetched with a row-value comparison
+against that key, which an index on the same columns answers with a single
+range scan, so deep pages cost the same as the first one.
+"""
+
+import base64
+import json
+from typing import Any, List, Sequence
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor is malformed or belongs to another listing"""
+
+
+def encode_cursor(kind: str, key: Sequence[Any]) -> str:
+    """
+    Encode a sort key as an opaque URL-safe token.
+
+    Args:
+        kind: Listing the cursor belongs to
+        key: Sort key values of the last row on the page (JSON encodable)
+
+    Returns:
+        Cursor token
+    """
+    payload = json.dumps([kind, list(key)], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(kind: str, token: str, size: int) -> List[Any]:
+    """
+    Decode a cursor token back into its sort key.
+
+    Args:
+        kind: Listing the cursor is expected to belong to
+        token: Cursor token from a previous page
+        size: Number of values in the sort key
+
+    Returns:
+        Sort key values
+
+    Raises:
+        InvalidCursor: If the token cannot be decoded or does not match
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_kind, key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor("Malformed cursor")
+    if cursor_kind != kind or not isinstance(key, list) or len(key) != size:
+        raise InvalidCursor("Cursor does not belong to this listing")
+    return key
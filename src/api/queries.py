@@ -0,0 +1,245 @@
+"""
+Read-only queries behind the HTTP API.
+
+Each function takes a SQLAlchemy session and returns JSON-ready dicts (or
+None when the resource does not exist). Internal surrogate keys are replaced
+with the API ids that appear in the source data. Listings are paged by
+keyset: each page carries a cursor for the sort key of its last row.
+"""
+
+from datetime import datetime, date
+from typing import List, Dict, Any, Optional, Iterable, Callable, Sequence
+
+from sqlalchemy import select, exists, or_, case, tuple_, func, literal_column
+from sqlalchemy.orm import Session
+
+from ..database.models import Game, Play, Boxscore, Person, Team
+from ..database.game_utils import GAME_STATUS_FINAL
+from .pagination import encode_cursor, decode_cursor, InvalidCursor
+
+
+# Surrogate and foreign keys that only make sense inside this database
+INTERNAL_COLUMNS = {'id', 'person_internal_id', 'arena_internal_id', 'team_id'}
+
+# Games missing a season or tip-off time sort first, under these stand-ins, so
+# the row-value comparison never meets a NULL. ix_game_season_game_et indexes
+# the same expressions, so they are inlined rather than bound.
+UNKNOWN_SEASON = 0
+UNKNOWN_GAME_ET = datetime(1900, 1, 1)
+GAME_SORT_KEY = (
+    func.coalesce(Game.season, literal_column(str(UNKNOWN_SEASON))),
+    func.coalesce(Game.game_et, literal_column("'1900-01-01 00:00:00'")),
+    Game.game_id,
+)
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert column values that json cannot encode"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def serialize(obj: Any, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Column values of a model instance as a dict"""
+    exclude = set(exclude)
+    return {
+        column.key: to_json_value(getattr(obj, column.key))
+        for column in obj.__table__.columns
+        if column.key not in exclude
+    }
+
+
+def page(rows: Sequence[Any], limit: int, kind: str, key: Callable[[Any], Sequence[Any]],
+         to_record: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build a page from up to limit + 1 fetched rows.
+
+    Args:
+        rows: Rows in sort order; one extra row signals a following page
+        limit: Page size
+        kind: Listing name stored in the cursor
+        key: Sort key of a row
+        to_record: Row serializer
+
+    Returns:
+        Dictionary with 'items' and 'next_cursor' (None on the last page)
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(kind, [to_json_value(value) for value in key(rows[-1])]) if has_more else None
+    return {'items': [to_record(row) for row in rows], 'next_cursor': next_cursor}
+
+
+def _game_key(cursor: str) -> tuple:
+    season, game_et, game_id = decode_cursor('games', cursor, 3)
+    try:
+        return int(season), datetime.fromisoformat(game_et), int(game_id)
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+def _play_key(cursor: str) -> tuple:
+    try:
+        return tuple(int(value) for value in decode_cursor('plays', cursor, 3))
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+def is_finished(session: Session, game_id: int) -> bool:
+    """A game is final once it was populated from a feed with a final game status"""
+    return bool(session.scalar(
+        select(exists().where(Game.game_id == game_id, Game.game_status == GAME_STATUS_FINAL))
+    ))
+
+
+def get_game(session: Session, game_id: int) -> Optional[Dict[str, Any]]:
+    """Game metadata"""
+    game = session.get(Game, game_id)
+    if game is None:
+        return None
+    return serialize(game, exclude=['arena_internal_id'])
+
+
+def list_games(session: Session, season: Optional[int] = None, game_type: Optional[str] = None,
+               team_id: Optional[int] = None, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Page of games ordered by (season, game_et, game_id), games missing a
+    season or tip-off time first.
+
+    Args:
+        season: Filter by season
+        game_type: Filter by game type ('regular' or 'playoff')
+        team_id: Games involving this team (API team id)
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    query = select(Game).order_by(*GAME_SORT_KEY).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(tuple_(*GAME_SORT_KEY) > tuple_(*_game_key(cursor)))
+    if season is not None:
+        query = query.where(Game.season == season)
+    if game_type is not None:
+        query = query.where(Game.game_type == game_type)
+    if team_id is not None:
+        query = query.where(or_(Game.home_team_id == team_id, Game.away_team_id == team_id))
+    return page(
+        session.scalars(query).all(), limit, 'games',
+        key=lambda game: (
+            UNKNOWN_SEASON if game.season is None else game.season,
+            game.game_et or UNKNOWN_GAME_ET,
+            game.game_id
+        ),
+        to_record=lambda game: serialize(game, exclude=['arena_internal_id'])
+    )
+
+
+def _play_record(row) -> Dict[str, Any]:
+    play, team_id = row
+    record = serialize(play, exclude=INTERNAL_COLUMNS)
+    record['team_id'] = team_id
+    return record
+
+
+def _play_page(session: Session, query, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    sort_key = (Play.game_id, Play.action_number, Play.play_id)
+    query = query.order_by(*sort_key).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(tuple_(*sort_key) > tuple_(*_play_key(cursor)))
+    return page(
+        session.execute(query).all(), limit, 'plays',
+        key=lambda row: (row[0].game_id, row[0].action_number, row[0].play_id),
+        to_record=_play_record
+    )
+
+
+def get_plays(session: Session, game_id: int, limit: int = 1000, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Page of play-by-play for a game ordered by action number, with API team ids.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    query = (
+        select(Play, Team.team_id)
+        .outerjoin(Team, Team.id == Play.team_id)
+        .where(Play.game_id == game_id)
+    )
+    return _play_page(session, query, limit, cursor)
+
+
+def list_season_plays(session: Session, season: int, game_type: Optional[str] = None,
+                      limit: int = 1000, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Page of play-by-play for a whole season ordered by (game_id, action_number).
+
+    Args:
+        season: Season to list
+        game_type: Filter by game type ('regular' or 'playoff')
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    games = select(Game.game_id).where(Game.season == season)
+    if game_type is not None:
+        games = games.where(Game.game_type == game_type)
+    query = (
+        select(Play, Team.team_id)
+        .outerjoin(Team, Team.id == Play.team_id)
+        .where(Play.game_id.in_(games))
+    )
+    return _play_page(session, query, limit, cursor)
+
+
+def get_boxscores(session: Session, game_id: int) -> List[Dict[str, Any]]:
+    """Boxscore rows for a game, with the API team id taken from the game's home/away side"""
+    team_id = case((Boxscore.home_away_team == 'h', Game.home_team_id), else_=Game.away_team_id)
+    rows = session.execute(
+        select(Boxscore, team_id)
+        .join(Game, Game.game_id == Boxscore.game_id)
+        .where(Boxscore.game_id == game_id)
+        .order_by(Boxscore.boxscore_id)
+    ).all()
+    boxscores = []
+    for boxscore, api_team_id in rows:
+        record = serialize(boxscore, exclude=INTERNAL_COLUMNS)
+        record['team_id'] = api_team_id
+        boxscores.append(record)
+    return boxscores
+
+
+def get_person(session: Session, person_id: int) -> Optional[Dict[str, Any]]:
+    """Most recently used record for a person (API person id)"""
+    person = session.scalars(
+        select(Person)
+        .where(Person.person_id == person_id)
+        .order_by(Person.last_used.desc().nulls_last(), Person.id.desc())
+        .limit(1)
+    ).first()
+    return serialize(person, exclude=['id']) if person else None
+
+
+def list_teams(session: Session) -> List[Dict[str, Any]]:
+    """Most recent record for every team"""
+    latest = {}
+    query = select(Team).order_by(Team.team_id, Team.last_used.asc().nulls_first(), Team.id)
+    for team in session.scalars(query):
+        # Later rows of the same team overwrite earlier ones
+        latest[team.team_id] = team
+    return [serialize(team, exclude=['id']) for team in latest.values()]
+
+
+def get_team(session: Session, team_id: int) -> Optional[Dict[str, Any]]:
+    """Most recently used record for a team (API team id)"""
+    team = session.scalars(
+        select(Team)
+        .where(Team.team_id == team_id)
+        .order_by(Team.last_used.desc().nulls_last(), Team.id.desc())
+        .limit(1)
+    ).first()
+    return serialize(team, exclude=['id']) if team else None
@@ -0,0 +1,211 @@
+"""
+Resumable chunked backfills.
+
+A backfill walks one table in key order, a chunk of rows at a time, and
+applies a transform to each chunk: a SQL statement over the chunk's key
+range (see sql_transform) or a Python function over its keys. The transform
+and the checkpoint recording the chunk's last key commit in the same
+transaction, so an interrupted run resumes after the last committed chunk
+without redoing or skipping rows. Runs can be throttled to a target rate
+and report progress with an ETA.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, insert, update, func, true
+from sqlalchemy.engine import Connection, Engine
+
+from .models import BackfillCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+# A transform receives the connection holding the chunk's transaction and the
+# chunk's keys in ascending order, and returns the number of rows it changed
+# (None counts every row of the chunk)
+Transform = Callable[[Connection, List[int]], Optional[int]]
+
+
+def sql_transform(build: Callable[[int, int], Any]) -> Transform:
+    """
+    Transform running one statement per chunk.
+
+    Args:
+        build: Called with the chunk's first and last key (inclusive) and
+            returning the statement to execute, typically an UPDATE with
+            WHERE key BETWEEN lo AND hi
+
+    Returns:
+        Transform reporting the statement's rowcount
+    """
+    def transform(conn: Connection, keys: List[int]) -> Optional[int]:
+        return conn.execute(build(keys[0], keys[-1])).rowcount
+    return transform
+
+
+class BackfillRunner:
+    """Walks a table by keyset chunks with a persisted checkpoint"""
+
+    def __init__(self, engine: Engine, name: str, key, where=None, chunk_size: int = 5000,
+                 rows_per_second: Optional[float] = None,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 log_interval: float = 10.0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            name: Checkpoint name, unique per backfill
+            key: Integer column the table is walked by, e.g. Game.game_id;
+                should be unique and indexed
+            where: Only visit rows matching this condition
+            chunk_size: Rows per chunk and transaction
+            rows_per_second: Throttle to this average rate (default: unthrottled)
+            progress: Called after each chunk with the progress dictionary
+            log_interval: Minimum seconds between progress log lines
+            clock: Monotonic time source
+            sleep: Used to wait when throttling
+        """
+        self.engine = engine
+        self.name = name
+        self.key = key
+        self.where = where if where is not None else true()
+        self.chunk_size = chunk_size
+        self.rows_per_second = rows_per_second
+        self.progress = progress
+        self.log_interval = log_interval
+        self.clock = clock
+        self.sleep = sleep
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Stored checkpoint of this backfill, or None if it never ran"""
+        with self.engine.connect() as conn:
+            return self._load(conn)
+
+    def _load(self, conn: Connection) -> Optional[Dict[str, Any]]:
+        row = conn.execute(
+            select(BackfillCheckpoint.__table__).where(BackfillCheckpoint.name == self.name)
+        ).mappings().first()
+        return dict(row) if row else None
+
+    def _save(self, conn: Connection, exists: bool, **values):
+        table = BackfillCheckpoint.__table__
+        values['updated_at'] = func.now()
+        if exists:
+            conn.execute(update(table).where(table.c.name == self.name).values(**values))
+        else:
+            conn.execute(insert(table).values(name=self.name, table_name=self.key.table.name, **values))
+
+    def _next_keys(self, conn: Connection, after: Optional[int]) -> List[int]:
+        query = select(self.key).where(self.where).order_by(self.key).limit(self.chunk_size)
+        if after is not None:
+            query = query.where(self.key > after)
+        return list(conn.scalars(query))
+
+    def _remaining(self, conn: Connection, after: Optional[int]) -> int:
+        query = select(func.count()).select_from(self.key.table).where(self.where)
+        if after is not None:
+            query = query.where(self.key > after)
+        return conn.scalar(query)
+
+    def run(self, transform: Optional[Transform] = None, dry_run: bool = False,
+            restart: bool = False) -> Dict[str, Any]:
+        """
+        Run the backfill, resuming from an unfinished checkpoint.
+
+        A completed checkpoint starts a fresh walk.
+
+        Args:
+            transform: Applied to each chunk (required unless dry_run)
+            dry_run: Walk and count the chunks without applying the transform
+                or writing the checkpoint
+            restart: Ignore an unfinished checkpoint and start from the beginning
+
+        Returns:
+            Dictionary with 'rows' visited and 'affected' by the transform in
+            this run, 'chunks', 'resumed_from' (key or None) and 'elapsed' seconds
+        """
+        if transform is None and not dry_run:
+            raise ValueError("A transform is required unless dry_run is set")
+
+        stats = {'rows': 0, 'affected': 0, 'chunks': 0, 'resumed_from': None, 'elapsed': 0.0}
+        with self.engine.connect() as conn:
+            state = self._load(conn)
+            after, processed, chunks = None, 0, 0
+            if state and state['completed_at'] is None and not restart and not dry_run:
+                after, processed, chunks = state['last_key'], state['rows_processed'] or 0, state['chunks'] or 0
+                stats['resumed_from'] = after
+                logger.info(f"Backfill {self.name}: resuming after key {after} ({processed} rows done)")
+            elif not dry_run:
+                self._save(conn, state is not None, last_key=None, rows_processed=0, chunks=0,
+                           started_at=func.now(), completed_at=None)
+                conn.commit()
+
+            total = processed + self._remaining(conn, after)
+            conn.rollback()
+            start = last_log = self.clock()
+
+            while True:
+                keys = self._next_keys(conn, after)
+                if not keys:
+                    break
+                if dry_run:
+                    affected = len(keys)
+                    conn.rollback()
+                else:
+                    affected = transform(conn, keys)
+                    affected = len(keys) if affected is None else affected
+                after = keys[-1]
+                processed += len(keys)
+                chunks += 1
+                if not dry_run:
+                    self._save(conn, True, last_key=after, rows_processed=processed, chunks=chunks)
+                    conn.commit()
+
+                stats['rows'] += len(keys)
+                stats['affected'] += affected
+                stats['chunks'] += 1
+                self._throttle(stats['rows'], start)
+                progress = self._report(stats, processed, total, after, start)
+                if self.progress:
+                    self.progress(progress)
+                now = self.clock()
+                if now - last_log >= self.log_interval:
+                    last_log = now
+                    eta = 'unknown' if progress['eta'] is None else f"{progress['eta']:.0f}s"
+                    logger.info(f"Backfill {self.name}: {processed}/{total} rows "
+                                f"({progress['rate']:.0f} rows/s, ETA {eta})")
+
+            if not dry_run:
+                self._save(conn, True, completed_at=func.now())
+                conn.commit()
+
+        stats['elapsed'] = self.clock() - start
+        logger.info(f"Backfill {self.name}: {stats['rows']} rows in {stats['chunks']} chunks, "
+                    f"{stats['affected']} affected{' (dry run)' if dry_run else ''}")
+        return stats
+
+    def _report(self, stats: Dict[str, Any], processed: int, total: int, last_key: int,
+                start: float) -> Dict[str, Any]:
+        """Progress of the run with its average rate and estimated time remaining"""
+        elapsed = self.clock() - start
+        rate = stats['rows'] / elapsed if elapsed > 0 else 0.0
+        remaining = max(total - processed, 0)
+        return {
+            'name': self.name,
+            'processed': processed,
+            'total': total,
+            'last_key': last_key,
+            'chunks': stats['chunks'],
+            'rate': rate,
+            'eta': remaining / rate if rate > 0 else None,
+        }
+
+    def _throttle(self, rows: int, start: float):
+        """Sleep until the run's average rate is back at the target"""
+        if not self.rows_per_second:
+            return
+        wait = rows / self.rows_per_second - (self.clock() - start)
+        if wait > 0:
+            self.sleep(wait)
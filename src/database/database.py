@@ -116,7 +116,10 @@ def verify_database_structure():
     expected_tables = [
         'raw_game_data', 'scraping_sessions', 'database_versions',
         'arena', 'team', 'game', 'person', 'person_game', 'team_game', 
-        'play', 'boxscore', 'alembic_version'
+        'play', 'boxscore', 'possession', 'lineup', 'stint', 'game_summary', 'shot_chart_bin',
+        'player_season_stats', 'team_season_stats', 'validation_run', 'backfill_checkpoint',
+        'population_run', 'population_run_game', 'scrape_queue',
+        'alembic_version'
     ]
     
     try:
@@ -0,0 +1,162 @@
+"""
+Streaming export of normalized tables as NDJSON or CSV.
+
+Rows are read through a server-side cursor (yield_per) in fixed-size
+partitions and encoded one partition at a time, so memory stays constant
+regardless of how many rows match. Output is produced as a sequence of text
+chunks that can be written to a file, a gzip stream or an HTTP response.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+from datetime import datetime, date
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .models import Game, Play, Boxscore, PersonGame
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_TABLES = {
+    'play': (Play, (Play.game_id, Play.action_number, Play.play_id)),
+    'boxscore': (Boxscore, (Boxscore.game_id, Boxscore.boxscore_id)),
+    'game': (Game, (Game.game_id,)),
+    'person_game': (PersonGame, (PersonGame.game_id, PersonGame.person_game_id)),
+}
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+
+def _text_value(value: Any) -> Any:
+    """Render dates as ISO 8601 so both formats agree"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(table: str) -> List[str]:
+    """Column names of an exportable table in declaration order"""
+    model, _ = EXPORT_TABLES[table]
+    return [column.key for column in model.__table__.columns]
+
+
+def export_query(table: str, seasons: Optional[Sequence[int]] = None,
+                 game_types: Optional[Sequence[str]] = None,
+                 team_ids: Optional[Sequence[int]] = None,
+                 game_ids: Optional[Sequence[int]] = None) -> Select:
+    """
+    Build the select for an export, ordered by game.
+
+    Args:
+        table: One of EXPORT_TABLES
+        seasons: Restrict to games from these seasons
+        game_types: Restrict to these game types
+        team_ids: Restrict to games involving these teams (API team ids)
+        game_ids: Restrict to these games
+
+    Returns:
+        Select over the table's columns
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table '{table}'")
+    model, order = EXPORT_TABLES[table]
+    columns = list(model.__table__.columns)
+    query = select(*columns).order_by(*order)
+
+    game_filters = []
+    if seasons:
+        game_filters.append(Game.season.in_(seasons))
+    if game_types:
+        game_filters.append(Game.game_type.in_(game_types))
+    if team_ids:
+        game_filters.append(or_(Game.home_team_id.in_(team_ids), Game.away_team_id.in_(team_ids)))
+
+    if model is Game:
+        query = query.where(*game_filters)
+        if game_ids:
+            query = query.where(Game.game_id.in_(game_ids))
+        return query
+
+    if game_filters:
+        query = query.where(model.game_id.in_(select(Game.game_id).where(*game_filters)))
+    if game_ids:
+        query = query.where(model.game_id.in_(game_ids))
+    return query
+
+
+def iter_export(session: Session, table: str, fmt: str = 'ndjson', batch_size: int = 5000,
+                **filters) -> Iterator[str]:
+    """
+    Stream an export as text chunks, one chunk per fetched partition.
+
+    Args:
+        session: Database session
+        table: One of EXPORT_TABLES
+        fmt: 'ndjson' or 'csv' (CSV starts with a header row)
+        batch_size: Rows fetched from the server-side cursor at a time
+        **filters: Passed to export_query
+
+    Yields:
+        Encoded rows
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+    columns = export_columns(table)
+    query = export_query(table, **filters).execution_options(yield_per=batch_size)
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    result = session.execute(query)
+    for partition in result.partitions():
+        if fmt == 'ndjson':
+            yield ''.join(
+                json.dumps(dict(zip(columns, map(_text_value, row))), separators=(',', ':')) + '\n'
+                for row in partition
+            )
+        else:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_text_value(value) for value in row] for row in partition)
+            yield buffer.getvalue()
+
+
+def write_export(session: Session, table: str, out: BinaryIO, fmt: str = 'ndjson',
+                 compress: bool = False, batch_size: int = 5000, **filters) -> int:
+    """
+    Write an export to a binary stream.
+
+    Args:
+        session: Database session
+        table: One of EXPORT_TABLES
+        out: Destination stream
+        fmt: 'ndjson' or 'csv'
+        compress: Gzip the output on the fly
+        batch_size: Rows fetched from the server-side cursor at a time
+        **filters: Passed to export_query
+
+    Returns:
+        Number of bytes of uncompressed output written
+    """
+    stream = gzip.GzipFile(fileobj=out, mode='wb') if compress else out
+    written = 0
+    try:
+        for chunk in iter_export(session, table, fmt=fmt, batch_size=batch_size, **filters):
+            data = chunk.encode('utf-8')
+            stream.write(data)
+            written += len(data)
+    finally:
+        if compress:
+            stream.close()
+    logger.info(f"Exported {table} as {fmt}: {written} bytes")
+    return written
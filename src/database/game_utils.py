@@ -2,6 +2,19 @@
 Utility functions for WNBA game ID parsing and analysis.
 """
 
+from sqlalchemy import and_, case, literal
+
+
+# Integer range of well-formed 10-digit game IDs starting with 10
+GAME_ID_MIN = 1000000000
+GAME_ID_MAX = 1099999999
+
+# Feed values of boxscore.gameStatus, stored as game.game_status
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_IN_PROGRESS = 2
+GAME_STATUS_FINAL = 3
+
+
 def parse_game_id(game_id: int) -> dict:
     """
     Parse WNBA game ID to extract season and game type information.
@@ -91,4 +104,38 @@ def determine_game_type_from_game_id(game_id: int) -> str:
     Returns:
         str: 'regular', 'playoff', 'unknown', or None if parsing fails
     """
-    return parse_game_id(game_id)['game_type']
\ No newline at end of file
+    return parse_game_id(game_id)['game_type']
+
+
+def game_id_is_valid_sql(column):
+    """
+    SQL predicate matching game IDs that parse_game_id can parse.
+
+    Args:
+        column: Integer game ID column or expression
+    """
+    return and_(column >= GAME_ID_MIN, column <= GAME_ID_MAX)
+
+
+def game_id_season_sql(column):
+    """
+    SQL expression for the season encoded in a game ID (digits YY of 10SYY00GGG).
+
+    Matches parse_game_id for IDs selected by game_id_is_valid_sql.
+    """
+    year_suffix = (column // 100000) % 100
+    return case((year_suffix >= 97, year_suffix + 1900), else_=year_suffix + 2000)
+
+
+def game_id_game_type_sql(column):
+    """
+    SQL expression for the game type encoded in a game ID (digit S of 10SYY00GGG).
+
+    Matches parse_game_id for IDs selected by game_id_is_valid_sql.
+    """
+    season_type = (column // 10000000) % 10
+    return case(
+        (season_type == 2, literal('regular')),
+        (season_type == 4, literal('playoff')),
+        else_=literal('unknown')
+    )
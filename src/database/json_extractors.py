@@ -137,7 +137,8 @@ class GameExtractor:
             'game_label': boxscore.get('gameLabel'),
             'game_attendance': boxscore.get('attendance'),
             'season': game_metadata['season'],
-            'game_type': game_metadata['game_type']
+            'game_type': game_metadata['game_type'],
+            'game_status': boxscore.get('gameStatus')
         }
 
 
@@ -384,6 +385,11 @@ class BoxscoreExtractor:
             
             # Individual player stats - these have statistics sub-object
             if 'players' in team_data:
+                # Starters are listed with a position; older games list positions
+                # for bench players too, so only trust it when exactly five are set
+                positioned = [p for p in team_data['players'] if p.get('position')]
+                starters_known = len(positioned) == 5
+                
                 for player_stats in team_data['players']:
                     # Player stats are in the 'statistics' sub-object
                     if 'statistics' in player_stats:
@@ -400,6 +406,8 @@ class BoxscoreExtractor:
                             box_type='player',
                             stats=player_stats['statistics']
                         )
+                        if starters_known:
+                            boxscore_entry['starter'] = bool(player_stats.get('position'))
                         boxscores.append(boxscore_entry)
         
         return boxscores
@@ -508,7 +516,8 @@ class BoxscoreExtractor:
             'team_id': team_id,
             'person_id': person_id,
             'home_away_team': home_away_team,
-            'box_type': box_type
+            'box_type': box_type,
+            'starter': None
         }
         
         # Map all known statistics
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, func, Boolean, Float, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, BigInteger, String, DateTime, Text, func, Boolean, Float, ForeignKey, UniqueConstraint, Index, text, JSON
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from datetime import datetime
@@ -120,6 +120,11 @@ class Team(Base):
 class Game(Base):
     """WNBA game information"""
     __tablename__ = 'game'
+    __table_args__ = (
+        # Keyset pagination order for game listings, with stand-ins for NULLs
+        Index('ix_game_season_game_et', text('coalesce(season, 0)'),
+              text("coalesce(game_et, '1900-01-01 00:00:00')"), 'game_id'),
+    )
     
     game_id = Column(Integer, primary_key=True)
     game_code = Column(String(50))
@@ -138,6 +143,8 @@ class Game(Base):
     game_attendance = Column(Integer)
     season = Column(Integer)
     game_type = Column(String(20))
+    game_status = Column(Integer, nullable=True)  # Feed's boxscore.gameStatus: 1 scheduled, 2 in progress, 3 final
+    populated_at = Column(DateTime, nullable=True, index=True)  # Last (re)population, for incremental validation
     
     # Relationships
     arena = relationship("Arena", back_populates="games")
@@ -145,6 +152,10 @@ class Game(Base):
     person_games = relationship("PersonGame", back_populates="game")
     plays = relationship("Play", back_populates="game")
     boxscores = relationship("Boxscore", back_populates="game")
+    possessions = relationship("Possession", back_populates="game")
+    stints = relationship("Stint", back_populates="game")
+    summary = relationship("GameSummary", back_populates="game", uselist=False)
+    shot_chart_bins = relationship("ShotChartBin", back_populates="game")
     
     def __repr__(self):
         return f"<Game(id={self.game_id}, code='{self.game_code}')>"
@@ -188,6 +199,10 @@ class PersonGame(Base):
 class Play(Base):
     """Play-by-play data for WNBA games"""
     __tablename__ = 'play'
+    __table_args__ = (
+        # Keyset pagination order for per-game and per-season play listings
+        Index('ix_play_game_action', 'game_id', 'action_number', 'play_id'),
+    )
     
     play_id = Column(Integer, primary_key=True)
     game_id = Column(Integer, ForeignKey('game.game_id'))
@@ -232,6 +247,7 @@ class Boxscore(Base):
     person_internal_id = Column(Integer, ForeignKey('person.id'), nullable=True)
     home_away_team = Column(String(1))  # 'h' or 'a'
     box_type = Column(String(20))  # 'starters', 'bench', or 'player'
+    starter = Column(Boolean, nullable=True)  # Player rows only; None when unknown
     min = Column(String(10))
     pts = Column(Integer)
     reb = Column(Integer)
@@ -259,4 +275,302 @@ class Boxscore(Base):
     person = relationship("Person", back_populates="boxscores")
     
     def __repr__(self):
-        return f"<Boxscore(id={self.boxscore_id}, game_id={self.game_id}, box_type='{self.box_type}')>"
\ No newline at end of file
+        return f"<Boxscore(id={self.boxscore_id}, game_id={self.game_id}, box_type='{self.box_type}')>"
+
+
+class Possession(Base):
+    """Possessions derived from play-by-play data"""
+    __tablename__ = 'possession'
+    
+    possession_id = Column(Integer, primary_key=True)
+    game_id = Column(Integer, ForeignKey('game.game_id'), index=True)
+    possession_number = Column(Integer)
+    period = Column(Integer)
+    team_id = Column(Integer)  # API team id of the offensive team
+    location = Column(String(1))  # 'h' or 'v'
+    start_action_number = Column(Integer)
+    end_action_number = Column(Integer)
+    start_clock = Column(Float)  # Seconds remaining in period
+    end_clock = Column(Float)
+    end_reason = Column(String(20))  # made_shot, free_throw, defensive_rebound, turnover, end_of_period
+    points = Column(Integer)
+    
+    # Relationships
+    game = relationship("Game", back_populates="possessions")
+    
+    def __repr__(self):
+        return f"<Possession(id={self.possession_id}, game_id={self.game_id}, number={self.possession_number})>"
+
+
+class Lineup(Base):
+    """Distinct five-player lineups stored as sorted API person ids"""
+    __tablename__ = 'lineup'
+    __table_args__ = (
+        UniqueConstraint('team_id', 'person_1', 'person_2', 'person_3', 'person_4', 'person_5',
+                         name='uq_lineup_team_players'),
+    )
+    
+    lineup_id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, nullable=False)  # API team id
+    person_1 = Column(Integer, nullable=False)
+    person_2 = Column(Integer, nullable=False)
+    person_3 = Column(Integer, nullable=False)
+    person_4 = Column(Integer, nullable=False)
+    person_5 = Column(Integer, nullable=False)
+    
+    # Relationships
+    stints = relationship("Stint", back_populates="lineup", foreign_keys="Stint.lineup_id")
+    
+    @property
+    def person_ids(self) -> tuple:
+        return (self.person_1, self.person_2, self.person_3, self.person_4, self.person_5)
+    
+    def __repr__(self):
+        return f"<Lineup(id={self.lineup_id}, team_id={self.team_id}, persons={self.person_ids})>"
+
+
+class Stint(Base):
+    """Interval of a game during which both teams' lineups are unchanged, from one team's view"""
+    __tablename__ = 'stint'
+    
+    stint_id = Column(Integer, primary_key=True)
+    game_id = Column(Integer, ForeignKey('game.game_id'), index=True)
+    stint_number = Column(Integer)
+    period = Column(Integer)
+    team_id = Column(Integer)  # API team id
+    lineup_id = Column(Integer, ForeignKey('lineup.lineup_id'), index=True)
+    opponent_lineup_id = Column(Integer, ForeignKey('lineup.lineup_id'))
+    start_seconds = Column(Float)  # Elapsed game seconds
+    end_seconds = Column(Float)
+    points_for = Column(Integer)
+    points_against = Column(Integer)
+    
+    # Relationships
+    game = relationship("Game", back_populates="stints")
+    lineup = relationship("Lineup", back_populates="stints", foreign_keys=[lineup_id])
+    
+    def __repr__(self):
+        return f"<Stint(id={self.stint_id}, game_id={self.game_id}, lineup_id={self.lineup_id})>"
+
+
+class GameSummary(Base):
+    """Cached per-game score timeline metrics"""
+    __tablename__ = 'game_summary'
+    
+    game_id = Column(Integer, ForeignKey('game.game_id'), primary_key=True)
+    home_team_id = Column(Integer)  # API team ids
+    away_team_id = Column(Integer)
+    home_score = Column(Integer)
+    away_score = Column(Integer)
+    lead_changes = Column(Integer)
+    times_tied = Column(Integer)
+    home_largest_lead = Column(Integer)
+    away_largest_lead = Column(Integer)
+    home_largest_run = Column(Integer)
+    away_largest_run = Column(Integer)
+    home_seconds_leading = Column(Float)
+    away_seconds_leading = Column(Float)
+    seconds_tied = Column(Float)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    game = relationship("Game", back_populates="summary")
+    
+    def __repr__(self):
+        return f"<GameSummary(game_id={self.game_id}, score={self.home_score}-{self.away_score})>"
+
+
+class ShotChartBin(Base):
+    """Field-goal attempts aggregated into court bins per game, shooter and grid"""
+    __tablename__ = 'shot_chart_bin'
+    __table_args__ = (
+        Index('ix_shot_chart_bin_grid_person', 'grid', 'bin_size', 'person_id', 'season'),
+        Index('ix_shot_chart_bin_grid_team', 'grid', 'bin_size', 'team_id', 'season'),
+    )
+    
+    shot_chart_bin_id = Column(Integer, primary_key=True)
+    game_id = Column(Integer, ForeignKey('game.game_id'), index=True)
+    season = Column(Integer)
+    person_id = Column(Integer)  # API person id of the shooter
+    team_id = Column(Integer)  # API team id of the shooting team
+    opponent_team_id = Column(Integer)
+    grid = Column(String(10))  # 'hex' or 'square'
+    bin_size = Column(Integer)  # Legacy court units (tenths of a foot)
+    bin_x = Column(Integer)
+    bin_y = Column(Integer)
+    attempts = Column(Integer)
+    made = Column(Integer)
+    points = Column(Integer)
+    
+    # Relationships
+    game = relationship("Game", back_populates="shot_chart_bins")
+    
+    def __repr__(self):
+        return f"<ShotChartBin(game_id={self.game_id}, person_id={self.person_id}, bin=({self.bin_x}, {self.bin_y}))>"
+
+
+class PlayerSeasonStats(Base):
+    """Materialized season totals per player, team, season and game type"""
+    __tablename__ = 'player_season_stats'
+    
+    person_id = Column(Integer, primary_key=True)  # API person id
+    team_id = Column(Integer, primary_key=True)  # API team id
+    season = Column(Integer, primary_key=True)
+    game_type = Column(String(20), primary_key=True)
+    games = Column(Integer)
+    games_started = Column(Integer)
+    minutes = Column(Float)
+    pts = Column(Integer)
+    reb = Column(Integer)
+    ast = Column(Integer)
+    stl = Column(Integer)
+    blk = Column(Integer)
+    fgm = Column(Integer)
+    fga = Column(Integer)
+    tpm = Column(Integer)
+    tpa = Column(Integer)
+    ftm = Column(Integer)
+    fta = Column(Integer)
+    to = Column(Integer)
+    pf = Column(Integer)
+    orebs = Column(Integer)
+    drebs = Column(Integer)
+    pm = Column(Integer)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<PlayerSeasonStats(person_id={self.person_id}, team_id={self.team_id}, season={self.season}, games={self.games})>"
+
+
+class TeamSeasonStats(Base):
+    """Materialized season totals per team, season and game type"""
+    __tablename__ = 'team_season_stats'
+    
+    team_id = Column(Integer, primary_key=True)  # API team id
+    season = Column(Integer, primary_key=True)
+    game_type = Column(String(20), primary_key=True)
+    games = Column(Integer)
+    wins = Column(Integer)
+    losses = Column(Integer)
+    minutes = Column(Float)
+    pts = Column(Integer)
+    reb = Column(Integer)
+    ast = Column(Integer)
+    stl = Column(Integer)
+    blk = Column(Integer)
+    fgm = Column(Integer)
+    fga = Column(Integer)
+    tpm = Column(Integer)
+    tpa = Column(Integer)
+    ftm = Column(Integer)
+    fta = Column(Integer)
+    to = Column(Integer)
+    pf = Column(Integer)
+    orebs = Column(Integer)
+    drebs = Column(Integer)
+    opp_pts = Column(Integer)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<TeamSeasonStats(team_id={self.team_id}, season={self.season}, games={self.games})>"
+
+
+class ValidationRun(Base):
+    """Completed data validation runs and the population watermark each covered"""
+    __tablename__ = 'validation_run'
+    
+    validation_run_id = Column(Integer, primary_key=True)
+    mode = Column(String(20))  # 'full' or 'incremental'
+    started_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime)
+    since = Column(DateTime, nullable=True)  # Incremental runs: populated_at lower bound checked
+    watermark = Column(DateTime, nullable=True)  # Newest Game.populated_at covered; None if scans errored
+    failed_game_ids = Column(JSON, nullable=True)  # Games with issues, rechecked by the next incremental run
+    games_checked = Column(Integer)
+    issues = Column(Integer)
+    passed = Column(Boolean)
+    
+    def __repr__(self):
+        return f"<ValidationRun(id={self.validation_run_id}, mode='{self.mode}', watermark='{self.watermark}')>"
+
+
+class BackfillCheckpoint(Base):
+    """Progress of a named chunked backfill, for resuming after interruption"""
+    __tablename__ = 'backfill_checkpoint'
+    
+    name = Column(String(100), primary_key=True)
+    table_name = Column(String(100))
+    last_key = Column(BigInteger, nullable=True)  # Last key processed; None before the first chunk
+    rows_processed = Column(Integer, default=0)
+    chunks = Column(Integer, default=0)
+    started_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+    completed_at = Column(DateTime, nullable=True)  # Set once the walk reaches the end of the table
+    
+    def __repr__(self):
+        return f"<BackfillCheckpoint(name='{self.name}', last_key={self.last_key}, completed_at='{self.completed_at}')>"
+
+
+class PopulationRun(Base):
+    """A population run and the selection it was started with, for resuming"""
+    __tablename__ = 'population_run'
+    
+    population_run_id = Column(Integer, primary_key=True)
+    mode = Column(String(20))  # 'all', 'games', 'seasons' or 'pipeline'
+    description = Column(String(500))  # Selection, e.g. 'seasons=[2024] limit=100'
+    override_existing = Column(Boolean, default=False)
+    total_games = Column(Integer)
+    started_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime, nullable=True)  # Set when a pass over the pending games ends
+    
+    def __repr__(self):
+        return f"<PopulationRun(id={self.population_run_id}, mode='{self.mode}', finished_at='{self.finished_at}')>"
+
+
+class PopulationRunGame(Base):
+    """A game of a population run, in processing order, with its status"""
+    __tablename__ = 'population_run_game'
+    
+    population_run_id = Column(Integer, ForeignKey('population_run.population_run_id', ondelete='CASCADE'),
+                               primary_key=True)
+    game_id = Column(Integer, primary_key=True)
+    position = Column(Integer, nullable=False)  # Chronological processing order within the run
+    status = Column(String(10), nullable=False, default='pending')  # pending, done, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)  # Last failure message
+    updated_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        # Next games to process for a run and status
+        Index('ix_population_run_game_status', 'population_run_id', 'status', 'position'),
+    )
+    
+    def __repr__(self):
+        return f"<PopulationRunGame(run={self.population_run_id}, game_id={self.game_id}, status='{self.status}')>"
+
+
+class ScrapeQueueItem(Base):
+    """A game waiting to be scraped, leased to one scraper process at a time"""
+    __tablename__ = 'scrape_queue'
+    
+    game_id = Column(Integer, primary_key=True)
+    season = Column(Integer, nullable=False)
+    game_type = Column(String(20), nullable=False)
+    game_url = Column(String(500), nullable=False)
+    priority = Column(Integer, nullable=False, default=0)  # Higher is claimed first
+    status = Column(String(10), nullable=False, default='pending')  # pending, leased, done, failed
+    lease_owner = Column(String(200), nullable=True)  # Worker holding the lease, e.g. 'host:pid'
+    lease_expires = Column(DateTime, nullable=True)  # Leased: reclaimable after; pending: retry not before
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+    
+    __table_args__ = (
+        # Next items to claim by status and priority
+        Index('ix_scrape_queue_claim', 'status', 'priority', 'game_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ScrapeQueueItem(game_id={self.game_id}, status='{self.status}', attempts={self.attempts})>"
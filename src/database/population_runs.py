@@ -0,0 +1,159 @@
+"""
+Population run records, for resuming interrupted runs.
+
+A run stores the games it selected in processing (chronological) order,
+each pending until populated. A game is marked done in the same transaction
+that commits its rows, and failed, with the error, once its transaction has
+rolled back, so the statuses always match the populated tables. Resuming
+reads the remaining game IDs back from the run in order, and retrying reads
+the failed ones, without selecting and sorting the raw games again.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.engine import Engine
+
+from .models import PopulationRun, PopulationRunGame
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+STATUSES = (PENDING, DONE, FAILED)
+
+MAX_ERROR_LENGTH = 2000
+
+
+class PopulationRunStore:
+    """Creates population runs and tracks the status of their games"""
+
+    def __init__(self, engine: Engine, batch_size: int = 1000):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            batch_size: Game rows per insert when creating a run
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+
+    def create(self, game_ids: Sequence[int], mode: str, description: str = '',
+               override_existing: bool = False) -> int:
+        """
+        Record a new run.
+
+        Args:
+            game_ids: Games to populate, in processing order
+            mode: Selection mode ('all', 'games', 'seasons' or 'pipeline')
+            description: Human-readable selection, shown when resuming
+            override_existing: Whether games are cleared before populating
+
+        Returns:
+            The new run's ID
+        """
+        games = PopulationRunGame.__table__
+        with self.engine.begin() as conn:
+            run_id = conn.execute(
+                insert(PopulationRun.__table__).values(
+                    mode=mode, description=description[:500], override_existing=override_existing,
+                    total_games=len(game_ids), started_at=func.now(), updated_at=func.now()
+                ).returning(PopulationRun.__table__.c.population_run_id)
+            ).scalar_one()
+            for start in range(0, len(game_ids), self.batch_size):
+                conn.execute(insert(games), [
+                    {'population_run_id': run_id, 'game_id': game_id, 'position': position,
+                     'status': PENDING, 'attempts': 0}
+                    for position, game_id in enumerate(game_ids[start:start + self.batch_size], start)
+                ])
+        logger.info(f"Population run {run_id}: {len(game_ids)} games ({mode} {description})".rstrip())
+        return run_id
+
+    def add_games(self, run_id: int, game_ids: Sequence[int]):
+        """Append pending games to a run, after its existing games in processing order"""
+        if not game_ids:
+            return
+        runs, games = PopulationRun.__table__, PopulationRunGame.__table__
+        with self.engine.begin() as conn:
+            first = conn.scalar(select(runs.c.total_games).where(runs.c.population_run_id == run_id)) or 0
+            conn.execute(insert(games), [
+                {'population_run_id': run_id, 'game_id': game_id, 'position': position,
+                 'status': PENDING, 'attempts': 0}
+                for position, game_id in enumerate(game_ids, first)
+            ])
+            conn.execute(
+                update(runs).where(runs.c.population_run_id == run_id)
+                .values(total_games=first + len(game_ids), updated_at=func.now())
+            )
+
+    def get(self, run_id: Optional[int] = None) -> Optional[Dict]:
+        """The run with this ID, or the most recent run; None if there is none"""
+        table = PopulationRun.__table__
+        query = select(table)
+        if run_id is None:
+            query = query.order_by(table.c.population_run_id.desc()).limit(1)
+        else:
+            query = query.where(table.c.population_run_id == run_id)
+        with self.engine.connect() as conn:
+            row = conn.execute(query).mappings().first()
+        return dict(row) if row else None
+
+    def game_ids(self, run_id: int, statuses: Iterable[str] = (PENDING,)) -> List[int]:
+        """IDs of the run's games with these statuses, in processing order"""
+        games = PopulationRunGame.__table__
+        with self.engine.connect() as conn:
+            return list(conn.scalars(
+                select(games.c.game_id)
+                .where(games.c.population_run_id == run_id, games.c.status.in_(list(statuses)))
+                .order_by(games.c.position)
+            ))
+
+    def counts(self, run_id: int) -> Dict[str, int]:
+        """Number of the run's games per status"""
+        games = PopulationRunGame.__table__
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(games.c.status, func.count())
+                .where(games.c.population_run_id == run_id)
+                .group_by(games.c.status)
+            ).all()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    @staticmethod
+    def mark_done(session, run_id: int, game_id: int):
+        """Mark a game done inside the session that populated it, before its commit"""
+        games = PopulationRunGame.__table__
+        session.execute(
+            update(games)
+            .where(games.c.population_run_id == run_id, games.c.game_id == game_id)
+            .values(status=DONE, attempts=games.c.attempts + 1, error=None, updated_at=func.now())
+        )
+
+    def mark_failed(self, run_id: int, game_id: int, error: str):
+        """Mark a game failed after its population transaction rolled back"""
+        games = PopulationRunGame.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(games)
+                .where(games.c.population_run_id == run_id, games.c.game_id == game_id)
+                .values(status=FAILED, attempts=games.c.attempts + 1, error=error[:MAX_ERROR_LENGTH],
+                        updated_at=func.now())
+            )
+
+    def start(self, run_id: int):
+        """Mark the run as running again before resuming or retrying it"""
+        self._update_run(run_id, finished_at=None)
+
+    def finish(self, run_id: int):
+        """Mark the end of a pass over the run's games"""
+        self._update_run(run_id, finished_at=func.now())
+
+    def _update_run(self, run_id: int, **values):
+        table = PopulationRun.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(table).where(table.c.population_run_id == run_id).values(updated_at=func.now(), **values)
+            )
@@ -4,17 +4,22 @@ Handles bulk insertions, conflict resolution, and transaction management.
 """
 
 from typing import List, Dict, Any, Optional, Set
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.dialects.postgresql import insert
 from datetime import datetime
 import logging
 
-from .models import Arena, Team, Person, Game, TeamGame, PersonGame, Play, Boxscore
+from .models import Arena, Team, Person, Game, TeamGame, PersonGame, Play, Boxscore, Possession, Stint, GameSummary, ShotChartBin
 from .json_extractors import (
     ArenaExtractor, TeamExtractor, GameExtractor, 
     PersonExtractor, PlayExtractor, BoxscoreExtractor
 )
+from ..analytics.season_stats import SeasonStatsService
+from ..analytics.game_state import GameSummaryService
+from .query_counter import operation
+from .. import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +70,7 @@ class BulkInsertService:
     def __init__(self, session: Session):
         self.session = session
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='arena')
     def bulk_insert_arenas(self, arenas: List[Dict[str, Any]], game_et: datetime) -> int:
         """
         Bulk insert arenas with value-based conflict detection and temporal tracking.
@@ -150,6 +156,7 @@ class BulkInsertService:
                 return False
         return True
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='team')
     def bulk_insert_teams(self, teams: List[Dict[str, Any]], game_et: datetime) -> int:
         """
         Bulk insert teams with value-based conflict detection and temporal tracking.
@@ -243,6 +250,7 @@ class BulkInsertService:
                 return False
         return True
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='person')
     def bulk_insert_persons(self, persons: List[Dict[str, Any]], game_et: datetime) -> int:
         """
         Bulk insert persons with value-based conflict detection and temporal tracking.
@@ -282,11 +290,19 @@ class BulkInsertService:
                     seen[person_key] = person
                     unique_persons.append(person)
             
+            # Load every existing version of these persons in one query
+            existing_by_id = {}
+            for existing in self.session.query(Person).filter(
+                Person.person_id.in_({p['person_id'] for p in unique_persons})
+            ).order_by(Person.id):
+                existing_by_id.setdefault(existing.person_id, []).append(existing)
+            
+            new_versions = []
             for person_data in unique_persons:
                 person_id = person_data['person_id']
                 
                 # Find existing persons with same person_id
-                existing_persons = self.session.query(Person).filter_by(person_id=person_id).all()
+                existing_persons = existing_by_id.get(person_id, [])
                 
                 # Check if any existing person has identical values
                 exact_match = None
@@ -319,11 +335,12 @@ class BulkInsertService:
                     # Insert new version with temporal tracking
                     person_data['first_used'] = game_et
                     person_data['last_used'] = game_et
-                    
-                    stmt = insert(Person).values([person_data])
-                    self.session.execute(stmt)
+                    new_versions.append(person_data)
                     inserted_count += 1
-                    logger.debug(f"Inserted new person version {person_id} with timestamp {game_et}")
+                    logger.debug(f"Inserting new person version {person_id} with timestamp {game_et}")
+            
+            if new_versions:
+                self.session.execute(insert(Person).values(new_versions))
             
             logger.info(f"Person processing: {inserted_count} inserted, {updated_count} updated")
             return inserted_count
@@ -346,6 +363,7 @@ class BulkInsertService:
                 return False
         return True
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='game')
     def bulk_insert_games(self, games: List[Dict[str, Any]]) -> int:
         """Bulk insert games and update season/game_type for existing games"""
         if not games:
@@ -385,6 +403,11 @@ class BulkInsertService:
                     if existing_game.game_type is None and game.get('game_type') is not None:
                         existing_game.game_type = game['game_type']
                         needs_update = True
+                    
+                    # Follow the feed's status, e.g. a game populated in progress turning final
+                    if game.get('game_status') is not None and existing_game.game_status != game['game_status']:
+                        existing_game.game_status = game['game_status']
+                        needs_update = True
                         
                     if needs_update:
                         updated_count += 1
@@ -403,6 +426,7 @@ class BulkInsertService:
             logger.error(f"Error bulk inserting games: {e}")
             raise
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='team_game')
     def bulk_insert_team_games(self, team_games: List[Dict[str, Any]]) -> int:
         """Bulk insert team-game relationships"""
         if not team_games:
@@ -425,6 +449,7 @@ class BulkInsertService:
             logger.error(f"Error bulk inserting team games: {e}")
             raise
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='person_game')
     def bulk_insert_person_games(self, person_games: List[Dict[str, Any]]) -> int:
         """Bulk insert person-game relationships"""
         if not person_games:
@@ -447,6 +472,7 @@ class BulkInsertService:
             logger.error(f"Error bulk inserting person games: {e}")
             raise
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='play')
     def bulk_insert_plays(self, plays: List[Dict[str, Any]]) -> int:
         """Bulk insert plays with validation"""
         if not plays:
@@ -468,6 +494,7 @@ class BulkInsertService:
             logger.error(f"Error bulk inserting plays: {e}")
             raise
     
+    @metrics.timed(metrics.DB_INSERT_SECONDS, metrics.DB_ROWS_INSERTED, table='boxscore')
     def bulk_insert_boxscores(self, boxscores: List[Dict[str, Any]]) -> int:
         """Bulk insert boxscore entries"""
         if not boxscores:
@@ -493,10 +520,14 @@ class BulkInsertService:
 class GamePopulationService:
     """Orchestrates the full game population process"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, refresh_season_stats: bool = True):
         self.session = session
         self.bulk_service = BulkInsertService(session)
+        # Set refresh_season_stats=False when populating many games (each refresh
+        # recomputes both teams' seasons) and refresh their team-seasons afterwards
+        self.season_stats = SeasonStatsService(session) if refresh_season_stats else None
     
+    @operation('populate_game')
     def populate_game(self, game_json: Dict[str, Any]) -> Dict[str, int]:
         """
         Populate all tables for a single game.
@@ -528,52 +559,69 @@ class GamePopulationService:
             # Phase 1: Independent tables (no foreign key dependencies)
             
             # 1. Arena
-            arena_data = ArenaExtractor.extract(game_json)
-            results['arenas'] = self.bulk_service.bulk_insert_arenas([arena_data], game_et)
+            with operation('arena'):
+                arena_data = ArenaExtractor.extract(game_json)
+                results['arenas'] = self.bulk_service.bulk_insert_arenas([arena_data], game_et)
             
             # 2. Teams
-            team_data = TeamExtractor.extract_teams_from_game(game_json)
-            results['teams'] = self.bulk_service.bulk_insert_teams(team_data, game_et)
+            with operation('team'):
+                team_data = TeamExtractor.extract_teams_from_game(game_json)
+                results['teams'] = self.bulk_service.bulk_insert_teams(team_data, game_et)
             
             # 3. Persons
-            person_data = PersonExtractor.extract_persons_from_game(game_json)
-            results['persons'] = self.bulk_service.bulk_insert_persons(person_data, game_et)
+            with operation('person'):
+                person_data = PersonExtractor.extract_persons_from_game(game_json)
+                results['persons'] = self.bulk_service.bulk_insert_persons(person_data, game_et)
             
             # Phase 2: Game table (depends on Arena)
             
             # 4. Game - resolve arena_internal_id (we already have game_data from above)
-            arena_api_id = game_data['arena_id']
-            arena = self.session.query(Arena).filter_by(arena_id=arena_api_id).first()
-            if arena:
-                game_data['arena_internal_id'] = arena.id
-            else:
-                # This shouldn't happen if arena was inserted above
-                logger.warning(f"Arena with arena_id {arena_api_id} not found for game {game_id}")
-                game_data['arena_internal_id'] = None
-            
-            results['games'] = self.bulk_service.bulk_insert_games([game_data])
+            with operation('game'):
+                arena_api_id = game_data['arena_id']
+                arena = self.session.query(Arena).filter_by(arena_id=arena_api_id).first()
+                if arena:
+                    game_data['arena_internal_id'] = arena.id
+                else:
+                    # This shouldn't happen if arena was inserted above
+                    logger.warning(f"Arena with arena_id {arena_api_id} not found for game {game_id}")
+                    game_data['arena_internal_id'] = None
+                
+                results['games'] = self.bulk_service.bulk_insert_games([game_data])
+                self.session.query(Game).filter(Game.game_id == game_id).update(
+                    {Game.populated_at: func.now()}, synchronize_session=False
+                )
             
             # Phase 3: Junction tables and dependent data
             
             # 5. TeamGame relationships
-            team_games = self._create_team_game_relationships(game_json)
-            results['team_games'] = self.bulk_service.bulk_insert_team_games(team_games)
+            with operation('team_game'):
+                team_games = self._create_team_game_relationships(game_json)
+                results['team_games'] = self.bulk_service.bulk_insert_team_games(team_games)
             
             # 6. PersonGame relationships  
-            person_games = self._create_person_game_relationships(game_json)
-            results['person_games'] = self.bulk_service.bulk_insert_person_games(person_games)
+            with operation('person_game'):
+                person_games = self._create_person_game_relationships(game_json)
+                results['person_games'] = self.bulk_service.bulk_insert_person_games(person_games)
             
             # 7. Plays
-            plays = PlayExtractor.extract_plays_from_game(game_json)
-            # Resolve team_id for plays
-            plays = self._resolve_team_ids_for_plays(plays, game_json)
-            results['plays'] = self.bulk_service.bulk_insert_plays(plays)
+            with operation('play'):
+                plays = PlayExtractor.extract_plays_from_game(game_json)
+                # Resolve team_id for plays
+                plays = self._resolve_team_ids_for_plays(plays, game_json)
+                results['plays'] = self.bulk_service.bulk_insert_plays(plays)
             
             # 8. Boxscores
-            boxscores = BoxscoreExtractor.extract_boxscores_from_game(game_json)
-            # Resolve team_id for boxscores
-            boxscores = self._resolve_team_ids_for_boxscores(boxscores, game_json)
-            results['boxscores'] = self.bulk_service.bulk_insert_boxscores(boxscores)
+            with operation('boxscore'):
+                boxscores = BoxscoreExtractor.extract_boxscores_from_game(game_json)
+                # Resolve team_id for boxscores
+                boxscores = self._resolve_team_ids_for_boxscores(boxscores, game_json)
+                results['boxscores'] = self.bulk_service.bulk_insert_boxscores(boxscores)
+            
+            # 9. Season aggregates for both teams' seasons
+            if self.season_stats and results['boxscores']:
+                with operation('season_stats'):
+                    counts = self.season_stats.refresh_games([game_id])
+                logger.info(f"Refreshed season stats for game {game_id}: {counts}")
             
             logger.info(f"Completed population for game {game_id}: {results}")
             return results
@@ -582,6 +630,45 @@ class GamePopulationService:
             logger.error(f"Error populating game {game_id}: {e}")
             raise
     
+    @operation('append_plays')
+    def append_new_plays(self, game_json: Dict[str, Any]) -> int:
+        """
+        Append the plays of an already populated game that are newer, by
+        actionNumber, than its stored plays, and refresh its game_summary.
+        
+        The game's possession, stint and shot_chart_bin rows are deleted
+        rather than rebuilt on every poll: build_analytics --incremental picks
+        up games without them, so the next analytics build recomputes them
+        from the longer play-by-play.
+        
+        For games in progress: stored plays and the other tables are left
+        as they are, so corrections to earlier plays and the boxscores wait
+        for a full repopulation.
+        
+        Returns:
+            Number of plays appended
+        """
+        game_id = int(game_json['boxscore']['gameId'])
+        last_action = self.session.query(func.max(Play.action_number)).filter(Play.game_id == game_id).scalar()
+        
+        plays = [
+            play for play in PlayExtractor.extract_plays_from_game(game_json)
+            if play['action_number'] is not None and (last_action is None or play['action_number'] > last_action)
+        ]
+        if not plays:
+            return 0
+        
+        plays = self._resolve_team_ids_for_plays(plays, game_json)
+        appended = self.bulk_service.bulk_insert_plays(plays)
+        GameSummaryService(self.session).build_games([game_id])
+        for model in (Possession, Stint, ShotChartBin):
+            self.session.query(model).filter(model.game_id == game_id).delete(synchronize_session=False)
+        self.session.query(Game).filter(Game.game_id == game_id).update(
+            {Game.populated_at: func.now()}, synchronize_session=False
+        )
+        logger.info(f"Appended {appended} plays to game {game_id} after action {last_action}")
+        return appended
+    
     def _create_team_game_relationships(self, game_json: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create TeamGame junction records"""
         game_id = int(game_json['boxscore']['gameId'])
@@ -594,20 +681,14 @@ class GamePopulationService:
         away_team_api_id = boxscore['awayTeam']['teamId']
         
         # Query database to get internal team IDs
-        home_team = self.session.query(Team).filter_by(team_id=home_team_api_id).first()
-        away_team = self.session.query(Team).filter_by(team_id=away_team_api_id).first()
-        
-        if home_team:
-            team_games.append({
-                'game_id': game_id,
-                'team_id': home_team.id
-            })
+        team_id_mapping = self._get_team_id_mapping(game_json)
         
-        if away_team:
-            team_games.append({
-                'game_id': game_id,
-                'team_id': away_team.id
-            })
+        for api_team_id in (home_team_api_id, away_team_api_id):
+            if api_team_id in team_id_mapping:
+                team_games.append({
+                    'game_id': game_id,
+                    'team_id': team_id_mapping[api_team_id]
+                })
         
         return team_games
     
@@ -617,14 +698,13 @@ class GamePopulationService:
         boxscore = game_json['boxscore']
         person_games = []
         
-        # Map team API IDs to database IDs
-        team_id_mapping = {}
-        for team_type, team_key in [('homeTeam', 'home'), ('awayTeam', 'away')]:
-            if team_type in boxscore:
-                api_team_id = boxscore[team_type]['teamId']
-                db_team = self.session.query(Team).filter_by(team_id=api_team_id).first()
-                if db_team:
-                    team_id_mapping[api_team_id] = db_team.id
+        # Map team and person API IDs to database IDs
+        team_id_mapping = self._get_team_id_mapping(game_json)
+        person_id_mapping = self._get_person_id_mapping(
+            [player['personId'] for team_type in ['homeTeam', 'awayTeam']
+             for player in boxscore.get(team_type, {}).get('players', [])]
+            + [official['personId'] for official in boxscore.get('officials', [])]
+        )
         
         # Players from both teams
         for team_type in ['homeTeam', 'awayTeam']:
@@ -634,14 +714,10 @@ class GamePopulationService:
                 
                 for player in boxscore[team_type]['players']:
                     person_api_id = player['personId']
-                    # Resolve person_internal_id
-                    db_person = self.session.query(Person).filter_by(person_id=person_api_id).first()
-                    person_internal_id = db_person.id if db_person else None
-                    
                     person_games.append({
                         'game_id': game_id,
                         'person_id': person_api_id,
-                        'person_internal_id': person_internal_id,
+                        'person_internal_id': person_id_mapping.get(person_api_id),
                         'team_id': db_team_id
                     })
         
@@ -649,14 +725,10 @@ class GamePopulationService:
         if 'officials' in boxscore:
             for official in boxscore['officials']:
                 person_api_id = official['personId']
-                # Resolve person_internal_id
-                db_person = self.session.query(Person).filter_by(person_id=person_api_id).first()
-                person_internal_id = db_person.id if db_person else None
-                
                 person_games.append({
                     'game_id': game_id,
                     'person_id': person_api_id,
-                    'person_internal_id': person_internal_id,
+                    'person_internal_id': person_id_mapping.get(person_api_id),
                     'team_id': None
                 })
         
@@ -676,13 +748,9 @@ class GamePopulationService:
                 play['team_id'] = None
         
         # Also resolve person_internal_id for plays
+        person_id_mapping = self._get_person_id_mapping([play.get('person_id') for play in plays])
         for play in plays:
-            person_api_id = play.get('person_id')
-            if person_api_id:
-                db_person = self.session.query(Person).filter_by(person_id=person_api_id).first()
-                play['person_internal_id'] = db_person.id if db_person else None
-            else:
-                play['person_internal_id'] = None
+            play['person_internal_id'] = person_id_mapping.get(play.get('person_id'))
         
         return plays
     
@@ -695,37 +763,49 @@ class GamePopulationService:
         home_team_api_id = boxscore['homeTeam']['teamId']
         away_team_api_id = boxscore['awayTeam']['teamId']
         
-        home_team = self.session.query(Team).filter_by(team_id=home_team_api_id).first()
-        away_team = self.session.query(Team).filter_by(team_id=away_team_api_id).first()
+        team_id_mapping = self._get_team_id_mapping(game_json)
+        home_team_id = team_id_mapping.get(home_team_api_id)
+        away_team_id = team_id_mapping.get(away_team_api_id)
+        person_id_mapping = self._get_person_id_mapping([entry.get('person_id') for entry in boxscores])
         
         # Update boxscores with resolved team IDs and person_internal_id
         for boxscore_entry in boxscores:
-            if boxscore_entry['home_away_team'] == 'h' and home_team:
-                boxscore_entry['team_id'] = home_team.id
-            elif boxscore_entry['home_away_team'] == 'a' and away_team:
-                boxscore_entry['team_id'] = away_team.id
+            if boxscore_entry['home_away_team'] == 'h' and home_team_id:
+                boxscore_entry['team_id'] = home_team_id
+            elif boxscore_entry['home_away_team'] == 'a' and away_team_id:
+                boxscore_entry['team_id'] = away_team_id
                 
             # Resolve person_internal_id for boxscore entries
-            person_api_id = boxscore_entry.get('person_id')
-            if person_api_id:
-                db_person = self.session.query(Person).filter_by(person_id=person_api_id).first()
-                boxscore_entry['person_internal_id'] = db_person.id if db_person else None
-            else:
-                boxscore_entry['person_internal_id'] = None
+            boxscore_entry['person_internal_id'] = person_id_mapping.get(boxscore_entry.get('person_id'))
         
         return boxscores
     
     def _get_team_id_mapping(self, game_json: Dict[str, Any]) -> Dict[int, int]:
         """Get mapping from API team IDs to database team IDs"""
         boxscore = game_json['boxscore']
+        api_team_ids = [boxscore[team_type]['teamId'] for team_type in ['homeTeam', 'awayTeam'] if team_type in boxscore]
+        
+        # First row per team_id, as .first() on each would return
         mapping = {}
+        for api_team_id, db_id in self.session.query(Team.team_id, Team.id).filter(
+            Team.team_id.in_(api_team_ids)
+        ).order_by(Team.id):
+            mapping.setdefault(api_team_id, db_id)
         
-        for team_type in ['homeTeam', 'awayTeam']:
-            if team_type in boxscore:
-                api_team_id = boxscore[team_type]['teamId']
-                db_team = self.session.query(Team).filter_by(team_id=api_team_id).first()
-                if db_team:
-                    mapping[api_team_id] = db_team.id
+        return mapping
+    
+    def _get_person_id_mapping(self, person_ids: List[Optional[int]]) -> Dict[int, int]:
+        """Get mapping from API person IDs to database person IDs in one query"""
+        wanted = {person_id for person_id in person_ids if person_id}
+        if not wanted:
+            return {}
+        
+        # First version per person_id, as .first() on each would return
+        mapping = {}
+        for api_person_id, db_id in self.session.query(Person.person_id, Person.id).filter(
+            Person.person_id.in_(wanted)
+        ).order_by(Person.id):
+            mapping.setdefault(api_person_id, db_id)
         
         return mapping
     
@@ -743,17 +823,41 @@ class GamePopulationService:
         logger.info(f"Clearing existing data for game {game_id}")
         
         deletion_counts = {
+            'possessions': 0,
+            'stints': 0,
+            'game_summaries': 0,
+            'shot_chart_bins': 0,
             'boxscores': 0,
             'plays': 0, 
             'person_games': 0,
             'team_games': 0,
             'games': 0
-            # Note: Not clearing arenas, teams, persons as they may be shared across games
+            # Note: Not clearing arenas, teams, persons or lineups as they may be shared across games
         }
         
         try:
             # Delete in reverse dependency order
             
+            # 0. Derived analytics rows (depend on game)
+            result = self.session.query(Possession).filter(Possession.game_id == game_id).delete()
+            deletion_counts['possessions'] = result
+            logger.info(f"Deleted {result} possession records for game {game_id}")
+            
+            result = self.session.query(Stint).filter(Stint.game_id == game_id).delete()
+            deletion_counts['stints'] = result
+            logger.info(f"Deleted {result} stint records for game {game_id}")
+            
+            result = self.session.query(GameSummary).filter(GameSummary.game_id == game_id).delete()
+            deletion_counts['game_summaries'] = result
+            logger.info(f"Deleted {result} game summary records for game {game_id}")
+            
+            result = self.session.query(ShotChartBin).filter(ShotChartBin.game_id == game_id).delete()
+            deletion_counts['shot_chart_bins'] = result
+            logger.info(f"Deleted {result} shot chart bin records for game {game_id}")
+            
+            # Team-seasons to re-aggregate once the game's boxscores are gone
+            team_seasons = self.season_stats.team_seasons_for_games([game_id]) if self.season_stats else set()
+            
             # 1. Boxscores (depends on game, person, team)
             result = self.session.query(Boxscore).filter(Boxscore.game_id == game_id).delete()
             deletion_counts['boxscores'] = result
@@ -779,6 +883,9 @@ class GamePopulationService:
             deletion_counts['games'] = result
             logger.info(f"Deleted {result} game record for game {game_id}")
             
+            if team_seasons:
+                self.season_stats.refresh_team_seasons(team_seasons)
+            
             logger.info(f"Completed clearing data for game {game_id}: {deletion_counts}")
             return deletion_counts
             
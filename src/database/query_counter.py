@@ -0,0 +1,216 @@
+"""
+Statement counting for SQLAlchemy engines, for finding N+1 query patterns.
+
+QueryCounter listens to an engine's execute events and counts, per logical
+operation, the statements issued (Connection.execute calls, including those
+the ORM makes), the round trips they took (cursor executions, so a batched
+insert can be one statement but several round trips) and the rows the
+driver reported (affected rows; SELECT rows where the driver reports them).
+
+Operations are labelled with operation(), a context manager and decorator
+that costs one context variable set when nothing is listening. Nested
+operations form dotted paths such as 'populate_game.play'. Besides query
+counters, any object registered with add_listener() is told when an
+operation starts and finishes; the profiler uses this for per-phase timing.
+
+    with QueryCounter(engine) as counter:
+        service.populate_game(game_json)
+    counter.assert_budget(statements=20, operation='populate_game')
+
+Identical SQL issued many times within one counter is the signature of a
+per-row lookup; repeated_statements() lists it and budget failures include
+it in their message.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+OTHER = '(none)'
+
+_operation: ContextVar[Tuple[str, ...]] = ContextVar('query_counter_operation', default=())
+_listeners: List[Any] = []
+
+
+def add_listener(listener: Any):
+    """Call listener.operation_started(path) and operation_finished(path) around every operation"""
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Any):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """Attribute statements issued inside the block to the named operation"""
+    path = _operation.get() + (name,)
+    token = _operation.set(path)
+    if not _listeners:
+        try:
+            yield
+        finally:
+            _operation.reset(token)
+        return
+
+    key = '.'.join(path)
+    listeners = list(_listeners)
+    for listener in listeners:
+        listener.operation_started(key)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+        for listener in listeners:
+            listener.operation_finished(key)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by QueryCounter.assert_budget when an operation issued too many statements"""
+
+
+@dataclass
+class OperationStats:
+    """Counts for one operation"""
+    calls: int = 0
+    statements: int = 0
+    round_trips: int = 0
+    rows: int = 0
+
+    def add(self, other: 'OperationStats'):
+        self.calls += other.calls
+        self.statements += other.statements
+        self.round_trips += other.round_trips
+        self.rows += other.rows
+
+
+class QueryCounter:
+    """Counts statements, round trips and rows issued through an engine while active"""
+
+    def __init__(self, bind: Union[Engine, Connection]):
+        self.engine = bind.engine if isinstance(bind, Connection) else bind
+        self._lock = threading.Lock()
+        self._stats: Dict[str, OperationStats] = {}
+        self._sql: Dict[str, int] = {}
+
+    def __enter__(self) -> 'QueryCounter':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        event.listen(self.engine, 'before_execute', self._before_execute)
+        event.listen(self.engine, 'after_cursor_execute', self._after_cursor_execute)
+        add_listener(self)
+
+    def stop(self):
+        remove_listener(self)
+        event.remove(self.engine, 'before_execute', self._before_execute)
+        event.remove(self.engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._sql.clear()
+
+    # Event hooks
+
+    def _current(self) -> OperationStats:
+        path = '.'.join(_operation.get()) or OTHER
+        stats = self._stats.get(path)
+        if stats is None:
+            stats = self._stats[path] = OperationStats()
+        return stats
+
+    def operation_started(self, path: str):
+        with self._lock:
+            self._stats.setdefault(path, OperationStats()).calls += 1
+
+    def operation_finished(self, path: str):
+        pass
+
+    def _before_execute(self, conn, clauseelement, multiparams, params, execution_options):
+        with self._lock:
+            self._current().statements += 1
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            stats = self._current()
+            stats.round_trips += 1
+            if cursor.rowcount and cursor.rowcount > 0:
+                stats.rows += cursor.rowcount
+            self._sql[statement] = self._sql.get(statement, 0) + 1
+
+    # Results
+
+    def by_operation(self) -> Dict[str, OperationStats]:
+        """Counts per operation path, excluding nested operations"""
+        with self._lock:
+            return {path: OperationStats(**vars(stats)) for path, stats in sorted(self._stats.items())}
+
+    def stats(self, operation: Optional[str] = None) -> OperationStats:
+        """
+        Counts for an operation including everything nested inside it.
+
+        Args:
+            operation: Dotted operation path; None for everything counted
+        """
+        total = OperationStats()
+        for path, stats in self.by_operation().items():
+            if operation is None or path == operation or path.startswith(operation + '.'):
+                if operation is not None and path != operation:
+                    stats.calls = 0  # nested operations do not add calls of the parent
+                total.add(stats)
+        return total
+
+    def repeated_statements(self, min_count: int = 2) -> List[Tuple[str, int]]:
+        """SQL text issued at least min_count times, most repeated first"""
+        with self._lock:
+            repeated = [(sql, count) for sql, count in self._sql.items() if count >= min_count]
+        return sorted(repeated, key=lambda item: -item[1])
+
+    def report(self) -> str:
+        """Counts per operation as a text table"""
+        lines = [f"{'Operation':<40} {'Calls':>7} {'Statements':>11} {'Round trips':>12} {'Rows':>9}"]
+        for path, stats in self.by_operation().items():
+            lines.append(f"{path:<40} {stats.calls:>7} {stats.statements:>11} {stats.round_trips:>12} {stats.rows:>9}")
+        return '\n'.join(lines)
+
+    def assert_budget(self, statements: Optional[int] = None, round_trips: Optional[int] = None,
+                      rows: Optional[int] = None, operation: Optional[str] = None, per_call: bool = False):
+        """
+        Fail if the counted work exceeds a budget.
+
+        Args:
+            statements: Maximum statements
+            round_trips: Maximum round trips
+            rows: Maximum rows
+            operation: Only count this operation and those nested in it
+            per_call: Divide by the number of times the operation was entered
+
+        Raises:
+            QueryBudgetExceeded: Naming each exceeded limit, with the report and
+                the most repeated SQL
+        """
+        stats = self.stats(operation)
+        calls = max(stats.calls, 1) if per_call else 1
+        failures = []
+        for name, limit in (('statements', statements), ('round_trips', round_trips), ('rows', rows)):
+            actual = getattr(stats, name) / calls
+            if limit is not None and actual > limit:
+                failures.append(f"{name} {actual:g} > {limit}")
+        if failures:
+            scope = operation or 'all operations'
+            repeated = '\n'.join(f"  {count:>6} x {sql.strip()[:160]}" for sql, count in self.repeated_statements()[:5])
+            raise QueryBudgetExceeded(
+                f"Query budget exceeded for {scope}{' per call' if per_call else ''}: {', '.join(failures)}\n"
+                f"{self.report()}\nMost repeated statements:\n{repeated or '  (none)'}"
+            )
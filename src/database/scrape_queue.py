@@ -0,0 +1,210 @@
+"""
+Shared scrape queue, for scraping with several processes or hosts at once.
+
+Games are enqueued once into the scrape_queue table and claimed by workers
+with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never claim
+the same game and never wait on each other's claims. A claim is a lease:
+the game stays with its worker until the lease expires, after which any
+worker can claim it again, so the games of a crashed worker are picked up
+without intervention. Each claim counts an attempt; a game that fails, or
+whose lease expires, on its last attempt is marked failed.
+
+Lease times come from the database clock, so hosts with skewed clocks agree
+on when a lease has expired. On SQLite, used in tests, FOR UPDATE SKIP LOCKED
+is omitted and claims are serialized by the database lock instead.
+"""
+
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update, func, and_, or_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+
+from .models import ScrapeQueueItem
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+STATUSES = (PENDING, LEASED, DONE, FAILED)
+
+MAX_ERROR_LENGTH = 2000
+
+
+def default_owner() -> str:
+    """Worker name identifying this process across hosts"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ScrapeQueue:
+    """Enqueues games to scrape and leases them to workers"""
+
+    def __init__(self, engine: Engine, owner: Optional[str] = None, lease_seconds: float = 300,
+                 max_attempts: int = 3, retry_delay: float = 60, batch_size: int = 1000):
+        """
+        Args:
+            engine: SQLAlchemy engine
+            owner: Name of this worker (default: 'host:pid')
+            lease_seconds: How long a claimed game stays with this worker; must
+                exceed the time to scrape one game
+            max_attempts: Claims per game before it is marked failed
+            retry_delay: Seconds before a failed attempt can be claimed again
+            batch_size: Games per insert when enqueueing
+        """
+        self.engine = engine
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _now(conn) -> datetime:
+        """Current database time, naive like the table's DateTime columns"""
+        return conn.scalar(select(func.now())).replace(tzinfo=None)
+
+    def enqueue(self, game_url_infos: Iterable, priority: int = 0) -> int:
+        """
+        Add games to the queue; games already queued keep their status.
+
+        Args:
+            game_url_infos: GameURLInfo objects to scrape
+            priority: Higher priorities are claimed first
+
+        Returns:
+            Number of games added
+        """
+        table = ScrapeQueueItem.__table__
+        dialect_insert = pg_insert if self.engine.dialect.name == 'postgresql' else sqlite_insert
+        statement = (dialect_insert(table).on_conflict_do_nothing(index_elements=['game_id'])
+                     .returning(table.c.game_id))
+        rows = [
+            {'game_id': int(info.game_id), 'season': int(info.season), 'game_type': info.game_type,
+             'game_url': info.game_url, 'priority': priority, 'status': PENDING, 'attempts': 0}
+            for info in game_url_infos
+        ]
+        added = 0
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                added += len(conn.execute(statement, rows[start:start + self.batch_size]).all())
+        logger.info(f"Scrape queue: {added} of {len(rows)} games added at priority {priority}")
+        return added
+
+    def claim(self, limit: int = 1) -> List[Dict]:
+        """
+        Lease up to limit games to this worker, highest priority first.
+
+        Pending games are claimable once any retry delay has passed, and
+        leased games once their lease has expired.
+
+        Returns:
+            The claimed games, with game_id, season, game_type, game_url,
+            priority and attempts (including this one)
+        """
+        table = ScrapeQueueItem.__table__
+        c = table.c
+        with self.engine.begin() as conn:
+            now = self._now(conn)
+            # Leases that expired on their last attempt are not retried
+            conn.execute(
+                update(table)
+                .where(c.status == LEASED, c.lease_expires <= now, c.attempts >= self.max_attempts)
+                .values(status=FAILED, lease_owner=None, last_error='Lease expired on the last attempt',
+                        updated_at=now)
+            )
+            game_ids = list(conn.scalars(
+                select(c.game_id)
+                .where(or_(
+                    and_(c.status == PENDING, or_(c.lease_expires.is_(None), c.lease_expires <= now)),
+                    and_(c.status == LEASED, c.lease_expires <= now),
+                ))
+                .order_by(c.priority.desc(), c.game_id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ))
+            if not game_ids:
+                return []
+            rows = conn.execute(
+                update(table)
+                .where(c.game_id.in_(game_ids))
+                .values(status=LEASED, lease_owner=self.owner,
+                        lease_expires=now + timedelta(seconds=self.lease_seconds),
+                        attempts=c.attempts + 1, updated_at=now)
+                .returning(c.game_id, c.season, c.game_type, c.game_url, c.priority, c.attempts)
+            ).mappings().all()
+        order = {game_id: position for position, game_id in enumerate(game_ids)}
+        return sorted((dict(row) for row in rows), key=lambda row: order[row['game_id']])
+
+    def renew(self, game_id: int) -> bool:
+        """Extend this worker's lease on a game; False if the lease was lost"""
+        with self.engine.begin() as conn:
+            now = self._now(conn)
+            return self._update_leased(conn, game_id, lease_expires=now + timedelta(seconds=self.lease_seconds),
+                                       updated_at=now)
+
+    def complete(self, game_id: int) -> bool:
+        """Mark a game this worker leased as done; False if the lease was lost"""
+        with self.engine.begin() as conn:
+            done = self._update_leased(conn, game_id, status=DONE, lease_owner=None, lease_expires=None,
+                                       last_error=None, updated_at=self._now(conn))
+        if not done:
+            logger.warning(f"Scrape queue: lease on game {game_id} was lost before it completed")
+        return done
+
+    def fail(self, game_id: int, error: str) -> bool:
+        """
+        Record a failed attempt at a game this worker leased.
+
+        The game becomes claimable again after the retry delay, or is marked
+        failed if this was its last attempt.
+
+        Returns:
+            False if the lease was lost
+        """
+        c = ScrapeQueueItem.__table__.c
+        with self.engine.begin() as conn:
+            now = self._now(conn)
+            failed = self._update_leased(
+                conn, game_id,
+                status=case((c.attempts >= self.max_attempts, FAILED), else_=PENDING),
+                lease_owner=None, lease_expires=now + timedelta(seconds=self.retry_delay),
+                last_error=error[:MAX_ERROR_LENGTH], updated_at=now
+            )
+        if not failed:
+            logger.warning(f"Scrape queue: lease on game {game_id} was lost before it failed")
+        return failed
+
+    def _update_leased(self, conn, game_id: int, **values) -> bool:
+        c = ScrapeQueueItem.__table__.c
+        result = conn.execute(
+            update(ScrapeQueueItem.__table__)
+            .where(c.game_id == game_id, c.status == LEASED, c.lease_owner == self.owner)
+            .values(**values)
+        )
+        return result.rowcount == 1
+
+    def retry_failed(self) -> int:
+        """Make failed games claimable again with fresh attempts; returns how many"""
+        table = ScrapeQueueItem.__table__
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(table).where(table.c.status == FAILED)
+                .values(status=PENDING, attempts=0, lease_expires=None, updated_at=func.now())
+            )
+        return result.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of queued games per status"""
+        table = ScrapeQueueItem.__table__
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(table.c.status, func.count()).group_by(table.c.status)).all()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
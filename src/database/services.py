@@ -16,6 +16,7 @@ import os
 from dotenv import load_dotenv
 
 from .models import Base, RawGameData, ScrapingSession, DatabaseVersion
+from .. import metrics
 
 load_dotenv()
 
@@ -27,7 +28,7 @@ class DatabaseConnection:
     
     def __init__(self):
         self.db_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-        self.engine = create_engine(self.db_url)
+        self.engine = metrics.instrument_pool(create_engine(self.db_url))
         self.SessionLocal = sessionmaker(bind=self.engine)
     
     def get_session(self) -> Session:
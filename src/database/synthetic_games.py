@@ -0,0 +1,668 @@
+"""
+Synthetic game JSON for load testing and capacity planning.
+
+Generates structurally valid games in the shape the scraper stores and
+json_extractors consumes: .boxscore with arena, teams, rosters and
+officials, .postGameData.postPlayByPlayData with period-grouped actions,
+and .postGameData.postBoxscoreData with player, starters, bench and team
+statistics. Old-era games carry placeholder statistics and only team totals
+under .boxscore.postgameCharts, like the early seasons of the real feed.
+
+Each game is simulated possession by possession and its boxscore is summed
+from its own plays, so points, shots, free throws, rebounds, turnovers and
+personal fouls reconcile exactly with the play-by-play. Rosters turn over
+between seasons and names are occasionally written differently, which
+exercises the versioned person rows. Generation is deterministic for a
+given configuration and seed.
+
+IDs are chosen not to collide with real data: game numbers start at 50001
+(real games use 00001-00999), teams use 1611661350+, players 5000001+,
+officials 4900001+ and arenas 90001+.
+"""
+
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Engine
+
+from .models import RawGameData
+
+logger = logging.getLogger(__name__)
+
+
+FIRST_GAME_NUMBER = 50001
+TEAM_ID_BASE = 1611661350
+PLAYER_ID_BASE = 5000000
+OFFICIAL_ID_BASE = 4900000
+ARENA_ID_BASE = 90000
+SYNTHETIC_URL = 'https://synthetic.invalid/game/{game_id}'
+
+_FIRST_NAMES = [
+    'Aaliyah', 'Alexis', 'Alyssa', 'Amanda', 'Angel', 'Ariel', 'Brianna', 'Brittney', 'Candace', 'Chelsea',
+    'Courtney', 'Dana', 'Diamond', 'Elena', 'Emma', 'Erica', 'Gabby', 'Haley', 'Imani', 'Jasmine',
+    'Jordan', 'Kayla', 'Kelsey', 'Kiara', 'Kristen', 'Layshia', 'Lexie', 'Maya', 'Monique', 'Natasha',
+    'Nia', 'Olivia', 'Paige', 'Rachel', 'Rebecca', 'Sabrina', 'Sami', 'Shakira', 'Sydney', 'Tamika',
+    'Tiffany', 'Tina', 'Victoria', 'Whitney', 'Yvonne', 'Zoe',
+]
+_FAMILY_NAMES = [
+    'Adams', 'Allen', 'Baker', 'Banks', 'Bell', 'Brooks', 'Carter', 'Clark', 'Collins', 'Cooper',
+    'Davis', 'Diggs', 'Edwards', 'Evans', 'Fisher', 'Ford', 'Foster', 'Garcia', 'Gray', 'Green',
+    'Hall', 'Harris', 'Hayes', 'Hill', 'Howard', 'Hughes', 'Jackson', 'James', 'Johnson', 'Jones',
+    'Kelly', 'King', 'Lee', 'Lewis', 'Long', 'Martin', 'Mason', 'Miller', 'Mitchell', 'Moore',
+    'Morgan', 'Morris', 'Murphy', 'Nelson', 'Owens', 'Parker', 'Perry', 'Phillips', 'Powell', 'Price',
+    'Reed', 'Reid', 'Rivera', 'Roberts', 'Robinson', 'Rogers', 'Ross', 'Russell', 'Sanders', 'Scott',
+    'Simmons', 'Smith', 'Stewart', 'Sullivan', 'Taylor', 'Thomas', 'Thompson', 'Turner', 'Walker', 'Ward',
+    'Warren', 'Washington', 'Watson', 'White', 'Williams', 'Wilson', 'Wood', 'Wright', 'Young',
+]
+_CITIES = [
+    'Atlanta', 'Boston', 'Charlotte', 'Chicago', 'Cleveland', 'Dallas', 'Denver', 'Detroit', 'Houston',
+    'Indiana', 'Las Vegas', 'Los Angeles', 'Memphis', 'Miami', 'Milwaukee', 'Minnesota', 'Nashville',
+    'New Orleans', 'New York', 'Oakland', 'Orlando', 'Philadelphia', 'Phoenix', 'Portland', 'Sacramento',
+    'San Antonio', 'San Diego', 'Seattle', 'Toronto', 'Tulsa', 'Utah', 'Washington',
+]
+_NICKNAMES = [
+    'Aces', 'Comets', 'Dream', 'Fever', 'Flames', 'Heat', 'Hornets', 'Liberty', 'Lightning', 'Lynx',
+    'Mercury', 'Miracle', 'Monarchs', 'Mystics', 'Owls', 'Pilots', 'Rockets', 'Shock', 'Sky', 'Sparks',
+    'Starzz', 'Storm', 'Sun', 'Thunder', 'Tides', 'Valkyries', 'Vipers', 'Wings', 'Wolves', 'Zephyrs',
+]
+_POSITIONS = ['G', 'G', 'F', 'F', 'C']
+_JUMP_SHOTS = ['Jump Shot', 'Pullup Jump shot', 'Step Back Jump shot', 'Turnaround Jump Shot',
+               'Driving Floating Jump Shot', 'Running Jump Shot']
+_LAYUPS = ['Layup Shot', 'Driving Layup Shot', 'Running Layup Shot', 'Putback Layup Shot', 'Cutting Layup Shot']
+_TURNOVERS = ['Bad Pass', 'Lost Ball', 'Traveling', 'Offensive Foul Turnover', 'Shot Clock Turnover',
+              'Out of Bounds - Bad Pass Turnover', 'Step Out of Bounds Turnover']
+_STEAL_TURNOVERS = {'Bad Pass', 'Lost Ball'}
+_ORDINALS = {1: '1st', 2: '2nd', 3: '3rd'}
+
+
+@dataclass
+class SyntheticConfig:
+    """Shape and volume of a synthetic corpus"""
+    seasons: Sequence[int] = (2024,)
+    games_per_season: int = 100           # regular season games per season
+    playoff_games_per_season: int = 0
+    teams: int = 12
+    roster_size: int = 12
+    plays_per_game: int = 450             # approximate actions per regulation game
+    periods: int = 4
+    period_minutes: int = 10
+    overtime_minutes: int = 5
+    roster_churn: float = 0.2             # share of each roster replaced between seasons
+    name_variation: float = 0.02          # chance a player's name is written differently in a game
+    old_era_fraction: float = 0.0         # share of games with only postgameCharts team totals
+    officials_per_game: int = 3
+    season_start: Tuple[int, int] = (5, 15)   # month and day of the first game
+    first_game_number: int = FIRST_GAME_NUMBER
+    seed: int = 0
+
+
+@dataclass
+class _Player:
+    person_id: int
+    first_name: str
+    family_name: str
+
+    def names(self, variant: bool) -> Tuple[str, str]:
+        """First and family name as written in one game"""
+        if not variant:
+            return self.first_name, self.family_name
+        if len(self.first_name) > 4:
+            return self.first_name[:-1], self.family_name
+        return self.first_name, f'{self.family_name}-{self.first_name}'
+
+
+@dataclass
+class _Team:
+    team_id: int
+    city: str
+    name: str
+    tricode: str
+    arena: Dict[str, Any]
+    roster: List[_Player]
+    wins: int = 0
+    losses: int = 0
+
+
+def _clock(seconds: float) -> str:
+    minutes, rest = divmod(max(seconds, 0.0), 60)
+    return f'PT{int(minutes):02d}M{rest:05.2f}S'
+
+
+def _minutes(seconds: float) -> str:
+    seconds = int(round(seconds))
+    return f'{seconds // 60}:{seconds % 60:02d}'
+
+
+def _period_name(period: int, periods: int) -> str:
+    if period > periods:
+        return 'Overtime' if period == periods + 1 else f'{period - periods}OT'
+    return f"{_ORDINALS.get(period, f'{period}th')} Period"
+
+
+class SyntheticGameGenerator:
+    """Generates seasons of synthetic games"""
+
+    def __init__(self, config: Optional[SyntheticConfig] = None):
+        self.config = config or SyntheticConfig()
+        self.rng = random.Random(self.config.seed)
+        self._next_player = PLAYER_ID_BASE
+        self.teams = [self._new_team(i) for i in range(self.config.teams)]
+        self.officials = [
+            _Player(OFFICIAL_ID_BASE + i + 1, self.rng.choice(_FIRST_NAMES), self.rng.choice(_FAMILY_NAMES))
+            for i in range(max(self.config.officials_per_game * 4, 10))
+        ]
+
+    def _new_player(self, taken: set) -> _Player:
+        # Family names are unique within a roster so descriptions resolve to one player
+        family = self.rng.choice([n for n in _FAMILY_NAMES if n not in taken] or _FAMILY_NAMES)
+        self._next_player += 1
+        return _Player(self._next_player, self.rng.choice(_FIRST_NAMES), family)
+
+    def _new_team(self, index: int) -> _Team:
+        city = _CITIES[index % len(_CITIES)]
+        name = _NICKNAMES[index % len(_NICKNAMES)]
+        roster: List[_Player] = []
+        for _ in range(self.config.roster_size):
+            roster.append(self._new_player({p.family_name for p in roster}))
+        arena = {
+            'arenaId': ARENA_ID_BASE + index + 1,
+            'arenaCity': city,
+            'arenaName': f'{city} {name} Arena',
+            'arenaState': '',
+            'arenaCountry': 'US',
+            'arenaTimezone': 'America/New_York',
+            'arenaPostalCode': '',
+            'arenaStreetAddress': '',
+        }
+        tricode = (city.replace(' ', '')[:2] + name[0]).upper()
+        return _Team(TEAM_ID_BASE + index, city, name, tricode, arena, roster)
+
+    def _churn_rosters(self):
+        replace = round(self.config.roster_churn * self.config.roster_size)
+        for team in self.teams:
+            for _ in range(replace):
+                team.roster.pop(self.rng.randrange(len(team.roster)))
+                team.roster.append(self._new_player({p.family_name for p in team.roster}))
+
+    def game_id(self, season: int, game_type: str, number: int) -> int:
+        """Game ID in the 10SYY00GGG layout, with a synthetic game number"""
+        season_type = 4 if game_type == 'playoff' else 2
+        return 1000000000 + season_type * 10000000 + (season % 100) * 100000 + number
+
+    def generate(self) -> Iterator[Dict[str, Any]]:
+        """
+        Generate every configured game in schedule order.
+
+        Yields:
+            Dictionaries with 'game_id', 'season', 'game_type', 'game_url'
+            and the 'game_data' JSON, matching the raw_game_data columns
+        """
+        for s, season in enumerate(self.config.seasons):
+            if s:
+                self._churn_rosters()
+            for team in self.teams:
+                team.wins = team.losses = 0
+            start = datetime(season, *self.config.season_start, 20, 0)
+            schedule = [('regular', n) for n in range(self.config.games_per_season)]
+            schedule += [('playoff', n) for n in range(self.config.playoff_games_per_season)]
+            for index, (game_type, number) in enumerate(schedule):
+                game_id = self.game_id(season, game_type, self.config.first_game_number + number)
+                pairing = index % max(len(self.teams) // 2, 1)
+                round_number = index // max(len(self.teams) // 2, 1)
+                order = self.teams[round_number % len(self.teams):] + self.teams[:round_number % len(self.teams)]
+                home, away = order[pairing], order[-1 - pairing]
+                if round_number % 2:
+                    home, away = away, home
+                game_et = start + timedelta(days=round_number, hours=pairing % 3)
+                yield {
+                    'game_id': game_id,
+                    'season': season,
+                    'game_type': game_type,
+                    'game_url': SYNTHETIC_URL.format(game_id=game_id),
+                    'game_data': self.game(game_id, game_type, home, away, game_et),
+                }
+
+    def game(self, game_id: int, game_type: str, home: _Team, away: _Team, game_et: datetime) -> Dict[str, Any]:
+        """Simulate one game and build its JSON"""
+        rng = random.Random(f'{self.config.seed}:{game_id}')
+        old_era = rng.random() < self.config.old_era_fraction
+        variants = {p.person_id for p in home.roster + away.roster if rng.random() < self.config.name_variation}
+        simulation = _GameSimulation(self.config, rng, home, away, variants)
+        periods = simulation.play()
+
+        home_score, away_score = simulation.score['h'], simulation.score['v']
+        winner, loser = (home, away) if home_score > away_score else (away, home)
+        winner.wins += 1
+        loser.losses += 1
+
+        officials = rng.sample(self.officials, self.config.officials_per_game)
+        boxscore = {
+            'gameId': str(game_id),
+            'gameCode': f"{game_et:%Y%m%d}/{away.tricode}{home.tricode}",
+            'gameEt': f"{game_et:%Y-%m-%dT%H:%M:%S}Z",
+            'gameTimeUTC': f"{game_et + timedelta(hours=4):%Y-%m-%dT%H:%M:%S}Z",
+            'gameStatus': 3,
+            'gameStatusText': 'Final',
+            'gameLabel': 'Playoffs' if game_type == 'playoff' else 'Regular Season',
+            'period': len(periods),
+            'duration': _minutes(simulation.game_seconds() / 60 * 2.8 + rng.randint(-10, 10)),
+            'attendance': rng.randint(3000, 18000),
+            'sellout': 0,
+            'arena': dict(home.arena),
+            'homeTeamId': home.team_id,
+            'awayTeamId': away.team_id,
+            'homeTeam': self._boxscore_team(simulation, home, 'h'),
+            'awayTeam': self._boxscore_team(simulation, away, 'v'),
+            'officials': [
+                {'name': f'{o.first_name} {o.family_name}', 'nameI': f'{o.first_name[0]}. {o.family_name}',
+                 'personId': o.person_id, 'firstName': o.first_name, 'familyName': o.family_name,
+                 'jerseyNum': str(o.person_id % 90), 'assignment': ''}
+                for o in officials
+            ],
+        }
+        boxscore['postgameCharts'] = {
+            key: {'teamId': team.team_id, 'teamCity': team.city, 'teamName': team.name,
+                  'teamTricode': team.tricode, 'statistics': simulation.team_statistics(side)}
+            for key, team, side in (('homeTeam', home, 'h'), ('awayTeam', away, 'v'))
+        }
+
+        return {
+            'key': str(game_id),
+            'gameID': str(game_id),
+            'boxscore': boxscore,
+            'postGameData': {
+                'postPlayByPlayData': periods,
+                'postBoxscoreData': {
+                    'gameId': str(game_id),
+                    'gameStatus': 3,
+                    'homeTeamId': home.team_id,
+                    'awayTeamId': away.team_id,
+                    'homeTeam': self._post_boxscore_team(simulation, home, 'h', old_era),
+                    'awayTeam': self._post_boxscore_team(simulation, away, 'v', old_era),
+                },
+            },
+        }
+
+    def _boxscore_team(self, simulation: '_GameSimulation', team: _Team, side: str) -> Dict[str, Any]:
+        return {
+            'teamId': team.team_id,
+            'teamCity': team.city,
+            'teamName': team.name,
+            'teamTricode': team.tricode,
+            'teamSlug': team.name.lower(),
+            'teamWins': team.wins,
+            'teamLosses': team.losses,
+            'score': simulation.score[side],
+            'periods': [{'period': i + 1, 'score': score, 'periodType': 'REGULAR' if i < self.config.periods
+                         else 'OVERTIME'} for i, score in enumerate(simulation.period_scores[side])],
+            'players': [
+                {'name': f'{first} {family}', 'nameI': f'{first[0]}. {family}', 'personId': player.person_id,
+                 'firstName': first, 'familyName': family, 'jerseyNum': ''}
+                for player, (first, family) in simulation.dressed(side)
+            ],
+            'statistics': {'dummyKey': 'dummyValue'},
+        }
+
+    def _post_boxscore_team(self, simulation: '_GameSimulation', team: _Team, side: str,
+                            old_era: bool) -> Dict[str, Any]:
+        entry = {
+            'teamId': team.team_id,
+            'teamCity': team.city,
+            'teamName': team.name,
+            'teamTricode': team.tricode,
+            'teamSlug': team.name.lower(),
+        }
+        if old_era:
+            entry['statistics'] = {'dummyKey': 'dummyValue'}
+            return entry
+        players = []
+        for player, (first, family) in simulation.dressed(side):
+            players.append({
+                'personId': player.person_id,
+                'firstName': first,
+                'familyName': family,
+                'nameI': f'{first[0]}. {family}',
+                'playerSlug': f'{first}-{family}'.lower(),
+                'position': simulation.positions.get(player.person_id, ''),
+                'jerseyNum': '',
+                'comment': '',
+                'statistics': simulation.player_statistics(player.person_id),
+            })
+        entry.update({
+            'players': players,
+            'starters': simulation.group_statistics(side, starters=True),
+            'bench': simulation.group_statistics(side, starters=False),
+            'statistics': simulation.team_statistics(side),
+        })
+        return entry
+
+
+_COUNTED = ('points', 'fieldGoalsMade', 'fieldGoalsAttempted', 'threePointersMade', 'threePointersAttempted',
+            'freeThrowsMade', 'freeThrowsAttempted', 'reboundsOffensive', 'reboundsDefensive', 'assists',
+            'steals', 'blocks', 'turnovers', 'foulsPersonal')
+
+
+class _GameSimulation:
+    """Possession-by-possession simulation of one game"""
+
+    def __init__(self, config: SyntheticConfig, rng: random.Random, home: _Team, away: _Team, variants: set):
+        self.config = config
+        self.rng = rng
+        self.teams = {'h': home, 'v': away}
+        self.variants = variants
+        self.score = {'h': 0, 'v': 0}
+        self.period_scores: Dict[str, List[int]] = {'h': [], 'v': []}
+        self.stats: Dict[int, Dict[str, float]] = {}
+        self.plus_minus: Dict[int, int] = {}
+        self.seconds: Dict[int, float] = {}
+        self.positions: Dict[int, str] = {}
+        self.roster: Dict[str, List[_Player]] = {}
+        self.on_court: Dict[str, List[_Player]] = {}
+        for side, team in self.teams.items():
+            roster = list(team.roster)
+            self.roster[side] = roster
+            self.on_court[side] = roster[:5]
+            for i, player in enumerate(roster):
+                self.stats[player.person_id] = dict.fromkeys(_COUNTED, 0)
+                self.plus_minus[player.person_id] = 0
+                self.seconds[player.person_id] = 0.0
+                if i < 5:
+                    self.positions[player.person_id] = _POSITIONS[i]
+        self.actions: List[Dict[str, Any]] = []
+        self.action_number = 0
+        self.period = 0
+        self.clock = 0.0
+
+    def dressed(self, side: str) -> List[Tuple[_Player, Tuple[str, str]]]:
+        return [(p, p.names(p.person_id in self.variants)) for p in self.roster[side]]
+
+    def _names(self, player: _Player) -> Tuple[str, str]:
+        return player.names(player.person_id in self.variants)
+
+    def game_seconds(self) -> float:
+        overtime = max(self.period - self.config.periods, 0)
+        return (self.config.periods * self.config.period_minutes + overtime * self.config.overtime_minutes) * 60
+
+    # Actions
+
+    def _action(self, action_type: str, side: str = '', player: Optional[_Player] = None, sub_type: str = '',
+                description: str = '', shot_value: int = 0, shot_result: str = '', distance: int = 0,
+                scored: bool = False, person_id: Optional[int] = None, points_total: int = 0):
+        self.action_number += self.rng.randint(1, 3)
+        team = self.teams.get(side)
+        x = y = 0
+        if distance:
+            x = self.rng.randint(-distance * 10, distance * 10)
+            y = max(int(((distance * 10) ** 2 - x ** 2) ** 0.5), 0)
+        family = self._names(player)[1] if player else ''
+        first = self._names(player)[0] if player else ''
+        self.actions.append({
+            'actionId': len(self.actions) + 1,
+            'actionNumber': self.action_number,
+            'actionType': action_type,
+            'subType': sub_type,
+            'clock': _clock(self.clock),
+            'period': self.period,
+            'teamId': team.team_id if team and player else 0,
+            'teamTricode': team.tricode if team and player else '',
+            'location': side or ' ',
+            'personId': player.person_id if player else (person_id or 0),
+            'playerName': family,
+            'playerNameI': f'{first[0]}. {family}' if player else '',
+            'scoreHome': str(self.score['h']) if scored else '',
+            'scoreAway': str(self.score['v']) if scored else '',
+            'shotValue': shot_value,
+            'shotResult': shot_result,
+            'isFieldGoal': 1 if action_type in ('Made Shot', 'Missed Shot') else 0,
+            'shotDistance': distance,
+            'xLegacy': x,
+            'yLegacy': y,
+            'pointsTotal': points_total,
+            'description': description,
+            'videoAvailable': 0,
+        })
+
+    def _advance(self, seconds: float):
+        seconds = min(seconds, self.clock)
+        for side in ('h', 'v'):
+            for player in self.on_court[side]:
+                self.seconds[player.person_id] += seconds
+        self.clock -= seconds
+
+    def _pick(self, side: str, exclude: Optional[_Player] = None) -> _Player:
+        choices = [p for p in self.on_court[side] if p is not exclude]
+        return self.rng.choice(choices)
+
+    def _score(self, side: str, player: _Player, points: int):
+        self.score[side] += points
+        self.stats[player.person_id]['points'] += points
+        other = 'v' if side == 'h' else 'h'
+        for p in self.on_court[side]:
+            self.plus_minus[p.person_id] += points
+        for p in self.on_court[other]:
+            self.plus_minus[p.person_id] -= points
+
+    def _shot(self, side: str, defense: str) -> bool:
+        """Field goal attempt; returns True if the offense keeps the ball"""
+        shooter = self._pick(side)
+        stats = self.stats[shooter.person_id]
+        name = self._names(shooter)[1]
+        three = self.rng.random() < 0.33
+        value = 3 if three else 2
+        distance = self.rng.randint(22, 27) if three else self.rng.choice([0, 1, 2, 4, 8, 12, 15, 18])
+        sub_type = self.rng.choice(_JUMP_SHOTS if three or distance > 6 else _LAYUPS)
+        shot = f"{distance}' {'3PT ' if three else ''}{sub_type}"
+        stats['fieldGoalsAttempted'] += 1
+        stats['threePointersAttempted'] += three
+        if self.rng.random() < (0.35 if three else 0.48):
+            stats['fieldGoalsMade'] += 1
+            stats['threePointersMade'] += three
+            self._score(side, shooter, value)
+            description = f"{name} {shot} ({int(stats['points'])} PTS)"
+            if self.rng.random() < 0.6:
+                assister = self._pick(side, exclude=shooter)
+                self.stats[assister.person_id]['assists'] += 1
+                description += f" ({self._names(assister)[1]} {int(self.stats[assister.person_id]['assists'])} AST)"
+            self._action('Made Shot', side, shooter, sub_type, description, value, 'Made', distance,
+                         scored=True, points_total=int(stats['points']))
+            return False
+
+        self._action('Missed Shot', side, shooter, sub_type, f'MISS {name} {shot}', value, 'Missed', distance)
+        if self.rng.random() < 0.06:
+            blocker = self._pick(defense)
+            self.stats[blocker.person_id]['blocks'] += 1
+            first, family = self._names(blocker)
+            self._action('', defense, blocker, '', f"{family} BLOCK "
+                         f"({int(self.stats[blocker.person_id]['blocks'])} BLK)", shot_value=value)
+        return self._rebound(side, defense)
+
+    def _rebound(self, side: str, defense: str) -> bool:
+        offensive = self.rng.random() < 0.25
+        rebound_side = side if offensive else defense
+        rebounder = self._pick(rebound_side)
+        stats = self.stats[rebounder.person_id]
+        stats['reboundsOffensive' if offensive else 'reboundsDefensive'] += 1
+        self._action('Rebound', rebound_side, rebounder, 'Unknown',
+                     f"{self._names(rebounder)[1]} REBOUND (Off:{int(stats['reboundsOffensive'])} "
+                     f"Def:{int(stats['reboundsDefensive'])})")
+        return offensive
+
+    def _free_throws(self, side: str, defense: str, count: int) -> bool:
+        shooter = self._pick(side)
+        stats = self.stats[shooter.person_id]
+        name = self._names(shooter)[1]
+        made = False
+        for i in range(1, count + 1):
+            sub_type = f'Free Throw {i} of {count}'
+            stats['freeThrowsAttempted'] += 1
+            made = self.rng.random() < 0.78
+            if made:
+                stats['freeThrowsMade'] += 1
+                self._score(side, shooter, 1)
+                self._action('Free Throw', side, shooter, sub_type,
+                             f"{name} {sub_type} ({int(stats['points'])} PTS)", scored=True,
+                             points_total=int(stats['points']))
+            else:
+                self._action('Free Throw', side, shooter, sub_type, f'MISS {name} {sub_type}')
+        return False if made else self._rebound(side, defense)
+
+    def _foul(self, defense: str, shooting: bool):
+        fouler = self._pick(defense)
+        stats = self.stats[fouler.person_id]
+        stats['foulsPersonal'] += 1
+        code = 'S.FOUL' if shooting else 'P.FOUL'
+        self._action('Foul', defense, fouler, 'Shooting' if shooting else 'Personal',
+                     f"{self._names(fouler)[1]} {code} (P{int(stats['foulsPersonal'])}.T1)")
+
+    def _turnover(self, side: str, defense: str):
+        player = self._pick(side)
+        stats = self.stats[player.person_id]
+        stats['turnovers'] += 1
+        sub_type = self.rng.choice(_TURNOVERS)
+        first, family = self._names(player)
+        self._action('Turnover', side, player, sub_type,
+                     f"{first[0]}. {family} {sub_type} (P{int(stats['turnovers'])}.T1)")
+        if sub_type in _STEAL_TURNOVERS and self.rng.random() < 0.6:
+            stealer = self._pick(defense)
+            self.stats[stealer.person_id]['steals'] += 1
+            self._action('', defense, stealer, '',
+                         f"{self._names(stealer)[1]} STEAL ({int(self.stats[stealer.person_id]['steals'])} STL)")
+
+    def _substitute(self, side: str):
+        bench = [p for p in self.roster[side] if p not in self.on_court[side]]
+        if not bench:
+            return
+        out = self.rng.choice(self.on_court[side])
+        into = self.rng.choice(bench)
+        self.on_court[side][self.on_court[side].index(out)] = into
+        self._action('Substitution', side, out, '', f'SUB: {self._names(into)[1]} FOR {self._names(out)[1]}')
+
+    def _possession(self, side: str):
+        """Play out one possession for side"""
+        defense = 'v' if side == 'h' else 'h'
+        for _ in range(6):
+            roll = self.rng.random()
+            if roll < 0.13:
+                self._turnover(side, defense)
+                return
+            if roll < 0.23:
+                self._foul(defense, shooting=True)
+                if not self._free_throws(side, defense, 2):
+                    return
+            elif roll < 0.28:
+                self._foul(defense, shooting=False)
+            elif not self._shot(side, defense):
+                return
+
+    def play(self) -> List[Dict[str, Any]]:
+        """Simulate regulation and any overtime; returns the period-grouped actions"""
+        periods = []
+        per_period = max(self.config.plays_per_game // self.config.periods, 20)
+        side = 'h'
+        while self.period < self.config.periods or self.score['h'] == self.score['v']:
+            self.period += 1
+            overtime = self.period > self.config.periods
+            length = (self.config.overtime_minutes if overtime else self.config.period_minutes) * 60
+            budget = max(int(per_period * length / (self.config.period_minutes * 60)), 10)
+            self.clock = float(length)
+            start_scores = dict(self.score)
+            self.actions = []
+            name = _period_name(self.period, self.config.periods)
+            self._action('period', sub_type='start', description=f'Start of {name}')
+            if self.period == 1:
+                home, away = self.on_court['h'][-1], self.on_court['v'][-1]
+                self._action('Jump Ball', 'h', home, '',
+                             f'Jump Ball {self._names(home)[1]} vs. {self._names(away)[1]}')
+
+            while len(self.actions) < budget and self.clock > 0:
+                self._possession(side)
+                side = 'v' if side == 'h' else 'h'
+                # The clock runs down in step with the period's share of the play budget
+                self._advance(self.clock - length * max(1 - len(self.actions) / budget, 0))
+                if self.rng.random() < 0.12:
+                    self._substitute(self.rng.choice(('h', 'v')))
+            self._advance(self.clock)
+            self._action('period', sub_type='end', description=f'End of {name}', scored=True)
+            for s in ('h', 'v'):
+                self.period_scores[s].append(self.score[s] - start_scores[s])
+            periods.append({'period': self.period, 'periodType': 'OVERTIME' if overtime else 'REGULAR',
+                            'actions': self.actions})
+        return periods
+
+    # Statistics
+
+    def _statistics(self, counts: Dict[str, float], seconds: float) -> Dict[str, Any]:
+        stats = {key: int(value) for key, value in counts.items()}
+        stats['reboundsTotal'] = stats['reboundsOffensive'] + stats['reboundsDefensive']
+        stats['minutes'] = _minutes(seconds)
+        for made, attempted, pct in (('fieldGoalsMade', 'fieldGoalsAttempted', 'fieldGoalsPercentage'),
+                                     ('threePointersMade', 'threePointersAttempted', 'threePointersPercentage'),
+                                     ('freeThrowsMade', 'freeThrowsAttempted', 'freeThrowsPercentage')):
+            stats[pct] = round(stats[made] / stats[attempted], 3) if stats[attempted] else 0
+        return stats
+
+    def _sum(self, players: List[_Player]) -> Tuple[Dict[str, float], float]:
+        totals = dict.fromkeys(_COUNTED, 0)
+        for player in players:
+            for key, value in self.stats[player.person_id].items():
+                totals[key] += value
+        return totals, sum(self.seconds[p.person_id] for p in players)
+
+    def player_statistics(self, person_id: int) -> Dict[str, Any]:
+        stats = self._statistics(self.stats[person_id], self.seconds[person_id])
+        stats['plusMinusPoints'] = self.plus_minus[person_id]
+        return stats
+
+    def group_statistics(self, side: str, starters: bool) -> Dict[str, Any]:
+        players = self.roster[side][:5] if starters else self.roster[side][5:]
+        return self._statistics(*self._sum(players))
+
+    def team_statistics(self, side: str) -> Dict[str, Any]:
+        stats = self._statistics(*self._sum(self.roster[side]))
+        other = 'v' if side == 'h' else 'h'
+        stats['plusMinusPoints'] = self.score[side] - self.score[other]
+        return stats
+
+
+def stream_to_raw_game_data(engine: Engine, games: Iterator[Dict[str, Any]], batch_size: int = 200) -> int:
+    """
+    Insert generated games into raw_game_data in batches.
+
+    Games whose ID is already stored are skipped on PostgreSQL.
+
+    Args:
+        engine: SQLAlchemy engine
+        games: Rows from SyntheticGameGenerator.generate()
+        batch_size: Games per INSERT and transaction
+
+    Returns:
+        Number of games written
+    """
+    table = RawGameData.__table__
+    if engine.dialect.name == 'postgresql':
+        statement = pg_insert(table).on_conflict_do_nothing(index_elements=['game_id'])
+    else:
+        statement = insert(table)
+
+    written = 0
+    batch: List[Dict[str, Any]] = []
+    with engine.connect() as conn:
+        for game in games:
+            batch.append(game)
+            if len(batch) >= batch_size:
+                conn.execute(statement, batch)
+                conn.commit()
+                written += len(batch)
+                batch = []
+                logger.info(f"Synthetic games: {written} written")
+        if batch:
+            conn.execute(statement, batch)
+            conn.commit()
+            written += len(batch)
+    logger.info(f"Synthetic games: {written} written to raw_game_data")
+    return written
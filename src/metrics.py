@@ -0,0 +1,359 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are declared at module level here and
+recorded on the scraping and population hot paths. Recording is a no-op
+while metrics are disabled, which is the default: an instrumented call pays
+one attribute check, and timers hand back a shared null context. Enable
+with enable() or WNBA_METRICS=1, then export with write_textfile() (for the
+node_exporter textfile collector) or serve a scrape endpoint with
+start_http_server().
+"""
+
+import functools
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTE_BUCKETS = (16e3, 64e3, 256e3, 512e3, 1e6, 2e6, 4e6, 8e6, 16e6)
+
+_NULL_TIMER = nullcontext()
+
+# Engines already passed to instrument_pool(), and the connection_record.info
+# key holding a tracked checkout's start time
+_INSTRUMENTED_ENGINES = weakref.WeakSet()
+_INSTRUMENTED_LOCK = threading.Lock()
+_CHECKOUT_STARTED = 'wnba_metrics_checkout_started'
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics: List['Metric'] = []
+
+    def register(self, metric: 'Metric') -> 'Metric':
+        self.metrics.append(metric)
+        return metric
+
+    def reset(self):
+        """Drop every recorded value (for tests and per-run text files)"""
+        for metric in self.metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        return ''.join(metric.render() for metric in self.metrics)
+
+
+REGISTRY = Registry()
+
+
+def enable(enabled: bool = True):
+    """Start (or stop) recording metrics"""
+    REGISTRY.enabled = enabled
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def render() -> str:
+    """The default registry in the Prometheus text exposition format"""
+    return REGISTRY.render()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _header(self) -> str:
+        return f'# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n'
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}\n'
+                 for key, value in items]
+        return self._header() + ''.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing total"""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Registry = REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the elapsed time of its block"""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return self._timer(labels)
+
+    @contextmanager
+    def _timer(self, labels: Dict[str, object]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0.0
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}\n')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}\n')
+            lines.append(f'{self.name}_count{labels} {count}\n')
+        return self._header() + ''.join(lines)
+
+
+def timed(histogram: Histogram, rows: Optional[Counter] = None, **labels) -> Callable:
+    """
+    Decorator observing a function's duration, and adding its integer return
+    value to a rows counter.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not histogram.registry.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            histogram.observe(time.perf_counter() - start, **labels)
+            if rows is not None and isinstance(result, int):
+                rows.inc(result, **labels)
+            return result
+        return wrapper
+    return decorator
+
+
+def instrument_pool(engine, name: str = 'default'):
+    """
+    Record how long checkouts from an engine's pool wait for a connection,
+    how long connections stay checked out and how many are in use.
+
+    Pool events fire only once a connection has been handed out, so the
+    wait is timed around the engine's raw_connection(), which every
+    Connection checks out through and which outlives the pools dispose()
+    replaces. Holding times and the in-use count come from the engine's
+    pool 'checkout' and 'checkin' events, which also reach new pools.
+    Instrumenting an engine again is a no-op, and nothing is recorded while
+    metrics are disabled.
+    """
+    from sqlalchemy import event
+
+    with _INSTRUMENTED_LOCK:
+        if engine in _INSTRUMENTED_ENGINES:
+            return engine
+        _INSTRUMENTED_ENGINES.add(engine)
+
+    lock = threading.Lock()
+    in_use = [0]
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if not REGISTRY.enabled:
+            return
+        connection_record.info[_CHECKOUT_STARTED] = time.perf_counter()
+        with lock:
+            in_use[0] += 1
+            POOL_CONNECTIONS_IN_USE.set(in_use[0], pool=name)
+
+    def on_checkin(dbapi_connection, connection_record):
+        # Only connections whose checkout was tracked
+        start = connection_record.info.pop(_CHECKOUT_STARTED, None) if connection_record else None
+        if start is None:
+            return
+        POOL_HOLD_SECONDS.observe(time.perf_counter() - start, pool=name)
+        with lock:
+            in_use[0] -= 1
+            POOL_CONNECTIONS_IN_USE.set(in_use[0], pool=name)
+
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        if not REGISTRY.enabled:
+            return raw_connection()
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start, pool=name)
+
+    engine.raw_connection = timed_raw_connection
+    event.listen(engine, 'checkout', on_checkout)
+    event.listen(engine, 'checkin', on_checkin)
+    return engine
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY):
+    """Write the metrics to a file atomically, for the node_exporter textfile collector"""
+    partial = f'{path}.{os.getpid()}.tmp'
+    with open(partial, 'w') as f:
+        f.write(registry.render())
+    os.replace(partial, path)
+
+
+def start_http_server(port: int, addr: str = '0.0.0.0', registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    Serve the metrics at /metrics from a daemon thread.
+
+    Returns:
+        The running server (call shutdown() to stop it)
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+# Scraping (RawDataExtractor, ScraperManager)
+HTTP_FETCH_SECONDS = Histogram(
+    'wnba_http_fetch_seconds', 'Game page HTTP fetch latency, including failed requests')
+PAGE_PARSE_SECONDS = Histogram(
+    'wnba_page_parse_seconds', 'Time to locate the embedded game JSON and decode it', ['stage'])
+PAGE_BYTES = Histogram(
+    'wnba_page_bytes', 'Size of fetched game pages in bytes', buckets=BYTE_BUCKETS)
+EXTRACTIONS = Counter(
+    'wnba_extractions_total', 'Game page extractions by result', ['result'])
+SCRAPE_GAME_SECONDS = Histogram(
+    'wnba_scrape_game_seconds', 'Time to scrape and store one game', ['outcome'])
+
+# Population (BulkInsertService, GameTablePopulator)
+DB_INSERT_SECONDS = Histogram(
+    'wnba_db_insert_seconds', 'Bulk insert latency per table', ['table'])
+DB_ROWS_INSERTED = Counter(
+    'wnba_db_rows_inserted_total', 'Rows inserted per table (rate() gives rows/sec)', ['table'])
+POOL_WAIT_SECONDS = Histogram(
+    'wnba_db_pool_wait_seconds', 'Time spent waiting for a pooled database connection, including opening one',
+    ['pool'])
+POOL_HOLD_SECONDS = Histogram(
+    'wnba_db_pool_hold_seconds', 'Time a pooled database connection stays checked out', ['pool'])
+POOL_CONNECTIONS_IN_USE = Gauge(
+    'wnba_db_pool_connections_in_use', 'Pooled database connections currently checked out', ['pool'])
+POPULATE_GAME_SECONDS = Histogram(
+    'wnba_populate_game_seconds', 'Time to populate all tables for one game', ['outcome'])
+POPULATION_ROWS_PER_SECOND = Gauge(
+    'wnba_population_rows_per_second', 'Rows inserted per second over the current population run')
+
+
+if os.getenv('WNBA_METRICS', '').lower() in ('1', 'true', 'yes'):
+    enable()
@@ -0,0 +1,237 @@
+"""
+CPU and memory profiling for the command line entry points.
+
+The CLIs take --profile cpu|mem and --profile-output PREFIX and wrap their run
+in a Profiler:
+
+    cpu  cProfile over the run, saved to PREFIX.pstats (open with pstats or
+         snakeviz), and the top functions by cumulative time in PREFIX.txt
+    mem  tracemalloc over the run; PREFIX.txt lists the top allocation sites
+         grown during each stage, with each stage's peak traced memory
+
+The whole run is one stage, named after the command; coarser steps inside it
+(clear_tables, populate, validate) are marked with stage(), which does
+nothing unless a profiler is running. Both
+modes also time every operation() labelled in the code, such as the eight
+GamePopulationService.populate_game phases, and report calls, total and mean
+time (and peak traced memory in mem mode) per operation.
+
+cProfile only sees the thread that started it, so work done in worker
+threads (validate_populated_data table scans) is missing from cpu profiles;
+run those with --workers 1 when profiling.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from .database import query_counter
+
+logger = logging.getLogger(__name__)
+
+MODES = ('cpu', 'mem')
+DEFAULT_TOP = 25
+TRACEMALLOC_FRAMES = 10
+
+_active: Optional['Profiler'] = None
+
+
+def stage(name: str):
+    """Mark a stage of the run for the active profiler; a no-op when none is running"""
+    return _active.stage(name) if _active else nullcontext()
+
+
+class _Timing:
+    __slots__ = ('calls', 'seconds', 'peak')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak = 0
+
+
+class Profiler:
+    """Profiles a run and writes its reports when stopped"""
+
+    def __init__(self, mode: str, output: str, name: str = 'run', top: int = DEFAULT_TOP):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.output = output
+        self.name = name
+        self.top = top
+        self._profile: Optional[cProfile.Profile] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._timings: Dict[str, _Timing] = {}
+        self._stages: List[str] = []
+        self._run_stage = None
+        self._started = 0.0
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def stats_path(self) -> str:
+        return f'{self.output}.pstats'
+
+    @property
+    def report_path(self) -> str:
+        return f'{self.output}.txt'
+
+    def start(self):
+        global _active
+        if self.mode == 'mem':
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        query_counter.add_listener(self)
+        _active = self
+        self._started = time.perf_counter()
+        self._run_stage = self.stage(self.name)
+        self._run_stage.__enter__()
+
+    def stop(self):
+        global _active
+        self._run_stage.__exit__(None, None, None)
+        elapsed = time.perf_counter() - self._started
+        _active = None
+        query_counter.remove_listener(self)
+        sections = [f"Profile ({self.mode}) finished in {elapsed:.2f}s at {datetime.now():%Y-%m-%d %H:%M:%S}"]
+        sections.extend(self._stages)
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self.stats_path)
+            text = io.StringIO()
+            pstats.Stats(self._profile, stream=text).sort_stats('cumulative').print_stats(self.top)
+            sections.append(f"Top {self.top} functions by cumulative time (full profile: {self.stats_path})\n"
+                            + text.getvalue().strip())
+        else:
+            tracemalloc.stop()
+        sections.append(self.timing_report())
+        with open(self.report_path, 'w') as f:
+            f.write('\n\n'.join(sections) + '\n')
+        logger.info(f"Profile written to {self.report_path}"
+                    + (f" and {self.stats_path}" if self._profile else ''))
+
+    # Stages (memory snapshots)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage; in mem mode, report the allocation sites that grew during it"""
+        if self.mode != 'mem':
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self._stages.append(f"Stage {name}: {time.perf_counter() - start:.2f}s")
+            return
+
+        before = tracemalloc.take_snapshot()
+        stack = self._stack()
+        self._fold_peak(stack)
+        frame = [name, time.perf_counter(), 0]
+        stack.insert(0, frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self._fold_peak(stack)
+            stack.remove(frame)
+            peak = frame[2]
+            current = tracemalloc.get_traced_memory()[0]
+            after = tracemalloc.take_snapshot()
+            lines = [f"Stage {name}: {elapsed:.2f}s, traced {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB",
+                     f"Top {self.top} allocation sites by growth:"]
+            for stat in after.compare_to(before, 'lineno')[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size_diff / 1024:>+10.1f} KiB {stat.count_diff:>+8} blocks  "
+                             f"{frame.filename}:{frame.lineno}")
+            self._stages.append('\n'.join(lines))
+
+    # Operation timing (query_counter listener)
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _fold_peak(self, stack: list):
+        """Carry the peak since the last reset into every open operation, then reset it"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for frame in stack:
+            frame[2] = max(frame[2], peak)
+        tracemalloc.reset_peak()
+
+    def operation_started(self, path: str):
+        stack = self._stack()
+        if self.mode == 'mem':
+            self._fold_peak(stack)
+        stack.append([path, time.perf_counter(), 0])
+
+    def operation_finished(self, path: str):
+        stack = self._stack()
+        if not stack or stack[-1][0] != path:
+            return
+        if self.mode == 'mem':
+            self._fold_peak(stack)
+        _, start, peak = stack.pop()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            timing = self._timings.get(path)
+            if timing is None:
+                timing = self._timings[path] = _Timing()
+            timing.calls += 1
+            timing.seconds += elapsed
+            timing.peak = max(timing.peak, peak)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Calls, total seconds, mean milliseconds and peak bytes per operation"""
+        with self._lock:
+            return {
+                path: {'calls': t.calls, 'seconds': t.seconds, 'mean_ms': t.seconds / t.calls * 1000,
+                       'peak_bytes': t.peak}
+                for path, t in sorted(self._timings.items())
+            }
+
+    def timing_report(self) -> str:
+        timings = self.timings()
+        if not timings:
+            return 'No labelled operations ran'
+        lines = [f"{'Operation':<40} {'Calls':>7} {'Total (s)':>10} {'Mean (ms)':>10}"
+                 + (f" {'Peak (MB)':>10}" if self.mode == 'mem' else '')]
+        for path, t in timings.items():
+            line = f"{path:<40} {t['calls']:>7} {t['seconds']:>10.3f} {t['mean_ms']:>10.2f}"
+            if self.mode == 'mem':
+                line += f" {t['peak_bytes'] / 1e6:>10.1f}"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def add_arguments(parser):
+    """Add --profile and --profile-output to an argument parser"""
+    parser.add_argument('--profile', choices=MODES, default=None,
+                        help='Profile the run: cpu (cProfile) or mem (tracemalloc)')
+    parser.add_argument('--profile-output', type=str, default=None,
+                        help='Path prefix for the profile files (default: profile_<command>_<timestamp>)')
+
+
+def from_args(args, command: str) -> Optional[Profiler]:
+    """A Profiler for the parsed --profile options, or None when not profiling"""
+    if not getattr(args, 'profile', None):
+        return None
+    output = args.profile_output or f"profile_{command}_{datetime.now():%Y%m%d_%H%M%S}"
+    return Profiler(args.profile, output, name=getattr(args, 'command', None) or command)
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from .. import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,23 +58,28 @@ class RawDataExtractor:
         
         try:
             headers = {'User-Agent': self.user_agent}
-            response = requests.get(game_url, timeout=self.timeout, headers=headers)
+            with metrics.HTTP_FETCH_SECONDS.time():
+                response = requests.get(game_url, timeout=self.timeout, headers=headers)
             response.raise_for_status()
+            if metrics.enabled():
+                metrics.PAGE_BYTES.observe(len(response.content))
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            data_script = soup.find('script', {'id': '__NEXT_DATA__'})
+            with metrics.PAGE_PARSE_SECONDS.time(stage='locate'):
+                soup = BeautifulSoup(response.text, 'html.parser')
+                data_script = soup.find('script', {'id': '__NEXT_DATA__'})
             
             if not data_script:
                 logger.warning(f"No __NEXT_DATA__ script found in {game_url}")
-                return ExtractionResult.NO_DATA, None, None
+                return self._result(ExtractionResult.NO_DATA)
             
             try:
-                game_json = json.loads(data_script.text)
+                with metrics.PAGE_PARSE_SECONDS.time(stage='decode'):
+                    game_json = json.loads(data_script.text)
                 game_data = game_json.get('props', {}).get('pageProps', {})
                 
                 if not game_data:
                     logger.warning(f"No pageProps data found in {game_url}")
-                    return ExtractionResult.NO_DATA, None, None
+                    return self._result(ExtractionResult.NO_DATA)
                 
                 # Determine data quality
                 data_quality = DataQuality.COMPLETE if game_data else DataQuality.EMPTY
@@ -85,18 +92,25 @@ class RawDataExtractor:
                     user_agent_used=self.user_agent
                 )
 
-                return ExtractionResult.SUCCESS, game_data, metadata
+                return self._result(ExtractionResult.SUCCESS, game_data, metadata)
                 
             except json.JSONDecodeError as e:
                 logger.error(f"JSON decode error for {game_url}: {e}")
-                return ExtractionResult.INVALID_JSON, None, None
+                return self._result(ExtractionResult.INVALID_JSON)
                 
         except requests.exceptions.Timeout:
             logger.error(f"Timeout error extracting game data from {game_url}")
-            return ExtractionResult.TIMEOUT, None, None
+            return self._result(ExtractionResult.TIMEOUT)
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error extracting game data from {game_url}: {e}")
-            return ExtractionResult.NETWORK_ERROR, None, None
+            return self._result(ExtractionResult.NETWORK_ERROR)
         except Exception as e:
             logger.error(f"Unexpected error extracting game data from {game_url}: {e}")
-            return ExtractionResult.SERVER_ERROR, None, None
\ No newline at end of file
+            return self._result(ExtractionResult.SERVER_ERROR)
+
+    @staticmethod
+    def _result(result: ExtractionResult, game_data: Optional[Dict[str, Any]] = None,
+                metadata: Optional[ExtractionMetadata] = None):
+        """Count the extraction outcome and return it"""
+        metrics.EXTRACTIONS.inc(result=result.value)
+        return result, game_data, metadata
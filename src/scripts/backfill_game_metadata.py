@@ -2,21 +2,30 @@
 """
 Backfill script to populate season and game_type columns for existing games.
 
-This script analyzes existing game_id values in the game table and populates
-the new season and game_type columns based on the game ID format.
+This script derives season and game_type from the game ID format
+(10SYY00GGG) in SQL and applies them with set-based UPDATE statements, one
+keyset chunk of game IDs at a time, so no rows are loaded into Python. It
+fills games whose season or game_type is missing and corrects raw_game_data
+rows whose stored values disagree with their game ID. Each chunk commits
+with a checkpoint, so an interrupted run resumes where it stopped. A dry run
+counts the affected rows through the same chunked predicates.
 
 Usage:
-    python -m src.scripts.backfill_game_metadata [--dry-run] [--verbose]
+    python -m src.scripts.backfill_game_metadata [--dry-run] [--verbose] [--chunk-size N]
+        [--rate ROWS_PER_SECOND] [--restart]
 """
 
 import argparse
 import logging
 import sys
-from typing import List, Tuple
+from typing import Dict, Optional
 
-from src.database.services import DatabaseService
-from src.database.models import Game
-from src.database.game_utils import parse_game_id
+from sqlalchemy import inspect, select, update, func, and_, or_, not_
+
+from src.database.services import DatabaseConnection
+from src.database.backfill import BackfillRunner, sql_transform
+from src.database.models import Game, RawGameData
+from src.database.game_utils import game_id_is_valid_sql, game_id_season_sql, game_id_game_type_sql
 
 
 def setup_logging(verbose: bool = False):
@@ -28,82 +37,106 @@ def setup_logging(verbose: bool = False):
     )
 
 
-def backfill_game_metadata(dry_run: bool = False, verbose: bool = False) -> Tuple[int, int, List[str]]:
+def _backfill_targets():
+    """
+    Tables to backfill with the predicate selecting rows that need an update.
+
+    Game rows are filled only where a value is missing; raw_game_data
+    columns are non-nullable, so its rows are corrected where they disagree
+    with the game ID.
+    """
+    raw_season = game_id_season_sql(RawGameData.game_id)
+    raw_game_type = game_id_game_type_sql(RawGameData.game_id)
+    return {
+        'game': (Game, or_(Game.season.is_(None), Game.game_type.is_(None))),
+        'raw_game_data': (RawGameData, or_(RawGameData.season != raw_season,
+                                           RawGameData.game_type != raw_game_type)),
+    }
+
+
+def backfill_table(engine, model, predicate, dry_run: bool = False, chunk_size: int = 5000,
+                   rows_per_second: Optional[float] = None, restart: bool = False) -> Dict[str, int]:
+    """
+    Backfill one table in keyset chunks of game IDs.
+
+    Each chunk is a single UPDATE over game_id BETWEEN first AND last key of
+    the chunk, committed together with the backfill checkpoint.
+
+    Args:
+        engine: SQLAlchemy engine
+        model: Game or RawGameData
+        predicate: Rows needing an update
+        dry_run: Count the affected rows instead of updating them
+        chunk_size: Rows per chunk
+        rows_per_second: Throttle to this rate
+        restart: Ignore an unfinished checkpoint
+
+    Returns:
+        Dictionary with 'updated' (or would-be updated) rows, 'unparseable'
+        rows that need an update but carry a malformed game ID, and 'chunks'
+    """
+    game_id = model.game_id
+    candidates = and_(predicate, game_id_is_valid_sql(game_id))
+
+    with engine.connect() as conn:
+        unparseable = conn.scalar(
+            select(func.count()).select_from(model).where(predicate, not_(game_id_is_valid_sql(game_id)))
+        )
+
+    runner = BackfillRunner(engine, f'game_metadata:{model.__tablename__}', game_id, where=candidates,
+                            chunk_size=chunk_size, rows_per_second=rows_per_second)
+    stats = runner.run(
+        sql_transform(lambda lo, hi: (
+            update(model)
+            .where(candidates, game_id.between(lo, hi))
+            .values(season=game_id_season_sql(game_id), game_type=game_id_game_type_sql(game_id))
+            .execution_options(synchronize_session=False)
+        )),
+        dry_run=dry_run,
+        restart=restart
+    )
+    return {'updated': stats['affected'], 'unparseable': unparseable, 'chunks': stats['chunks']}
+
+
+def backfill_game_metadata(dry_run: bool = False, verbose: bool = False, chunk_size: int = 5000,
+                           engine=None, rows_per_second: Optional[float] = None,
+                           restart: bool = False) -> Dict[str, Dict[str, int]]:
     """
     Backfill season and game_type columns for existing games.
     
     Args:
         dry_run: If True, don't actually update the database
         verbose: Enable verbose logging
+        chunk_size: Rows updated per statement and transaction
+        engine: SQLAlchemy engine (defaults to the configured database)
+        rows_per_second: Throttle each table to this rate
+        restart: Ignore unfinished checkpoints and start over
         
     Returns:
-        tuple: (total_games, updated_games, errors)
+        Dictionary of table name -> backfill_table statistics, for the
+        tables that exist
     """
     logger = logging.getLogger(__name__)
+    if engine is None:
+        engine = DatabaseConnection().get_engine()
     
-    with DatabaseService() as db:
-        session = db.get_session()
-        
-        # Get all games that need to be updated (where season or game_type is None)
-        games_to_update = session.query(Game).filter(
-            (Game.season.is_(None)) | (Game.game_type.is_(None))
-        ).all()
-        
-        total_games = len(games_to_update)
-        updated_games = 0
-        errors = []
-        
-        logger.info(f"Found {total_games} games that need metadata updates")
-        
-        if dry_run:
-            logger.info("DRY RUN MODE - No actual updates will be made")
-        
-        for game in games_to_update:
-            try:
-                # Parse the game ID to extract metadata
-                metadata = parse_game_id(game.game_id)
-                season = metadata['season']
-                game_type = metadata['game_type']
-                
-                if season is None or game_type is None:
-                    error_msg = f"Could not parse game_id {game.game_id}"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
-                    continue
-                
-                # Update the game record
-                old_season = game.season
-                old_game_type = game.game_type
-                
-                if not dry_run:
-                    game.season = season
-                    game.game_type = game_type
-                
-                updated_games += 1
-                
-                if verbose:
-                    logger.debug(
-                        f"Game {game.game_id}: season {old_season} -> {season}, "
-                        f"game_type {old_game_type} -> {game_type}"
-                    )
-                
-                # Commit periodically to avoid large transactions
-                if not dry_run and updated_games % 1000 == 0:
-                    session.commit()
-                    logger.info(f"Committed {updated_games} updates...")
-                    
-            except Exception as e:
-                error_msg = f"Error processing game {game.game_id}: {str(e)}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                continue
-        
-        # Final commit
-        if not dry_run and updated_games > 0:
-            session.commit()
-            logger.info(f"Final commit of {updated_games} updates")
+    if dry_run:
+        logger.info("DRY RUN MODE - No actual updates will be made")
     
-    return total_games, updated_games, errors
+    available = set(inspect(engine).get_table_names())
+    results = {}
+    for table, (model, predicate) in _backfill_targets().items():
+        if table not in available:
+            logger.info(f"Skipping {table}: table does not exist")
+            continue
+        results[table] = backfill_table(engine, model, predicate, dry_run=dry_run, chunk_size=chunk_size,
+                                        rows_per_second=rows_per_second, restart=restart)
+        logger.info(
+            f"{table}: {results[table]['updated']} rows {'to update' if dry_run else 'updated'} "
+            f"in {results[table]['chunks']} chunks"
+        )
+    
+    return results
 
 
 def main():
@@ -113,6 +146,12 @@ def main():
                        help='Show what would be updated without making changes')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                       help='Rows updated per statement and transaction (default: 5000)')
+    parser.add_argument('--rate', type=float,
+                       help='Throttle to this many rows per second')
+    parser.add_argument('--restart', action='store_true',
+                       help='Ignore an interrupted run and start from the beginning')
     
     args = parser.parse_args()
     
@@ -122,22 +161,21 @@ def main():
     try:
         logger.info("Starting game metadata backfill...")
         
-        total_games, updated_games, errors = backfill_game_metadata(
+        results = backfill_game_metadata(
             dry_run=args.dry_run,
-            verbose=args.verbose
+            verbose=args.verbose,
+            chunk_size=args.chunk_size,
+            rows_per_second=args.rate,
+            restart=args.restart
         )
         
         logger.info("=" * 60)
         logger.info("BACKFILL COMPLETE")
         logger.info("=" * 60)
-        logger.info(f"Total games examined: {total_games}")
-        logger.info(f"Games updated: {updated_games}")
-        logger.info(f"Errors encountered: {len(errors)}")
-        
-        if errors:
-            logger.warning("Errors encountered:")
-            for error in errors:
-                logger.warning(f"  {error}")
+        for table, stats in results.items():
+            logger.info(f"{table}: {stats['updated']} rows {'would be updated' if args.dry_run else 'updated'}")
+            if stats['unparseable']:
+                logger.warning(f"{table}: {stats['unparseable']} rows with unparseable game IDs")
         
         if args.dry_run:
             logger.info("DRY RUN MODE - No actual changes were made")
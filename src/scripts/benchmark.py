@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Reproducible performance benchmarks for the extract and populate pipeline.
+
+Each benchmark runs over a fixed corpus of game JSON: the real games in
+tests/test_data plus a seeded synthetic season from synthetic_games.
+Benchmarks run against a scratch database (a temporary SQLite
+file by default) and each is repeated, recording every run's wall time:
+
+    extract        json_extractors over every game (games/s)
+    html_extract   RawDataExtractor fetching and parsing pages served locally (pages/s)
+    populate       GamePopulationService.populate_game into empty tables (games/s)
+    insert.<table> BulkInsertService time per table during populate (rows/s)
+    validate       DataValidator.validate_all over the populated tables (runs/s)
+
+Results are appended to a JSON history file; the compare command diffs two
+runs from the history and fails if any benchmark slowed beyond a threshold.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, delete, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from ..database.models import Base
+from ..database.json_extractors import (
+    ArenaExtractor, TeamExtractor, GameExtractor,
+    PersonExtractor, PlayExtractor, BoxscoreExtractor
+)
+from ..database.population_services import GamePopulationService
+from ..database.synthetic_games import SyntheticConfig, SyntheticGameGenerator
+from ..scrapers.raw_data_extractor import RawDataExtractor, ExtractionResult
+from .validate_populated_data import DataValidator
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CORPUS = REPO_ROOT / 'tests' / 'test_data'
+DEFAULT_HISTORY = 'benchmark_history.json'
+DEFAULT_THRESHOLD = 0.10
+
+INSERT_TABLES = ('arena', 'team', 'person', 'game', 'team_game', 'person_game', 'play', 'boxscore')
+
+
+def load_corpus(directory: Path = DEFAULT_CORPUS) -> List[Dict[str, Any]]:
+    """Real game JSON files from a directory, in file name order"""
+    games = []
+    for path in sorted(Path(directory).glob('raw_game_*.json')):
+        with open(path) as f:
+            games.append(json.load(f))
+    if not games:
+        raise ValueError(f"No raw_game_*.json files found in {directory}")
+    return games
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """count generated games of one season; the same seed always yields the same games"""
+    generator = SyntheticGameGenerator(SyntheticConfig(games_per_season=count, seed=seed))
+    return [game['game_data'] for game in generator.generate()]
+
+
+def extract_game(game_json: Dict[str, Any]) -> int:
+    """Run every json_extractors extractor over a game; returns the rows produced"""
+    rows = 2  # arena and game
+    ArenaExtractor.extract(game_json)
+    GameExtractor.extract(game_json)
+    rows += len(TeamExtractor.extract_teams_from_game(game_json))
+    rows += len(PersonExtractor.extract_persons_from_game(game_json))
+    rows += len(PlayExtractor.extract_plays_from_game(game_json))
+    rows += len(BoxscoreExtractor.extract_boxscores_from_game(game_json))
+    return rows
+
+
+def render_page(game_json: Dict[str, Any]) -> bytes:
+    """A game page in the shape the site serves, with the game embedded as __NEXT_DATA__"""
+    payload = json.dumps({'props': {'pageProps': game_json}})
+    return (f'<html><head><title>Game</title></head><body><div id="__next"></div>'
+            f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+            f'</body></html>').encode('utf-8')
+
+
+class PageServer:
+    """Serves rendered game pages on a local port for the HTML extract benchmark"""
+
+    def __init__(self, pages: List[bytes]):
+        self.pages = pages
+
+        class PageHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(handler):
+                body = self.pages[int(handler.path.rsplit('/', 1)[-1])]
+                handler.send_response(200)
+                handler.send_header('Content-Type', 'text/html; charset=utf-8')
+                handler.send_header('Content-Length', str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, name='benchmark-pages', daemon=True)
+
+    def url(self, index: int) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}/game/{index}'
+
+    def __enter__(self) -> 'PageServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _summarize(unit: str, items: int, runs: List[float]) -> Dict[str, Any]:
+    median = statistics.median(runs)
+    return {
+        'unit': unit,
+        'items': items,
+        'runs': runs,
+        'median': median,
+        'min': min(runs),
+        'per_second': items / median if median > 0 else None,
+    }
+
+
+class BenchmarkSuite:
+    """Runs the benchmarks over a corpus against a scratch database"""
+
+    def __init__(self, games: List[Dict[str, Any]], engine: Optional[Engine] = None, repeat: int = 3):
+        """
+        Args:
+            games: Game JSON corpus
+            engine: Scratch database; its game tables are created, emptied
+                between runs and dropped afterwards (default: temporary SQLite file)
+            repeat: Runs per benchmark
+        """
+        self.games = games
+        self.repeat = repeat
+        self._tempdir = None
+        if engine is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix='wnba-benchmark-')
+            engine = create_engine(f"sqlite:///{Path(self._tempdir.name) / 'benchmark.db'}")
+        self.engine = engine
+        self.Session = sessionmaker(bind=engine)
+        # raw_game_data is JSONB and population never reads it
+        self.tables = [t for t in Base.metadata.sorted_tables
+                       if t.name != 'raw_game_data' or engine.dialect.name == 'postgresql']
+
+    def run(self, only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the benchmarks.
+
+        Args:
+            only: Benchmark names to run (default: all); insert.<table> results
+                come with populate and validate requires populate
+
+        Returns:
+            Dictionary of benchmark name -> summary with 'unit', 'items', every
+            run's seconds under 'runs', 'median', 'min' and 'per_second'
+        """
+        selected = set(only or ('extract', 'html_extract', 'populate', 'validate'))
+        if 'validate' in selected:
+            selected.add('populate')
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if 'extract' in selected:
+            results['extract'] = self.bench_extract()
+        if 'html_extract' in selected:
+            results['html_extract'] = self.bench_html_extract()
+        if 'populate' in selected:
+            self._create_tables()
+            try:
+                results.update(self.bench_populate())
+                if 'validate' in selected:
+                    results['validate'] = self.bench_validate()
+            finally:
+                Base.metadata.drop_all(self.engine, tables=self.tables)
+        return results
+
+    def close(self):
+        self.engine.dispose()
+        if self._tempdir:
+            self._tempdir.cleanup()
+
+    def _create_tables(self):
+        existing = set(inspect(self.engine).get_table_names())
+        if existing & {t.name for t in self.tables}:
+            raise RuntimeError("Benchmark database already has game tables; use an empty scratch database")
+        Base.metadata.create_all(self.engine, tables=self.tables)
+
+    def _empty_tables(self):
+        with self.engine.begin() as conn:
+            for table in reversed(self.tables):
+                conn.execute(delete(table))
+
+    def bench_extract(self) -> Dict[str, Any]:
+        def extract_all():
+            for game_json in self.games:
+                extract_game(game_json)
+        runs = [_timed(extract_all) for _ in range(self.repeat)]
+        return _summarize('games', len(self.games), runs)
+
+    def bench_html_extract(self) -> Dict[str, Any]:
+        pages = [render_page(game_json) for game_json in self.games]
+        extractor = RawDataExtractor()
+        with PageServer(pages) as server:
+            urls = [server.url(i) for i in range(len(pages))]
+
+            def extract_all():
+                for url in urls:
+                    result, _, _ = extractor.extract_game_data(url)
+                    if result != ExtractionResult.SUCCESS:
+                        raise RuntimeError(f"HTML extraction of {url} failed: {result}")
+            runs = [_timed(extract_all) for _ in range(self.repeat)]
+        return _summarize('pages', len(pages), runs)
+
+    def bench_populate(self) -> Dict[str, Dict[str, Any]]:
+        """Populate the corpus once per run, reading per-table insert time from the metrics"""
+        was_enabled = metrics.enabled()
+        metrics.enable()
+        runs: List[float] = []
+        insert_runs = {table: [] for table in INSERT_TABLES}
+        insert_rows = {table: 0 for table in INSERT_TABLES}
+        try:
+            for _ in range(self.repeat):
+                self._empty_tables()
+                metrics.REGISTRY.reset()
+
+                def populate_all():
+                    for game_json in self.games:
+                        with self.Session() as session:
+                            GamePopulationService(session).populate_game(game_json)
+                            session.commit()
+                runs.append(_timed(populate_all))
+                for table in INSERT_TABLES:
+                    insert_runs[table].append(metrics.DB_INSERT_SECONDS.sum(table=table))
+                    insert_rows[table] = metrics.DB_ROWS_INSERTED.value(table=table)
+        finally:
+            metrics.REGISTRY.reset()
+            metrics.enable(was_enabled)
+
+        results = {'populate': _summarize('games', len(self.games), runs)}
+        for table in INSERT_TABLES:
+            results[f'insert.{table}'] = _summarize('rows', int(insert_rows[table]), insert_runs[table])
+        return results
+
+    def bench_validate(self) -> Dict[str, Any]:
+        validator = DataValidator(engine=self.engine, max_workers=1)
+        runs = [_timed(validator.validate_all) for _ in range(self.repeat)]
+        return _summarize('runs', 1, runs)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    """Recorded runs, oldest first (empty if the file does not exist)"""
+    if not Path(path).exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(path: str, entry: Dict[str, Any]):
+    history = load_history(path)
+    history.append(entry)
+    partial = Path(f'{path}.tmp')
+    partial.write_text(json.dumps(history, indent=2))
+    partial.replace(path)
+
+
+def compare_runs(baseline: Dict[str, Any], candidate: Dict[str, Any],
+                 threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare the median time of every benchmark present in both runs.
+
+    Args:
+        baseline: History entry to compare against
+        candidate: History entry being checked
+        threshold: Relative slowdown of the median beyond which a benchmark regressed
+
+    Returns:
+        One row per benchmark with 'name', 'baseline' and 'candidate' medians,
+        relative 'change' and 'regression'
+    """
+    rows = []
+    for name, result in candidate['results'].items():
+        before = baseline['results'].get(name)
+        if before is None or not before['median']:
+            continue
+        change = result['median'] / before['median'] - 1
+        rows.append({
+            'name': name,
+            'baseline': before['median'],
+            'candidate': result['median'],
+            'change': change,
+            'regression': change > threshold,
+        })
+    return rows
+
+
+def run_command(args) -> int:
+    games = load_corpus(Path(args.corpus))
+    corpus = {'real': len(games), 'synthetic': args.synthetic}
+    games = games + synthetic_corpus(args.synthetic)
+
+    engine = create_engine(args.database_url) if args.database_url else None
+    suite = BenchmarkSuite(games, engine=engine, repeat=args.repeat)
+    try:
+        results = suite.run(only=args.only)
+        dialect = suite.engine.dialect.name
+    finally:
+        suite.close()
+
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'label': args.label,
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'database': dialect,
+        'repeat': args.repeat,
+        'corpus': corpus,
+        'results': results,
+    }
+    append_history(args.history, entry)
+
+    print(f"\n{'Benchmark':<22} {'Median (s)':>12} {'Min (s)':>12} {'Throughput':>20}")
+    for name, result in results.items():
+        rate = f"{result['per_second']:,.1f} {result['unit']}/s" if result['per_second'] else '-'
+        print(f"{name:<22} {result['median']:>12.4f} {result['min']:>12.4f} {rate:>20}")
+    logger.info(f"Results appended to {args.history}")
+    return 0
+
+
+def compare_command(args) -> int:
+    history = load_history(args.history)
+    try:
+        baseline, candidate = history[args.baseline], history[args.candidate]
+    except IndexError:
+        logger.error(f"{args.history} has {len(history)} runs; cannot compare {args.baseline} with {args.candidate}")
+        return 1
+
+    rows = compare_runs(baseline, candidate, args.threshold)
+    print(f"\nBaseline {baseline.get('label') or baseline.get('commit')} ({baseline['timestamp']}) vs "
+          f"candidate {candidate.get('label') or candidate.get('commit')} ({candidate['timestamp']})")
+    print(f"{'Benchmark':<22} {'Baseline (s)':>14} {'Candidate (s)':>14} {'Change':>9}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<22} {row['baseline']:>14.4f} {row['candidate']:>14.4f} {row['change']:>+9.1%}{flag}")
+
+    regressions = [row['name'] for row in rows if row['regression']]
+    if regressions:
+        logger.error(f"{len(regressions)} benchmarks regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the extract and populate pipeline")
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help=f'JSON history file (default: {DEFAULT_HISTORY})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and append the results to the history')
+    run_parser.add_argument('--corpus', default=str(DEFAULT_CORPUS),
+                            help='Directory of raw_game_*.json files (default: tests/test_data)')
+    run_parser.add_argument('--synthetic', type=int, default=20,
+                            help='Synthetic games added to the corpus (default: 20)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (default: 3)')
+    run_parser.add_argument('--database-url',
+                            help='Empty scratch database to populate (default: temporary SQLite file)')
+    run_parser.add_argument('--only', nargs='+', choices=['extract', 'html_extract', 'populate', 'validate'],
+                            help='Run only these benchmarks')
+    run_parser.add_argument('--label', help='Label stored with the results, e.g. a branch name')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two runs from the history')
+    compare_parser.add_argument('--baseline', type=int, default=-2,
+                                help='History index of the baseline run (default: -2, the previous run)')
+    compare_parser.add_argument('--candidate', type=int, default=-1,
+                                help='History index of the candidate run (default: -1, the latest run)')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help=f'Relative slowdown flagged as a regression (default: {DEFAULT_THRESHOLD})')
+
+    args = parser.parse_args()
+
+    # Pipeline logging stays quiet so runs time the work, not the console; the
+    # validator's findings on the corpus are not benchmark results
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger(DataValidator.__module__).setLevel(logging.CRITICAL)
+    logger.setLevel(logging.INFO)
+
+    try:
+        command = run_command if args.command == 'run' else compare_command
+        sys.exit(command(args))
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
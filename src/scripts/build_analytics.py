@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Build derived analytics tables from populated game tables.
+Supports possession segmentation, lineup/stint reconstruction, game-state
+summaries, shot chart bins and season aggregates.
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, Optional, Callable
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from ..database.services import DatabaseConnection
+from ..database.models import Game
+from ..analytics.possessions import PossessionService
+from ..analytics.lineups import LineupService
+from ..analytics.game_state import GameSummaryService
+from ..analytics.shot_charts import ShotChartService
+from ..analytics.season_stats import SeasonStatsService
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler('build_analytics.log')
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsBuilder:
+    """Orchestrates building of derived analytics tables"""
+
+    def __init__(self, batch_size: int = 250):
+        self.db_connection = DatabaseConnection()
+        self.engine = self.db_connection.get_engine()
+        self.Session = sessionmaker(bind=self.engine)
+        self.batch_size = batch_size
+
+    def _select_game_ids(self, session, game_ids: Optional[List[int]] = None,
+                         seasons: Optional[List[int]] = None,
+                         pending: Optional[Callable] = None) -> List[int]:
+        """
+        Resolve the set of games to process.
+
+        Args:
+            session: Database session
+            game_ids: Restrict to these games
+            seasons: Restrict to these seasons
+            pending: Service method returning unbuilt games (incremental mode)
+
+        Returns:
+            Sorted list of game IDs
+        """
+        if pending is not None:
+            targets = pending(seasons=seasons)
+            if game_ids:
+                wanted = set(game_ids)
+                targets = [g for g in targets if g in wanted]
+            return targets
+
+        query = select(Game.game_id).order_by(Game.game_id)
+        if game_ids:
+            query = query.where(Game.game_id.in_(game_ids))
+        if seasons:
+            query = query.where(Game.season.in_(seasons))
+        return list(session.scalars(query))
+
+    def build_possessions(self, game_ids: Optional[List[int]] = None,
+                          seasons: Optional[List[int]] = None,
+                          incremental: bool = False) -> dict:
+        """
+        Build the possession table.
+
+        Args:
+            game_ids: Specific games to rebuild
+            seasons: Seasons to rebuild
+            incremental: Only process games that have no possessions yet
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = datetime.now()
+
+        with self.Session() as session:
+            service = PossessionService(session, batch_size=self.batch_size)
+
+            targets = self._select_game_ids(session, game_ids, seasons,
+                                            pending=service.pending_game_ids if incremental else None)
+
+            logger.info(f"Building possessions for {len(targets)} games")
+            stats = service.build(targets)
+
+        stats['duration'] = datetime.now() - start_time
+        logger.info(f"✅ Built {stats['possessions']} possessions for {stats['games']} games "
+                    f"in {stats['duration']}")
+        return stats
+
+    def build_lineups(self, game_ids: Optional[List[int]] = None,
+                      seasons: Optional[List[int]] = None,
+                      incremental: bool = False) -> dict:
+        """
+        Build the lineup and stint tables.
+
+        Args:
+            game_ids: Specific games to rebuild
+            seasons: Seasons to rebuild
+            incremental: Only process games that have no stints yet
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = datetime.now()
+
+        with self.Session() as session:
+            service = LineupService(session, batch_size=self.batch_size)
+
+            targets = self._select_game_ids(session, game_ids, seasons,
+                                            pending=service.pending_game_ids if incremental else None)
+
+            logger.info(f"Building lineups and stints for {len(targets)} games")
+            stats = service.build(targets)
+
+        stats['duration'] = datetime.now() - start_time
+        logger.info(f"✅ Built {stats['stints']} stints ({stats['lineups']} new lineups) "
+                    f"for {stats['games']} games in {stats['duration']}")
+        if stats['incomplete']:
+            logger.warning(f"⚠️  {stats['incomplete']} stints skipped a team with an incomplete lineup")
+        return stats
+
+    def build_game_summaries(self, game_ids: Optional[List[int]] = None,
+                             seasons: Optional[List[int]] = None,
+                             incremental: bool = False) -> dict:
+        """
+        Build the game_summary table.
+
+        Args:
+            game_ids: Specific games to rebuild
+            seasons: Seasons to rebuild
+            incremental: Only process games that have no summary yet
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = datetime.now()
+
+        with self.Session() as session:
+            service = GameSummaryService(session, batch_size=self.batch_size)
+
+            targets = self._select_game_ids(session, game_ids, seasons,
+                                            pending=service.pending_game_ids if incremental else None)
+
+            logger.info(f"Building game summaries for {len(targets)} games")
+            stats = service.build(targets)
+
+        stats['duration'] = datetime.now() - start_time
+        logger.info(f"✅ Built {stats['summaries']} game summaries for {stats['games']} games "
+                    f"in {stats['duration']}")
+        return stats
+
+    def build_shot_charts(self, game_ids: Optional[List[int]] = None,
+                          seasons: Optional[List[int]] = None,
+                          incremental: bool = False) -> dict:
+        """
+        Build the shot_chart_bin table.
+
+        Args:
+            game_ids: Specific games to rebuild
+            seasons: Seasons to rebuild
+            incremental: Only process games that have no shot chart bins yet
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = datetime.now()
+
+        with self.Session() as session:
+            service = ShotChartService(session, batch_size=self.batch_size)
+
+            targets = self._select_game_ids(session, game_ids, seasons,
+                                            pending=service.pending_game_ids if incremental else None)
+
+            logger.info(f"Building shot charts for {len(targets)} games")
+            stats = service.build(targets)
+
+        stats['duration'] = datetime.now() - start_time
+        logger.info(f"✅ Built {stats['bins']} shot chart bins for {stats['games']} games "
+                    f"in {stats['duration']}")
+        return stats
+
+    def build_season_stats(self, game_ids: Optional[List[int]] = None,
+                           seasons: Optional[List[int]] = None,
+                           incremental: bool = False) -> dict:
+        """
+        Build the player_season_stats and team_season_stats tables.
+
+        Without game IDs or --incremental this is a full rebuild of the
+        selected seasons (all seasons for --all).
+
+        Args:
+            game_ids: Refresh the team-seasons of these games
+            seasons: Seasons to rebuild
+            incremental: Only refresh team-seasons whose game counts are stale
+
+        Returns:
+            Dictionary with processing statistics
+        """
+        start_time = datetime.now()
+
+        with self.Session() as session:
+            service = SeasonStatsService(session, batch_size=self.batch_size)
+
+            if game_ids or incremental:
+                targets = self._select_game_ids(session, game_ids, seasons,
+                                                pending=service.pending_game_ids if incremental else None)
+                logger.info(f"Refreshing season stats for {len(targets)} games")
+                stats = service.build(targets)
+            else:
+                logger.info(f"Rebuilding season stats for {'seasons ' + str(seasons) if seasons else 'all seasons'}")
+                stats = service.rebuild(seasons)
+
+        stats['duration'] = datetime.now() - start_time
+        logger.info(f"✅ Wrote {stats['players']} player and {stats['teams']} team season rows "
+                    f"for {stats['team_seasons']} team-seasons in {stats['duration']}")
+        return stats
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Build derived WNBA analytics tables"
+    )
+    parser.add_argument(
+        'table', choices=['possessions', 'lineups', 'game-state', 'shot-charts', 'season-stats'],
+        help='Analytics table to build'
+    )
+
+    # Mode selection
+    mode_group = parser.add_mutually_exclusive_group(required=True)
+    mode_group.add_argument(
+        '--all', action='store_true',
+        help='Process all games'
+    )
+    mode_group.add_argument(
+        '--game-ids', type=int, nargs='+',
+        help='Process specific game IDs'
+    )
+    mode_group.add_argument(
+        '--seasons', type=int, nargs='+',
+        help='Process games from specific seasons'
+    )
+
+    # Options
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Only process games that have not been built yet'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=250,
+        help='Number of games loaded per vectorized batch (default: 250)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        builder = AnalyticsBuilder(batch_size=args.batch_size)
+
+        if args.table == 'possessions':
+            builder.build_possessions(
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                incremental=args.incremental
+            )
+        elif args.table == 'lineups':
+            builder.build_lineups(
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                incremental=args.incremental
+            )
+        elif args.table == 'game-state':
+            builder.build_game_summaries(
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                incremental=args.incremental
+            )
+        elif args.table == 'shot-charts':
+            builder.build_shot_charts(
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                incremental=args.incremental
+            )
+        elif args.table == 'season-stats':
+            builder.build_season_stats(
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                incremental=args.incremental
+            )
+
+    except Exception as e:
+        logger.error(f"Analytics build failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
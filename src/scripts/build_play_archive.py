@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Build a memory-mapped binary play archive from the play table for fast
+offline analytics.
+"""
+
+import argparse
+import logging
+import sys
+
+from sqlalchemy.orm import sessionmaker
+
+from ..database.services import DatabaseConnection
+from ..analytics.play_archive import build_play_archive
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Build a memory-mapped play archive"
+    )
+    parser.add_argument(
+        'output_dir',
+        help='Archive directory (replaced if it exists)'
+    )
+    parser.add_argument(
+        '--seasons', type=int, nargs='+',
+        help='Only archive these seasons'
+    )
+    parser.add_argument(
+        '--game-ids', type=int, nargs='+',
+        help='Only archive these games'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=250,
+        help='Games loaded per batch (default: 250)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        engine = DatabaseConnection().get_engine()
+        with sessionmaker(bind=engine)() as session:
+            stats = build_play_archive(
+                session, args.output_dir,
+                game_ids=args.game_ids,
+                seasons=args.seasons,
+                batch_size=args.batch_size
+            )
+
+        print(f"\n🗄️  PLAY ARCHIVE ({args.output_dir}):")
+        print(f"  Games: {stats['games']}")
+        print(f"  Plays: {stats['plays']}")
+
+    except Exception as e:
+        logger.error(f"Play archive build failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
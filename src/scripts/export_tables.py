@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Export normalized tables as NDJSON or CSV.
+Rows are streamed from a server-side cursor, so memory use does not depend
+on the size of the export.
+"""
+
+import argparse
+import logging
+import sys
+
+from sqlalchemy.orm import sessionmaker
+
+from ..database.services import DatabaseConnection
+from ..database.export import EXPORT_TABLES, EXPORT_FORMATS, write_export
+
+
+# Configure logging (stdout may carry the export itself)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stderr)]
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Export normalized WNBA tables as NDJSON or CSV"
+    )
+    parser.add_argument(
+        'table', choices=list(EXPORT_TABLES),
+        help='Table to export'
+    )
+    parser.add_argument(
+        '--format', choices=EXPORT_FORMATS, default='ndjson',
+        help='Output format (default: ndjson)'
+    )
+    parser.add_argument(
+        '--output', '-o', default='-',
+        help='Output file, "-" for stdout (default: stdout)'
+    )
+    parser.add_argument(
+        '--gzip', action='store_true',
+        help='Gzip the output (implied by an output name ending in .gz)'
+    )
+    parser.add_argument(
+        '--seasons', type=int, nargs='+',
+        help='Export games from specific seasons'
+    )
+    parser.add_argument(
+        '--game-type', choices=['regular', 'playoff'],
+        help='Export only this game type'
+    )
+    parser.add_argument(
+        '--team-ids', type=int, nargs='+',
+        help='Export games involving these teams (API team ids)'
+    )
+    parser.add_argument(
+        '--game-ids', type=int, nargs='+',
+        help='Export specific game IDs'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=5000,
+        help='Rows fetched per round trip (default: 5000)'
+    )
+
+    args = parser.parse_args()
+    compress = args.gzip or args.output.endswith('.gz')
+
+    try:
+        engine = DatabaseConnection().get_engine()
+        session = sessionmaker(bind=engine)()
+        out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+        try:
+            write_export(
+                session, args.table, out,
+                fmt=args.format,
+                compress=compress,
+                batch_size=args.batch_size,
+                seasons=args.seasons,
+                game_types=[args.game_type] if args.game_type else None,
+                team_ids=args.team_ids,
+                game_ids=args.game_ids
+            )
+        finally:
+            session.close()
+            if out is not sys.stdout.buffer:
+                out.close()
+            else:
+                out.flush()
+
+    except Exception as e:
+        logger.error(f"Export failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
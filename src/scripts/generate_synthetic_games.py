@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic games for load testing. Games are written as
+raw_game_{id}.json files or streamed straight into raw_game_data, where
+populate_game_tables picks them up like scraped games.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from ..database.services import DatabaseConnection
+from ..database.synthetic_games import SyntheticConfig, SyntheticGameGenerator, stream_to_raw_game_data
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+def write_files(games, output_dir: str) -> int:
+    """Write each game's JSON to output_dir; returns the number written"""
+    os.makedirs(output_dir, exist_ok=True)
+    written = 0
+    for game in games:
+        with open(os.path.join(output_dir, f"raw_game_{game['game_id']}.json"), 'w') as f:
+            json.dump(game['game_data'], f)
+        written += 1
+    return written
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic WNBA game JSON for load testing"
+    )
+    parser.add_argument(
+        '--seasons', type=int, nargs='+', default=[2024],
+        help='Seasons to generate (default: 2024)'
+    )
+    parser.add_argument(
+        '--games-per-season', type=int, default=100,
+        help='Regular season games per season (default: 100)'
+    )
+    parser.add_argument(
+        '--playoff-games', type=int, default=0,
+        help='Playoff games per season (default: 0)'
+    )
+    parser.add_argument(
+        '--teams', type=int, default=12,
+        help='Number of teams (default: 12)'
+    )
+    parser.add_argument(
+        '--roster-size', type=int, default=12,
+        help='Players per roster (default: 12)'
+    )
+    parser.add_argument(
+        '--plays-per-game', type=int, default=450,
+        help='Approximate actions per regulation game (default: 450)'
+    )
+    parser.add_argument(
+        '--periods', type=int, default=4,
+        help='Regulation periods (default: 4)'
+    )
+    parser.add_argument(
+        '--period-minutes', type=int, default=10,
+        help='Minutes per regulation period (default: 10)'
+    )
+    parser.add_argument(
+        '--roster-churn', type=float, default=0.2,
+        help='Share of each roster replaced between seasons (default: 0.2)'
+    )
+    parser.add_argument(
+        '--name-variation', type=float, default=0.02,
+        help="Chance a player's name is written differently in a game (default: 0.02)"
+    )
+    parser.add_argument(
+        '--old-era-fraction', type=float, default=0.0,
+        help='Share of games with only postgameCharts team totals (default: 0)'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Random seed (default: 0)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Write raw_game_{id}.json files here instead of inserting into raw_game_data'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=200,
+        help='Games per insert when streaming to the database (default: 200)'
+    )
+
+    args = parser.parse_args()
+
+    config = SyntheticConfig(
+        seasons=args.seasons,
+        games_per_season=args.games_per_season,
+        playoff_games_per_season=args.playoff_games,
+        teams=args.teams,
+        roster_size=args.roster_size,
+        plays_per_game=args.plays_per_game,
+        periods=args.periods,
+        period_minutes=args.period_minutes,
+        roster_churn=args.roster_churn,
+        name_variation=args.name_variation,
+        old_era_fraction=args.old_era_fraction,
+        seed=args.seed,
+    )
+
+    try:
+        games = SyntheticGameGenerator(config).generate()
+        if args.output:
+            written = write_files(games, args.output)
+            destination = args.output
+        else:
+            written = stream_to_raw_game_data(DatabaseConnection().get_engine(), games, args.batch_size)
+            destination = 'raw_game_data'
+
+        print(f"\n🧪 SYNTHETIC GAMES ({destination}):")
+        print(f"  Seasons: {', '.join(str(s) for s in args.seasons)}")
+        print(f"  Games written: {written}")
+
+    except Exception as e:
+        logger.error(f"Synthetic game generation failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
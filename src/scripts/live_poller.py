@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Live polling of games in progress.
+
+Re-scraping a game normally replaces its raw JSON and repopulates every
+normalized table. While a game is in progress the poller instead fetches the
+page, appends only the plays whose actionNumber is past the last stored play,
+and refreshes the game's game_summary (score, lead changes, runs), leaving
+raw_game_data and the other tables untouched.
+
+A game is fully stored and populated once when it is first seen in progress,
+and once more when it is final, so corrections the league makes to earlier
+plays and the final boxscores end up in every table. Until that final pass
+the game's game_status stays in progress, so the API keeps revalidating its
+responses instead of caching them as immutable.
+
+Each game is polled on its own adaptive interval: back to the minimum as soon
+as a poll finds new plays, doubling up to the maximum while nothing happens
+(timeouts, halftime) and at the maximum before tip-off.
+"""
+
+import argparse
+import heapq
+import logging
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, insert, update, func
+
+from ..database.models import RawGameData, Game
+from ..database.population_services import GamePopulationService
+from ..database.game_utils import (
+    parse_game_id, GAME_STATUS_SCHEDULED as SCHEDULED, GAME_STATUS_IN_PROGRESS as IN_PROGRESS,
+    GAME_STATUS_FINAL as FINAL
+)
+from ..scrapers.game_url_generator import GameURLGenerator, GameURLInfo
+from ..scrapers.raw_data_extractor import RawDataExtractor, ExtractionResult
+from .populate_game_tables import GameTablePopulator
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LiveGamePoller:
+    """Polls games in progress and appends their new plays"""
+
+    def __init__(self, populator: GameTablePopulator, extractor: Optional[RawDataExtractor] = None,
+                 min_interval: float = 15.0, max_interval: float = 120.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            populator: Populator for the full population of new and final games
+            extractor: Page fetcher (default: a RawDataExtractor)
+            min_interval: Seconds between polls of a game while plays keep coming
+            max_interval: Longest interval, used before tip-off and while idle
+            clock: Monotonic time source
+        """
+        self.populator = populator
+        self.extractor = extractor or RawDataExtractor()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.stats = {'polls': 0, 'plays_appended': 0, 'games_final': 0, 'failed_polls': 0}
+
+    def stop(self):
+        """Exit run() after the current poll"""
+        self.stop_event.set()
+
+    def poll(self, game_url_info: GameURLInfo) -> Dict:
+        """
+        Fetch a game once and bring its tables up to date.
+
+        Returns:
+            Dict with the game's status and the action taken: 'waiting'
+            (not started), 'populated' (first seen in progress), 'appended'
+            (with the number of plays), 'finalized' or 'failed'
+        """
+        game_id = int(game_url_info.game_id)
+        self.stats['polls'] += 1
+        result, game_json, _ = self.extractor.extract_game_data(game_url_info.game_url)
+        if result != ExtractionResult.SUCCESS or not game_json:
+            logger.warning(f"Live poll of game {game_id} failed: {result}")
+            self.stats['failed_polls'] += 1
+            return {'game_id': game_id, 'status': None, 'action': 'failed', 'appended': 0}
+
+        status = game_json['boxscore'].get('gameStatus')
+        outcome = {'game_id': game_id, 'status': status, 'action': 'waiting', 'appended': 0}
+        if status == FINAL:
+            self._store_and_populate(game_url_info, game_json)
+            self.stats['games_final'] += 1
+            outcome['action'] = 'finalized'
+        elif status == IN_PROGRESS and not self._is_populated(game_id):
+            self._store_and_populate(game_url_info, game_json)
+            outcome['action'] = 'populated'
+        elif status == IN_PROGRESS:
+            with self.populator.Session() as session:
+                service = GamePopulationService(session, refresh_season_stats=False)
+                outcome['appended'] = service.append_new_plays(game_json)
+                session.commit()
+            self.stats['plays_appended'] += outcome['appended']
+            outcome['action'] = 'appended'
+        return outcome
+
+    def next_interval(self, interval: float, outcome: Dict) -> float:
+        """Seconds until a game's next poll, given its last interval and poll outcome"""
+        if outcome['action'] == 'populated' or outcome['appended']:
+            return self.min_interval
+        if outcome['status'] == SCHEDULED:
+            return self.max_interval
+        return min(interval * 2, self.max_interval)
+
+    def _is_populated(self, game_id: int) -> bool:
+        with self.populator.Session() as session:
+            return session.scalar(select(Game.game_id).where(Game.game_id == game_id)) is not None
+
+    def _store_and_populate(self, game_url_info: GameURLInfo, game_json: Dict):
+        """Store the game's raw JSON, replacing any, and repopulate all its tables"""
+        table = RawGameData.__table__
+        game_id = int(game_url_info.game_id)
+        with self.populator.engine.begin() as conn:
+            updated = conn.execute(
+                update(table).where(table.c.game_id == game_id).values(game_data=game_json, updated_at=func.now())
+            ).rowcount
+            if not updated:
+                conn.execute(insert(table).values(
+                    game_id=game_id, season=int(game_url_info.season), game_type=game_url_info.game_type,
+                    game_url=game_url_info.game_url, game_data=game_json,
+                    created_at=func.now(), updated_at=func.now()
+                ))
+        stats = self.populator.populate_specific_games([game_id], override_existing=True)
+        if stats['failed_games']:
+            raise RuntimeError(f"Population of game {game_id} failed")
+
+    def run(self, game_url_infos: List[GameURLInfo]) -> Dict:
+        """Poll the games until all are final or stop() is called"""
+        # (next poll time, game_id, interval) per game still being polled
+        schedule = [(self.clock(), int(info.game_id), self.min_interval) for info in game_url_infos]
+        heapq.heapify(schedule)
+        games = {int(info.game_id): info for info in game_url_infos}
+
+        while schedule and not self.stop_event.is_set():
+            due, game_id, interval = schedule[0]
+            if self.stop_event.wait(max(0.0, due - self.clock())):
+                break
+            heapq.heappop(schedule)
+
+            try:
+                outcome = self.poll(games[game_id])
+            except Exception as e:
+                logger.error(f"Live poll of game {game_id} failed: {e}")
+                self.stats['failed_polls'] += 1
+                outcome = {'game_id': game_id, 'status': None, 'action': 'failed', 'appended': 0}
+
+            if outcome['action'] == 'finalized':
+                logger.info(f"Game {game_id} is final; stopped polling it")
+                continue
+            interval = self.next_interval(interval, outcome)
+            logger.info(f"Game {game_id}: {outcome['action']}, {outcome['appended']} new plays; "
+                        f"next poll in {interval:.0f}s")
+            heapq.heappush(schedule, (self.clock() + interval, game_id, interval))
+
+        logger.info(f"Live polling stopped: {self.stats['polls']} polls, {self.stats['plays_appended']} plays "
+                    f"appended, {self.stats['games_final']} games final, {self.stats['failed_polls']} failed polls")
+        return self.stats
+
+
+def game_url_infos(game_ids: List[str]) -> List[GameURLInfo]:
+    """GameURLInfo for each game ID, with its season and game type parsed from the ID"""
+    url_generator = GameURLGenerator()
+    infos = []
+    for game_id in game_ids:
+        parsed = parse_game_id(int(game_id))
+        if parsed['season'] is None:
+            raise ValueError(f"Malformed game ID: {game_id}")
+        infos.append(GameURLInfo(game_id=game_id, season=str(parsed['season']),
+                                 game_url=url_generator.generate_game_url(game_id),
+                                 game_type=parsed['game_type']))
+    return infos
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Poll WNBA games in progress and append their new plays until they are final"
+    )
+    parser.add_argument('--game-ids', type=str, nargs='+', required=True,
+                        help='Game IDs to poll')
+    parser.add_argument('--min-interval', type=float, default=15.0,
+                        help='Seconds between polls of a game while new plays keep coming (default: 15)')
+    parser.add_argument('--max-interval', type=float, default=120.0,
+                        help='Longest interval between polls, used before tip-off and while idle (default: 120)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus-format metrics at /metrics on this port while running')
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        metrics.enable()
+        metrics.start_http_server(args.metrics_port)
+
+    try:
+        poller = LiveGamePoller(GameTablePopulator(), min_interval=args.min_interval,
+                                max_interval=args.max_interval)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: poller.stop())
+        poller.run(game_url_infos(args.game_ids))
+    except Exception as e:
+        logger.error(f"Live polling failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
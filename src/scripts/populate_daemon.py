@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Long-running populator driven by Postgres notifications.
+
+Triggers on raw_game_data (migration 8f4d2a6c1e59) NOTIFY the 'raw_game_data'
+channel with the game_id of every inserted game and every game whose JSON
+changed. The daemon LISTENs on that channel, collects game IDs for a short
+window, and repopulates each batch with GameTablePopulator, clearing the
+games' existing rows first, so the normalized tables follow raw data within
+seconds without polling.
+
+Notifications are only delivered to connected listeners, so on start and
+after every reconnect the daemon catches up on games whose raw data changed
+after they were last populated (raw_game_data.updated_at > game.populated_at,
+or never populated).
+"""
+
+import argparse
+import logging
+import select
+import signal
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select as sql_select, or_
+
+from ..database.models import RawGameData, Game
+from .populate_game_tables import GameTablePopulator
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'raw_game_data'
+
+
+class PostgresListener:
+    """LISTENs on a channel over a dedicated psycopg2 connection"""
+
+    def __init__(self, engine, channel: str = CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        self._connection = None
+
+    def listen(self):
+        """(Re)connect and start listening"""
+        self.close()
+        raw = self.engine.raw_connection()
+        raw.detach()  # Autocommit below must not leak back into the pool
+        self._connection = raw.driver_connection
+        self._connection.autocommit = True
+        with self._connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        logger.info(f"Listening on channel {self.channel}")
+
+    def wait(self, timeout: float) -> List[str]:
+        """Payloads received within timeout seconds (empty if none arrived)"""
+        conn = self._connection
+        if not conn.notifies:
+            readable, _, _ = select.select([conn], [], [], timeout)
+            if readable:
+                conn.poll()
+        payloads = [notify.payload for notify in conn.notifies]
+        conn.notifies.clear()
+        return payloads
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+class PopulateDaemon:
+    """Repopulates games in batches as their raw data is inserted or changed"""
+
+    def __init__(self, populator: GameTablePopulator, listener=None, batch_window: float = 2.0,
+                 max_batch: int = 100, idle_timeout: float = 5.0, reconnect_delay: float = 5.0,
+                 catch_up: bool = True, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            populator: Populator used for each batch
+            listener: Notification source with listen(), wait(timeout) and
+                close() (default: a PostgresListener on the populator's engine)
+            batch_window: Seconds to keep collecting after the first game of a batch
+            max_batch: Populate as soon as this many distinct games are waiting
+            idle_timeout: Longest wait for a notification while nothing is waiting,
+                which bounds how long stop() takes to be noticed
+            reconnect_delay: Seconds between reconnection attempts
+            catch_up: Populate games changed while not listening on (re)connect
+            clock: Monotonic time source
+        """
+        self.populator = populator
+        self.listener = listener or PostgresListener(populator.engine)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+        self.reconnect_delay = reconnect_delay
+        self.catch_up_on_connect = catch_up
+        self.clock = clock
+        self.stop_event = threading.Event()
+        self.stats = {'batches': 0, 'games': 0, 'failed_games': 0, 'reconnects': 0}
+
+    def stop(self):
+        """Finish the current batch and exit run()"""
+        self.stop_event.set()
+
+    def games_to_catch_up(self) -> List[int]:
+        """Raw games never populated or changed since they were last populated"""
+        with self.populator.Session() as session:
+            return list(session.scalars(
+                sql_select(RawGameData.game_id)
+                .outerjoin(Game, Game.game_id == RawGameData.game_id)
+                .where(or_(Game.game_id.is_(None), Game.populated_at.is_(None),
+                           RawGameData.updated_at > Game.populated_at))
+                .order_by(RawGameData.game_id)
+            ))
+
+    def _connect(self):
+        self.listener.listen()
+        # Catch up after LISTEN, so changes made in between are not missed
+        if self.catch_up_on_connect:
+            missed = self.games_to_catch_up()
+            if missed:
+                logger.info(f"Catching up on {len(missed)} games changed while not listening")
+                for start in range(0, len(missed), self.max_batch):
+                    self.populate(missed[start:start + self.max_batch])
+
+    def populate(self, game_ids: List[int]) -> dict:
+        """Repopulate a batch of games"""
+        logger.info(f"Populating {len(game_ids)} changed games")
+        stats = self.populator.populate_specific_games(game_ids, override_existing=True)
+        self.stats['batches'] += 1
+        self.stats['games'] += stats['successful_games']
+        self.stats['failed_games'] += stats['failed_games']
+        return stats
+
+    def run(self):
+        """Listen and populate until stop() is called"""
+        pending: Dict[int, None] = {}  # Insertion-ordered set of waiting game IDs
+        first_at: Optional[float] = None
+        connected = False
+
+        while not self.stop_event.is_set():
+            try:
+                if not connected:
+                    self._connect()
+                    connected = True
+
+                if pending:
+                    timeout = max(0.0, first_at + self.batch_window - self.clock())
+                else:
+                    timeout = self.idle_timeout
+                for payload in self.listener.wait(timeout):
+                    try:
+                        pending[int(payload)] = None
+                    except ValueError:
+                        logger.warning(f"Ignoring notification with payload {payload!r}")
+                if pending and first_at is None:
+                    first_at = self.clock()
+
+                if pending and (len(pending) >= self.max_batch or self.clock() - first_at >= self.batch_window):
+                    self.populate(list(pending))
+                    pending, first_at = {}, None
+
+            except Exception as e:
+                # Connection lost or database unavailable; waiting games are
+                # picked up again by the catch-up after reconnecting
+                logger.error(f"Populate daemon error: {e}")
+                connected = False
+                self.stats['reconnects'] += 1
+                self.listener.close()
+                self.stop_event.wait(self.reconnect_delay)
+
+        if pending and connected:
+            self.populate(list(pending))
+        self.listener.close()
+        logger.info(f"Populate daemon stopped: {self.stats['games']} games populated in "
+                    f"{self.stats['batches']} batches, {self.stats['failed_games']} failed")
+        return self.stats
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Populate WNBA game tables as raw game data is inserted or changed (Postgres LISTEN/NOTIFY)"
+    )
+    parser.add_argument('--batch-window', type=float, default=2.0,
+                        help='Seconds to collect changed games before populating them (default: 2)')
+    parser.add_argument('--max-batch', type=int, default=100,
+                        help='Populate immediately once this many games are waiting (default: 100)')
+    parser.add_argument('--no-catch-up', action='store_true',
+                        help='Skip populating games that changed while the daemon was not running')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus-format metrics at /metrics on this port while running')
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        metrics.enable()
+        metrics.start_http_server(args.metrics_port)
+
+    try:
+        daemon = PopulateDaemon(GameTablePopulator(), batch_window=args.batch_window,
+                                max_batch=args.max_batch, catch_up=not args.no_catch_up)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: daemon.stop())
+        daemon.run()
+    except Exception as e:
+        logger.error(f"Populate daemon failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,13 +2,18 @@
 """
 Main script for populating normalized WNBA game tables from raw JSON data.
 Processes games from raw_game_data table and populates the 8 normalized tables.
+Season aggregates are refreshed once per run, for the team-seasons of the
+games it populated, rather than after every game.
 """
 
 import argparse
 import logging
+import queue
 import sys
+import threading
+import time
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, text
@@ -16,7 +21,10 @@ from sqlalchemy import create_engine, text
 from ..database.services import DatabaseConnection
 from ..database.models import RawGameData
 from ..database.population_services import GamePopulationService
+from ..database.population_runs import PopulationRunStore, PENDING, DONE, FAILED
+from ..analytics.season_stats import SeasonStatsService
 from ..database.services import DatabaseService
+from .. import metrics, profiling
 
 
 # Configure logging
@@ -31,13 +39,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Start time for chronological ordering, read without loading the whole game JSON
+GAME_ET = RawGameData.game_data[('boxscore', 'gameEt')].as_string()
+
+# Raw games loaded per query while processing a run
+FETCH_BATCH_SIZE = 100
+
+
 class GameTablePopulator:
     """Main orchestrator for populating game tables"""
     
-    def __init__(self):
-        self.db_connection = DatabaseConnection()
-        self.engine = self.db_connection.get_engine()
+    def __init__(self, engine=None):
+        """
+        Args:
+            engine: SQLAlchemy engine (defaults to the configured database)
+        """
+        if engine is None:
+            self.db_connection = DatabaseConnection()
+            engine = self.db_connection.get_engine()
+        self.engine = engine
         self.Session = sessionmaker(bind=self.engine)
+        self.runs = PopulationRunStore(self.engine)
+        self._stats_lock = threading.Lock()
     
     def populate_all_games(self, limit: Optional[int] = None, 
                           resume_from_game_id: Optional[int] = None,
@@ -57,7 +80,7 @@ class GameTablePopulator:
         
         with self.Session() as session:
             # Get games to process
-            query = session.query(RawGameData).order_by(RawGameData.game_id)
+            query = session.query(RawGameData.game_id, GAME_ET).order_by(RawGameData.game_id)
             
             if resume_from_game_id:
                 query = query.filter(RawGameData.game_id >= resume_from_game_id)
@@ -68,13 +91,17 @@ class GameTablePopulator:
                 logger.info(f"Processing limit: {limit} games")
             
             games = query.all()
-            logger.info(f"Found {len(games)} games to process")
-            
-            # Sort games chronologically by extracting game_et from JSON data
-            logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
-            games = self._sort_games_chronologically(games)
-            
-            return self._process_games(games, override_existing=override_existing)
+        logger.info(f"Found {len(games)} games to process")
+        
+        # Sort games chronologically by extracting game_et from JSON data
+        logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
+        game_ids = self._sort_games_chronologically(games)
+        
+        description = ' '.join(part for part in (
+            f"from={resume_from_game_id}" if resume_from_game_id else '',
+            f"limit={limit}" if limit else '',
+        ) if part)
+        return self._start_run(game_ids, 'all', description, override_existing)
     
     def populate_specific_games(self, game_ids: List[int], override_existing: bool = False) -> dict:
         """
@@ -90,24 +117,24 @@ class GameTablePopulator:
         logger.info(f"Starting population of {len(game_ids)} specific games")
         
         with self.Session() as session:
-            games = (session.query(RawGameData)
+            games = (session.query(RawGameData.game_id, GAME_ET)
                     .filter(RawGameData.game_id.in_(game_ids))
                     .order_by(RawGameData.game_id)
                     .all())
-            
-            found_ids = [g.game_id for g in games]
-            missing_ids = set(game_ids) - set(found_ids)
-            
-            if missing_ids:
-                logger.warning(f"Games not found in raw data: {sorted(missing_ids)}")
-            
-            logger.info(f"Found {len(games)} games to process")
-            
-            # Sort games chronologically by extracting game_et from JSON data
-            logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
-            games = self._sort_games_chronologically(games)
-            
-            return self._process_games(games, override_existing=override_existing)
+        
+        found_ids = [g.game_id for g in games]
+        missing_ids = set(game_ids) - set(found_ids)
+        
+        if missing_ids:
+            logger.warning(f"Games not found in raw data: {sorted(missing_ids)}")
+        
+        logger.info(f"Found {len(games)} games to process")
+        
+        # Sort games chronologically by extracting game_et from JSON data
+        logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
+        sorted_ids = self._sort_games_chronologically(games)
+        
+        return self._start_run(sorted_ids, 'games', f"{len(game_ids)} requested", override_existing)
     
     def populate_games_by_season(self, seasons: List[int], 
                                 limit: Optional[int] = None,
@@ -126,7 +153,7 @@ class GameTablePopulator:
         logger.info(f"Starting population for seasons: {seasons}")
         
         with self.Session() as session:
-            query = (session.query(RawGameData)
+            query = (session.query(RawGameData.game_id, GAME_ET)
                     .filter(RawGameData.season.in_(seasons))
                     .order_by(RawGameData.season, RawGameData.game_id))
             
@@ -135,59 +162,129 @@ class GameTablePopulator:
                 logger.info(f"Processing limit: {limit} games per season")
             
             games = query.all()
-            logger.info(f"Found {len(games)} games to process")
+        logger.info(f"Found {len(games)} games to process")
+        
+        # Sort games chronologically by extracting game_et from JSON data
+        logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
+        game_ids = self._sort_games_chronologically(games)
+        
+        description = f"seasons={seasons}" + (f" limit={limit}" if limit else '')
+        return self._start_run(game_ids, 'seasons', description, override_existing)
+    
+    def resume_run(self, run_id: Optional[int] = None) -> dict:
+        """
+        Continue a population run with the games it has not attempted yet.
+        
+        Args:
+            run_id: Run to resume (default: the most recent run)
             
-            # Sort games chronologically by extracting game_et from JSON data
-            logger.info("Sorting games chronologically to ensure correct first_used timestamps...")
-            games = self._sort_games_chronologically(games)
+        Returns:
+            Dictionary with processing statistics
+        """
+        run = self._get_run(run_id)
+        game_ids = self.runs.game_ids(run['population_run_id'], (PENDING,))
+        logger.info(f"Resuming population run {run['population_run_id']} ({run['mode']} {run['description']}): "
+                    f"{len(game_ids)} of {run['total_games']} games pending")
+        return self._continue_run(run, game_ids)
+    
+    def retry_failed_games(self, run_id: Optional[int] = None) -> dict:
+        """
+        Populate the games that failed in a population run again.
+        
+        Args:
+            run_id: Run whose failed games are retried (default: the most recent run)
             
-            return self._process_games(games, override_existing=override_existing)
+        Returns:
+            Dictionary with processing statistics
+        """
+        run = self._get_run(run_id)
+        game_ids = self.runs.game_ids(run['population_run_id'], (FAILED,))
+        logger.info(f"Retrying {len(game_ids)} failed games of population run {run['population_run_id']}")
+        return self._continue_run(run, game_ids)
+    
+    def _get_run(self, run_id: Optional[int]) -> dict:
+        run = self.runs.get(run_id)
+        if run is None:
+            raise ValueError(f"Population run {run_id} not found" if run_id else "No population runs recorded")
+        return run
+    
+    def _start_run(self, game_ids: List[int], mode: str, description: str, override_existing: bool) -> dict:
+        run_id = self.runs.create(game_ids, mode, description, override_existing=override_existing)
+        return self._process_games(run_id, game_ids, override_existing=override_existing)
+    
+    def _continue_run(self, run: dict, game_ids: List[int]) -> dict:
+        self.runs.start(run['population_run_id'])
+        return self._process_games(run['population_run_id'], game_ids,
+                                   override_existing=bool(run['override_existing']))
     
-    def _sort_games_chronologically(self, games: List[RawGameData]) -> List[RawGameData]:
+    def _sort_games_chronologically(self, games) -> List[int]:
         """
-        Sort games chronologically by extracting game_et from JSON data.
+        Sort games chronologically by their game_et start time.
         This ensures first_used timestamps are set correctly.
+        
+        Args:
+            games: Rows of (game_id, game_et string) in game ID order
+            
+        Returns:
+            Game IDs in chronological order
         """
-        def extract_game_et(raw_game: RawGameData):
-            """Extract game_et timestamp from JSON data for sorting"""
+        undated = datetime(1900, 1, 1, tzinfo=timezone.utc)  # Very early date for games without timestamps
+        
+        def parse_game_et(game_id: int, game_et_str: Optional[str]) -> datetime:
+            """Parse a game_et timestamp for sorting"""
+            if not game_et_str:
+                return undated
             try:
-                game_data = raw_game.game_data
-                if 'boxscore' in game_data and 'gameEt' in game_data['boxscore']:
-                    game_et_str = game_data['boxscore']['gameEt']
-                    if game_et_str:
-                        from datetime import datetime
-                        return datetime.fromisoformat(game_et_str.replace('Z', '+00:00'))
-                
-                # Fallback: use game_id as proxy for chronological order within same format
-                return datetime(1900, 1, 1)  # Very early date for games without timestamps
-                
-            except Exception as e:
-                logger.warning(f"Could not extract game_et from game {raw_game.game_id}: {e}")
-                return datetime(1900, 1, 1)  # Very early date for problematic games
+                game_et = datetime.fromisoformat(game_et_str.replace('Z', '+00:00'))
+            except ValueError as e:
+                logger.warning(f"Could not extract game_et from game {game_id}: {e}")
+                return undated
+            return game_et if game_et.tzinfo else game_et.replace(tzinfo=timezone.utc)
         
-        # Sort by game_et timestamp
-        sorted_games = sorted(games, key=extract_game_et)
+        # Sort by game_et timestamp; the sort is stable, so ties keep game ID order
+        keyed = sorted(((parse_game_et(game_id, game_et), game_id) for game_id, game_et in games),
+                       key=lambda item: item[0])
         
-        if len(sorted_games) > 0:
-            first_date = extract_game_et(sorted_games[0])
-            last_date = extract_game_et(sorted_games[-1])
-            logger.info(f"Games sorted chronologically: {first_date} to {last_date}")
+        if keyed:
+            logger.info(f"Games sorted chronologically: {keyed[0][0]} to {keyed[-1][0]}")
         
-        return sorted_games
+        return [game_id for _, game_id in keyed]
     
-    def _process_games(self, games: List[RawGameData], override_existing: bool = False) -> dict:
+    def _process_games(self, run_id: int, game_ids: List[int], override_existing: bool = False) -> dict:
         """
-        Process a list of games with transaction management.
+        Process a run's games in order, each in its own transaction.
+        
+        Each game's status in the run is updated with its outcome, so an
+        interrupted run can be resumed from the first game not yet attempted.
         
         Args:
-            games: List of RawGameData objects to process
+            run_id: Population run the games belong to
+            game_ids: Game IDs to process, in order
             override_existing: If True, clear existing data for each game before processing
             
         Returns:
             Dictionary with processing statistics
         """
-        stats = {
-            'total_games': len(games),
+        stats = self._new_stats(run_id, len(game_ids))
+        for batch_start in range(0, len(game_ids), FETCH_BATCH_SIZE):
+            batch = game_ids[batch_start:batch_start + FETCH_BATCH_SIZE]
+            game_data = self._load_game_data(batch)
+            
+            for i, game_id in enumerate(batch, batch_start + 1):
+                logger.info(f"Processing game {game_id} ({i}/{len(game_ids)})")
+                self._populate_game(run_id, game_id, game_data.pop(game_id, None), stats,
+                                    override_existing=override_existing)
+                
+                # Log progress every 10 games
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{len(game_ids)} games processed")
+        
+        return self._finish_run(stats)
+    
+    def _new_stats(self, run_id: int, total_games: int) -> dict:
+        return {
+            'population_run_id': run_id,
+            'total_games': total_games,
             'successful_games': 0,
             'failed_games': 0,
             'failed_game_ids': [],
@@ -204,56 +301,107 @@ class GameTablePopulator:
             'start_time': datetime.now(),
             'end_time': None
         }
+    
+    def _load_game_data(self, game_ids: List[int]) -> dict:
+        """Raw game JSON by game ID"""
+        with self.Session() as session:
+            return dict(session.query(RawGameData.game_id, RawGameData.game_data)
+                        .filter(RawGameData.game_id.in_(game_ids)))
+    
+    def _populate_game(self, run_id: int, game_id: int, game_json: Optional[dict], stats: dict,
+                       override_existing: bool = False) -> bool:
+        """
+        Populate one game in its own transaction and record the outcome in the
+        run and in stats. Safe to call from several threads.
         
-        for i, raw_game in enumerate(games, 1):
-            game_id = raw_game.game_id
+        Args:
+            game_json: Game JSON; None loads it from raw_game_data
+        
+        Returns:
+            True if the game was populated
+        """
+        game_start = time.perf_counter()
+        try:
+            if game_json is None:
+                game_json = self._load_game_data([game_id]).get(game_id)
+            if game_json is None:
+                raise LookupError(f"game {game_id} is not in raw_game_data")
             
-            try:
-                # Process each game in its own transaction
-                with self.Session() as session:
-                    population_service = GamePopulationService(session)
-                    
-                    logger.info(f"Processing game {game_id} ({i}/{len(games)})")
-                    
-                    # Clear existing data if override is requested
-                    if override_existing:
-                        logger.info(f"Override flag set - clearing existing data for game {game_id}")
-                        population_service.clear_game_data(game_id)
-                    
-                    # Populate the game
-                    game_results = population_service.populate_game(raw_game.game_data)
-                    
-                    # Commit the transaction
-                    session.commit()
-                    
-                    # Update statistics
-                    stats['successful_games'] += 1
-                    for table, count in game_results.items():
-                        stats['table_counts'][table] += count
-                    
-                    # Log progress every 10 games
-                    if i % 10 == 0:
-                        logger.info(f"Progress: {i}/{len(games)} games processed")
-                    
-            except Exception as e:
-                logger.error(f"Failed to process game {game_id}: {e}")
+            with self.Session() as session:
+                # Season stats are refreshed once when the run finishes
+                population_service = GamePopulationService(session, refresh_season_stats=False)
+                
+                # Clear existing data if override is requested
+                if override_existing:
+                    logger.info(f"Override flag set - clearing existing data for game {game_id}")
+                    population_service.clear_game_data(game_id)
+                
+                # Populate the game
+                game_results = population_service.populate_game(game_json)
+                
+                # Record the game as done and commit both together
+                self.runs.mark_done(session, run_id, game_id)
+                session.commit()
+        
+        except Exception as e:
+            logger.error(f"Failed to process game {game_id}: {e}")
+            metrics.POPULATE_GAME_SECONDS.observe(time.perf_counter() - game_start, outcome='failed')
+            self.runs.mark_failed(run_id, game_id, str(e))
+            with self._stats_lock:
                 stats['failed_games'] += 1
                 stats['failed_game_ids'].append(game_id)
-                
-                # Continue with next game
-                continue
+            return False
         
+        metrics.POPULATE_GAME_SECONDS.observe(time.perf_counter() - game_start, outcome='success')
+        with self._stats_lock:
+            stats['successful_games'] += 1
+            for table, count in game_results.items():
+                stats['table_counts'][table] += count
+            rows_inserted = sum(stats['table_counts'].values())
+            elapsed = (datetime.now() - stats['start_time']).total_seconds()
+        if elapsed > 0:
+            metrics.POPULATION_ROWS_PER_SECOND.set(rows_inserted / elapsed)
+        return True
+    
+    def _finish_run(self, stats: dict) -> dict:
+        stats['season_stats'] = self._refresh_season_stats(stats['population_run_id'])
+        self.runs.finish(stats['population_run_id'])
         stats['end_time'] = datetime.now()
         stats['duration'] = stats['end_time'] - stats['start_time']
         
         self._log_final_statistics(stats)
         return stats
     
+    def _refresh_season_stats(self, run_id: int) -> Optional[dict]:
+        """
+        Recompute the season aggregates of the team-seasons the run populated.
+        
+        Refreshing after every game would recompute both teams' whole seasons
+        once per game, and concurrent pipeline workers would insert the same
+        aggregate rows. Runs refresh from a single thread at the end instead;
+        two runs finishing at once can still collide, so a failed refresh is
+        logged and left to build_analytics season-stats --incremental.
+        
+        Returns:
+            SeasonStatsService.build() counts, or None if the refresh failed
+        """
+        game_ids = self.runs.game_ids(run_id, (DONE,))
+        if not game_ids:
+            return {'games': 0, 'team_seasons': 0, 'players': 0, 'teams': 0}
+        try:
+            with self.Session() as session:
+                return SeasonStatsService(session).build(game_ids)
+        except Exception as e:
+            logger.error(f"Failed to refresh season stats for population run {run_id}: {e}; "
+                         f"run build_analytics season-stats --incremental")
+            return None
+    
     def _log_final_statistics(self, stats: dict):
         """Log final processing statistics"""
         logger.info("=" * 60)
         logger.info("POPULATION COMPLETE")
         logger.info("=" * 60)
+        logger.info(f"Population run: {stats['population_run_id']}")
         logger.info(f"Total games processed: {stats['total_games']}")
         logger.info(f"Successful: {stats['successful_games']}")
         logger.info(f"Failed: {stats['failed_games']}")
@@ -261,6 +409,7 @@ class GameTablePopulator:
         
         if stats['failed_game_ids']:
             logger.warning(f"Failed game IDs: {stats['failed_game_ids']}")
+            logger.warning(f"Retry them with --retry-failed --run-id {stats['population_run_id']}")
         
         logger.info("\nRecords inserted by table:")
         for table, count in stats['table_counts'].items():
@@ -278,6 +427,17 @@ class GameTablePopulator:
         
         # Define tables in dependency order (children first, parents last)
         tables_to_clear = [
+            'population_run_game',
+            'population_run',
+            'backfill_checkpoint',
+            'validation_run',
+            'player_season_stats',
+            'team_season_stats',
+            'shot_chart_bin',
+            'game_summary',
+            'possession',
+            'stint',
+            'lineup',
             'boxscore',
             'play', 
             'person_game',
@@ -396,6 +556,95 @@ class GameTablePopulator:
         return all_valid
 
 
+class PopulationPipeline:
+    """
+    Populates games from a bounded queue while they are still being scraped.
+    
+    submit() queues a scraped game's JSON for the population workers, blocking
+    while the queue is full so scraping cannot run far ahead of population.
+    Games are recorded in a population run as they are submitted, so games
+    left pending by an interrupted pipeline are finished with
+    populate_game_tables --resume.
+    
+        with PopulationPipeline(populator) as pipeline:
+            scraper_manager.scrape_season(2024, on_stored=pipeline.submit)
+        stats = pipeline.stats
+    """
+    
+    def __init__(self, populator: GameTablePopulator, workers: int = 1, queue_size: int = 8,
+                 override_existing: bool = False, description: str = ''):
+        """
+        Args:
+            populator: Populator whose engine and run records are used
+            workers: Population threads; more than one can contend on shared
+                team and person rows, and games that fail are retried with
+                --retry-failed
+            queue_size: Games held in memory waiting for a worker
+            override_existing: Clear each game's existing data before populating
+            description: Recorded with the population run
+        """
+        self.populator = populator
+        self.workers = workers
+        self.override_existing = override_existing
+        self.description = description
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.stats = None
+        self._submitted = set()
+        self._threads: List[threading.Thread] = []
+    
+    def __enter__(self) -> 'PopulationPipeline':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def start(self):
+        run_id = self.populator.runs.create([], 'pipeline', self.description,
+                                            override_existing=self.override_existing)
+        self.stats = self.populator._new_stats(run_id, 0)
+        self._threads = [threading.Thread(target=self._work, name=f'populate-{i}', daemon=True)
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, game_id: int, game_json: Optional[dict] = None):
+        """
+        Queue a game for population.
+        
+        Args:
+            game_id: Game ID
+            game_json: Game JSON as scraped; None loads it from raw_game_data
+        """
+        if game_id in self._submitted:
+            return
+        self._submitted.add(game_id)
+        self.populator.runs.add_games(self.stats['population_run_id'], [game_id])
+        with self.populator._stats_lock:
+            self.stats['total_games'] += 1
+        self.queue.put((game_id, game_json))
+    
+    def close(self) -> dict:
+        """Wait for the queued games to be populated and finish the run"""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        return self.populator._finish_run(self.stats)
+    
+    def _work(self):
+        run_id = self.stats['population_run_id']
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            game_id, game_json = item
+            logger.info(f"Processing game {game_id} (queued: {self.queue.qsize()})")
+            self.populator._populate_game(run_id, game_id, game_json, self.stats,
+                                          override_existing=self.override_existing)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -416,6 +665,14 @@ def main():
         '--seasons', type=int, nargs='+',
         help='Process games from specific seasons'
     )
+    mode_group.add_argument(
+        '--resume', action='store_true',
+        help='Continue the most recent population run (or --run-id) from its first unprocessed game'
+    )
+    mode_group.add_argument(
+        '--retry-failed', action='store_true',
+        help='Process the games that failed in the most recent population run (or --run-id) again'
+    )
     
     # Options
     parser.add_argument(
@@ -426,6 +683,10 @@ def main():
         '--resume-from', type=int,
         help='Resume processing from this game ID (only with --all)'
     )
+    parser.add_argument(
+        '--run-id', type=int,
+        help='Population run to use with --resume or --retry-failed (default: the most recent)'
+    )
     parser.add_argument(
         '--validate', action='store_true',
         help='Validate foreign key integrity after population'
@@ -442,12 +703,37 @@ def main():
         '--clear-tables', action='store_true',
         help='Clear all populated tables and reset sequences before processing (hard reset)'
     )
+    parser.add_argument(
+        '--metrics-file', type=str,
+        help='Write Prometheus-format metrics to this file when finished'
+    )
+    parser.add_argument(
+        '--metrics-port', type=int,
+        help='Serve Prometheus-format metrics at /metrics on this port while running'
+    )
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
     
     # Validation
     if args.resume_from and not args.all:
         parser.error("--resume-from can only be used with --all")
+    if args.run_id and not (args.resume or args.retry_failed):
+        parser.error("--run-id can only be used with --resume or --retry-failed")
+    if (args.resume or args.retry_failed) and (args.limit or args.override):
+        parser.error("--limit and --override cannot be used with --resume or --retry-failed; "
+                     "the run keeps its original selection and override setting")
+    if (args.resume or args.retry_failed) and args.clear_tables:
+        parser.error("--clear-tables cannot be used with --resume or --retry-failed; "
+                     "it deletes the population runs they continue")
+    
+    if args.metrics_file or args.metrics_port:
+        metrics.enable()
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+    profiler = profiling.from_args(args, 'populate_game_tables')
+    if profiler:
+        profiler.start()
     
     try:
         populator = GameTablePopulator()
@@ -459,29 +745,36 @@ def main():
         # Clear all tables if requested (hard reset)
         if args.clear_tables:
             logger.info("🗑️  HARD RESET requested - clearing all tables and resetting sequences")
-            populator.clear_all_tables()
+            with profiling.stage('clear_tables'):
+                populator.clear_all_tables()
             logger.info("Hard reset complete. Starting fresh population...")
         
         # Execute population based on mode
-        if args.all:
-            stats = populator.populate_all_games(
-                limit=args.limit,
-                resume_from_game_id=args.resume_from,
-                override_existing=args.override
-            )
-        elif args.game_ids:
-            stats = populator.populate_specific_games(args.game_ids, override_existing=args.override)
-        elif args.seasons:
-            stats = populator.populate_games_by_season(
-                args.seasons,
-                limit=args.limit,
-                override_existing=args.override
-            )
+        with profiling.stage('populate'):
+            if args.all:
+                stats = populator.populate_all_games(
+                    limit=args.limit,
+                    resume_from_game_id=args.resume_from,
+                    override_existing=args.override
+                )
+            elif args.game_ids:
+                stats = populator.populate_specific_games(args.game_ids, override_existing=args.override)
+            elif args.seasons:
+                stats = populator.populate_games_by_season(
+                    args.seasons,
+                    limit=args.limit,
+                    override_existing=args.override
+                )
+            elif args.resume:
+                stats = populator.resume_run(args.run_id)
+            elif args.retry_failed:
+                stats = populator.retry_failed_games(args.run_id)
         
         # Validate foreign keys if requested
         if args.validate:
             logger.info("\nRunning foreign key validation...")
-            is_valid = populator.validate_foreign_keys()
+            with profiling.stage('validate'):
+                is_valid = populator.validate_foreign_keys()
             if not is_valid:
                 logger.error("Foreign key validation failed!")
                 sys.exit(1)
@@ -498,6 +791,11 @@ def main():
     except Exception as e:
         logger.error(f"Population failed: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
 
 
 if __name__ == '__main__':
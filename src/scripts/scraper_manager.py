@@ -9,15 +9,21 @@ import argparse
 import logging
 import sys
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 from datetime import datetime
 
 from ..scrapers.game_url_generator import GameURLGenerator, GameURLInfo
 from ..scrapers.raw_data_extractor import RawDataExtractor, ExtractionResult
-from ..database.services import DatabaseService
+from ..database.services import DatabaseService, DatabaseConnection
+from ..database.scrape_queue import ScrapeQueue
+from ..database.query_counter import operation
+from .. import metrics, profiling
 
 logger = logging.getLogger(__name__)
 
+# Receives a game's ID and JSON once the game is in raw_game_data
+OnStored = Callable[[int, Optional[Dict[str, Any]]], None]
+
 
 class ScraperManager:
     """Coordinates WNBA game data scraping operations."""
@@ -84,14 +90,27 @@ class ScraperManager:
         logger.info(f"Generated {len(game_urls)} URLs for {season} {game_type} season")
         return game_urls
     
-    def scrape_single_game(self, game_url_info: GameURLInfo, override_existing: bool = False) -> bool:
-        """Scrape a single game and save to database."""
+    @operation('scrape_game')
+    def scrape_single_game(self, game_url_info: GameURLInfo, override_existing: bool = False,
+                           on_stored: Optional[OnStored] = None) -> bool:
+        """
+        Scrape a single game and save to database.
+        
+        Args:
+            game_url_info: Game to scrape
+            override_existing: If True, re-scrape a game that already exists
+            on_stored: Called with the game ID and its JSON once saved, or with
+                None as the JSON if the game already existed and was skipped
+        """
+        start = time.perf_counter()
         try:
             # Check if game already exists (unless overriding)
             with DatabaseService() as db:
                 if not override_existing and db.game_data.game_exists(int(game_url_info.game_id)):
                     logger.info(f"Game {game_url_info.game_id} already exists, skipping")
-                    return True
+                    if on_stored:
+                        on_stored(int(game_url_info.game_id), None)
+                    return self._scrape_outcome(start, 'skipped', True)
                 elif override_existing and db.game_data.game_exists(int(game_url_info.game_id)):
                     logger.info(f"Game {game_url_info.game_id} already exists, but override_existing=True - will re-scrape")
             
@@ -100,7 +119,7 @@ class ScraperManager:
             
             if result != ExtractionResult.SUCCESS or not game_data:
                 logger.warning(f"Failed to extract data for game {game_url_info.game_id}: {result}")
-                return False
+                return self._scrape_outcome(start, 'failed', False)
             
             # Save to database (with override handling)
             with DatabaseService() as db:
@@ -120,14 +139,22 @@ class ScraperManager:
                 if success:
                     action = "re-scraped" if override_existing else "scraped"
                     logger.info(f"Successfully {action} game {game_url_info.game_id}")
-                    return True
+                    if on_stored:
+                        on_stored(int(game_url_info.game_id), game_data)
+                    return self._scrape_outcome(start, 'scraped', True)
                 else:
                     logger.error(f"Failed to save game {game_url_info.game_id} to database")
-                    return False
+                    return self._scrape_outcome(start, 'failed', False)
         
         except Exception as e:
             logger.error(f"Error scraping game {game_url_info.game_id}: {e}")
-            return False
+            return self._scrape_outcome(start, 'failed', False)
+
+    @staticmethod
+    def _scrape_outcome(start: float, outcome: str, success: bool) -> bool:
+        """Record how long a game took to scrape and pass its result through"""
+        metrics.SCRAPE_GAME_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+        return success
     
     def _detect_data_changes(self, existing_data: Dict[str, Any], fresh_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -571,7 +598,8 @@ class ScraperManager:
         
         return stats
     
-    def scrape_season(self, season: int, game_type: str = 'regular', max_games: Optional[int] = None) -> Dict[str, int]:
+    def scrape_season(self, season: int, game_type: str = 'regular', max_games: Optional[int] = None,
+                      on_stored: Optional[OnStored] = None) -> Dict[str, int]:
         """
         Scrape all games for a season.
         
@@ -579,6 +607,8 @@ class ScraperManager:
             season: WNBA season year
             game_type: 'regular' or 'playoff'
             max_games: Maximum number of games to scrape (for testing)
+            on_stored: Called with each game's ID and JSON once it is in
+                raw_game_data (None as the JSON for games skipped as existing)
             
         Returns:
             Dict with scraping statistics
@@ -610,9 +640,11 @@ class ScraperManager:
                 if db.game_data.game_exists(int(game_url_info.game_id)):
                     stats['skipped'] += 1
                     logger.info(f"Game {game_url_info.game_id} already exists, skipping")
+                    if on_stored:
+                        on_stored(int(game_url_info.game_id), None)
                     continue
             
-            success = self.scrape_single_game(game_url_info, override_existing=False)
+            success = self.scrape_single_game(game_url_info, override_existing=False, on_stored=on_stored)
             
             if success:
                 stats['success'] += 1
@@ -636,13 +668,16 @@ class ScraperManager:
         logger.info(f"Scraping completed. Success: {stats['success']}, Failed: {stats['failed']}, Skipped: {stats['skipped']}")
         return stats
     
-    def scrape_specific_games(self, game_ids: List[str], override_existing: bool = False) -> Dict[str, int]:
+    def scrape_specific_games(self, game_ids: List[str], override_existing: bool = False,
+                              on_stored: Optional[OnStored] = None) -> Dict[str, int]:
         """
         Scrape specific games by ID.
         
         Args:
             game_ids: List of game IDs to scrape
             override_existing: If True, re-scrape games that already exist
+            on_stored: Called with each game's ID and JSON once it is in
+                raw_game_data (None as the JSON for games skipped as existing)
             
         Returns:
             Dict with scraping statistics
@@ -688,9 +723,12 @@ class ScraperManager:
                     if db.game_data.game_exists(int(game_url_info.game_id)):
                         stats['skipped'] += 1
                         logger.info(f"Game {game_url_info.game_id} already exists, skipping")
+                        if on_stored:
+                            on_stored(int(game_url_info.game_id), None)
                         continue
             
-            success = self.scrape_single_game(game_url_info, override_existing=override_existing)
+            success = self.scrape_single_game(game_url_info, override_existing=override_existing,
+                                              on_stored=on_stored)
             
             if success:
                 stats['success'] += 1
@@ -714,6 +752,90 @@ class ScraperManager:
         logger.info(f"Specific game scraping completed. Success: {stats['success']}, Failed: {stats['failed']}, Skipped: {stats['skipped']}")
         return stats
     
+    def enqueue_season(self, queue: ScrapeQueue, season: int, game_type: str = 'regular',
+                       priority: int = 0) -> int:
+        """Add a season's games to the shared scrape queue; returns how many were new."""
+        return queue.enqueue(self.generate_urls_for_season(season, game_type), priority)
+    
+    def work_queue(self, queue: ScrapeQueue, max_games: Optional[int] = None, override_existing: bool = False,
+                   on_stored: Optional[OnStored] = None, poll_interval: float = 10.0) -> Dict[str, int]:
+        """
+        Claim and scrape games from the shared scrape queue until it is drained.
+        
+        Any number of processes, on any hosts, can work the same queue. While
+        nothing is claimable but other workers still hold leases or failed
+        games wait for their retry, this worker polls, so the games of a
+        crashed worker are scraped once their leases expire.
+        
+        Args:
+            queue: Queue to claim games from, leased as this worker
+            max_games: Maximum number of games to claim
+            override_existing: If True, re-scrape games that already exist
+            on_stored: Called with each game's ID and JSON once it is in
+                raw_game_data (None as the JSON for games skipped as existing)
+            poll_interval: Seconds between claims while nothing is claimable
+        
+        Returns:
+            Dict with scraping statistics
+        """
+        session_name = f"queue_{queue.owner}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        session_id = self.start_scraping_session(session_name)
+        
+        if not session_id:
+            logger.error("Failed to start scraping session")
+            return {'total': 0, 'success': 0, 'failed': 0}
+        
+        stats = {'total': 0, 'success': 0, 'failed': 0}
+        logger.info(f"Working scrape queue as {queue.owner}")
+        
+        while max_games is None or stats['total'] < max_games:
+            claimed = queue.claim()
+            if not claimed:
+                remaining = queue.counts()
+                if not remaining['pending'] and not remaining['leased']:
+                    break
+                logger.info(f"Waiting for {remaining['leased']} leased and {remaining['pending']} "
+                            f"delayed games in the scrape queue")
+                time.sleep(poll_interval)
+                continue
+            
+            item = claimed[0]
+            game_url_info = GameURLInfo(
+                game_id=str(item['game_id']),
+                season=str(item['season']),
+                game_url=item['game_url'],
+                game_type=item['game_type']
+            )
+            logger.info(f"Scraping queued game {item['game_id']} (attempt {item['attempts']})")
+            
+            success = self.scrape_single_game(game_url_info, override_existing=override_existing,
+                                              on_stored=on_stored)
+            
+            stats['total'] += 1
+            if success:
+                stats['success'] += 1
+                queue.complete(item['game_id'])
+            else:
+                stats['failed'] += 1
+                queue.fail(item['game_id'], 'Scrape failed (see scraper log)')
+            
+            # Update session progress every 10 games
+            if stats['total'] % 10 == 0:
+                self.update_session_progress(stats['success'], stats['failed'])
+            
+            # Small delay to be respectful to the server
+            time.sleep(1)
+        
+        # Final session update
+        self.update_session_progress(stats['success'], stats['failed'])
+        
+        # Complete session
+        session_status = 'completed' if stats['failed'] == 0 else 'completed_with_errors'
+        self.complete_session(session_status)
+        
+        logger.info(f"Queue work completed. Success: {stats['success']}, Failed: {stats['failed']}")
+        return stats
+    
     def _determine_season_from_game_id(self, game_id: str) -> int:
         """Determine the season from game ID format."""
         # WNBA game IDs follow format: 10SYY00GGG where:
@@ -956,7 +1078,8 @@ def main():
     """Main CLI interface for the scraper manager."""
     parser = argparse.ArgumentParser(description='WNBA Game Data Scraper Manager')
     
-    parser.add_argument('command', choices=['scrape-season', 'scrape-all-regular', 'scrape-all-playoff', 'scrape-all-games', 'scrape-games', 'test-single', 'verify-games', 'verify-season', 'list-sessions'],
+    parser.add_argument('command', choices=['scrape-season', 'scrape-all-regular', 'scrape-all-playoff', 'scrape-all-games', 'scrape-games', 'test-single', 'verify-games', 'verify-season', 'list-sessions',
+                                            'queue-season', 'work-queue', 'queue-status', 'queue-retry-failed'],
                        help='Command to execute')
     
     parser.add_argument('--season', type=int, required=False,
@@ -977,14 +1100,42 @@ def main():
     parser.add_argument('--override', action='store_true',
                        help='Override existing games - re-scrape games that already exist')
     
+    parser.add_argument('--priority', type=int, default=0,
+                       help='Queue priority for queue-season; higher is scraped first (default: 0)')
+    
+    parser.add_argument('--worker-id', type=str, default=None,
+                       help='Lease owner name for work-queue (default: host:pid)')
+    
+    parser.add_argument('--lease-seconds', type=float, default=300,
+                       help='How long a claimed game stays with this worker (default: 300)')
+    
+    parser.add_argument('--max-attempts', type=int, default=3,
+                       help='Claims per queued game before it is marked failed (default: 3)')
+    
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
     
+    parser.add_argument('--metrics-file', type=str, default=None,
+                       help='Write Prometheus-format metrics to this file when finished')
+    
+    parser.add_argument('--metrics-port', type=int, default=None,
+                       help='Serve Prometheus-format metrics at /metrics on this port while running')
+    
+    profiling.add_arguments(parser)
+    
     args = parser.parse_args()
     
     # Setup logging
     setup_logging(args.verbose)
     
+    if args.metrics_file or args.metrics_port:
+        metrics.enable()
+    if args.metrics_port:
+        metrics.start_http_server(args.metrics_port)
+    profiler = profiling.from_args(args, 'scraper_manager')
+    if profiler:
+        profiler.start()
+    
     # Initialize scraper manager
     manager = ScraperManager()
     
@@ -1184,12 +1335,42 @@ def main():
         
         elif args.command == 'list-sessions':
             manager.list_active_sessions()
+        
+        elif args.command in ('queue-season', 'work-queue', 'queue-status', 'queue-retry-failed'):
+            queue = ScrapeQueue(DatabaseConnection().get_engine(), owner=args.worker_id,
+                                lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+            
+            if args.command == 'queue-season':
+                if not args.season:
+                    logger.error("--season is required for queue-season command")
+                    sys.exit(1)
+                added = manager.enqueue_season(queue, args.season, args.game_type, args.priority)
+                print(f"Queued {added} new games for {args.season} {args.game_type} season")
+            
+            elif args.command == 'work-queue':
+                stats = manager.work_queue(queue, args.max_games, override_existing=args.override)
+                
+                print(f"\nScrape Queue Results for worker {queue.owner}:")
+                print(f"  Games claimed: {stats['total']}")
+                print(f"  Successfully scraped: {stats['success']}")
+                print(f"  Failed: {stats['failed']}")
+            
+            elif args.command == 'queue-retry-failed':
+                print(f"Requeued {queue.retry_failed()} failed games")
+            
+            counts = queue.counts()
+            print(f"\nScrape queue: " + ', '.join(f"{count} {status}" for status, count in counts.items()))
             
     except Exception as e:
         logger.error(f"Error in main: {e}")
         if manager.current_session_id:
             manager.complete_session('failed')
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
 
 
 if __name__ == "__main__":
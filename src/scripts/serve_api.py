@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Serve the read-only WNBA data API over HTTP.
+"""
+
+import argparse
+import logging
+import sys
+
+from aiohttp import web
+from sqlalchemy import create_engine
+
+from ..database.services import DatabaseConnection
+from ..api import create_app, ResponseCache
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Serve the read-only WNBA data API"
+    )
+    parser.add_argument(
+        '--host', default='0.0.0.0',
+        help='Interface to bind (default: 0.0.0.0)'
+    )
+    parser.add_argument(
+        '--port', type=int, default=8080,
+        help='Port to listen on (default: 8080)'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=8,
+        help='Concurrent database workers and pooled connections (default: 8)'
+    )
+    parser.add_argument(
+        '--cache-size', type=int, default=2048,
+        help='Maximum cached responses (default: 2048, 0 disables caching)'
+    )
+    parser.add_argument(
+        '--cache-ttl', type=float, default=60.0,
+        help='Seconds to cache responses for unfinished data (default: 60)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        engine = create_engine(
+            DatabaseConnection().db_url,
+            pool_size=args.workers,
+            max_overflow=0,
+            pool_pre_ping=True
+        )
+        cache = ResponseCache(max_entries=args.cache_size, default_ttl=args.cache_ttl)
+        app = create_app(engine, cache=cache, max_workers=args.workers)
+
+        logger.info(f"🚀 Serving API on http://{args.host}:{args.port} with {args.workers} database workers")
+        web.run_app(app, host=args.host, port=args.port, print=None)
+
+    except Exception as e:
+        logger.error(f"API server failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
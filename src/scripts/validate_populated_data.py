@@ -2,19 +2,29 @@
 """
 Data validation script for populated WNBA game tables.
 Performs comprehensive data quality checks and foreign key integrity validation.
+Each table is read in a single scan whose conditional aggregates evaluate
+all of its checks and statistics, and independent tables are scanned
+concurrently on separate pooled connections. Every run records the newest
+population time it covered, less a safety margin for population transactions
+still committing when it was read, and the games it found issues in;
+incremental runs only check games populated since the previous run's
+watermark plus the games that run failed.
 """
 
 import argparse
 import logging
 import sys
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import text, select, func, bindparam, or_, DateTime
 from sqlalchemy.orm import sessionmaker
 
 from ..database.services import DatabaseConnection
-from ..database.models import Arena, Team, Person, Game, TeamGame, PersonGame, Play, Boxscore
+from ..database.models import Game, ValidationRun
+from ..analytics.reconciliation import ReconciliationService
+from .. import profiling
 
 
 # Configure logging
@@ -25,381 +35,569 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# One scan per table: every check on a table is a conditional aggregate of
+# the same pass. Person and arena ids are versioned (several rows per id), so
+# they are joined through their distinct ids to keep row counts intact.
+# Game-scoped tables name their game id column under 'scope'; incremental
+# runs restrict those scans to recently populated games and skip the rest.
+TABLE_SCANS = [
+    {
+        'table': 'arena',
+        'query': 'SELECT COUNT(*) AS total FROM arena {scope}'
+    },
+    {
+        'table': 'team',
+        'query': 'SELECT COUNT(*) AS total FROM team {scope}'
+    },
+    {
+        'table': 'person',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE person_name IS NULL AND person_iname IS NULL) AS missing_names,
+                COUNT(*) FILTER (WHERE person_name IS NOT NULL) AS persons_with_names
+            FROM person
+            {scope}
+        '''
+    },
+    {
+        'table': 'game',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE a.arena_id IS NULL) AS fk_arena,
+                COUNT(*) FILTER (WHERE g.arena_id IS NULL) AS missing_arena,
+                COUNT(*) FILTER (WHERE g.home_team_id IS NULL OR g.away_team_id IS NULL) AS missing_teams,
+                COUNT(DISTINCT g.arena_id) AS unique_arenas,
+                COUNT(DISTINCT g.home_team_id) AS unique_home_teams,
+                COUNT(DISTINCT g.away_team_id) AS unique_away_teams,
+                MIN(g.game_et) AS earliest_game,
+                MAX(g.game_et) AS latest_game
+            FROM game g
+            LEFT JOIN (SELECT DISTINCT arena_id FROM arena) a ON g.arena_id = a.arena_id
+            {scope}
+        ''',
+        'scope': 'g.game_id'
+    },
+    {
+        'table': 'team_game',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE g.game_id IS NULL) AS fk_game,
+                COUNT(*) FILTER (WHERE t.id IS NULL) AS fk_team
+            FROM team_game tg
+            LEFT JOIN game g ON tg.game_id = g.game_id
+            LEFT JOIN team t ON tg.team_id = t.id
+            {scope}
+        ''',
+        'scope': 'tg.game_id'
+    },
+    {
+        'table': 'person_game',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE g.game_id IS NULL) AS fk_game,
+                COUNT(*) FILTER (WHERE pe.person_id IS NULL) AS fk_person
+            FROM person_game pg
+            LEFT JOIN game g ON pg.game_id = g.game_id
+            LEFT JOIN (SELECT DISTINCT person_id FROM person) pe ON pg.person_id = pe.person_id
+            {scope}
+        ''',
+        'scope': 'pg.game_id'
+    },
+    {
+        'table': 'play',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE g.game_id IS NULL) AS fk_game,
+                COUNT(*) FILTER (WHERE p.person_id IS NOT NULL AND pe.person_id IS NULL) AS fk_person,
+                COUNT(*) FILTER (WHERE p.action_type IS NULL) AS missing_action_type,
+                COUNT(DISTINCT p.game_id) AS games_with_plays,
+                COUNT(DISTINCT p.action_type) AS unique_action_types,
+                AVG(CAST(p.points_total AS FLOAT)) AS avg_points_per_play
+            FROM play p
+            LEFT JOIN game g ON p.game_id = g.game_id
+            LEFT JOIN (SELECT DISTINCT person_id FROM person) pe ON p.person_id = pe.person_id
+            {scope}
+        ''',
+        'scope': 'p.game_id'
+    },
+    {
+        'table': 'boxscore',
+        'query': '''
+            SELECT
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE g.game_id IS NULL) AS fk_game,
+                COUNT(*) FILTER (WHERE b.person_id IS NOT NULL AND pe.person_id IS NULL) AS fk_person,
+                COUNT(*) FILTER (WHERE b.box_type IS NULL) AS missing_box_type,
+                COUNT(*) FILTER (WHERE b.home_away_team NOT IN ('h', 'a')) AS invalid_home_away,
+                COUNT(*) FILTER (WHERE b.pts < 0 OR b.reb < 0 OR b.ast < 0 OR b.fgm < 0 OR b.fga < 0) AS negative_stats,
+                COUNT(*) FILTER (WHERE b.fgp IS NOT NULL AND (b.fgp < 0 OR b.fgp > 1)) AS invalid_fgp,
+                COUNT(*) FILTER (WHERE b.box_type = 'player') AS player_entries,
+                COUNT(DISTINCT CASE WHEN b.box_type = 'player' THEN b.game_id END) AS games_with_boxscores,
+                COUNT(DISTINCT CASE WHEN b.box_type = 'player' THEN b.person_id END) AS unique_persons,
+                AVG(CASE WHEN b.box_type = 'player' THEN CAST(b.pts AS FLOAT) END) AS avg_points,
+                MAX(CASE WHEN b.box_type = 'player' THEN b.pts END) AS max_points
+            FROM boxscore b
+            LEFT JOIN game g ON b.game_id = g.game_id
+            LEFT JOIN (SELECT DISTINCT person_id FROM person) pe ON b.person_id = pe.person_id
+            {scope}
+        ''',
+        'scope': 'b.game_id'
+    }
+]
+
+# Longer than a game's population transaction: a game stamped before the
+# watermark is read but committed after it still falls after the watermark
+WATERMARK_MARGIN = timedelta(minutes=10)
+
+SCOPE_FILTER = 'WHERE {column} IN (SELECT game_id FROM game WHERE populated_at > :since)'
+RECHECK_SCOPE_FILTER = ('WHERE ({column} IN (SELECT game_id FROM game WHERE populated_at > :since) '
+                        'OR {column} IN :recheck)')
+
+# Checks read their violation count from a column of a table scan
+FOREIGN_KEY_CHECKS = [
+    {
+        'name': 'Game -> Arena', 'table': 'game', 'column': 'fk_arena',
+        'description': 'Games referencing non-existent arenas'
+    },
+    {
+        'name': 'TeamGame -> Game', 'table': 'team_game', 'column': 'fk_game',
+        'description': 'Team-game relationships referencing non-existent games'
+    },
+    {
+        'name': 'TeamGame -> Team', 'table': 'team_game', 'column': 'fk_team',
+        'description': 'Team-game relationships referencing non-existent teams'
+    },
+    {
+        'name': 'PersonGame -> Game', 'table': 'person_game', 'column': 'fk_game',
+        'description': 'Person-game relationships referencing non-existent games'
+    },
+    {
+        'name': 'PersonGame -> Person', 'table': 'person_game', 'column': 'fk_person',
+        'description': 'Person-game relationships referencing non-existent persons'
+    },
+    {
+        'name': 'Play -> Game', 'table': 'play', 'column': 'fk_game',
+        'description': 'Plays referencing non-existent games'
+    },
+    {
+        'name': 'Play -> Person (non-null)', 'table': 'play', 'column': 'fk_person',
+        'description': 'Plays referencing non-existent persons'
+    },
+    {
+        'name': 'Boxscore -> Game', 'table': 'boxscore', 'column': 'fk_game',
+        'description': 'Boxscore entries referencing non-existent games'
+    },
+    {
+        'name': 'Boxscore -> Person (non-null)', 'table': 'boxscore', 'column': 'fk_person',
+        'description': 'Boxscore entries referencing non-existent persons'
+    }
+]
+
+QUALITY_CHECKS = [
+    {
+        'name': 'Games with missing arena', 'table': 'game', 'column': 'missing_arena',
+        'description': 'Games without arena information', 'severity': 'ERROR'
+    },
+    {
+        'name': 'Games with missing teams', 'table': 'game', 'column': 'missing_teams',
+        'description': 'Games without complete team information', 'severity': 'ERROR'
+    },
+    {
+        'name': 'Plays without action type', 'table': 'play', 'column': 'missing_action_type',
+        'description': 'Plays missing action type', 'severity': 'WARNING'
+    },
+    {
+        'name': 'Persons without names', 'table': 'person', 'column': 'missing_names',
+        'description': 'Persons without any name information', 'severity': 'WARNING'
+    },
+    {
+        'name': 'Boxscore entries without box type', 'table': 'boxscore', 'column': 'missing_box_type',
+        'description': 'Boxscore entries missing box type', 'severity': 'ERROR'
+    },
+    {
+        'name': 'Invalid home/away team indicators', 'table': 'boxscore', 'column': 'invalid_home_away',
+        'description': 'Invalid home/away team indicators', 'severity': 'ERROR'
+    },
+    {
+        'name': 'Negative statistics', 'table': 'boxscore', 'column': 'negative_stats',
+        'description': 'Negative statistical values', 'severity': 'WARNING'
+    },
+    {
+        'name': 'Invalid field goal percentages', 'table': 'boxscore', 'column': 'invalid_fgp',
+        'description': 'Field goal percentages outside valid range (0-1)', 'severity': 'WARNING'
+    }
+]
+
+
 class DataValidator:
     """Comprehensive data validation for populated WNBA tables"""
     
-    def __init__(self):
-        self.db_connection = DatabaseConnection()
-        self.engine = self.db_connection.get_engine()
+    def __init__(self, engine=None, max_workers: int = 4, watermark_margin: timedelta = WATERMARK_MARGIN):
+        """
+        Args:
+            engine: SQLAlchemy engine (defaults to the configured database)
+            max_workers: Tables scanned concurrently, each on its own pooled connection
+            watermark_margin: Subtracted from the newest population time to
+                give the recorded watermark
+        """
+        if engine is None:
+            self.db_connection = DatabaseConnection()
+            engine = self.db_connection.get_engine()
+        self.engine = engine
         self.Session = sessionmaker(bind=self.engine)
+        self.max_workers = max_workers
+        self.watermark_margin = watermark_margin
         self.issues = []
     
-    def validate_all(self) -> Dict[str, any]:
+    def validate_all(self, incremental: bool = False, reconcile: bool = False) -> Dict[str, any]:
         """
         Run all validation checks.
         
+        Args:
+            incremental: Only check games populated since the watermark of the
+                previous run, and the games it found issues in (falls back to a
+                full run if none)
+            reconcile: Also reconcile boxscore totals against play-by-play
+        
         Returns:
             Dictionary with validation results
         """
         logger.info("Starting comprehensive data validation...")
         
         results = {
+            'mode': 'full',
+            'since': None,
+            'games_checked': 0,
             'table_counts': {},
             'foreign_key_issues': [],
             'data_quality_issues': [],
             'statistical_summary': {},
+            'failed_game_ids': [],
             'validation_passed': True
         }
         
         with self.Session() as session:
-            # 1. Table counts
-            results['table_counts'] = self._get_table_counts(session)
-            
-            # 2. Foreign key integrity
-            results['foreign_key_issues'] = self._validate_foreign_keys(session)
+            # Newest population covered by this run, read before scanning so
+            # games populated meanwhile are picked up by the next run. Games
+            # are stamped when their transaction starts, so one still
+            # committing can carry an older stamp: back off by the margin.
+            watermark = session.scalar(select(func.max(Game.populated_at)))
+            if watermark is not None:
+                watermark -= self.watermark_margin
+            last_run = self._last_run(session) if incremental else None
+            since = last_run.watermark if last_run else None
+            recheck = sorted(last_run.failed_game_ids or []) if last_run else []
+            if incremental and since is None:
+                logger.info("No previous validation watermark - running full validation")
             
-            # 3. Data quality checks
-            results['data_quality_issues'] = self._validate_data_quality(session)
-            
-            # 4. Statistical summaries
-            results['statistical_summary'] = self._generate_statistics(session)
-            
-            # Determine overall validation status
-            if results['foreign_key_issues'] or results['data_quality_issues']:
-                results['validation_passed'] = False
+            games = select(func.count()).select_from(Game)
+            if since is not None:
+                games = games.where(or_(Game.populated_at > since, Game.game_id.in_(recheck)))
+                results['mode'] = 'incremental'
+                results['since'] = since
+            results['games_checked'] = session.scalar(games)
+        
+        if since is not None:
+            logger.info(f"Validating {results['games_checked']} games populated since {since}, "
+                        f"including {len(recheck)} that failed the previous run")
         
+        # 1. Scan every table once
+        with profiling.stage('scan'):
+            scans = self._scan_tables(since, recheck)
+        
+        # 2. Table counts
+        results['table_counts'] = self._get_table_counts(scans)
+        
+        # 3. Foreign key integrity
+        results['foreign_key_issues'] = self._validate_foreign_keys(scans)
+        
+        # 4. Data quality checks
+        results['data_quality_issues'] = self._validate_data_quality(scans)
+        
+        # 5. Statistical summaries
+        results['statistical_summary'] = self._generate_statistics(scans)
+        
+        # 6. Boxscore totals against play-by-play
+        if reconcile:
+            with profiling.stage('reconcile'):
+                results['reconciliation'] = self._reconcile(since, recheck)
+            results['data_quality_issues'].extend(self._reconciliation_issues(results['reconciliation']))
+        
+        # Determine overall validation status
+        if results['foreign_key_issues'] or results['data_quality_issues']:
+            results['validation_passed'] = False
+            with profiling.stage('failed_games'):
+                results['failed_game_ids'] = self._failed_game_ids(scans, since, recheck,
+                                                                   results.get('reconciliation'))
+        
+        # A run whose scans errored did not cover its games: the next run
+        # starts from the previous watermark instead
+        completed = not any(isinstance(row, Exception) for row in scans.values()) \
+            and 'error' not in results.get('reconciliation', {})
+        self._record_run(results, watermark if completed else None)
         self._log_results(results)
         return results
     
-    def _get_table_counts(self, session) -> Dict[str, int]:
+    def _reconcile(self, since=None, recheck: List[int] = ()) -> Dict[str, any]:
+        """Reconcile boxscores with plays for all games, or those populated after since and recheck"""
+        logger.info("Reconciling boxscores against play-by-play...")
+        try:
+            with self.Session() as session:
+                game_ids = None
+                if since is not None:
+                    game_ids = list(session.scalars(
+                        select(Game.game_id).where(or_(Game.populated_at > since, Game.game_id.in_(recheck)))
+                    ))
+                return ReconciliationService(session).reconcile_games(game_ids=game_ids)
+        except Exception as e:
+            logger.error(f"  ❌ Reconciliation failed - {e}")
+            return {'error': str(e)}
+    
+    def _reconciliation_issues(self, reconciliation: Dict[str, any]) -> List[Dict[str, any]]:
+        """One issue per stat with discrepancies between boxscores and plays"""
+        if 'error' in reconciliation:
+            return [{
+                'check': 'Boxscore vs play-by-play',
+                'description': f"Failed to execute check: {reconciliation['error']}",
+                'count': None,
+                'severity': 'ERROR'
+            }]
+        
+        issues = []
+        for stat, count in reconciliation['by_stat'].items():
+            if count > 0:
+                issues.append({
+                    'check': f'Boxscore vs play-by-play: {stat}',
+                    'description': f'Player and team {stat} totals disagreeing with play-by-play',
+                    'count': count,
+                    'severity': 'WARNING'
+                })
+                logger.warning(f"  ⚠️  Boxscore vs play-by-play: {stat}: {count} discrepancies")
+        if not issues:
+            logger.info(f"  ✓ Boxscore vs play-by-play: No discrepancies in {reconciliation['games']} games")
+        return issues
+    
+    def _last_run(self, session):
+        """Most recent validation run that recorded a watermark, or None"""
+        return session.scalar(
+            select(ValidationRun)
+            .where(ValidationRun.watermark.is_not(None))
+            .order_by(ValidationRun.validation_run_id.desc())
+            .limit(1)
+        )
+    
+    def _failed_game_ids(self, scans: Dict[str, any], since=None, recheck: List[int] = (),
+                         reconciliation: Dict[str, any] = None) -> List[int]:
+        """
+        Games in scope with foreign key or data quality issues.
+        
+        Game-scoped tables whose scan found violations are scanned again,
+        grouped by game, so only the failing games are rechecked by the next
+        incremental run. Issues in arena, team and person rows belong to no
+        game and are reported by full runs only.
+        """
+        checks = FOREIGN_KEY_CHECKS + QUALITY_CHECKS
+        game_ids = set()
+        for scan in TABLE_SCANS:
+            row = scans.get(scan['table'])
+            if not scan.get('scope') or row is None or isinstance(row, Exception):
+                continue
+            columns = [check['column'] for check in checks if check['table'] == scan['table']]
+            if not any(row[column] for column in columns):
+                continue
+            for game_row in self._scan_table(scan, since, recheck, by_game=True):
+                if any(game_row[column] for column in columns):
+                    game_ids.add(game_row['game_id'])
+        for discrepancy in (reconciliation or {}).get('discrepancies', []):
+            game_ids.add(discrepancy['game_id'])
+        return sorted(game_ids)
+    
+    def _record_run(self, results: Dict[str, any], watermark):
+        """Store the run so the next incremental run starts from its watermark and failed games"""
+        try:
+            with self.Session() as session:
+                session.add(ValidationRun(
+                    mode=results['mode'],
+                    since=results['since'],
+                    watermark=watermark,
+                    failed_game_ids=results['failed_game_ids'],
+                    games_checked=results['games_checked'],
+                    issues=len(results['foreign_key_issues']) + len(results['data_quality_issues']),
+                    passed=results['validation_passed'],
+                    finished_at=func.now()
+                ))
+                session.commit()
+        except Exception as e:
+            logger.error(f"Could not record validation run: {e}")
+    
+    def _scan_table(self, scan: Dict[str, str], since=None, recheck: List[int] = (), by_game: bool = False):
+        """
+        Run one table scan on its own session, scoped to games populated
+        since a time and the games to recheck.
+        
+        Args:
+            by_game: Group the scan by its game id column, returning one row
+                per game instead of one row for the table
+        """
+        scope = ''
+        if since is not None:
+            scope = (RECHECK_SCOPE_FILTER if recheck else SCOPE_FILTER).format(column=scan['scope'])
+        sql = scan['query'].format(scope=scope)
+        if by_game:
+            sql = sql.replace('SELECT', f"SELECT {scan['scope']} AS game_id,", 1) + f" GROUP BY {scan['scope']}"
+        query = text(sql)
+        if since is not None:
+            query = query.bindparams(bindparam('since', since, type_=DateTime))
+        if since is not None and recheck:
+            query = query.bindparams(bindparam('recheck', list(recheck), expanding=True))
+        with self.Session() as session:
+            rows = session.execute(query).mappings()
+            return [dict(row) for row in rows] if by_game else dict(rows.one())
+    
+    def _scan_tables(self, since=None, recheck: List[int] = ()) -> Dict[str, any]:
+        """
+        Scan all tables concurrently.
+        
+        Args:
+            since: Restrict game-scoped tables to games populated after this
+                time and skip the others
+            recheck: Games to scan in incremental runs whatever their
+                population time
+        
+        Returns:
+            Dictionary of table name -> scan row, or the exception if the scan failed
+        """
+        scans_to_run = [scan for scan in TABLE_SCANS if since is None or scan.get('scope')]
+        logger.info(f"Scanning {len(scans_to_run)} tables ({self.max_workers} concurrent)...")
+        scans = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            futures = {executor.submit(self._scan_table, scan, since, recheck): scan['table']
+                       for scan in scans_to_run}
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    scans[table] = future.result()
+                except Exception as e:
+                    logger.error(f"  ❌ Scan of {table} failed - {e}")
+                    scans[table] = e
+        return scans
+    
+    def _get_table_counts(self, scans: Dict[str, any]) -> Dict[str, int]:
         """Get record counts for all tables"""
         logger.info("Collecting table counts...")
         
-        tables = [
-            ('arena', Arena),
-            ('team', Team),
-            ('person', Person),
-            ('game', Game),
-            ('team_game', TeamGame),
-            ('person_game', PersonGame),
-            ('play', Play),
-            ('boxscore', Boxscore)
-        ]
-        
         counts = {}
-        for table_name, model_class in tables:
-            count = session.query(model_class).count()
-            counts[table_name] = count
-            logger.info(f"  {table_name}: {count:,} records")
+        for scan in TABLE_SCANS:
+            row = scans.get(scan['table'])
+            if row is None or isinstance(row, Exception):
+                continue
+            counts[scan['table']] = row['total']
+            logger.info(f"  {scan['table']}: {row['total']:,} records")
         
         return counts
     
-    def _validate_foreign_keys(self, session) -> List[Dict[str, any]]:
-        """Validate foreign key integrity"""
-        logger.info("Validating foreign key integrity...")
-        
+    def _run_checks(self, scans: Dict[str, any], checks: List[Dict[str, str]],
+                    label: str) -> List[Dict[str, any]]:
+        """Turn scan columns into issues for a list of checks"""
         issues = []
-        
-        # Define foreign key checks
-        fk_checks = [
-            {
-                'name': 'Game -> Arena',
-                'query': '''
-                    SELECT COUNT(*) FROM game g 
-                    LEFT JOIN arena a ON g.arena_id = a.arena_id 
-                    WHERE a.arena_id IS NULL
-                ''',
-                'description': 'Games referencing non-existent arenas'
-            },
-            {
-                'name': 'TeamGame -> Game',
-                'query': '''
-                    SELECT COUNT(*) FROM team_game tg 
-                    LEFT JOIN game g ON tg.game_id = g.game_id 
-                    WHERE g.game_id IS NULL
-                ''',
-                'description': 'Team-game relationships referencing non-existent games'
-            },
-            {
-                'name': 'TeamGame -> Team',
-                'query': '''
-                    SELECT COUNT(*) FROM team_game tg 
-                    LEFT JOIN team t ON tg.team_id = t.id 
-                    WHERE t.id IS NULL
-                ''',
-                'description': 'Team-game relationships referencing non-existent teams'
-            },
-            {
-                'name': 'PersonGame -> Game',
-                'query': '''
-                    SELECT COUNT(*) FROM person_game pg 
-                    LEFT JOIN game g ON pg.game_id = g.game_id 
-                    WHERE g.game_id IS NULL
-                ''',
-                'description': 'Person-game relationships referencing non-existent games'
-            },
-            {
-                'name': 'PersonGame -> Person',
-                'query': '''
-                    SELECT COUNT(*) FROM person_game pg 
-                    LEFT JOIN person p ON pg.person_id = p.person_id 
-                    WHERE p.person_id IS NULL
-                ''',
-                'description': 'Person-game relationships referencing non-existent persons'
-            },
-            {
-                'name': 'Play -> Game',
-                'query': '''
-                    SELECT COUNT(*) FROM play p 
-                    LEFT JOIN game g ON p.game_id = g.game_id 
-                    WHERE g.game_id IS NULL
-                ''',
-                'description': 'Plays referencing non-existent games'
-            },
-            {
-                'name': 'Play -> Person (non-null)',
-                'query': '''
-                    SELECT COUNT(*) FROM play p 
-                    LEFT JOIN person pe ON p.person_id = pe.person_id 
-                    WHERE p.person_id IS NOT NULL AND pe.person_id IS NULL
-                ''',
-                'description': 'Plays referencing non-existent persons'
-            },
-            {
-                'name': 'Boxscore -> Game',
-                'query': '''
-                    SELECT COUNT(*) FROM boxscore b 
-                    LEFT JOIN game g ON b.game_id = g.game_id 
-                    WHERE g.game_id IS NULL
-                ''',
-                'description': 'Boxscore entries referencing non-existent games'
-            },
-            {
-                'name': 'Boxscore -> Person (non-null)',
-                'query': '''
-                    SELECT COUNT(*) FROM boxscore b 
-                    LEFT JOIN person pe ON b.person_id = pe.person_id 
-                    WHERE b.person_id IS NOT NULL AND pe.person_id IS NULL
-                ''',
-                'description': 'Boxscore entries referencing non-existent persons'
-            }
-        ]
-        
-        for check in fk_checks:
-            try:
-                count = session.execute(text(check['query'])).scalar()
-                if count > 0:
-                    issue = {
-                        'check': check['name'],
-                        'description': check['description'],
-                        'count': count,
-                        'severity': 'ERROR'
-                    }
-                    issues.append(issue)
-                    logger.error(f"  ❌ {check['name']}: {count} violations")
-                else:
-                    logger.info(f"  ✓ {check['name']}: No violations")
-            except Exception as e:
-                issue = {
+        for check in checks:
+            if check['table'] not in scans:
+                continue
+            severity = check.get('severity', 'ERROR')
+            row = scans[check['table']]
+            if isinstance(row, Exception):
+                issues.append({
                     'check': check['name'],
-                    'description': f"Failed to execute check: {e}",
+                    'description': f"Failed to execute check: {row}",
                     'count': None,
                     'severity': 'ERROR'
-                }
-                issues.append(issue)
-                logger.error(f"  ❌ {check['name']}: Check failed - {e}")
-        
+                })
+                logger.error(f"  ❌ {check['name']}: Check failed - {row}")
+                continue
+            
+            count = row[check['column']] or 0
+            if count > 0:
+                issues.append({
+                    'check': check['name'],
+                    'description': check['description'],
+                    'count': count,
+                    'severity': severity
+                })
+                if severity == 'ERROR':
+                    logger.error(f"  ❌ {check['name']}: {count} {label}")
+                else:
+                    logger.warning(f"  ⚠️  {check['name']}: {count} {label}")
+            else:
+                logger.info(f"  ✓ {check['name']}: No {label}")
         return issues
     
-    def _validate_data_quality(self, session) -> List[Dict[str, any]]:
+    def _validate_foreign_keys(self, scans: Dict[str, any]) -> List[Dict[str, any]]:
+        """Validate foreign key integrity"""
+        logger.info("Validating foreign key integrity...")
+        return self._run_checks(scans, FOREIGN_KEY_CHECKS, 'violations')
+    
+    def _validate_data_quality(self, scans: Dict[str, any]) -> List[Dict[str, any]]:
         """Validate data quality and consistency"""
         logger.info("Validating data quality...")
-        
-        issues = []
-        
-        # Data quality checks
-        quality_checks = [
-            {
-                'name': 'Games with missing arena',
-                'query': 'SELECT COUNT(*) FROM game WHERE arena_id IS NULL',
-                'description': 'Games without arena information',
-                'severity': 'ERROR'
-            },
-            {
-                'name': 'Games with missing teams',
-                'query': '''
-                    SELECT COUNT(*) FROM game 
-                    WHERE home_team_id IS NULL OR away_team_id IS NULL
-                ''',
-                'description': 'Games without complete team information',
-                'severity': 'ERROR'
-            },
-            {
-                'name': 'Plays without action type',
-                'query': 'SELECT COUNT(*) FROM play WHERE action_type IS NULL',
-                'description': 'Plays missing action type',
-                'severity': 'WARNING'
-            },
-            {
-                'name': 'Persons without names',
-                'query': '''
-                    SELECT COUNT(*) FROM person 
-                    WHERE person_name IS NULL AND person_iname IS NULL
-                ''',
-                'description': 'Persons without any name information',
-                'severity': 'WARNING'
-            },
-            {
-                'name': 'Boxscore entries without box type',
-                'query': 'SELECT COUNT(*) FROM boxscore WHERE box_type IS NULL',
-                'description': 'Boxscore entries missing box type',
-                'severity': 'ERROR'
-            },
-            {
-                'name': 'Invalid home/away team indicators',
-                'query': '''
-                    SELECT COUNT(*) FROM boxscore 
-                    WHERE home_away_team NOT IN ('h', 'a')
-                ''',
-                'description': 'Invalid home/away team indicators',
-                'severity': 'ERROR'
-            },
-            {
-                'name': 'Negative statistics',
-                'query': '''
-                    SELECT COUNT(*) FROM boxscore 
-                    WHERE pts < 0 OR reb < 0 OR ast < 0 OR fgm < 0 OR fga < 0
-                ''',
-                'description': 'Negative statistical values',
-                'severity': 'WARNING'
-            },
-            {
-                'name': 'Invalid field goal percentages',
-                'query': '''
-                    SELECT COUNT(*) FROM boxscore 
-                    WHERE fgp IS NOT NULL AND (fgp < 0 OR fgp > 1)
-                ''',
-                'description': 'Field goal percentages outside valid range (0-1)',
-                'severity': 'WARNING'
-            }
-        ]
-        
-        for check in quality_checks:
-            try:
-                count = session.execute(text(check['query'])).scalar()
-                if count > 0:
-                    issue = {
-                        'check': check['name'],
-                        'description': check['description'],
-                        'count': count,
-                        'severity': check['severity']
-                    }
-                    issues.append(issue)
-                    
-                    if check['severity'] == 'ERROR':
-                        logger.error(f"  ❌ {check['name']}: {count} issues")
-                    else:
-                        logger.warning(f"  ⚠️  {check['name']}: {count} issues")
-                else:
-                    logger.info(f"  ✓ {check['name']}: No issues")
-            except Exception as e:
-                issue = {
-                    'check': check['name'],
-                    'description': f"Failed to execute check: {e}",
-                    'count': None,
-                    'severity': 'ERROR'
-                }
-                issues.append(issue)
-                logger.error(f"  ❌ {check['name']}: Check failed - {e}")
-        
-        return issues
+        return self._run_checks(scans, QUALITY_CHECKS, 'issues')
     
-    def _generate_statistics(self, session) -> Dict[str, any]:
-        """Generate statistical summary of the data"""
+    def _generate_statistics(self, scans: Dict[str, any]) -> Dict[str, any]:
+        """Generate statistical summary of the data from the table scans"""
         logger.info("Generating statistical summary...")
         
         stats = {}
+        failed = [table for table in ('game', 'play', 'boxscore', 'person') if isinstance(scans.get(table), Exception)]
+        if failed:
+            stats['error'] = f"Scans failed for: {', '.join(failed)}"
+            return stats
         
-        try:
-            # Game statistics
-            game_stats = session.execute(text('''
-                SELECT 
-                    COUNT(*) as total_games,
-                    COUNT(DISTINCT arena_id) as unique_arenas,
-                    COUNT(DISTINCT home_team_id) as unique_home_teams,
-                    COUNT(DISTINCT away_team_id) as unique_away_teams,
-                    MIN(game_et) as earliest_game,
-                    MAX(game_et) as latest_game
-                FROM game
-            ''')).fetchone()
-            
+        if 'game' in scans:
+            game_stats = scans['game']
             stats['games'] = {
-                'total_games': game_stats.total_games,
-                'unique_arenas': game_stats.unique_arenas,
-                'unique_teams': len(set([game_stats.unique_home_teams, game_stats.unique_away_teams])),
+                'total_games': game_stats['total'],
+                'unique_arenas': game_stats['unique_arenas'],
+                'unique_teams': len(set([game_stats['unique_home_teams'], game_stats['unique_away_teams']])),
                 'date_range': {
-                    'earliest': str(game_stats.earliest_game) if game_stats.earliest_game else None,
-                    'latest': str(game_stats.latest_game) if game_stats.latest_game else None
+                    'earliest': str(game_stats['earliest_game']) if game_stats['earliest_game'] else None,
+                    'latest': str(game_stats['latest_game']) if game_stats['latest_game'] else None
                 }
             }
-            
-            # Play statistics
-            play_stats = session.execute(text('''
-                SELECT 
-                    COUNT(*) as total_plays,
-                    COUNT(DISTINCT game_id) as games_with_plays,
-                    COUNT(DISTINCT action_type) as unique_action_types,
-                    AVG(CAST(points_total AS FLOAT)) as avg_points_per_play
-                FROM play
-            ''')).fetchone()
-            
+        
+        if 'play' in scans:
+            play_stats = scans['play']
             stats['plays'] = {
-                'total_plays': play_stats.total_plays,
-                'games_with_plays': play_stats.games_with_plays,
-                'unique_action_types': play_stats.unique_action_types,
-                'avg_points_per_play': round(play_stats.avg_points_per_play or 0, 2)
+                'total_plays': play_stats['total'],
+                'games_with_plays': play_stats['games_with_plays'],
+                'unique_action_types': play_stats['unique_action_types'],
+                'avg_points_per_play': round(play_stats['avg_points_per_play'] or 0, 2)
             }
-            
-            # Boxscore statistics
-            boxscore_stats = session.execute(text('''
-                SELECT 
-                    COUNT(*) as total_entries,
-                    COUNT(DISTINCT game_id) as games_with_boxscores,
-                    COUNT(DISTINCT person_id) as unique_persons,
-                    AVG(CAST(pts AS FLOAT)) as avg_points,
-                    MAX(pts) as max_points
-                FROM boxscore 
-                WHERE box_type = 'player'
-            ''')).fetchone()
-            
+        
+        if 'boxscore' in scans:
+            boxscore_stats = scans['boxscore']
             stats['boxscores'] = {
-                'total_entries': boxscore_stats.total_entries,
-                'games_with_boxscores': boxscore_stats.games_with_boxscores,
-                'unique_players': boxscore_stats.unique_persons,
-                'avg_player_points': round(boxscore_stats.avg_points or 0, 1),
-                'max_player_points': boxscore_stats.max_points or 0
+                'total_entries': boxscore_stats['player_entries'],
+                'games_with_boxscores': boxscore_stats['games_with_boxscores'],
+                'unique_players': boxscore_stats['unique_persons'],
+                'avg_player_points': round(boxscore_stats['avg_points'] or 0, 1),
+                'max_player_points': boxscore_stats['max_points'] or 0
             }
-            
-            # Person statistics
-            person_stats = session.execute(text('''
-                SELECT 
-                    COUNT(*) as total_persons,
-                    COUNT(CASE WHEN person_name IS NOT NULL THEN 1 END) as persons_with_names
-                FROM person
-            ''')).fetchone()
-            
+        
+        # Persons are not game-scoped, so incremental runs leave them out
+        if 'person' in scans:
+            person_stats = scans['person']
             stats['persons'] = {
-                'total_persons': person_stats.total_persons,
-                'persons_with_names': person_stats.persons_with_names,
+                'total_persons': person_stats['total'],
+                'persons_with_names': person_stats['persons_with_names'],
                 'name_coverage': round(
-                    (person_stats.persons_with_names / person_stats.total_persons * 100) 
-                    if person_stats.total_persons > 0 else 0, 1
+                    (person_stats['persons_with_names'] / person_stats['total'] * 100)
+                    if person_stats['total'] > 0 else 0, 1
                 )
             }
-            
-        except Exception as e:
-            logger.error(f"Error generating statistics: {e}")
-            stats['error'] = str(e)
         
         return stats
     
@@ -408,6 +606,12 @@ class DataValidator:
         logger.info("\n" + "=" * 60)
         logger.info("DATA VALIDATION SUMMARY")
         logger.info("=" * 60)
+        if results['mode'] == 'incremental':
+            logger.info(f"Incremental: {results['games_checked']} games populated since {results['since']} "
+                        f"or rechecked")
+        if results['failed_game_ids']:
+            logger.info(f"Games with issues (rechecked by the next incremental run): "
+                        f"{len(results['failed_game_ids'])}")
         
         # Table counts
         logger.info("\nTable Record Counts:")
@@ -472,12 +676,31 @@ def main():
         '--json', action='store_true',
         help='Output results as JSON'
     )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Only check games populated since the previous validation run and the games it failed'
+    )
+    parser.add_argument(
+        '--reconcile', action='store_true',
+        help='Also reconcile boxscore totals against play-by-play'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=4,
+        help='Tables scanned concurrently (default: 4)'
+    )
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
     
+    profiler = profiling.from_args(args, 'validate_populated_data')
+    if profiler:
+        if args.profile == 'cpu' and args.workers > 1:
+            logger.warning("cProfile only sees the main thread; use --workers 1 to profile table scans")
+        profiler.start()
+    
     try:
-        validator = DataValidator()
-        results = validator.validate_all()
+        validator = DataValidator(max_workers=args.workers)
+        results = validator.validate_all(incremental=args.incremental, reconcile=args.reconcile)
         
         # Output results
         if args.output:
@@ -502,6 +725,14 @@ def main():
                         f.write(f"\nData Quality Issues ({len(results['data_quality_issues'])}):\n")
                         for issue in results['data_quality_issues']:
                             f.write(f"  - {issue['check']}: {issue['count']} issues ({issue['severity']})\n")
+                    
+                    discrepancies = results.get('reconciliation', {}).get('discrepancies')
+                    if discrepancies:
+                        f.write(f"\nBoxscore vs Play-by-Play Discrepancies ({len(discrepancies)}):\n")
+                        for d in discrepancies:
+                            entity = f"person {d['person_id']}" if d['level'] == 'player' else f"team {d['team_id']}"
+                            f.write(f"  - game {d['game_id']} {entity} {d['stat']}: "
+                                    f"boxscore {d['boxscore']}, plays {d['plays']}\n")
             
             logger.info(f"Validation report written to: {args.output}")
         
@@ -512,6 +743,9 @@ def main():
     except Exception as e:
         logger.error(f"Validation failed: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == '__main__':
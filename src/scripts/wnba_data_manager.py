@@ -13,7 +13,8 @@ import sys
 from typing import List, Optional, Dict, Any
 
 from .scraper_manager import ScraperManager
-from .populate_game_tables import GameTablePopulator
+from .populate_game_tables import GameTablePopulator, PopulationPipeline
+from .. import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +22,43 @@ logger = logging.getLogger(__name__)
 class WNBADataManager:
     """Unified manager for WNBA data scraping and population operations."""
     
-    def __init__(self):
+    def __init__(self, populate_workers: int = 1, queue_size: int = 8):
+        """
+        Args:
+            populate_workers: Population threads in pipelined mode
+            queue_size: Scraped games waiting for population in pipelined mode
+        """
         self.scraper_manager = ScraperManager()
         self.table_populator = GameTablePopulator()
+        self.populate_workers = populate_workers
+        self.queue_size = queue_size
+    
+    def _scrape_pipelined(self, scrape, override_existing: bool, description: str) -> Dict[str, Any]:
+        """
+        Run a scrape with each stored game handed straight to population workers.
+        
+        Args:
+            scrape: Called with the on_stored callback; returns scraping statistics
+            override_existing: Clear each game's existing data before populating
+            description: Recorded with the population run
+            
+        Returns:
+            Dict with scraping and population statistics
+        """
+        logger.info(f"🕷️📊 Scraping and populating in a pipeline "
+                    f"({self.populate_workers} workers, queue of {self.queue_size})")
+        pipeline = PopulationPipeline(self.table_populator, workers=self.populate_workers,
+                                      queue_size=self.queue_size, override_existing=override_existing,
+                                      description=description)
+        with profiling.stage('pipeline'):
+            with pipeline:
+                scraping_stats = scrape(pipeline.submit)
+        return {'scraping': scraping_stats, 'population': pipeline.stats}
     
     def scrape_and_populate_games(self, game_ids: List[str], 
                                  override_existing: bool = False,
-                                 clear_tables_first: bool = False) -> Dict[str, Any]:
+                                 clear_tables_first: bool = False,
+                                 pipelined: bool = False) -> Dict[str, Any]:
         """
         Scrape specific games and immediately populate them into normalized tables.
         
@@ -35,6 +66,8 @@ class WNBADataManager:
             game_ids: List of game IDs to scrape and populate
             override_existing: If True, re-scrape games that already exist
             clear_tables_first: If True, clear all populated tables before processing
+            pipelined: If True, populate each game as soon as it is scraped
+                instead of after all scraping has finished
             
         Returns:
             Dict with combined scraping and population statistics
@@ -49,12 +82,22 @@ class WNBADataManager:
                 logger.error("Failed to clear tables - aborting operation")
                 return {'scraping': {}, 'population': {}, 'success': False}
         
+        if pipelined:
+            combined_stats = self._scrape_pipelined(
+                lambda on_stored: self.scraper_manager.scrape_specific_games(
+                    game_ids, override_existing=override_existing, on_stored=on_stored),
+                override_existing=override_existing,
+                description=f"{len(game_ids)} requested"
+            )
+            return self._log_combined(combined_stats, "Scrape-and-populate")
+        
         # Step 2: Scrape the games
         logger.info("🕷️ Starting scraping phase...")
-        scraping_stats = self.scraper_manager.scrape_specific_games(
-            game_ids, 
-            override_existing=override_existing
-        )
+        with profiling.stage('scrape'):
+            scraping_stats = self.scraper_manager.scrape_specific_games(
+                game_ids, 
+                override_existing=override_existing
+            )
         
         if scraping_stats['success'] == 0:
             logger.warning("No games were successfully scraped - skipping population")
@@ -75,19 +118,22 @@ class WNBADataManager:
             except ValueError:
                 logger.warning(f"Invalid game ID format: {game_id} - skipping")
         
-        population_stats = self.table_populator.populate_specific_games(
-            game_ids_int,
-            override_existing=override_existing
-        )
+        with profiling.stage('populate'):
+            population_stats = self.table_populator.populate_specific_games(
+                game_ids_int,
+                override_existing=override_existing
+            )
         
         # Combined results
-        combined_stats = {
-            'scraping': scraping_stats,
-            'population': population_stats,
-            'success': scraping_stats['success'] > 0 and population_stats['successful_games'] > 0
-        }
+        combined_stats = {'scraping': scraping_stats, 'population': population_stats}
+        return self._log_combined(combined_stats, "Scrape-and-populate")
+    
+    def _log_combined(self, combined_stats: Dict[str, Any], operation: str) -> Dict[str, Any]:
+        """Add the overall success flag to scrape-and-populate results and log them"""
+        scraping_stats, population_stats = combined_stats['scraping'], combined_stats['population']
+        combined_stats['success'] = scraping_stats['success'] > 0 and population_stats['successful_games'] > 0
         
-        logger.info(f"✅ Scrape-and-populate completed. "
+        logger.info(f"✅ {operation} completed. "
                    f"Scraped: {scraping_stats['success']}/{scraping_stats['total']}, "
                    f"Populated: {population_stats['successful_games']}/{population_stats['total_games']}")
         
@@ -95,7 +141,8 @@ class WNBADataManager:
     
     def scrape_and_populate_season(self, season: int, game_type: str = 'regular',
                                   max_games: Optional[int] = None,
-                                  clear_tables_first: bool = False) -> Dict[str, Any]:
+                                  clear_tables_first: bool = False,
+                                  pipelined: bool = False) -> Dict[str, Any]:
         """
         Scrape an entire season and populate it into normalized tables.
         
@@ -104,6 +151,8 @@ class WNBADataManager:
             game_type: 'regular' or 'playoff'
             max_games: Maximum number of games to process
             clear_tables_first: If True, clear all populated tables before processing
+            pipelined: If True, populate each game as soon as it is scraped
+                instead of after all scraping has finished
             
         Returns:
             Dict with combined scraping and population statistics
@@ -118,9 +167,19 @@ class WNBADataManager:
                 logger.error("Failed to clear tables - aborting operation")
                 return {'scraping': {}, 'population': {}, 'success': False}
         
+        if pipelined:
+            combined_stats = self._scrape_pipelined(
+                lambda on_stored: self.scraper_manager.scrape_season(
+                    season, game_type, max_games, on_stored=on_stored),
+                override_existing=False,
+                description=f"season={season} {game_type}" + (f" limit={max_games}" if max_games else '')
+            )
+            return self._log_combined(combined_stats, "Season scrape-and-populate")
+        
         # Step 2: Scrape the season
         logger.info(f"🕷️ Starting scraping phase for {season} {game_type} season...")
-        scraping_stats = self.scraper_manager.scrape_season(season, game_type, max_games)
+        with profiling.stage('scrape'):
+            scraping_stats = self.scraper_manager.scrape_season(season, game_type, max_games)
         
         if scraping_stats['success'] == 0:
             logger.warning("No games were successfully scraped - skipping population")
@@ -132,24 +191,16 @@ class WNBADataManager:
         
         # Step 3: Populate all games from this season
         logger.info("📊 Starting population phase...")
-        population_stats = self.table_populator.populate_games_by_season(
-            [season],
-            limit=max_games,
-            override_existing=False  # Don't override since we just scraped
-        )
+        with profiling.stage('populate'):
+            population_stats = self.table_populator.populate_games_by_season(
+                [season],
+                limit=max_games,
+                override_existing=False  # Don't override since we just scraped
+            )
         
         # Combined results
-        combined_stats = {
-            'scraping': scraping_stats,
-            'population': population_stats,
-            'success': scraping_stats['success'] > 0 and population_stats['successful_games'] > 0
-        }
-        
-        logger.info(f"✅ Season scrape-and-populate completed. "
-                   f"Scraped: {scraping_stats['success']}/{scraping_stats['total']}, "
-                   f"Populated: {population_stats['successful_games']}/{population_stats['total_games']}")
-        
-        return combined_stats
+        combined_stats = {'scraping': scraping_stats, 'population': population_stats}
+        return self._log_combined(combined_stats, "Season scrape-and-populate")
     
     def verify_and_repopulate_games(self, game_ids: List[str]) -> Dict[str, Any]:
         """
@@ -165,7 +216,8 @@ class WNBADataManager:
         
         # Step 1: Verify and update games in raw_game_data
         logger.info("🔍 Starting verification phase...")
-        verification_stats = self.scraper_manager.verify_and_update_games(game_ids)
+        with profiling.stage('verify'):
+            verification_stats = self.scraper_manager.verify_and_update_games(game_ids)
         
         # Step 2: Repopulate games that were updated
         updated_game_ids = []
@@ -179,10 +231,11 @@ class WNBADataManager:
         population_stats = None
         if updated_game_ids:
             logger.info(f"📊 Re-populating {len(updated_game_ids)} updated games...")
-            population_stats = self.table_populator.populate_specific_games(
-                updated_game_ids,
-                override_existing=True  # Override since we know data changed
-            )
+            with profiling.stage('populate'):
+                population_stats = self.table_populator.populate_specific_games(
+                    updated_game_ids,
+                    override_existing=True  # Override since we know data changed
+                )
         else:
             logger.info("No games were updated - skipping population phase")
             population_stats = {'total_games': 0, 'successful_games': 0, 'failed_games': 0}
@@ -216,9 +269,10 @@ class WNBADataManager:
         
         # Step 1: Verify and update season in raw_game_data
         logger.info("🔍 Starting season verification phase...")
-        verification_stats = self.scraper_manager.verify_and_update_season(
-            season, game_type, max_games
-        )
+        with profiling.stage('verify'):
+            verification_stats = self.scraper_manager.verify_and_update_season(
+                season, game_type, max_games
+            )
         
         # Step 2: Repopulate games that were updated
         updated_game_ids = []
@@ -232,10 +286,11 @@ class WNBADataManager:
         population_stats = None
         if updated_game_ids:
             logger.info(f"📊 Re-populating {len(updated_game_ids)} updated games...")
-            population_stats = self.table_populator.populate_specific_games(
-                updated_game_ids,
-                override_existing=True  # Override since we know data changed
-            )
+            with profiling.stage('populate'):
+                population_stats = self.table_populator.populate_specific_games(
+                    updated_game_ids,
+                    override_existing=True  # Override since we know data changed
+                )
         else:
             logger.info("No games were updated - skipping population phase")
             population_stats = {'total_games': 0, 'successful_games': 0, 'failed_games': 0}
@@ -267,10 +322,11 @@ class WNBADataManager:
         
         # Step 1: Re-scrape all games (with override)
         logger.info("🕷️ Re-scraping games with override...")
-        scraping_stats = self.scraper_manager.scrape_specific_games(
-            game_ids,
-            override_existing=True
-        )
+        with profiling.stage('scrape'):
+            scraping_stats = self.scraper_manager.scrape_specific_games(
+                game_ids,
+                override_existing=True
+            )
         
         # Step 2: Clear existing populated data for these games only
         logger.info("🗑️ Clearing existing populated data for these games...")
@@ -285,10 +341,11 @@ class WNBADataManager:
         
         # Step 3: Re-populate the games
         logger.info("📊 Re-populating games...")
-        population_stats = self.table_populator.populate_specific_games(
-            game_ids_int,
-            override_existing=True
-        )
+        with profiling.stage('populate'):
+            population_stats = self.table_populator.populate_specific_games(
+                game_ids_int,
+                override_existing=True
+            )
         
         combined_stats = {
             'scraping': scraping_stats,
@@ -352,12 +409,19 @@ def main():
                        help='Clear all populated tables before processing')
     parser.add_argument('--validate', action='store_true',
                        help='Validate foreign key integrity after population')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Populate each game as soon as it is scraped (scrape-populate-games/season)')
+    parser.add_argument('--populate-workers', type=int, default=1,
+                       help='Population threads with --pipeline (default: 1)')
+    parser.add_argument('--queue-size', type=int, default=8,
+                       help='Scraped games waiting for population with --pipeline (default: 8)')
     
     # Utility options  
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose logging')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be processed without actual processing')
+    profiling.add_arguments(parser)
     
     args = parser.parse_args()
     
@@ -365,7 +429,10 @@ def main():
     setup_logging(args.verbose)
     
     # Initialize manager
-    manager = WNBADataManager()
+    manager = WNBADataManager(populate_workers=args.populate_workers, queue_size=args.queue_size)
+    profiler = profiling.from_args(args, 'wnba_data_manager')
+    if profiler:
+        profiler.start()
     
     try:
         if args.dry_run:
@@ -380,7 +447,8 @@ def main():
             stats = manager.scrape_and_populate_games(
                 args.game_ids,
                 override_existing=args.override,
-                clear_tables_first=args.clear_tables
+                clear_tables_first=args.clear_tables,
+                pipelined=args.pipeline
             )
             
             print(f"\nScrape-and-Populate Results:")
@@ -403,7 +471,8 @@ def main():
                 args.season,
                 args.game_type,
                 args.max_games,
-                clear_tables_first=args.clear_tables
+                clear_tables_first=args.clear_tables,
+                pipelined=args.pipeline
             )
             
             print(f"\nSeason Scrape-and-Populate Results ({args.season} {args.game_type}):")
@@ -578,6 +647,9 @@ def main():
     except Exception as e:
         logger.error(f"Error in main: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == '__main__':
@@ -320,6 +320,24 @@ def postgresql_session(postgresql_engine):
     session.close()
 
 
+@pytest.fixture
+def sqlite_session():
+    """In-memory SQLite session with every table except JSONB-backed raw_game_data"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.database.models import Base
+    
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+    engine.dispose()
+
+
 @pytest.fixture(scope="session")
 def sample_game_json():
     """Load sample game JSON data (session-scoped for performance)"""
@@ -346,4 +364,41 @@ def all_sample_games():
         with open(json_file, 'r') as f:
             games.append(json.load(f))
     
-    return games
\ No newline at end of file
+    return games
+
+
+@pytest.fixture
+def population_engine(tmp_path):
+    """SQLite file database with every table, raw_game_data storing its JSON as text"""
+    from sqlalchemy import create_engine, text
+    from src.database.models import Base
+    
+    engine = create_engine(f"sqlite:///{tmp_path / 'population.db'}")
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE raw_game_data (id INTEGER PRIMARY KEY, game_id INTEGER UNIQUE NOT NULL, "
+            "season INTEGER NOT NULL, game_type VARCHAR(20) NOT NULL, game_url VARCHAR(500) NOT NULL, "
+            "game_data JSON NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def populator(population_engine, all_sample_games):
+    """GameTablePopulator over population_engine with the sample games in raw_game_data"""
+    import json
+    from sqlalchemy import text
+    from src.scripts.populate_game_tables import GameTablePopulator
+    
+    with population_engine.begin() as conn:
+        for game_json in all_sample_games:
+            game_id = int(game_json['boxscore']['gameId'])
+            conn.execute(
+                text("INSERT INTO raw_game_data (game_id, season, game_type, game_url, game_data, created_at, updated_at) "
+                     "VALUES (:game_id, :season, 'regular', '', :game_data, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"),
+                {'game_id': game_id, 'season': 2000 + game_id // 100000 % 100, 'game_data': json.dumps(game_json)}
+            )
+    return GameTablePopulator(population_engine)
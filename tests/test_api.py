@@ -0,0 +1,314 @@
+"""
+Tests for the read-only HTTP API.
+
+Test Categories:
+- unit: Response cache expiry and eviction, cursor encoding
+- integration: Endpoints, keyset pagination, caching and ETags against a populated SQLite database
+"""
+
+import asyncio
+import copy
+import json
+from datetime import datetime
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Boxscore
+from src.database.population_services import GamePopulationService
+from src.api import create_app, ResponseCache
+from src.api.pagination import encode_cursor, decode_cursor, InvalidCursor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test TTL expiry and LRU eviction"""
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(max_entries=10, default_ttl=5, clock=clock)
+        cache.set('a', b'1', '"a"')
+        cache.set('b', b'2', '"b"', immutable=True)
+
+        clock.now = 4
+        assert cache.get('a').body == b'1'
+        clock.now = 6
+        assert cache.get('a') is None
+        assert cache.get('b').body == b'2'
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.set('a', b'1', '"a"')
+        cache.set('b', b'2', '"b"')
+        cache.get('a')
+        cache.set('c', b'3', '"c"')
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert len(cache) == 2
+
+    def test_disabled(self):
+        cache = ResponseCache(max_entries=0)
+        cache.set('a', b'1', '"a"')
+        assert cache.get('a') is None
+
+
+@pytest.mark.unit
+class TestCursors:
+    """Test opaque cursor round trips and validation"""
+
+    def test_round_trip(self):
+        token = encode_cursor('plays', [1022400005, 12, 340])
+        assert '=' not in token
+        assert decode_cursor('plays', token, 3) == [1022400005, 12, 340]
+
+    def test_rejects_other_listing(self):
+        token = encode_cursor('games', [2024, '2024-05-14T19:00:00', 1022400005])
+        with pytest.raises(InvalidCursor):
+            decode_cursor('plays', token, 3)
+
+    def test_rejects_garbage(self):
+        for token in ['not-a-cursor', '', encode_cursor('plays', [1, 2])]:
+            with pytest.raises(InvalidCursor):
+                decode_cursor('plays', token, 3)
+
+
+@pytest.fixture
+def api_engine(tmp_path, sample_game_json):
+    """File-backed SQLite database (shared across worker threads) with one populated game"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    with sessionmaker(bind=engine)() as session:
+        GamePopulationService(session).populate_game(sample_game_json)
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def run_with_client(app, scenario):
+    """Run an async scenario against a test server for the app"""
+    async def go():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(go())
+
+
+@pytest.mark.integration
+class TestApi:
+    """Test API endpoints against a populated game"""
+
+    GAME_ID = 1022400005
+
+    def test_game_endpoints(self, api_engine, sample_game_json):
+        async def scenario(client):
+            game = await client.get(f'/games/{self.GAME_ID}')
+            assert game.status == 200
+            body = await game.json()
+            assert body['game_id'] == self.GAME_ID
+            assert 'arena_internal_id' not in body
+
+            page = await (await client.get(f'/games/{self.GAME_ID}/plays')).json()
+            assert page['next_cursor'] is None
+            plays = page['items']
+            assert len(plays) == 454
+            numbers = [p['action_number'] for p in plays]
+            assert numbers == sorted(numbers)
+            home_team_id = sample_game_json['boxscore']['homeTeam']['teamId']
+            assert {p['team_id'] for p in plays} >= {home_team_id}
+
+            boxscores = await (await client.get(f'/games/{self.GAME_ID}/boxscores')).json()
+            totals = [b for b in boxscores if b['box_type'] == 'totals' and b['home_away_team'] == 'h']
+            assert totals[0]['team_id'] == home_team_id
+
+            games = await (await client.get('/games?season=2024&game_type=regular')).json()
+            assert [g['game_id'] for g in games['items']] == [self.GAME_ID]
+            assert await (await client.get('/games?season=1999')).json() == {'items': [], 'next_cursor': None}
+
+            teams = await (await client.get('/teams')).json()
+            assert len(teams) == 2
+            team = await (await client.get(f'/teams/{home_team_id}')).json()
+            assert team['team_id'] == home_team_id
+
+            person_id = plays[[p['person_id'] is not None for p in plays].index(True)]['person_id']
+            person = await (await client.get(f'/persons/{person_id}')).json()
+            assert person['person_id'] == person_id
+
+            health = await (await client.get('/health')).json()
+            assert health['status'] == 'ok'
+
+        run_with_client(create_app(api_engine), scenario)
+
+    def test_errors(self, api_engine):
+        async def scenario(client):
+            assert (await client.get('/games/999')).status == 404
+            assert (await client.get('/games/999/plays')).status == 404
+            assert (await client.get('/persons/1')).status == 404
+            assert (await client.get('/games/abc')).status == 400
+            assert (await client.get('/games?limit=0')).status == 400
+            assert (await client.get(f'/games/{self.GAME_ID}/plays?limit=1001')).status == 400
+            assert (await client.get(f'/games/{self.GAME_ID}/plays?cursor=bogus')).status == 400
+            games_cursor = encode_cursor('games', [2024, '2024-05-14T19:00:00', 1])
+            assert (await client.get(f'/seasons/2024/plays?cursor={games_cursor}')).status == 400
+
+        run_with_client(create_app(api_engine), scenario)
+
+    def test_keyset_pagination(self, api_engine):
+        async def collect(client, path):
+            items, pages, cursor = [], 0, None
+            while True:
+                url = path if cursor is None else f'{path}&cursor={cursor}'
+                body = await (await client.get(url)).json()
+                items.extend(body['items'])
+                pages += 1
+                cursor = body['next_cursor']
+                if cursor is None:
+                    return items, pages
+
+        async def scenario(client):
+            full = (await (await client.get(f'/games/{self.GAME_ID}/plays')).json())['items']
+
+            paged, pages = await collect(client, f'/games/{self.GAME_ID}/plays?limit=100')
+            assert pages == 5
+            assert [p['play_id'] for p in paged] == [p['play_id'] for p in full]
+
+            season, _ = await collect(client, '/seasons/2024/plays?limit=250')
+            assert [p['play_id'] for p in season] == [p['play_id'] for p in full]
+            assert (await (await client.get('/seasons/1999/plays')).json())['items'] == []
+
+            exact, pages = await collect(client, f'/games/{self.GAME_ID}/plays?limit=454')
+            assert (len(exact), pages) == (454, 1)
+
+            games, pages = await collect(client, '/games?limit=1')
+            assert ([g['game_id'] for g in games], pages) == ([self.GAME_ID], 1)
+
+        run_with_client(create_app(api_engine), scenario)
+
+    def test_streaming_export(self, api_engine):
+        async def scenario(client):
+            response = await client.get(f'/export/play?format=csv&game_id={self.GAME_ID}',
+                                        headers={'Accept-Encoding': 'gzip'})
+            assert response.status == 200
+            assert response.headers['Content-Encoding'] == 'gzip'
+            assert response.headers['Content-Type'].startswith('text/csv')
+            lines = (await response.text()).splitlines()
+            assert lines[0].startswith('play_id,game_id')
+            assert len(lines) == 455
+
+            ndjson = await (await client.get('/export/game?season=2024')).text()
+            assert json.loads(ndjson)['game_id'] == self.GAME_ID
+            assert await (await client.get('/export/game?season=1999')).text() == ''
+
+            assert (await client.get('/export/raw_game_data')).status == 404
+            assert (await client.get('/export/play?format=xml')).status == 400
+
+        run_with_client(create_app(api_engine), scenario)
+
+    def test_finished_game_is_immutable_with_etag(self, api_engine):
+        cache = ResponseCache(max_entries=100, default_ttl=30)
+
+        async def scenario(client):
+            first = await client.get(f'/games/{self.GAME_ID}/plays')
+            etag = first.headers['ETag']
+            assert 'immutable' in first.headers['Cache-Control']
+            assert etag.startswith('"')
+
+            revalidated = await client.get(f'/games/{self.GAME_ID}/plays', headers={'If-None-Match': etag})
+            assert revalidated.status == 304
+            assert revalidated.headers['ETag'] == etag
+
+            listing = await client.get('/games')
+            assert listing.headers['Cache-Control'] == 'public, max-age=30'
+
+        run_with_client(create_app(api_engine, cache=cache), scenario)
+        assert cache.hits == 1
+
+    def test_in_progress_game_expires(self, api_engine, sample_game_json):
+        in_progress = copy.deepcopy(sample_game_json)
+        in_progress['boxscore']['gameStatus'] = 2
+        with sessionmaker(bind=api_engine)() as session:
+            service = GamePopulationService(session)
+            service.clear_game_data(self.GAME_ID)
+            service.populate_game(in_progress)
+            session.commit()
+            # Team totals are populated for games in progress too
+            assert session.query(Boxscore).filter_by(game_id=self.GAME_ID, box_type='totals').count() == 2
+
+        async def scenario(client):
+            for path in (f'/games/{self.GAME_ID}', f'/games/{self.GAME_ID}/plays'):
+                response = await client.get(path)
+                assert response.status == 200
+                assert 'immutable' not in response.headers['Cache-Control']
+
+        run_with_client(create_app(api_engine), scenario)
+
+
+@pytest.mark.integration
+class TestKeysetQueries:
+    """Test keyset pages across several games"""
+
+    def test_games_and_season_plays_page_without_gaps(self, sqlite_session, all_sample_games):
+        from src.api import queries
+        from src.database.models import Game, Play
+
+        service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            service.populate_game(game_json)
+        sqlite_session.commit()
+
+        def collect(fetch):
+            items, cursor = [], None
+            while True:
+                result = fetch(cursor)
+                items.extend(result['items'])
+                cursor = result['next_cursor']
+                if cursor is None:
+                    return items
+
+        games = collect(lambda cursor: queries.list_games(sqlite_session, limit=2, cursor=cursor))
+        expected = sqlite_session.query(Game).order_by(Game.season, Game.game_et, Game.game_id).all()
+        assert [g['game_id'] for g in games] == [g.game_id for g in expected]
+
+        season = expected[0].season
+        plays = collect(lambda cursor: queries.list_season_plays(sqlite_session, season, limit=97, cursor=cursor))
+        expected_plays = (
+            sqlite_session.query(Play.play_id).join(Game, Game.game_id == Play.game_id)
+            .filter(Game.season == season)
+            .order_by(Play.game_id, Play.action_number, Play.play_id).all()
+        )
+        assert [p['play_id'] for p in plays] == [row.play_id for row in expected_plays]
+
+    def test_games_missing_season_or_tip_off_are_paged(self, sqlite_session, all_sample_games):
+        from src.api import queries
+        from src.database.models import Game
+
+        service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            service.populate_game(game_json)
+        sqlite_session.add(Game(game_id=1, season=None, game_et=None))
+        sqlite_session.add(Game(game_id=2, season=None, game_et=datetime(2024, 5, 1, 19)))
+        sqlite_session.commit()
+
+        game_ids, cursor = [], None
+        while True:
+            result = queries.list_games(sqlite_session, limit=1, cursor=cursor)
+            game_ids.extend(g['game_id'] for g in result['items'])
+            cursor = result['next_cursor']
+            if cursor is None:
+                break
+
+        expected = sqlite_session.query(Game).filter(Game.season.isnot(None)).order_by(
+            Game.season, Game.game_et, Game.game_id
+        ).all()
+        assert game_ids == [1, 2] + [g.game_id for g in expected]
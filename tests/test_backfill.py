@@ -0,0 +1,137 @@
+"""
+Tests for the resumable chunked backfill runner.
+
+Test Categories:
+- integration: Keyset chunking, checkpoints, resume, throttling and progress against SQLite
+"""
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from src.database.models import Base, Game, BackfillCheckpoint
+from src.database.backfill import BackfillRunner, sql_transform
+
+
+class FakeClock:
+    """Clock that advances only when slept on or stepped"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        session.add_all([Game(game_id=1022400000 + i) for i in range(1, 11)])
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def mark_season(lo, hi):
+    return update(Game).where(Game.game_id.between(lo, hi)).values(season=2024)
+
+
+@pytest.mark.integration
+class TestBackfillRunner:
+    """Test chunk walking and checkpoint handling"""
+
+    def test_runs_in_chunks_and_completes(self, engine):
+        chunks = []
+
+        def transform(conn, keys):
+            chunks.append(keys)
+            return sql_transform(mark_season)(conn, keys)
+
+        stats = BackfillRunner(engine, 'test', Game.game_id, chunk_size=4).run(transform)
+
+        assert [len(keys) for keys in chunks] == [4, 4, 2]
+        assert stats['rows'] == stats['affected'] == 10
+        assert stats['chunks'] == 3
+        with Session(engine) as session:
+            assert session.query(Game).filter(Game.season == 2024).count() == 10
+            checkpoint = session.get(BackfillCheckpoint, 'test')
+            assert checkpoint.table_name == 'game'
+            assert checkpoint.rows_processed == 10
+            assert checkpoint.completed_at is not None
+
+    def test_resumes_after_failure(self, engine):
+        calls = []
+
+        def failing(conn, keys):
+            calls.append(keys)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return sql_transform(mark_season)(conn, keys)
+
+        runner = BackfillRunner(engine, 'test', Game.game_id, chunk_size=3)
+        with pytest.raises(RuntimeError):
+            runner.run(failing)
+
+        checkpoint = runner.checkpoint()
+        assert checkpoint['last_key'] == calls[0][-1]
+        assert checkpoint['rows_processed'] == 3
+        assert checkpoint['completed_at'] is None
+        with Session(engine) as session:
+            # The failed chunk rolled back with its checkpoint
+            assert session.query(Game).filter(Game.season == 2024).count() == 3
+
+        resumed = []
+        stats = runner.run(lambda conn, keys: resumed.append(keys) or sql_transform(mark_season)(conn, keys))
+
+        assert stats['resumed_from'] == calls[0][-1]
+        assert resumed[0][0] == calls[1][0]
+        assert stats['rows'] == 7
+        assert runner.checkpoint()['rows_processed'] == 10
+        with Session(engine) as session:
+            assert session.query(Game).filter(Game.season == 2024).count() == 10
+
+    def test_restart_and_completed_runs_start_over(self, engine):
+        runner = BackfillRunner(engine, 'test', Game.game_id, chunk_size=5)
+        runner.run(sql_transform(mark_season))
+
+        assert runner.run(sql_transform(mark_season))['rows'] == 10
+        assert runner.run(sql_transform(mark_season), restart=True)['resumed_from'] is None
+
+    def test_where_and_dry_run(self, engine):
+        with Session(engine) as session:
+            session.query(Game).filter(Game.game_id <= 1022400004).update({Game.season: 2024})
+            session.commit()
+
+        runner = BackfillRunner(engine, 'test', Game.game_id, where=Game.season.is_(None), chunk_size=4)
+        stats = runner.run(dry_run=True)
+
+        assert stats['rows'] == 6
+        assert stats['chunks'] == 2
+        assert runner.checkpoint() is None
+        with pytest.raises(ValueError):
+            runner.run()
+
+    def test_throttle_and_progress(self, engine):
+        clock = FakeClock()
+        reports = []
+        runner = BackfillRunner(engine, 'test', Game.game_id, chunk_size=5, rows_per_second=2.0,
+                                progress=reports.append, clock=clock, sleep=clock.sleep)
+
+        stats = runner.run(sql_transform(mark_season))
+
+        # The transform takes no time on the fake clock, so each 5-row chunk waits 2.5s
+        assert clock.sleeps == [2.5, 2.5]
+        assert stats['elapsed'] == 5.0
+        assert [r['processed'] for r in reports] == [5, 10]
+        assert reports[0]['total'] == 10
+        assert reports[0]['eta'] == pytest.approx(2.5)
+        assert reports[1]['rate'] == pytest.approx(2.0)
+        assert reports[1]['eta'] == 0
@@ -0,0 +1,78 @@
+"""
+Tests for the set-based game metadata backfill.
+
+Test Categories:
+- unit: SQL game ID expressions against parse_game_id
+- integration: Chunked, checkpointed backfill and dry runs against SQLite
+"""
+
+import pytest
+from sqlalchemy import create_engine, select, literal_column, Integer
+from sqlalchemy.orm import Session
+
+from src.database.models import Base, Game, BackfillCheckpoint
+from src.database.game_utils import parse_game_id, game_id_season_sql, game_id_game_type_sql
+from src.scripts.backfill_game_metadata import backfill_game_metadata
+
+
+GAME_IDS = [1029700003, 1020100043, 1022400005, 1041400203, 1042300302, 1052400001]
+
+
+@pytest.fixture
+def backfill_engine():
+    engine = create_engine("sqlite://")
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        session.add_all([Game(game_id=game_id) for game_id in GAME_IDS])
+        session.add(Game(game_id=12345))
+        session.add(Game(game_id=1022400006, season=2030, game_type='regular'))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestGameIdSql:
+    """Test the SQL counterparts of parse_game_id"""
+
+    def test_matches_parse_game_id(self):
+        engine = create_engine("sqlite://")
+        with engine.connect() as conn:
+            for game_id in GAME_IDS:
+                value = literal_column(str(game_id), Integer)
+                season, game_type = conn.execute(
+                    select(game_id_season_sql(value), game_id_game_type_sql(value))
+                ).one()
+                assert {'season': season, 'game_type': game_type} == parse_game_id(game_id)
+
+
+@pytest.mark.integration
+class TestBackfillGameMetadata:
+    """Test chunked updates and dry runs"""
+
+    def test_dry_run_counts_without_updating(self, backfill_engine):
+        results = backfill_game_metadata(dry_run=True, engine=backfill_engine, chunk_size=4)
+
+        assert results['game'] == {'updated': len(GAME_IDS), 'unparseable': 1, 'chunks': 2}
+        assert 'raw_game_data' not in results
+        with Session(backfill_engine) as session:
+            assert session.query(Game).filter(Game.season.is_(None)).count() == len(GAME_IDS) + 1
+            assert session.query(BackfillCheckpoint).count() == 0
+
+    def test_backfill_updates_in_chunks(self, backfill_engine):
+        results = backfill_game_metadata(engine=backfill_engine, chunk_size=2)
+
+        assert results['game']['updated'] == len(GAME_IDS)
+        assert results['game']['chunks'] == 3
+        with Session(backfill_engine) as session:
+            for game in session.query(Game).filter(Game.game_id.in_(GAME_IDS)):
+                assert {'season': game.season, 'game_type': game.game_type} == parse_game_id(game.game_id)
+            assert session.get(Game, 12345).season is None
+            # Games that already have metadata are left alone
+            assert session.get(Game, 1022400006).season == 2030
+            checkpoint = session.get(BackfillCheckpoint, 'game_metadata:game')
+            assert checkpoint.completed_at is not None
+            assert checkpoint.last_key == max(GAME_IDS)
+
+        assert backfill_game_metadata(engine=backfill_engine)['game']['updated'] == 0
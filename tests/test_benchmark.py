@@ -0,0 +1,79 @@
+"""
+Tests for the performance benchmark suite.
+
+Test Categories:
+- unit: Synthetic corpus, history files and run comparison
+- integration: A single-repeat suite run over two games against SQLite
+"""
+
+import json
+
+import pytest
+
+from src.scripts.benchmark import (
+    BenchmarkSuite, INSERT_TABLES, synthetic_corpus, extract_game, append_history, load_history, compare_runs
+)
+
+
+def _entry(**medians):
+    return {'timestamp': '2026-01-01T00:00:00+00:00',
+            'results': {name: {'median': median} for name, median in medians.items()}}
+
+
+@pytest.mark.unit
+class TestCorpus:
+    """Test the synthetic corpus"""
+
+    def test_synthetic_corpus_is_reproducible(self, all_sample_games):
+        games = synthetic_corpus(3)
+
+        real_ids = {g['boxscore']['gameId'] for g in all_sample_games}
+        assert [g['boxscore']['gameId'] for g in games] == ['1022450001', '1022450002', '1022450003']
+        assert not real_ids & {g['boxscore']['gameId'] for g in games}
+        assert json.dumps(games) == json.dumps(synthetic_corpus(3))
+        assert all(extract_game(g) > 0 for g in games)
+
+
+@pytest.mark.unit
+class TestHistory:
+    """Test the history file and comparison"""
+
+    def test_append_and_load(self, tmp_path):
+        path = str(tmp_path / 'history.json')
+        assert load_history(path) == []
+
+        append_history(path, _entry(extract=1.0))
+        append_history(path, _entry(extract=2.0))
+
+        assert [run['results']['extract']['median'] for run in load_history(path)] == [1.0, 2.0]
+
+    def test_compare_flags_slowdowns_beyond_threshold(self):
+        rows = compare_runs(_entry(extract=1.0, populate=2.0, validate=1.0),
+                            _entry(extract=1.05, populate=2.5, html_extract=1.0), threshold=0.10)
+
+        by_name = {row['name']: row for row in rows}
+        assert set(by_name) == {'extract', 'populate'}
+        assert not by_name['extract']['regression']
+        assert by_name['populate']['regression']
+        assert by_name['populate']['change'] == pytest.approx(0.25)
+
+
+@pytest.mark.integration
+class TestBenchmarkSuite:
+    """Test a full suite run"""
+
+    def test_run_reports_every_benchmark(self, all_sample_games):
+        games = sorted(all_sample_games, key=lambda g: g['boxscore']['gameId'])[-2:]
+        suite = BenchmarkSuite(games, repeat=1)
+        try:
+            results = suite.run()
+        finally:
+            suite.close()
+
+        expected = {'extract', 'html_extract', 'populate', 'validate'} | {f'insert.{t}' for t in INSERT_TABLES}
+        assert set(results) == expected
+        assert results['populate']['items'] == 2
+        assert results['insert.game']['items'] == 2
+        assert results['insert.play']['items'] > 0
+        for result in results.values():
+            assert len(result['runs']) == 1 and result['median'] >= 0
@@ -0,0 +1,85 @@
+"""
+Tests for streaming table exports.
+
+Test Categories:
+- unit: Query filters and format encoding
+- integration: Exports of a populated game, chunking and gzip output
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from src.database.models import Game, Play, Boxscore, PersonGame
+from src.database.population_services import GamePopulationService
+from src.database.export import export_query, export_columns, iter_export, write_export
+
+
+@pytest.fixture
+def populated_session(sqlite_session, sample_game_json):
+    GamePopulationService(sqlite_session).populate_game(sample_game_json)
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.mark.unit
+class TestExportQuery:
+    """Test export query construction"""
+
+    def test_unknown_table(self):
+        with pytest.raises(ValueError):
+            export_query('raw_game_data')
+
+    def test_columns_follow_model(self):
+        assert export_columns('play')[:2] == ['play_id', 'game_id']
+        assert 'season' in export_columns('game')
+
+    def test_filters_go_through_game(self):
+        sql = str(export_query('play', seasons=[2024], team_ids=[1611661313]))
+        assert 'game.season IN' in sql
+        assert 'ORDER BY play.game_id, play.action_number, play.play_id' in sql
+
+
+@pytest.mark.integration
+class TestStreamingExport:
+    """Test exports of a populated game"""
+
+    GAME_ID = 1022400005
+
+    def test_ndjson_matches_table(self, populated_session):
+        text = ''.join(iter_export(populated_session, 'play', fmt='ndjson'))
+        rows = [json.loads(line) for line in text.splitlines()]
+        assert len(rows) == populated_session.query(Play).count()
+        assert rows[0]['game_id'] == self.GAME_ID
+        numbers = [row['action_number'] for row in rows]
+        assert numbers == sorted(numbers)
+
+    def test_csv_has_header_and_iso_dates(self, populated_session):
+        text = ''.join(iter_export(populated_session, 'game', fmt='csv'))
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert len(rows) == 1
+        assert rows[0]['game_id'] == str(self.GAME_ID)
+        assert 'T' in rows[0]['game_et']
+
+    def test_streams_in_partitions(self, populated_session):
+        chunks = list(iter_export(populated_session, 'boxscore', fmt='ndjson', batch_size=10))
+        total = populated_session.query(Boxscore).count()
+        assert len(chunks) == -(-total // 10)
+        assert sum(chunk.count('\n') for chunk in chunks) == total
+
+    def test_filters(self, populated_session):
+        assert ''.join(iter_export(populated_session, 'play', seasons=[1999])) == ''
+        assert ''.join(iter_export(populated_session, 'person_game', game_ids=[1])) == ''
+        home_team = populated_session.get(Game, self.GAME_ID).home_team_id
+        text = ''.join(iter_export(populated_session, 'person_game', team_ids=[home_team], game_types=['regular']))
+        assert text.count('\n') == populated_session.query(PersonGame).count()
+
+    def test_gzip_output(self, populated_session):
+        out = io.BytesIO()
+        written = write_export(populated_session, 'play', out, fmt='csv', compress=True, batch_size=100)
+        data = gzip.decompress(out.getvalue())
+        assert len(data) == written
+        assert data.count(b'\n') == populated_session.query(Play).count() + 1
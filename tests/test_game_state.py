@@ -0,0 +1,145 @@
+"""
+Tests for game-state timelines and cached game summaries.
+
+Test Categories:
+- unit: Synthetic score sequences run through summarize_games
+- integration: Summaries built from sample games in SQLite
+"""
+
+import pytest
+
+from src.database.models import GameSummary
+from src.database.population_services import GamePopulationService
+from src.analytics.play_arrays import build_play_arrays
+from src.analytics.game_state import GameSummaryService, summarize_games, game_timeline
+
+
+GAME_ID = 1022400999
+HOME, AWAY = 1611661319, 1611661320
+
+
+def build(scores, period=1, blank='', game_id=GAME_ID):
+    """scores: (clock, score_home, score_away) with None for non-scoring plays"""
+    rows = []
+    for i, (clock, home, away) in enumerate(scores):
+        action_type = 'Made Shot' if home is not None else 'Rebound'
+        rows.append((game_id, i + 1, period, clock, action_type, '', 'h', None, 0, '',
+                     blank if home is None else str(home), blank if away is None else str(away), i + 1))
+    return rows
+
+
+def summarize(*games):
+    rows = [row for game in games for row in game]
+    home_away = {row[0]: (HOME, AWAY) for row in rows}
+    return summarize_games(build_play_arrays(rows, home_away))
+
+
+@pytest.mark.unit
+class TestSummarizeGames:
+    """Test lead, tie and run metrics on synthetic score sequences"""
+
+    def test_lead_changes_ties_and_runs(self):
+        summary = summarize(build([
+            ('PT10M00.00S', None, None),
+            ('PT09M00.00S', 2, 0),
+            ('PT08M00.00S', 2, 3),
+            ('PT07M00.00S', 4, 3),
+            ('PT06M00.00S', 6, 3),
+            ('PT05M00.00S', None, None),
+            ('PT04M00.00S', 6, 6),
+            ('PT00M00.00S', None, None),
+        ]))
+
+        assert summary['lead_changes'][0] == 2
+        assert summary['times_tied'][0] == 1
+        assert summary['home_largest_lead'][0] == 3
+        assert summary['away_largest_lead'][0] == 1
+        assert summary['home_largest_run'][0] == 4
+        assert summary['away_largest_run'][0] == 3
+        assert (summary['home_score'][0], summary['away_score'][0]) == (6, 6)
+
+    def test_seconds_in_each_state(self):
+        summary = summarize(build([
+            ('PT10M00.00S', None, None),
+            ('PT08M00.00S', 2, 0),
+            ('PT05M00.00S', 2, 2),
+            ('PT00M00.00S', None, None),
+        ]))
+
+        assert summary['seconds_tied'][0] == pytest.approx(420.0)
+        assert summary['home_seconds_leading'][0] == pytest.approx(180.0)
+        assert summary['away_seconds_leading'][0] == 0.0
+
+    def test_zero_scores_on_non_scoring_plays(self):
+        # Older feeds write '0'/'0' rather than blanks on plays without a score change
+        summary = summarize(build([
+            ('PT10M00.00S', None, None),
+            ('PT09M00.00S', 3, 0),
+            ('PT08M00.00S', None, None),
+            ('PT07M00.00S', 3, 2),
+            ('PT00M00.00S', None, None),
+        ], blank='0'))
+
+        assert summary['times_tied'][0] == 0
+        assert summary['home_largest_run'][0] == 3
+        assert (summary['home_score'][0], summary['away_score'][0]) == (3, 2)
+
+    def test_games_are_summarized_independently(self):
+        summary = summarize(
+            build([('PT10M00.00S', None, None), ('PT05M00.00S', 5, 0)], game_id=1),
+            build([('PT10M00.00S', None, None), ('PT05M00.00S', 0, 4)], game_id=2),
+        )
+
+        assert list(summary['game_id']) == [1, 2]
+        assert list(summary['home_largest_run']) == [5, 0]
+        assert list(summary['away_largest_run']) == [0, 4]
+        assert list(summary['lead_changes']) == [0, 0]
+
+    def test_timeline_margin(self):
+        rows = build([('PT10M00.00S', None, None), ('PT09M00.00S', 2, 0), ('PT08M00.00S', 2, 5)])
+        timeline = game_timeline(build_play_arrays(rows, {GAME_ID: (HOME, AWAY)}))
+
+        assert list(timeline['margin']) == [0, 2, -3]
+        assert list(timeline['elapsed']) == [0.0, 60.0, 120.0]
+
+    def test_empty_input(self):
+        summary = summarize_games(build_play_arrays([], {}))
+        assert len(summary['game_id']) == 0
+
+
+@pytest.mark.integration
+class TestGameSummaryService:
+    """Test building and caching summaries for populated sample games"""
+
+    def test_final_scores_match_boxscore(self, sqlite_session, all_sample_games):
+        population_service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            population_service.populate_game(game_json)
+        sqlite_session.commit()
+
+        service = GameSummaryService(sqlite_session)
+        stats = service.build(service.pending_game_ids())
+
+        assert stats['summaries'] == len(all_sample_games)
+        assert service.pending_game_ids() == []
+        for game_json in all_sample_games:
+            summary = sqlite_session.get(GameSummary, int(game_json['boxscore']['gameId']))
+            assert summary.home_score == int(game_json['boxscore']['homeTeam']['score'])
+            assert summary.away_score == int(game_json['boxscore']['awayTeam']['score'])
+            assert summary.home_largest_run <= summary.home_score
+
+    def test_get_summary_computes_on_miss(self, sqlite_session, sample_game_json):
+        population_service = GamePopulationService(sqlite_session)
+        population_service.populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+
+        service = GameSummaryService(sqlite_session)
+        summary = service.get_summary(game_id)
+
+        assert summary is not None
+        assert service.get_summary(game_id) is summary
+        assert sqlite_session.query(GameSummary).count() == 1
+        assert service.get_summary(999) is None
+
+        counts = population_service.clear_game_data(game_id)
+        assert counts['game_summaries'] == 1
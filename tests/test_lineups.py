@@ -0,0 +1,193 @@
+"""
+Tests for lineup and stint reconstruction.
+
+Test Categories:
+- unit: Roster name resolution and synthetic substitution sequences
+- integration: Stints built from a sample game in SQLite
+"""
+
+import pytest
+from collections import Counter
+
+from src.database.models import Game, Boxscore, Lineup, Stint
+from src.database.population_services import GamePopulationService
+from src.database.json_extractors import BoxscoreExtractor
+from src.analytics.play_arrays import build_play_arrays, SIDE_HOME, SIDE_AWAY
+from src.analytics.lineups import Roster, LineupService, reconstruct_stints
+
+
+GAME_ID = 1022400999
+HOME, AWAY = 1611661319, 1611661320
+HOME_PLAYERS = [101, 102, 103, 104, 105, 106]
+AWAY_PLAYERS = [201, 202, 203, 204, 205]
+
+
+def make_rosters(home_starters=True):
+    home, away = Roster(), Roster()
+    for person_id in HOME_PLAYERS:
+        home.add(person_id, home_starters and person_id != 106, f"Home{person_id}")
+    for person_id in AWAY_PLAYERS:
+        away.add(person_id, True, f"Away{person_id}")
+    return {SIDE_HOME: home, SIDE_AWAY: away}
+
+
+def build(plays):
+    """plays: (period, clock, action_type, location, person_id, description, home, away, shot_value)"""
+    rows = [
+        (GAME_ID, i + 1, period, clock, action_type, '', location, person_id, shot_value,
+         description, home, away, i + 1)
+        for i, (period, clock, action_type, location, person_id, description, home, away, shot_value)
+        in enumerate(plays)
+    ]
+    descriptions = {i + 1: play[5] for i, play in enumerate(plays)}
+    return build_play_arrays(rows, {GAME_ID: (HOME, AWAY)}), descriptions
+
+
+@pytest.mark.unit
+class TestRoster:
+    """Test substitution name resolution"""
+
+    def test_resolve_priority_and_ambiguity(self):
+        roster = Roster()
+        roster.add(1, False, 'Brown', 'K. Brown', 'Kalani Brown', 'Kalani')
+        roster.add(2, False, 'Brown', 'J. Brown', 'Jaelyn Brown', 'Jaelyn')
+        roster.add(3, False, 'Li', 'Y. Li', 'Li Yueru', 'Yueru')
+
+        assert roster.resolve('K. Brown') == 1
+        assert roster.resolve('Brown') is None
+        assert roster.resolve('li') == 3
+        assert roster.resolve('Yueru') == 3
+        assert roster.resolve('Nobody') is None
+
+    def test_duplicate_player_ignored(self):
+        roster = Roster()
+        roster.add(1, True, 'Smith')
+        roster.add(1, True, 'Smith')
+        assert roster.person_ids == [1]
+        assert roster.starters == [1]
+
+
+@pytest.mark.unit
+class TestReconstructStints:
+    """Test stint boundaries, lineups and points on synthetic games"""
+
+    def test_substitution_splits_stints(self):
+        arrays, descriptions = build([
+            (1, 'PT10M00.00S', 'period', '', None, 'Start', '', '', 0),
+            (1, 'PT08M00.00S', 'Made Shot', 'h', 101, 'Shot', '2', '0', 2),
+            (1, 'PT06M00.00S', 'Substitution', 'h', 105, 'SUB: Home106 FOR Home105', '', '', 0),
+            (1, 'PT04M00.00S', 'Made Shot', 'v', 201, 'Shot', '2', '3', 3),
+            (1, 'PT00M00.00S', 'period', '', None, 'End', '', '', 0),
+        ])
+
+        stints = reconstruct_stints(arrays, 0, descriptions, make_rosters())
+
+        assert len(stints) == 2
+        assert stints[0]['home_lineup'] == (101, 102, 103, 104, 105)
+        assert stints[1]['home_lineup'] == (101, 102, 103, 104, 106)
+        assert stints[0]['away_lineup'] == stints[1]['away_lineup'] == (201, 202, 203, 204, 205)
+        assert (stints[0]['start_seconds'], stints[0]['end_seconds']) == (0.0, 240.0)
+        assert (stints[1]['start_seconds'], stints[1]['end_seconds']) == (240.0, 600.0)
+        assert (stints[0]['home_points'], stints[0]['away_points']) == (2, 0)
+        assert (stints[1]['home_points'], stints[1]['away_points']) == (0, 3)
+
+    def test_starters_inferred_without_boxscore_flag(self):
+        arrays, descriptions = build([
+            (1, 'PT10M00.00S', 'period', '', None, 'Start', '', '', 0),
+            (1, 'PT09M00.00S', 'Foul', 'h', 102, 'Foul', '', '', 0),
+            (1, 'PT08M00.00S', 'Made Shot', 'h', 103, 'Shot', '2', '0', 2),
+            (1, 'PT07M00.00S', 'Turnover', 'h', 104, 'Turnover', '', '', 0),
+            (1, 'PT06M00.00S', 'Substitution', 'h', 101, 'SUB: Home106 FOR Home101', '', '', 0),
+            (1, 'PT05M00.00S', 'Rebound', 'h', 105, 'Rebound', '', '', 0),
+            (1, 'PT04M00.00S', 'Rebound', 'h', 106, 'Rebound', '', '', 0),
+            (1, 'PT00M00.00S', 'period', '', None, 'End', '', '', 0),
+        ])
+
+        stints = reconstruct_stints(arrays, 0, descriptions, make_rosters(home_starters=False))
+
+        assert stints[0]['home_lineup'] == (101, 102, 103, 104, 105)
+        assert stints[1]['home_lineup'] == (102, 103, 104, 105, 106)
+
+    def test_back_to_back_substitutions_collapse(self):
+        arrays, descriptions = build([
+            (1, 'PT10M00.00S', 'period', '', None, 'Start', '', '', 0),
+            (1, 'PT06M00.00S', 'Substitution', 'h', 105, 'SUB: Home106 FOR Home105', '', '', 0),
+            (1, 'PT06M00.00S', 'Substitution', 'h', 106, 'SUB: Home105 FOR Home106', '', '', 0),
+            (1, 'PT00M00.00S', 'period', '', None, 'End', '', '', 0),
+        ])
+
+        stints = reconstruct_stints(arrays, 0, descriptions, make_rosters())
+
+        assert len(stints) == 2
+        assert stints[0]['home_lineup'] == stints[1]['home_lineup']
+
+    def test_unresolved_player_gives_incomplete_lineup(self):
+        arrays, descriptions = build([
+            (1, 'PT10M00.00S', 'period', '', None, 'Start', '', '', 0),
+            (1, 'PT06M00.00S', 'Substitution', 'v', 205, 'SUB: Unknown FOR Away205', '', '', 0),
+            (1, 'PT00M00.00S', 'period', '', None, 'End', '', '', 0),
+        ])
+
+        stints = reconstruct_stints(arrays, 0, descriptions, make_rosters())
+
+        assert stints[1]['away_lineup'] is None
+        assert stints[1]['home_lineup'] is not None
+
+
+@pytest.mark.integration
+class TestLineupService:
+    """Test building lineups and stints from a populated sample game"""
+
+    def test_starter_flag_extracted(self, sample_game_json):
+        boxscores = BoxscoreExtractor.extract_boxscores_from_game(sample_game_json)
+        starters = Counter(b['home_away_team'] for b in boxscores if b['starter'])
+        assert starters == {'h': 5, 'a': 5}
+
+    def test_minutes_match_boxscore(self, sqlite_session, sample_game_json):
+        GamePopulationService(sqlite_session).populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+
+        service = LineupService(sqlite_session)
+        assert service.pending_game_ids() == [game_id]
+        stats = service.build([game_id])
+
+        assert stats['stints'] > 0
+        assert stats['incomplete'] == 0
+        assert service.pending_game_ids() == []
+
+        lineups = {lineup.lineup_id: lineup for lineup in sqlite_session.query(Lineup).all()}
+        seconds = Counter()
+        for stint in sqlite_session.query(Stint).all():
+            assert list(lineups[stint.lineup_id].person_ids) == sorted(lineups[stint.lineup_id].person_ids)
+            for person_id in lineups[stint.lineup_id].person_ids:
+                seconds[person_id] += stint.end_seconds - stint.start_seconds
+
+        for boxscore in sqlite_session.query(Boxscore).filter_by(box_type='player').all():
+            if boxscore.min:
+                minutes, secs = boxscore.min.split(':')
+                assert abs(seconds[boxscore.person_id] - (int(minutes) * 60 + int(secs))) <= 60
+
+    def test_rebuild_reuses_lineups(self, sqlite_session, sample_game_json):
+        GamePopulationService(sqlite_session).populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+
+        service = LineupService(sqlite_session)
+        first = service.build_games([game_id])
+        second = service.build_games([game_id])
+
+        assert second['lineups'] == 0
+        assert first['stints'] == second['stints']
+        assert sqlite_session.query(Stint).count() == first['stints']
+        assert sqlite_session.query(Lineup).count() == first['lineups']
+
+    def test_team_points_match_final_score(self, sqlite_session, sample_game_json):
+        GamePopulationService(sqlite_session).populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+        LineupService(sqlite_session).build_games([game_id])
+
+        game = sqlite_session.get(Game, game_id)
+        home = sqlite_session.query(Stint).filter_by(team_id=game.home_team_id).all()
+        away = sqlite_session.query(Stint).filter_by(team_id=game.away_team_id).all()
+
+        assert sum(s.points_for for s in home) == sum(s.points_against for s in away)
+        assert sum(s.points_for for s in home) == int(sample_game_json['boxscore']['homeTeam']['score'])
@@ -0,0 +1,187 @@
+"""
+Tests for live polling of games in progress.
+
+Test Categories:
+- unit: Adaptive poll intervals and the polling loop
+- integration: Appending new plays and finalizing a game as it progresses,
+  rebuilding its analytics after appends, and API caching of polled games
+"""
+
+import asyncio
+import copy
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from sqlalchemy import func, select
+
+from src.analytics import PossessionService, LineupService, ShotChartService
+from src.api import create_app
+from src.database.models import Play, GameSummary, RawGameData, Possession
+from src.scrapers.game_url_generator import GameURLInfo
+from src.scrapers.raw_data_extractor import ExtractionResult
+from src.scripts.live_poller import LiveGamePoller, SCHEDULED, IN_PROGRESS, FINAL
+from src.scripts.populate_game_tables import GameTablePopulator
+
+
+class FakeExtractor:
+    """Returns scripted page snapshots, repeating the last one"""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+
+    def extract_game_data(self, game_url):
+        snapshot = self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+        if snapshot is None:
+            return ExtractionResult.TIMEOUT, None, None
+        return ExtractionResult.SUCCESS, snapshot, None
+
+
+def _snapshot(game_json, status, last_action=None):
+    """The game as published while in progress: its actions up to last_action"""
+    snapshot = copy.deepcopy(game_json)
+    snapshot['boxscore']['gameStatus'] = status
+    if last_action is not None:
+        for period in snapshot['postGameData']['postPlayByPlayData']:
+            period['actions'] = [a for a in period.get('actions', []) if a['actionNumber'] <= last_action]
+    return snapshot
+
+
+def _action_numbers(game_json):
+    return sorted(a['actionNumber'] for period in game_json['postGameData']['postPlayByPlayData']
+                  for a in period.get('actions', []))
+
+
+def _info(game_json):
+    game_id = game_json['boxscore']['gameId']
+    return GameURLInfo(game_id=str(game_id), season='2025', game_url=f'https://example.com/game/{game_id}')
+
+
+@pytest.mark.unit
+class TestPollIntervals:
+    """Test adaptive poll intervals and the polling loop"""
+
+    def test_next_interval(self, population_engine):
+        poller = LiveGamePoller(GameTablePopulator(population_engine), extractor=FakeExtractor([None]),
+                                min_interval=10, max_interval=60)
+
+        assert poller.next_interval(40, {'action': 'appended', 'appended': 3, 'status': IN_PROGRESS}) == 10
+        assert poller.next_interval(40, {'action': 'populated', 'appended': 0, 'status': IN_PROGRESS}) == 10
+        assert poller.next_interval(20, {'action': 'appended', 'appended': 0, 'status': IN_PROGRESS}) == 40
+        assert poller.next_interval(40, {'action': 'failed', 'appended': 0, 'status': None}) == 60
+        assert poller.next_interval(10, {'action': 'waiting', 'appended': 0, 'status': SCHEDULED}) == 60
+
+    def test_run_stops_when_games_are_final(self, population_engine, all_sample_games):
+        game = all_sample_games[0]
+        extractor = FakeExtractor([_snapshot(game, SCHEDULED), None, _snapshot(game, FINAL)])
+        poller = LiveGamePoller(GameTablePopulator(population_engine), extractor=extractor,
+                                min_interval=0, max_interval=0)
+
+        stats = poller.run([_info(game)])
+
+        assert stats == {'polls': 3, 'plays_appended': 0, 'games_final': 1, 'failed_polls': 1}
+
+
+@pytest.mark.integration
+class TestLivePolling:
+    """Test a game polled from tip-off to final"""
+
+    def test_appends_new_plays_until_final(self, population_engine, all_sample_games):
+        game = all_sample_games[0]
+        game_id = int(game['boxscore']['gameId'])
+        actions = _action_numbers(game)
+        early, later = actions[len(actions) // 4], actions[len(actions) // 2]
+        extractor = FakeExtractor([
+            _snapshot(game, SCHEDULED),
+            _snapshot(game, IN_PROGRESS, early),
+            _snapshot(game, IN_PROGRESS, later),
+            _snapshot(game, IN_PROGRESS, later),
+            _snapshot(game, FINAL),
+        ])
+        populator = GameTablePopulator(population_engine)
+        poller = LiveGamePoller(populator, extractor=extractor)
+
+        def plays():
+            with populator.Session() as session:
+                return session.scalar(select(func.count()).select_from(Play).where(Play.game_id == game_id))
+
+        assert poller.poll(_info(game))['action'] == 'waiting'
+        assert plays() == 0
+
+        assert poller.poll(_info(game))['action'] == 'populated'
+        assert plays() == len([a for a in actions if a <= early])
+
+        outcome = poller.poll(_info(game))
+        assert (outcome['action'], outcome['appended']) == ('appended', len([a for a in actions if early < a <= later]))
+        assert plays() == len([a for a in actions if a <= later])
+        with populator.Session() as session:
+            last_play = session.scalars(
+                select(Play).where(Play.game_id == game_id, Play.score_home.isnot(None), Play.score_home != '')
+                .order_by(Play.action_number.desc())
+            ).first()
+            summary = session.get(GameSummary, game_id)
+            assert (summary.home_score, summary.away_score) == (int(last_play.score_home), int(last_play.score_away))
+            # The raw JSON is not rewritten on appends
+            raw = session.scalar(select(RawGameData.game_data).where(RawGameData.game_id == game_id))
+            assert _action_numbers(raw)[-1] == early
+
+        assert poller.poll(_info(game))['appended'] == 0
+
+        assert poller.poll(_info(game))['action'] == 'finalized'
+        assert plays() == len(actions)
+        with populator.Session() as session:
+            raw = session.scalar(select(RawGameData.game_data).where(RawGameData.game_id == game_id))
+            assert raw['boxscore']['gameStatus'] == FINAL
+
+    def test_appends_leave_analytics_to_rebuild(self, population_engine, all_sample_games):
+        game = all_sample_games[0]
+        game_id = int(game['boxscore']['gameId'])
+        actions = _action_numbers(game)
+        extractor = FakeExtractor([
+            _snapshot(game, IN_PROGRESS, actions[len(actions) // 2]),
+            _snapshot(game, IN_PROGRESS),
+        ])
+        populator = GameTablePopulator(population_engine)
+        poller = LiveGamePoller(populator, extractor=extractor)
+        services = (PossessionService, LineupService, ShotChartService)
+
+        assert poller.poll(_info(game))['action'] == 'populated'
+        with populator.Session() as session:
+            for service in services:
+                service(session).build([game_id])
+                assert service(session).pending_game_ids() == []
+
+        assert poller.poll(_info(game))['appended'] > 0
+        with populator.Session() as session:
+            # The stale rows are gone, so the next incremental build recomputes them
+            for service in services:
+                assert service(session).pending_game_ids() == [game_id]
+                service(session).build([game_id])
+            last_possession_play = session.scalar(select(func.max(Possession.end_action_number))
+                                                  .where(Possession.game_id == game_id))
+            assert last_possession_play > actions[len(actions) // 2]
+
+    def test_api_revalidates_games_until_final(self, population_engine, all_sample_games):
+        game = all_sample_games[0]
+        game_id = game['boxscore']['gameId']
+        actions = _action_numbers(game)
+        extractor = FakeExtractor([
+            _snapshot(game, IN_PROGRESS, actions[len(actions) // 2]),
+            _snapshot(game, IN_PROGRESS),
+            _snapshot(game, FINAL),
+        ])
+        poller = LiveGamePoller(GameTablePopulator(population_engine), extractor=extractor)
+
+        async def cache_control(path):
+            # A new app per request, so nothing is served from its response cache
+            async with TestClient(TestServer(create_app(population_engine))) as client:
+                response = await client.get(path)
+                assert response.status == 200
+                return response.headers['Cache-Control']
+
+        for action in ('populated', 'appended'):
+            assert poller.poll(_info(game))['action'] == action
+            for path in (f'/games/{game_id}', f'/games/{game_id}/plays', f'/games/{game_id}/boxscores'):
+                assert 'immutable' not in asyncio.run(cache_control(path))
+
+        assert poller.poll(_info(game))['action'] == 'finalized'
+        assert 'immutable' in asyncio.run(cache_control(f'/games/{game_id}/plays'))
@@ -0,0 +1,203 @@
+"""
+Tests for pipeline metrics and their Prometheus text exposition.
+
+Test Categories:
+- unit: Metric types, rendering, the disabled no-op path and exporters
+- integration: Metrics recorded by the extractor, bulk inserts and pool checkouts
+"""
+
+import threading
+import time
+import urllib.request
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from src import metrics
+from src.metrics import Registry, Counter, Gauge, Histogram
+from src.database.population_services import GamePopulationService
+from src.scrapers.raw_data_extractor import RawDataExtractor, ExtractionResult
+
+
+@pytest.fixture
+def registry():
+    registry = Registry()
+    registry.enabled = True
+    return registry
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.enable(False)
+    metrics.REGISTRY.reset()
+
+
+@pytest.mark.unit
+class TestMetricTypes:
+    """Test recording and rendering"""
+
+    def test_counter_and_gauge_render(self, registry):
+        counter = Counter('jobs_total', 'Jobs run', ['result'], registry=registry)
+        gauge = Gauge('queue_depth', 'Jobs waiting', registry=registry)
+        counter.inc(result='ok')
+        counter.inc(2, result='ok')
+        counter.inc(result='fail')
+        gauge.set(1.5)
+
+        assert registry.render() == (
+            '# HELP jobs_total Jobs run\n'
+            '# TYPE jobs_total counter\n'
+            'jobs_total{result="fail"} 1\n'
+            'jobs_total{result="ok"} 3\n'
+            '# HELP queue_depth Jobs waiting\n'
+            '# TYPE queue_depth gauge\n'
+            'queue_depth 1.5\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = Histogram('latency_seconds', 'Latency', ['stage'], buckets=(0.1, 1.0), registry=registry)
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, stage='fetch')
+
+        lines = registry.render().splitlines()
+        assert lines[2:] == [
+            'latency_seconds_bucket{stage="fetch",le="0.1"} 1',
+            'latency_seconds_bucket{stage="fetch",le="1"} 3',
+            'latency_seconds_bucket{stage="fetch",le="+Inf"} 4',
+            'latency_seconds_sum{stage="fetch"} 4.25',
+            'latency_seconds_count{stage="fetch"} 4',
+        ]
+
+    def test_label_values_are_escaped(self, registry):
+        counter = Counter('errors_total', 'Errors', ['message'], registry=registry)
+        counter.inc(message='bad "quote"\n')
+        assert 'errors_total{message="bad \\"quote\\"\\n"} 1' in registry.render()
+
+    def test_disabled_registry_records_nothing(self):
+        registry = Registry()
+        counter = Counter('jobs_total', 'Jobs run', registry=registry)
+        histogram = Histogram('latency_seconds', 'Latency', registry=registry)
+        counter.inc()
+        histogram.observe(1.0)
+        with histogram.time():
+            pass
+
+        assert histogram.time() is histogram.time()
+        assert counter.value() == 0 and histogram.count() == 0
+        assert 'latency_seconds_count' not in registry.render()
+
+    def test_timer_and_decorator(self, registry):
+        histogram = Histogram('insert_seconds', 'Insert time', ['table'], registry=registry)
+        rows = Counter('rows_total', 'Rows', ['table'], registry=registry)
+
+        @metrics.timed(histogram, rows, table='play')
+        def insert(n):
+            return n
+
+        with histogram.time(table='game'):
+            pass
+        assert insert(7) == 7
+        assert histogram.count(table='game') == 1
+        assert histogram.count(table='play') == 1
+        assert rows.value(table='play') == 7
+
+
+@pytest.mark.unit
+class TestExporters:
+    """Test the text file and HTTP exporters"""
+
+    def test_write_textfile(self, tmp_path, enabled_metrics):
+        metrics.EXTRACTIONS.inc(result='success')
+        path = tmp_path / 'wnba.prom'
+        metrics.write_textfile(str(path))
+
+        assert 'wnba_extractions_total{result="success"} 1' in path.read_text()
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_http_server(self, enabled_metrics):
+        metrics.EXTRACTIONS.inc(result='timeout')
+        server = metrics.start_http_server(0, addr='127.0.0.1')
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+                assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'wnba_extractions_total{result="timeout"} 1' in body
+
+
+@pytest.mark.integration
+class TestPipelineInstrumentation:
+    """Test metrics recorded by the instrumented pipeline stages"""
+
+    @patch('src.scrapers.raw_data_extractor.requests.get')
+    def test_extractor_records_fetch_and_parse(self, mock_get, mock_html_response, enabled_metrics):
+        mock_response = Mock()
+        mock_response.text = mock_html_response
+        mock_response.content = mock_html_response.encode('utf-8')
+        mock_get.return_value = mock_response
+
+        result, _, _ = RawDataExtractor().extract_game_data('https://www.wnba.com/game/1029700001/playbyplay')
+
+        assert result == ExtractionResult.SUCCESS
+        assert metrics.HTTP_FETCH_SECONDS.count() == 1
+        assert metrics.PAGE_PARSE_SECONDS.count(stage='locate') == 1
+        assert metrics.PAGE_PARSE_SECONDS.count(stage='decode') == 1
+        assert metrics.PAGE_BYTES.sum() == len(mock_response.content)
+        assert metrics.EXTRACTIONS.value(result='success') == 1
+
+    def test_bulk_inserts_record_rows_per_table(self, sqlite_session, sample_game_json, enabled_metrics):
+        results = GamePopulationService(sqlite_session, refresh_season_stats=False).populate_game(sample_game_json)
+
+        assert metrics.DB_ROWS_INSERTED.value(table='play') == results['plays']
+        assert metrics.DB_ROWS_INSERTED.value(table='boxscore') == results['boxscores']
+        assert metrics.DB_INSERT_SECONDS.count(table='game') == 1
+
+    def test_pool_checkouts_are_recorded(self, enabled_metrics, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        assert metrics.instrument_pool(metrics.instrument_pool(engine)) is engine  # Applied once
+
+        with engine.connect() as first, engine.connect() as second:
+            first.execute(text('SELECT 1'))
+            second.execute(text('SELECT 1'))
+            assert metrics.POOL_CONNECTIONS_IN_USE.value(pool='default') == 2
+        assert metrics.POOL_CONNECTIONS_IN_USE.value(pool='default') == 0
+        assert metrics.POOL_HOLD_SECONDS.count(pool='default') == 2
+        assert metrics.POOL_WAIT_SECONDS.count(pool='default') == 2
+
+        # Pools recreated by dispose() keep the listeners
+        engine.dispose()
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        assert metrics.POOL_HOLD_SECONDS.count(pool='default') == 3
+        assert metrics.POOL_WAIT_SECONDS.count(pool='default') == 3
+        engine.dispose()
+
+    def test_pool_wait_covers_a_saturated_pool(self, enabled_metrics, tmp_path):
+        engine = metrics.instrument_pool(create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool,
+                                                       pool_size=1, max_overflow=0), name='small')
+        checked_out = threading.Event()
+
+        def hold():
+            with engine.connect():
+                checked_out.set()
+                time.sleep(0.2)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        checked_out.wait()
+        with engine.connect() as conn:  # Waits for the holder's connection
+            conn.execute(text('SELECT 1'))
+        holder.join()
+        engine.dispose()
+
+        assert metrics.POOL_WAIT_SECONDS.count(pool='small') == 2
+        assert metrics.POOL_WAIT_SECONDS.sum(pool='small') >= 0.1
+        assert metrics.POOL_HOLD_SECONDS.sum(pool='small') >= 0.2
@@ -0,0 +1,126 @@
+"""
+Tests for the partitioned Parquet export.
+
+Test Categories:
+- unit: Arrow type mapping and partition paths
+- integration: Full and incremental exports of populated sample games
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import pandas as pd
+import pyarrow as pa
+from src.database.models import Game, Play, Boxscore
+from src.database.population_services import GamePopulationService
+from src.analytics.play_arrays import parse_clock
+from src.analytics.parquet_export import ParquetExporter, arrow_type, partition_path
+
+
+@pytest.fixture
+def populated_session(sqlite_session, all_sample_games):
+    service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+    for game_json in all_sample_games:
+        service.populate_game(game_json)
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.mark.unit
+class TestLayout:
+    """Test type mapping and directory layout"""
+
+    def test_arrow_types(self):
+        assert arrow_type(Play.__table__.c.play_id) == pa.int32()
+        assert arrow_type(Play.__table__.c.shot_distance) == pa.float64()
+        assert arrow_type(Play.__table__.c.is_field_goal) == pa.bool_()
+        assert arrow_type(Game.__table__.c.game_et) == pa.timestamp('us')
+        assert arrow_type(Play.__table__.c.description) == pa.string()
+
+    def test_partition_path(self):
+        root = Path('/lake')
+        assert partition_path(root, 'play', 2024, 'regular') == root / 'play/season=2024/game_type=regular'
+        assert partition_path(root, 'game', None, None) == root / 'game/season=unknown/game_type=unknown'
+
+
+@pytest.mark.integration
+class TestParquetExport:
+    """Test exports of the sample games"""
+
+    def test_full_export(self, populated_session, tmp_path):
+        exporter = ParquetExporter(populated_session, tmp_path, batch_size=100)
+        stats = exporter.export()
+        seasons = {(g.season, g.game_type) for g in populated_session.query(Game)}
+        assert stats['partitions'] == len(seasons)
+
+        plays = pd.read_parquet(tmp_path / 'play')
+        assert len(plays) == populated_session.query(Play).count()
+        assert isinstance(plays['action_type'].dtype, pd.CategoricalDtype)
+        assert str(plays['clock_seconds'].dtype) == 'float32'
+        first = plays.iloc[0]
+        assert first['clock_seconds'] == pytest.approx(parse_clock(first['clock']))
+        assert {(int(s), t) for s, t in zip(plays['season'], plays['game_type'])} <= seasons
+
+        games = pd.read_parquet(tmp_path / 'game')
+        assert len(games) == populated_session.query(Game).count()
+        assert pd.read_parquet(tmp_path / 'boxscore')['minutes'].max() > 0
+
+    def test_incremental_rewrites_changed_partitions(self, populated_session, tmp_path):
+        exporter = ParquetExporter(populated_session, tmp_path)
+        exporter.export()
+        assert exporter.export() == {'partitions': 0, 'skipped': 5, 'removed': 0, 'rows': 0}
+
+        game = populated_session.get(Game, 1022400005)
+        untouched = partition_path(tmp_path, 'play', 2001, 'regular') / 'part-0.parquet'
+        before = untouched.stat().st_mtime_ns
+
+        # A corrected feed drops the game's last plays
+        last = populated_session.query(Play.play_id).filter(Play.game_id == game.game_id) \
+            .order_by(Play.play_id.desc()).limit(3)
+        populated_session.query(Play).filter(Play.play_id.in_(last.scalar_subquery())).delete(synchronize_session=False)
+        populated_session.commit()
+
+        written = []
+        stats = exporter.export(progress=written.append)
+        assert written == [f'{game.season}/{game.game_type}']
+        assert stats['skipped'] == 4
+        assert untouched.stat().st_mtime_ns == before
+
+        count = populated_session.query(Play).filter(Play.game_id == game.game_id).count()
+        changed = pd.read_parquet(partition_path(tmp_path, 'play', game.season, game.game_type))
+        assert len(changed) == count
+
+    def test_incremental_rewrites_rows_updated_in_place(self, populated_session, tmp_path):
+        exporter = ParquetExporter(populated_session, tmp_path, tables=['game', 'boxscore'])
+        exporter.export()
+
+        # Repopulation updated a boxscore row without changing its key
+        game = populated_session.get(Game, 1022400005)
+        row = populated_session.query(Boxscore).filter(Boxscore.game_id == game.game_id) \
+            .order_by(Boxscore.boxscore_id).first()
+        row.pts += 1
+        game.populated_at = game.populated_at + timedelta(minutes=1)
+        populated_session.commit()
+
+        written = []
+        exporter.export(progress=written.append)
+        assert written == [f'{game.season}/{game.game_type}']
+        exported = pd.read_parquet(partition_path(tmp_path, 'boxscore', game.season, game.game_type))
+        assert exported.set_index('boxscore_id').loc[row.boxscore_id, 'pts'] == row.pts
+
+    def test_removed_partition(self, populated_session, tmp_path):
+        exporter = ParquetExporter(populated_session, tmp_path, tables=['game', 'play', 'boxscore'])
+        exporter.export()
+
+        game = populated_session.get(Game, 1022400005)
+        GamePopulationService(populated_session, refresh_season_stats=False).clear_game_data(game.game_id)
+        populated_session.commit()
+
+        stats = exporter.export()
+        assert stats['removed'] == 1
+        assert not list(partition_path(tmp_path, 'play', 2024, 'regular').glob('*.parquet'))
+        assert 1022400005 not in set(pd.read_parquet(tmp_path / 'game')['game_id'])
@@ -0,0 +1,91 @@
+"""
+Tests for the memory-mapped play archive.
+
+Test Categories:
+- integration: Archive round trips against load_play_arrays for the sample games
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.database.population_services import GamePopulationService
+from src.analytics.play_arrays import load_play_arrays
+from src.analytics.play_archive import build_play_archive, PlayArchive, PLAY_COLUMNS, MANIFEST_FILE
+from src.analytics.game_state import summarize_games
+from src.analytics.possessions import segment_possessions
+
+
+@pytest.fixture
+def populated_session(sqlite_session, all_sample_games):
+    service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+    for game_json in all_sample_games:
+        service.populate_game(game_json)
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.fixture
+def archive(populated_session, tmp_path):
+    build_play_archive(populated_session, tmp_path / 'plays', batch_size=2)
+    return PlayArchive(tmp_path / 'plays')
+
+
+@pytest.mark.integration
+class TestPlayArchive:
+    """Test building and reading archives"""
+
+    def test_round_trip_matches_database(self, populated_session, archive):
+        game_ids = archive.game_ids.tolist()
+        assert game_ids == sorted(game_ids)
+        expected = load_play_arrays(populated_session, game_ids)
+
+        view = archive.all()
+        assert len(view) == len(expected) == len(archive)
+        for name in PLAY_COLUMNS:
+            if name != 'sub_type':
+                assert np.array_equal(np.asarray(getattr(view, name)), getattr(expected, name)), name
+        assert list(view.sub_types[view.sub_type]) == list(expected.sub_types[expected.sub_type])
+        assert np.array_equal(view.game_starts, expected.game_starts)
+        assert np.array_equal(view.home_team_ids, expected.home_team_ids)
+
+    def test_single_game_is_zero_copy(self, populated_session, archive):
+        game = archive.game(1022400005)
+        assert isinstance(game.play_id, np.memmap)
+        assert np.shares_memory(game.score_home, archive.columns['score_home'])
+        assert game.game_starts.tolist() == [0]
+        assert len(game) == len(load_play_arrays(populated_session, [1022400005]))
+        assert 1022400005 in archive
+        with pytest.raises(KeyError):
+            archive.game(1)
+
+    def test_select_keeps_requested_order(self, archive):
+        first, last = archive.game_ids[0], archive.game_ids[-1]
+        selected = archive.select([last, first])
+        assert selected.game_ids.tolist() == [last, first]
+        assert selected.game_starts.tolist() == [0, len(archive.game(last))]
+        assert np.array_equal(selected.play_id[:len(archive.game(last))], archive.game(last).play_id)
+
+    def test_analytics_accept_archive_views(self, populated_session, archive):
+        expected = summarize_games(load_play_arrays(populated_session, archive.game_ids.tolist()))
+        summary = summarize_games(archive.all())
+        for key in ('home_score', 'away_score', 'lead_changes', 'home_largest_run'):
+            assert np.array_equal(summary[key], expected[key]), key
+        assert len(segment_possessions(archive.game(1022400005))['game_id']) > 0
+
+    def test_rebuild_and_filters(self, populated_session, tmp_path):
+        path = tmp_path / 'plays'
+        build_play_archive(populated_session, path)
+        stats = build_play_archive(populated_session, path, seasons=[1999])
+        assert stats == {'games': 0, 'plays': 0}
+        empty = PlayArchive(path)
+        assert len(empty) == 0 and len(empty.all()) == 0
+
+        assert build_play_archive(populated_session, path, game_ids=[1022400005])['games'] == 1
+        assert PlayArchive(path).game_ids.tolist() == [1022400005]
+
+    def test_rejects_foreign_directory(self, tmp_path):
+        (tmp_path / MANIFEST_FILE).write_text(json.dumps({'format': 'other'}))
+        with pytest.raises(ValueError):
+            PlayArchive(tmp_path)
@@ -0,0 +1,120 @@
+"""
+Tests for the notification-driven populate daemon.
+
+Test Categories:
+- unit: Batching and de-duplicating notified game IDs, and reconnecting
+- integration: Catching up on games changed while not listening
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.scripts.populate_daemon import PopulateDaemon
+
+
+class FakeListener:
+    """Delivers scripted payload batches, then stops the daemon"""
+
+    def __init__(self, deliveries, fail_first_wait=False):
+        self.deliveries = list(deliveries)
+        self.fail_first_wait = fail_first_wait
+        self.daemon = None
+        self.listens = 0
+        self.timeouts = []
+
+    def listen(self):
+        self.listens += 1
+
+    def wait(self, timeout):
+        self.timeouts.append(timeout)
+        if self.fail_first_wait:
+            self.fail_first_wait = False
+            raise ConnectionError('server closed the connection')
+        if not self.deliveries:
+            self.daemon.stop()
+            return []
+        return self.deliveries.pop(0)
+
+    def close(self):
+        pass
+
+
+def _daemon(populator, listener, **kwargs):
+    daemon = PopulateDaemon(populator, listener=listener, reconnect_delay=0, **kwargs)
+    listener.daemon = daemon
+    batches = []
+    populate = populator.populate_specific_games
+
+    def record(game_ids, override_existing=False):
+        batches.append(list(game_ids))
+        assert override_existing
+        return populate(game_ids, override_existing=override_existing)
+
+    populator.populate_specific_games = record
+    return daemon, batches
+
+
+def _game_ids(all_sample_games):
+    return sorted(int(g['boxscore']['gameId']) for g in all_sample_games)
+
+
+@pytest.mark.unit
+class TestNotificationBatching:
+    """Test how notifications become population batches"""
+
+    def test_batches_and_deduplicates(self, populator, all_sample_games):
+        ids = [str(game_id) for game_id in _game_ids(all_sample_games)]
+        listener = FakeListener([[ids[0], ids[1], ids[0], 'not-an-id'], [ids[1]], [ids[2]], [], [ids[3]]])
+        now = [0.0]
+        daemon, batches = _daemon(populator, listener, batch_window=2.0, catch_up=False, clock=lambda: now[0])
+
+        def wait(timeout):
+            now[0] += 1.0  # Each wait takes a second
+            return FakeListener.wait(listener, timeout)
+        listener.wait = wait
+
+        stats = daemon.run()
+
+        # A batch collects for two seconds from its first notification; the
+        # last one is populated when the daemon stops
+        assert batches == [[int(ids[0]), int(ids[1]), int(ids[2])], [int(ids[3])]]
+        assert stats['batches'] == 2 and stats['games'] == 4
+        assert listener.timeouts[0] == daemon.idle_timeout
+
+    def test_max_batch_populates_early(self, populator, all_sample_games):
+        ids = [str(game_id) for game_id in _game_ids(all_sample_games)]
+        listener = FakeListener([ids[:2], ids[2:3]])
+        daemon, batches = _daemon(populator, listener, batch_window=3600, max_batch=2, catch_up=False)
+
+        daemon.run()
+
+        # The last game waits for its window until the daemon stops
+        assert batches == [[int(ids[0]), int(ids[1])], [int(ids[2])]]
+
+    def test_reconnects_after_connection_loss(self, populator, all_sample_games):
+        listener = FakeListener([[str(_game_ids(all_sample_games)[0])]], fail_first_wait=True)
+        daemon, batches = _daemon(populator, listener, batch_window=0, catch_up=False)
+
+        stats = daemon.run()
+
+        assert listener.listens == 2
+        assert stats['reconnects'] == 1
+        assert batches == [[_game_ids(all_sample_games)[0]]]
+
+
+@pytest.mark.integration
+class TestCatchUp:
+    """Test catching up on games changed while the daemon was not listening"""
+
+    def test_catches_up_on_new_and_changed_games(self, populator, all_sample_games):
+        ids = _game_ids(all_sample_games)
+        daemon, batches = _daemon(populator, FakeListener([]), max_batch=3)
+        assert daemon.games_to_catch_up() == ids
+
+        daemon.run()
+        assert batches == [ids[:3], ids[3:]]
+        assert daemon.games_to_catch_up() == []
+
+        with populator.engine.begin() as conn:
+            conn.execute(text("UPDATE raw_game_data SET updated_at = '2999-01-01' WHERE game_id = :id"), {'id': ids[1]})
+        assert daemon.games_to_catch_up() == [ids[1]]
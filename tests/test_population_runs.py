@@ -0,0 +1,193 @@
+"""
+Tests for checkpointed population runs.
+
+Test Categories:
+- unit: Run records, per-game statuses and processing order
+- integration: Interrupting, resuming and retrying GameTablePopulator runs, and pipelined population
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.analytics.season_stats import SeasonStatsService
+from src.database.models import Game, PlayerSeasonStats, TeamSeasonStats
+from src.database.population_runs import PopulationRunStore, PENDING, DONE, FAILED
+from src.database.population_services import GamePopulationService
+from src.scripts.populate_game_tables import PopulationPipeline, main
+
+
+def _chronological_ids(all_sample_games):
+    return [int(g['boxscore']['gameId']) for g in sorted(all_sample_games, key=lambda g: g['boxscore']['gameEt'])]
+
+
+@pytest.mark.unit
+class TestPopulationRunStore:
+    """Test run records and statuses"""
+
+    def test_statuses_keep_processing_order(self, population_engine):
+        store = PopulationRunStore(population_engine, batch_size=2)
+        run_id = store.create([30, 10, 20], 'games', '3 requested')
+
+        assert store.game_ids(run_id) == [30, 10, 20]
+        with Session(population_engine) as session:
+            store.mark_done(session, run_id, 10)
+            session.commit()
+        store.mark_failed(run_id, 20, 'boom')
+
+        assert store.game_ids(run_id) == [30]
+        assert store.game_ids(run_id, (DONE, FAILED)) == [10, 20]
+        assert store.counts(run_id) == {PENDING: 1, DONE: 1, FAILED: 1}
+
+    def test_get_latest_run(self, population_engine):
+        store = PopulationRunStore(population_engine)
+        assert store.get() is None
+        first = store.create([1], 'all')
+        second = store.create([2], 'seasons', 'seasons=[2024]', override_existing=True)
+        store.finish(second)
+
+        assert store.get()['population_run_id'] == second
+        assert store.get()['finished_at'] is not None
+        assert store.get(first)['finished_at'] is None
+        assert store.get(second)['override_existing']
+
+
+@pytest.mark.integration
+class TestResumableRuns:
+    """Test interrupted, resumed and retried population runs"""
+
+    def test_run_records_chronological_order(self, populator, all_sample_games):
+        stats = populator.populate_all_games()
+
+        assert stats['successful_games'] == len(all_sample_games)
+        run_id = stats['population_run_id']
+        assert populator.runs.game_ids(run_id, (DONE,)) == _chronological_ids(all_sample_games)
+        assert populator.runs.get(run_id)['finished_at'] is not None
+
+    def test_resume_and_retry(self, populator, all_sample_games, monkeypatch):
+        order = _chronological_ids(all_sample_games)
+        populate_game = GamePopulationService.populate_game
+        calls = []
+
+        def flaky(service, game_json):
+            game_id = int(game_json['boxscore']['gameId'])
+            calls.append(game_id)
+            if game_id == order[1]:
+                raise ValueError('bad game')
+            if len(calls) == 4:
+                raise KeyboardInterrupt
+            return populate_game(service, game_json)
+
+        monkeypatch.setattr(GamePopulationService, 'populate_game', flaky)
+        with pytest.raises(KeyboardInterrupt):
+            populator.populate_all_games()
+
+        run_id = populator.runs.get()['population_run_id']
+        assert populator.runs.game_ids(run_id, (DONE,)) == [order[0], order[2]]
+        assert populator.runs.game_ids(run_id, (FAILED,)) == [order[1]]
+        assert populator.runs.game_ids(run_id) == order[3:]
+        assert populator.runs.get(run_id)['finished_at'] is None
+
+        # The interrupted game rolled back and is the first one resumed
+        calls.clear()
+        stats = populator.resume_run()
+        assert calls == order[3:]
+        assert stats['successful_games'] == len(order) - 3
+        assert populator.runs.counts(run_id) == {PENDING: 0, DONE: len(order) - 1, FAILED: 1}
+
+        monkeypatch.setattr(GamePopulationService, 'populate_game', populate_game)
+        stats = populator.retry_failed_games(run_id)
+        assert (stats['total_games'], stats['successful_games']) == (1, 1)
+        assert populator.runs.counts(run_id)[DONE] == len(order)
+
+        with Session(populator.engine) as session:
+            assert sorted(g.game_id for g in session.query(Game.game_id)) == sorted(order)
+
+    def test_resume_without_runs(self, populator):
+        with pytest.raises(ValueError, match='No population runs recorded'):
+            populator.resume_run()
+
+    @pytest.mark.parametrize('mode', ['--resume', '--retry-failed'])
+    def test_clear_tables_rejected_when_continuing_a_run(self, mode, capsys):
+        with patch('sys.argv', ['populate_game_tables.py', mode, '--clear-tables']), \
+             patch('src.scripts.populate_game_tables.GameTablePopulator') as populator_class:
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        assert exc_info.value.code == 2
+        assert '--clear-tables cannot be used' in capsys.readouterr().err
+        populator_class.assert_not_called()
+
+
+@pytest.mark.integration
+class TestPopulationPipeline:
+    """Test populating games while they are being submitted"""
+
+    @staticmethod
+    def _wait_for(condition, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline, 'timed out'
+            time.sleep(0.01)
+
+    def test_games_populate_while_scraping(self, populator, all_sample_games):
+        order = _chronological_ids(all_sample_games)
+        games = {int(g['boxscore']['gameId']): g for g in all_sample_games}
+
+        with PopulationPipeline(populator, queue_size=2, description='test') as pipeline:
+            run_id = pipeline.stats['population_run_id']
+            for i, game_id in enumerate(order):
+                # Games already in raw_game_data are submitted without their JSON
+                pipeline.submit(game_id, games[game_id] if i % 2 == 0 else None)
+                pipeline.submit(game_id, games[game_id])  # Duplicates are ignored
+                # Each game is populated before the "scrape" of the next one
+                self._wait_for(lambda: populator.runs.counts(run_id)[DONE] == i + 1)
+
+        stats = pipeline.stats
+        assert (stats['total_games'], stats['successful_games'], stats['failed_games']) == (len(order), len(order), 0)
+        assert populator.runs.game_ids(run_id, (DONE,)) == order
+        assert populator.runs.get(run_id)['mode'] == 'pipeline'
+        assert populator.runs.get(run_id)['finished_at'] is not None
+
+    def test_failed_pipeline_games_retry(self, populator, all_sample_games, monkeypatch):
+        order = _chronological_ids(all_sample_games)
+        monkeypatch.setattr(GamePopulationService, 'populate_game', lambda service, game_json: 1 / 0)
+
+        with PopulationPipeline(populator, workers=2) as pipeline:
+            for game_id in order:
+                pipeline.submit(game_id)
+        assert pipeline.stats['failed_games'] == len(order)
+
+        monkeypatch.undo()
+        stats = populator.retry_failed_games()
+        assert stats['successful_games'] == len(order)
+        assert sorted(populator.runs.game_ids(pipeline.stats['population_run_id'], (DONE,))) == sorted(order)
+
+    def test_season_stats_refreshed_once_per_run(self, populator, all_sample_games, monkeypatch):
+        refresh = SeasonStatsService.refresh_team_seasons
+        refreshes = []
+
+        def counted(service, keys):
+            refreshes.append(len(keys))
+            return refresh(service, keys)
+
+        monkeypatch.setattr(SeasonStatsService, 'refresh_team_seasons', counted)
+        with PopulationPipeline(populator, workers=2) as pipeline:
+            for game_id in _chronological_ids(all_sample_games):
+                pipeline.submit(game_id)
+
+        assert pipeline.stats['failed_games'] == 0
+        assert len(refreshes) == 1  # One batch of team-seasons, not one refresh per game
+        assert pipeline.stats['season_stats']['games'] == len(all_sample_games)
+
+        def stored(session):
+            return ({(p.person_id, p.team_id, p.season, p.game_type): (p.games, p.pts, p.minutes)
+                     for p in session.query(PlayerSeasonStats)},
+                    {(t.team_id, t.season, t.game_type): (t.games, t.wins, t.pts) for t in session.query(TeamSeasonStats)})
+
+        with Session(populator.engine) as session:
+            refreshed = stored(session)
+            assert refreshed[0] and refreshed[1]
+            SeasonStatsService(session).rebuild()
+            assert stored(session) == refreshed
@@ -0,0 +1,202 @@
+"""
+Tests for vectorized possession segmentation.
+
+Test Categories:
+- unit: Synthetic play sequences run through segment_possessions
+- integration: Possessions built from sample games in SQLite
+"""
+
+import pytest
+
+from src.database.models import Game, Possession
+from src.database.population_services import GamePopulationService
+from src.analytics.play_arrays import build_play_arrays, parse_clock, load_play_arrays
+from src.analytics.possessions import PossessionService, segment_possessions
+
+
+GAME_ID = 1022400999
+HOME, AWAY = 1611661319, 1611661320
+
+
+def make_play(clock, action_type, sub_type='', location='', shot_value=0,
+              description='', score_home='', score_away='', period=1):
+    """Build a play row tuple in the order expected by build_play_arrays"""
+    return (GAME_ID, 0, period, clock, action_type, sub_type, location, None,
+            shot_value, description, score_home, score_away)
+
+
+def segment(plays):
+    rows = [(p[0], i + 1) + p[2:] + (i + 1,) for i, p in enumerate(plays)]
+    arrays = build_play_arrays(rows, {GAME_ID: (HOME, AWAY)})
+    return segment_possessions(arrays)
+
+
+@pytest.mark.unit
+class TestSegmentPossessions:
+    """Test possession end rules on synthetic play sequences"""
+
+    def test_parse_clock(self):
+        assert parse_clock('PT09M34.00S') == 574.0
+        assert parse_clock('PT00M04.40S') == pytest.approx(4.4)
+        assert parse_clock('') == 0.0
+        assert parse_clock('bad') == 0.0
+
+    def test_made_shot_and_defensive_rebound(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M40.00S', 'Made Shot', 'Jump Shot', 'h', 2, 'Shot', '2', '0'),
+            make_play('PT09M20.00S', 'Missed Shot', 'Jump Shot', 'v', 3, 'MISS Shot'),
+            make_play('PT09M18.00S', 'Rebound', 'Unknown', 'h', 0, 'REBOUND'),
+            make_play('PT09M00.00S', 'Turnover', 'Bad Pass', 'h'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [0, 2, 3, 4]
+        assert list(result['team_id']) == [HOME, AWAY, HOME, AWAY]
+        assert list(result['points']) == [2, 0, 0, 0]
+        assert list(result['possession_number']) == [1, 2, 3, 4]
+        assert result['start_clock'][1] == 580.0
+        assert result['end_clock'][1] == 558.0
+
+    def test_offensive_rebound_continues_possession(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M40.00S', 'Missed Shot', 'Layup', 'v', 2, 'MISS Layup'),
+            make_play('PT09M38.00S', 'Rebound', 'Unknown', 'v', 0, 'REBOUND'),
+            make_play('PT09M30.00S', 'Made Shot', 'Layup', 'v', 2, 'Layup', '0', '2'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [0, 4]
+        assert list(result['team_id']) == [AWAY, HOME]
+        assert result['points'][0] == 2
+
+    def test_free_throw_trip_ends_on_last_made(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M40.00S', 'Foul', 'Shooting', 'v'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw 1 of 2', 'h', 0, 'FT 1 of 2', '1', '0'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw 2 of 2', 'h', 0, 'FT 2 of 2', '2', '0'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [1, 4]
+        assert result['points'][0] == 2
+
+    def test_missed_first_free_throw_rebound_is_ignored(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M50.00S', 'Missed Shot', 'Jump Shot', 'h', 2, 'MISS Shot'),
+            make_play('PT09M48.00S', 'Rebound', 'Unknown', 'h', 0, 'REBOUND'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw 1 of 2', 'h', 0, 'MISS FT 1 of 2'),
+            make_play('PT09M40.00S', 'Rebound', 'Normal Rebound', 'v', 0, 'Team Rebound'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw 2 of 2', 'h', 0, 'MISS FT 2 of 2'),
+            make_play('PT09M38.00S', 'Rebound', 'Unknown', 'v', 0, 'REBOUND'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [2, 4]
+        assert list(result['team_id']) == [HOME, AWAY]
+
+    def test_and_one_keeps_possession_until_free_throw(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M40.00S', 'Made Shot', 'Layup', 'h', 2, 'Layup', '2', '0'),
+            make_play('PT09M40.00S', 'Foul', 'Shooting', 'v'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw 1 of 1', 'h', 0, 'FT 1 of 1', '3', '0'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [1, 4]
+        assert result['points'][0] == 3
+
+    def test_technical_free_throw_does_not_end_possession(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT09M40.00S', 'Free Throw', 'Free Throw Technical', 'v', 0, 'FT Technical', '0', '1'),
+            make_play('PT09M30.00S', 'Made Shot', 'Layup', 'h', 2, 'Layup', '2', '1'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [0, 4]
+        assert result['team_id'][0] == HOME
+
+    def test_period_end_after_basket_at_buzzer_is_dropped(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start'),
+            make_play('PT00M00.00S', 'Made Shot', 'Jump Shot', 'h', 2, 'Shot', '2', '0'),
+            make_play('PT00M00.00S', 'period', 'end'),
+        ])
+
+        assert list(result['end_reason']) == [0]
+
+    def test_periods_are_segmented_separately(self):
+        result = segment([
+            make_play('PT10M00.00S', 'period', 'start', period=1),
+            make_play('PT05M00.00S', 'Turnover', 'Bad Pass', 'h', period=1),
+            make_play('PT00M00.00S', 'period', 'end', period=1),
+            make_play('PT10M00.00S', 'period', 'start', period=2),
+            make_play('PT00M00.00S', 'period', 'end', period=2),
+        ])
+
+        assert list(result['period']) == [1, 1, 2]
+        assert list(result['end_reason']) == [3, 4, 4]
+        assert result['start_clock'][2] == 600.0
+
+    def test_empty_input(self):
+        result = segment_possessions(build_play_arrays([], {}))
+        assert len(result['game_id']) == 0
+
+
+@pytest.mark.integration
+class TestPossessionService:
+    """Test building possessions from populated sample games"""
+
+    def test_possession_points_match_final_score(self, sqlite_session, all_sample_games):
+        population_service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            population_service.populate_game(game_json)
+        sqlite_session.commit()
+
+        service = PossessionService(sqlite_session)
+        pending = service.pending_game_ids()
+        assert len(pending) == len(all_sample_games)
+
+        stats = service.build(pending)
+        assert stats['games'] == len(all_sample_games)
+        assert stats['possessions'] == sqlite_session.query(Possession).count()
+        assert service.pending_game_ids() == []
+
+        for game in sqlite_session.query(Game).all():
+            possessions = sqlite_session.query(Possession).filter_by(game_id=game.game_id).all()
+            home = sum(p.points for p in possessions if p.team_id == game.home_team_id)
+            away = sum(p.points for p in possessions if p.team_id == game.away_team_id)
+            arrays = load_play_arrays(sqlite_session, [game.game_id])
+
+            assert home == arrays.score_home[-1]
+            assert away == arrays.score_away[-1]
+            # Possessions alternate, so counts differ by at most a few
+            assert abs(sum(p.team_id == game.home_team_id for p in possessions)
+                       - sum(p.team_id == game.away_team_id for p in possessions)) <= 4
+
+    def test_rebuild_replaces_existing_rows(self, sqlite_session, sample_game_json):
+        GamePopulationService(sqlite_session).populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+
+        service = PossessionService(sqlite_session)
+        first = service.build_games([game_id])
+        second = service.build_games([game_id])
+
+        assert first == second
+        assert sqlite_session.query(Possession).count() == first
+
+    def test_clear_game_data_removes_possessions(self, sqlite_session, sample_game_json):
+        population_service = GamePopulationService(sqlite_session)
+        population_service.populate_game(sample_game_json)
+        game_id = int(sample_game_json['boxscore']['gameId'])
+        PossessionService(sqlite_session).build_games([game_id])
+
+        counts = population_service.clear_game_data(game_id)
+
+        assert counts['possessions'] > 0
+        assert sqlite_session.query(Possession).count() == 0
@@ -0,0 +1,96 @@
+"""
+Tests for the CLI profiling switches.
+
+Test Categories:
+- unit: Argument handling, stages without a profiler and operation timing
+- integration: CPU and memory profiles of game population
+"""
+
+import argparse
+import pstats
+from contextlib import nullcontext
+
+import pytest
+
+from src import profiling
+from src.profiling import Profiler
+from src.database.population_services import GamePopulationService
+from src.database.query_counter import operation
+
+POPULATE_PHASES = ('arena', 'team', 'person', 'game', 'team_game', 'person_game', 'play', 'boxscore')
+
+
+def _parser():
+    parser = argparse.ArgumentParser()
+    profiling.add_arguments(parser)
+    return parser
+
+
+@pytest.mark.unit
+class TestProfilerSetup:
+    """Test options and the inactive path"""
+
+    def test_from_args(self, tmp_path):
+        assert profiling.from_args(_parser().parse_args([]), 'populate') is None
+
+        args = _parser().parse_args(['--profile', 'mem', '--profile-output', str(tmp_path / 'run')])
+        profiler = profiling.from_args(args, 'populate')
+        assert (profiler.mode, profiler.name) == ('mem', 'populate')
+        assert profiler.report_path == str(tmp_path / 'run.txt')
+
+        with pytest.raises(SystemExit):
+            _parser().parse_args(['--profile', 'gpu'])
+
+    def test_stage_is_a_no_op_without_profiler(self):
+        assert isinstance(profiling.stage('populate'), nullcontext)
+
+    def test_operation_timing(self, tmp_path):
+        with Profiler('cpu', str(tmp_path / 'run')) as profiler:
+            for _ in range(3):
+                with operation('outer'):
+                    with operation('inner'):
+                        pass
+
+        timings = profiler.timings()
+        assert set(timings) == {'outer', 'outer.inner'}
+        assert timings['outer']['calls'] == 3
+        assert timings['outer']['seconds'] >= timings['outer.inner']['seconds']
+
+
+@pytest.mark.integration
+class TestPopulationProfiles:
+    """Test profiles of populate_game"""
+
+    def test_cpu_profile(self, sqlite_session, all_sample_games, tmp_path):
+        service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+        with Profiler('cpu', str(tmp_path / 'cpu'), name='populate') as profiler:
+            with profiling.stage('populate'):
+                for game_json in all_sample_games:
+                    service.populate_game(game_json)
+
+        stats = pstats.Stats(profiler.stats_path)
+        assert any(func[2] == 'populate_game' for func in stats.stats)
+        report = (tmp_path / 'cpu.txt').read_text()
+        assert 'Top 25 functions by cumulative time' in report
+        assert 'Stage populate:' in report
+        timings = profiler.timings()
+        assert timings['populate_game']['calls'] == len(all_sample_games)
+        for phase in POPULATE_PHASES:
+            assert timings[f'populate_game.{phase}']['calls'] == len(all_sample_games)
+
+    def test_mem_profile(self, sqlite_session, all_sample_games, tmp_path):
+        service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+        with Profiler('mem', str(tmp_path / 'mem'), name='populate') as profiler:
+            with profiling.stage('load'):
+                retained = [bytearray(2_000_000)]
+            with profiling.stage('populate'):
+                service.populate_game(all_sample_games[0])
+
+        report = (tmp_path / 'mem.txt').read_text()
+        load = report[report.index('Stage load:'):report.index('Stage populate:')]
+        assert 'peak 2.' in load
+        assert 'test_profiling.py' in load.splitlines()[2]
+        assert 'Peak (MB)' in report
+        assert profiler.timings()['populate_game.play']['peak_bytes'] > 0
+        assert not (tmp_path / 'mem.pstats').exists()
+        del retained
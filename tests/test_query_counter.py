@@ -0,0 +1,109 @@
+"""
+Tests for statement counting and query budgets.
+
+Test Categories:
+- unit: Counting statements, round trips and rows per operation, repeated SQL and budget failures
+- integration: Statement budgets for game population
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Person, Play
+from src.database.population_services import GamePopulationService
+from src.database.query_counter import QueryCounter, QueryBudgetExceeded, operation, OTHER
+from src.database.synthetic_games import SyntheticConfig, SyntheticGameGenerator
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)'))
+    return engine
+
+
+@pytest.mark.unit
+class TestQueryCounter:
+    """Test counting and budgets"""
+
+    def test_counts_per_operation(self, engine):
+        with QueryCounter(engine) as counter, engine.begin() as conn:
+            with operation('load'):
+                conn.execute(text('INSERT INTO item (name) VALUES (:name)'), [{'name': 'a'}, {'name': 'b'}])
+                with operation('lookup'):
+                    for i in range(3):
+                        conn.execute(text('SELECT name FROM item WHERE id = :id'), {'id': i})
+            conn.execute(text('DELETE FROM item'))
+
+        stats = counter.by_operation()
+        assert set(stats) == {'load', 'load.lookup', OTHER}
+        assert (stats['load'].calls, stats['load'].statements, stats['load'].rows) == (1, 1, 2)
+        assert stats['load.lookup'].statements == 3
+        assert stats[OTHER].rows == 2
+        assert counter.stats('load').statements == 4
+        assert counter.stats().statements == 5
+        assert counter.repeated_statements(3) == [('SELECT name FROM item WHERE id = ?', 3)]
+
+    def test_stops_counting_after_exit(self, engine):
+        with QueryCounter(engine) as counter:
+            with engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        assert counter.stats().statements == 1
+
+    def test_budget_per_call(self, engine):
+        with QueryCounter(engine) as counter, engine.connect() as conn:
+            for _ in range(2):
+                with operation('fetch'):
+                    for _ in range(3):
+                        conn.execute(text('SELECT 1'))
+
+        counter.assert_budget(statements=3, operation='fetch', per_call=True)
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            counter.assert_budget(statements=5, operation='fetch')
+        assert 'statements 6 > 5' in str(excinfo.value)
+        assert '6 x SELECT 1' in str(excinfo.value)
+
+
+@pytest.mark.integration
+class TestPopulationBudget:
+    """Test statement budgets for populate_game"""
+
+    @staticmethod
+    def _population():
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != 'raw_game_data'])
+        session = sessionmaker(bind=engine)()
+        return engine, session, GamePopulationService(session, refresh_season_stats=False)
+
+    def test_populate_game_statement_budget(self, all_sample_games):
+        engine, session, service = self._population()
+        with QueryCounter(engine) as counter:
+            for game_json in all_sample_games:
+                service.populate_game(game_json)
+        session.close()
+
+        counter.assert_budget(statements=25, operation='populate_game', per_call=True)
+        assert counter.stats('populate_game.play').statements <= 3 * len(all_sample_games)
+
+    def test_statements_do_not_grow_with_plays(self):
+        counts = []
+        for plays_per_game in (200, 800):
+            engine, session, service = self._population()
+            config = SyntheticConfig(games_per_season=1, plays_per_game=plays_per_game)
+            game_json = next(SyntheticGameGenerator(config).generate())['game_data']
+            with QueryCounter(engine) as counter:
+                service.populate_game(game_json)
+            counts.append(counter.stats('populate_game').statements)
+
+            # Batched lookups still resolve the player on every play
+            session.commit()
+            unresolved = session.query(Play).filter(Play.person_id.in_(session.query(Person.person_id)),
+                                                    Play.person_internal_id.is_(None))
+            assert unresolved.count() == 0
+            session.close()
+
+        assert counts[0] == counts[1]
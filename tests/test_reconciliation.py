@@ -0,0 +1,131 @@
+"""
+Tests for boxscore vs play-by-play reconciliation.
+
+Test Categories:
+- unit: Stat increments and keyed diffs on hand-built plays
+- integration: Reconciliation of populated sample games in SQLite
+"""
+
+import numpy as np
+import pytest
+
+from src.database.models import Boxscore, Game, Play
+from src.database.population_services import GamePopulationService
+from src.analytics.play_arrays import build_play_arrays
+from src.analytics.reconciliation import (
+    RECONCILED_STATS, ReconciliationService, play_stat_increments, play_totals, diff_totals
+)
+
+
+def _play(action_type, person_id, location='h', sub_type='', shot_value=0, description=''):
+    return (1, 1, 1, 'PT10M00.00S', action_type, sub_type, location, person_id,
+            shot_value, description, '', '', 1)
+
+
+def _stats(**values):
+    return [values.get(stat, 0) for stat in RECONCILED_STATS]
+
+
+@pytest.fixture
+def populated_session(sqlite_session, all_sample_games):
+    service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+    for game_json in all_sample_games:
+        service.populate_game(game_json)
+    sqlite_session.commit()
+    return sqlite_session
+
+
+@pytest.mark.unit
+class TestStatIncrements:
+    """Test per-play increments and diffs"""
+
+    def test_play_increments(self):
+        rows = [
+            _play('Made Shot', 7, shot_value=3, description="Smith 25' 3PT Jump Shot (3 PTS)"),
+            _play('Missed Shot', 7, shot_value=2, description="MISS Smith 10' Jump Shot"),
+            _play('Free Throw', 7, description='Smith Free Throw 1 of 2 (4 PTS)'),
+            _play('Free Throw', 7, description='MISS Smith Free Throw 2 of 2'),
+            _play('Rebound', 8, location='v'),
+            _play('Foul', 8, location='v', sub_type='Personal'),
+            _play('Foul', 8, location='v', sub_type='Technical'),
+            _play('Turnover', None, location='v'),
+        ]
+        arrays = build_play_arrays(rows, {1: (100, 200)})
+
+        increments = play_stat_increments(arrays)
+        totals = dict(zip(RECONCILED_STATS, increments.sum(axis=0).tolist()))
+        assert totals == {'pts': 4, 'fgm': 1, 'fga': 2, 'tpm': 1, 'tpa': 1, 'ftm': 1, 'fta': 2,
+                          'reb': 1, 'to': 1, 'pf': 1}
+
+        keys, values = play_totals(arrays)['player']
+        assert keys.tolist() == [[1, 7], [1, 8]]
+        assert values[0].tolist() == _stats(pts=4, fgm=1, fga=2, tpm=1, tpa=1, ftm=1, fta=2)
+        assert values[1].tolist() == _stats(reb=1, pf=1)
+
+        # The uncredited team turnover is left out of the team totals too
+        keys, values = play_totals(arrays)['team']
+        assert keys.tolist() == [[1, 100], [1, 200]]
+        assert values[1].tolist() == _stats(reb=1, pf=1)
+
+    def test_diff_totals(self):
+        box_keys = np.array([[1, 7], [1, 8]])
+        box_values = np.array([_stats(pts=10), _stats(reb=2)])
+        play_keys = np.array([[1, 7], [1, 9]])
+        play_values = np.array([_stats(pts=8), _stats(pf=1)])
+
+        keys, stats, box, plays = diff_totals(box_keys, box_values, play_keys, play_values)
+
+        found = {(tuple(k), RECONCILED_STATS[s], b, p)
+                 for k, s, b, p in zip(keys.tolist(), stats.tolist(), box.tolist(), plays.tolist())}
+        assert found == {((1, 7), 'pts', 10, 8), ((1, 8), 'reb', 2, 0), ((1, 9), 'pf', 0, 1)}
+
+    def test_diff_totals_empty(self):
+        empty = np.zeros((0, 2), dtype=np.int64)
+        keys, stats, _, _ = diff_totals(empty, np.zeros((0, len(RECONCILED_STATS))),
+                                        empty, np.zeros((0, len(RECONCILED_STATS))))
+        assert len(keys) == 0 and len(stats) == 0
+
+
+@pytest.mark.integration
+class TestReconciliationService:
+    """Test reconciliation of populated games"""
+
+    def test_sample_games_reconcile(self, populated_session):
+        result = ReconciliationService(populated_session, batch_size=2).reconcile_games()
+
+        assert result['games'] == 5
+        assert result['discrepancies'] == []
+        assert result['games_with_discrepancies'] == 0
+
+    def test_flags_boxscore_and_play_changes(self, populated_session):
+        game_id = 1022400005
+        box = (populated_session.query(Boxscore)
+               .filter_by(game_id=game_id, box_type='player')
+               .filter(Boxscore.fga > 0).order_by(Boxscore.boxscore_id).first())
+        box.pts += 2
+        rebound = (populated_session.query(Play)
+                   .filter_by(game_id=game_id, action_type='Rebound')
+                   .filter(Play.person_id.is_not(None)).order_by(Play.play_id).first())
+        rebounder, side = rebound.person_id, rebound.location
+        populated_session.delete(rebound)
+        populated_session.commit()
+
+        result = ReconciliationService(populated_session).reconcile_games(seasons=[2024])
+
+        assert result['games'] == 1
+        assert result['by_stat']['pts'] == 1
+        assert result['by_stat']['reb'] == 2
+        found = {(d['level'], d.get('person_id', d.get('team_id')), d['stat'], d['difference'])
+                 for d in result['discrepancies']}
+        game = populated_session.get(Game, game_id)
+        team_id = game.home_team_id if side == 'h' else game.away_team_id
+        assert found == {('player', box.person_id, 'pts', 2), ('player', rebounder, 'reb', 1),
+                         ('team', team_id, 'reb', 1)}
+
+    def test_games_without_plays_are_skipped(self, populated_session):
+        populated_session.query(Play).filter_by(game_id=1022400005).delete()
+        populated_session.commit()
+
+        service = ReconciliationService(populated_session)
+        assert 1022400005 not in service.reconcilable_game_ids()
+        assert service.reconcile_games(game_ids=[1022400005])['games'] == 0
@@ -0,0 +1,109 @@
+"""
+Tests for the shared scrape queue.
+
+Test Categories:
+- unit: Enqueueing, claiming by priority, lease expiry, retries and failures
+- integration: ScraperManager workers draining the queue
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.database.scrape_queue import ScrapeQueue, PENDING, LEASED, DONE, FAILED
+from src.scrapers.game_url_generator import GameURLInfo
+from src.scripts.scraper_manager import ScraperManager
+
+
+def _infos(*game_ids):
+    return [GameURLInfo(game_id=str(game_id), season='2024', game_url=f'https://example.com/game/{game_id}')
+            for game_id in game_ids]
+
+
+@pytest.mark.unit
+class TestScrapeQueue:
+    """Test enqueueing and leasing games"""
+
+    def test_claims_by_priority_without_overlap(self, population_engine):
+        first = ScrapeQueue(population_engine, owner='host-a:1')
+        second = ScrapeQueue(population_engine, owner='host-b:1')
+        assert first.enqueue(_infos(3, 1, 2)) == 3
+        assert first.enqueue(_infos(2, 4), priority=5) == 1  # Game 2 is already queued
+
+        claimed = first.claim(limit=2)
+        assert [item['game_id'] for item in claimed] == [4, 1]
+        assert claimed[0]['attempts'] == 1 and claimed[0]['season'] == 2024
+        assert [item['game_id'] for item in second.claim(limit=5)] == [2, 3]
+        assert second.claim() == []
+
+        assert first.complete(4)
+        assert not second.complete(1)  # Leased to the first worker
+        assert first.counts() == {PENDING: 0, LEASED: 3, DONE: 1, FAILED: 0}
+
+    def test_expired_leases_are_reclaimed(self, population_engine):
+        crashed = ScrapeQueue(population_engine, owner='crashed', lease_seconds=0, max_attempts=2)
+        survivor = ScrapeQueue(population_engine, owner='survivor', lease_seconds=0, max_attempts=2)
+        crashed.enqueue(_infos(1))
+
+        crashed.claim()
+        reclaimed = survivor.claim()
+        assert [(item['game_id'], item['attempts']) for item in reclaimed] == [(1, 2)]
+        assert not crashed.complete(1)
+
+        # The second lease expires on the last attempt
+        assert survivor.claim() == []
+        assert survivor.counts()[FAILED] == 1
+
+    def test_failed_attempts_retry_then_fail(self, population_engine):
+        queue = ScrapeQueue(population_engine, owner='worker', max_attempts=2, retry_delay=0)
+        queue.enqueue(_infos(1))
+
+        queue.claim()
+        assert queue.fail(1, 'timeout')
+        assert queue.counts()[PENDING] == 1
+        assert queue.claim()[0]['attempts'] == 2
+        queue.fail(1, 'timeout')
+        assert queue.counts()[FAILED] == 1
+        assert queue.claim() == []
+
+        assert queue.retry_failed() == 1
+        assert queue.claim()[0]['attempts'] == 1
+
+    def test_retry_delay(self, population_engine):
+        queue = ScrapeQueue(population_engine, owner='worker', retry_delay=3600)
+        queue.enqueue(_infos(1))
+        queue.claim()
+        queue.fail(1, 'timeout')
+
+        assert queue.claim() == []
+        assert queue.counts()[PENDING] == 1
+
+
+@pytest.mark.integration
+class TestQueueWorkers:
+    """Test ScraperManager workers draining the queue"""
+
+    @patch('src.scripts.scraper_manager.time.sleep')  # Speed up tests
+    @patch('src.scripts.scraper_manager.DatabaseService')
+    def test_workers_drain_queue(self, mock_db_service, mock_sleep, population_engine):
+        mock_db_service.return_value.__enter__.return_value.scraping_session.start_session.return_value.id = 1
+        ScrapeQueue(population_engine).enqueue(_infos(1, 2, 3, 4))
+        scraped = []
+
+        def scrape(game_url_info, override_existing=False, on_stored=None):
+            scraped.append(int(game_url_info.game_id))
+            return game_url_info.game_id != '3'
+
+        with patch('src.scripts.scraper_manager.GameURLGenerator'), \
+             patch('src.scripts.scraper_manager.RawDataExtractor'):
+            manager = ScraperManager()
+        manager.scrape_single_game = scrape
+
+        first = ScrapeQueue(population_engine, owner='a', max_attempts=2, retry_delay=0)
+        assert manager.work_queue(first, max_games=2) == {'total': 2, 'success': 2, 'failed': 0}
+        second = ScrapeQueue(population_engine, owner='b', max_attempts=2, retry_delay=0)
+        stats = manager.work_queue(second)
+
+        assert scraped == [1, 2, 3, 3, 4]  # Game 3 is retried at once, before game 4
+        assert stats == {'total': 3, 'success': 1, 'failed': 2}
+        assert second.counts() == {PENDING: 0, LEASED: 0, DONE: 3, FAILED: 1}
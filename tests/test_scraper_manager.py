@@ -235,6 +235,26 @@ class TestScraperManager:
         
         assert result is False
 
+    @patch('src.scripts.scraper_manager.DatabaseService')
+    def test_scrape_single_game_on_stored(self, mock_db_service, mock_scraper_manager,
+                                          sample_game_url_infos, sample_game_data, mock_extraction_metadata):
+        """Test that stored and skipped games are passed to the on_stored callback."""
+        game_data_service = mock_db_service.return_value.__enter__.return_value.game_data
+        mock_scraper_manager.data_extractor.extract_game_data.return_value = (
+            ExtractionResult.SUCCESS, sample_game_data, mock_extraction_metadata
+        )
+        on_stored = Mock()
+
+        game_data_service.game_exists.return_value = False
+        mock_scraper_manager.scrape_single_game(sample_game_url_infos[0], on_stored=on_stored)
+        game_data_service.game_exists.return_value = True
+        mock_scraper_manager.scrape_single_game(sample_game_url_infos[1], on_stored=on_stored)
+
+        assert on_stored.call_args_list == [
+            call(int(sample_game_url_infos[0].game_id), sample_game_data),
+            call(int(sample_game_url_infos[1].game_id), None),
+        ]
+
     @patch('src.scripts.scraper_manager.time.sleep')  # Speed up tests
     @patch('src.scripts.scraper_manager.DatabaseService')
     def test_scrape_season(self, mock_db_service, mock_sleep, mock_scraper_manager, sample_game_url_infos):
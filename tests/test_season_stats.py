@@ -0,0 +1,115 @@
+"""
+Tests for materialized season aggregates.
+
+Test Categories:
+- unit: Minutes parsing, group sums and averages
+- integration: Aggregates maintained by GamePopulationService in SQLite
+"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from src.database.models import Boxscore, Game, PlayerSeasonStats, TeamSeasonStats
+from src.database.population_services import GamePopulationService
+from src.analytics.season_stats import SeasonStatsService, parse_minutes, group_sum, season_averages
+
+
+@pytest.mark.unit
+class TestSeasonStatsHelpers:
+    """Test parsing and aggregation helpers"""
+
+    def test_parse_minutes(self):
+        assert parse_minutes('25:30') == pytest.approx(25.5)
+        assert parse_minutes('200:00') == 200.0
+        assert parse_minutes('PT18M30.00S') == pytest.approx(18.5)
+        assert parse_minutes('') == 0.0
+        assert parse_minutes(None) == 0.0
+        assert parse_minutes('DNP') == 0.0
+
+    def test_group_sum(self):
+        keys = np.array([[2, 1], [1, 1], [2, 1]])
+        values = np.array([[1, 10], [1, 5], [1, 7]])
+
+        distinct, sums = group_sum(keys, values)
+
+        assert distinct.tolist() == [[1, 1], [2, 1]]
+        assert sums.tolist() == [[1, 5], [2, 17]]
+
+    def test_season_averages(self):
+        row = PlayerSeasonStats(games=4, minutes=120.0, pts=50, reb=20, ast=8, stl=4, blk=2, to=6,
+                                fgm=20, fga=40, tpm=2, tpa=0, ftm=8, fta=10)
+        averages = season_averages(row)
+
+        assert averages['mpg'] == 30.0
+        assert averages['pts_per_game'] == 12.5
+        assert averages['fg_pct'] == 0.5
+        assert averages['tp_pct'] is None
+        assert season_averages(PlayerSeasonStats(games=0))['pts_per_game'] is None
+
+
+@pytest.mark.integration
+class TestSeasonStatsService:
+    """Test incremental refresh and full rebuilds against boxscores"""
+
+    def test_population_refreshes_aggregates(self, sqlite_session, all_sample_games):
+        population_service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            population_service.populate_game(game_json)
+
+        for team in sqlite_session.query(TeamSeasonStats).all():
+            totals = (
+                sqlite_session.query(Boxscore).join(Game, Game.game_id == Boxscore.game_id)
+                .filter(Boxscore.box_type == 'totals', Game.season == team.season)
+                .filter(((Boxscore.home_away_team == 'h') & (Game.home_team_id == team.team_id))
+                        | ((Boxscore.home_away_team == 'a') & (Game.away_team_id == team.team_id)))
+                .all()
+            )
+            assert team.games == len(totals)
+            assert team.pts == sum(b.pts or 0 for b in totals)
+            assert team.wins + team.losses == team.games
+
+        player = sqlite_session.query(PlayerSeasonStats).filter(PlayerSeasonStats.season == 2024).first()
+        rows = sqlite_session.query(Boxscore).filter_by(person_id=player.person_id, box_type='player').all()
+        assert player.pts == sum(b.pts or 0 for b in rows)
+        assert player.minutes == pytest.approx(sum(parse_minutes(b.min) for b in rows), abs=0.01)
+
+        assert SeasonStatsService(sqlite_session).pending_game_ids() == []
+
+    def test_second_game_accumulates(self, sqlite_session, sample_game_json):
+        population_service = GamePopulationService(sqlite_session)
+        population_service.populate_game(sample_game_json)
+        first = {t.team_id: (t.games, t.pts) for t in sqlite_session.query(TeamSeasonStats).all()}
+
+        second_game = copy.deepcopy(sample_game_json)
+        second_game['boxscore']['gameId'] = '1022400006'
+        population_service.populate_game(second_game)
+
+        for team in sqlite_session.query(TeamSeasonStats).all():
+            games, pts = first[team.team_id]
+            assert (team.games, team.pts) == (games * 2, pts * 2)
+
+        population_service.clear_game_data(1022400006)
+        after_clear = {t.team_id: (t.games, t.pts) for t in sqlite_session.query(TeamSeasonStats).all()}
+        assert after_clear == first
+
+    def test_rebuild_matches_incremental(self, sqlite_session, all_sample_games):
+        population_service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+        for game_json in all_sample_games:
+            population_service.populate_game(game_json)
+        assert sqlite_session.query(PlayerSeasonStats).count() == 0
+
+        service = SeasonStatsService(sqlite_session)
+        assert len(service.pending_game_ids()) == len(all_sample_games)
+
+        stats = service.rebuild()
+        rebuilt = {(p.person_id, p.team_id, p.season, p.game_type): (p.games, p.pts, p.minutes)
+                   for p in sqlite_session.query(PlayerSeasonStats).all()}
+        assert stats['players'] == len(rebuilt)
+
+        service.build([g.game_id for g in sqlite_session.query(Game).all()])
+        refreshed = {(p.person_id, p.team_id, p.season, p.game_type): (p.games, p.pts, p.minutes)
+                     for p in sqlite_session.query(PlayerSeasonStats).all()}
+        assert refreshed == rebuilt
+        assert service.pending_game_ids() == []
@@ -44,6 +44,7 @@ class TestDatabaseConnection:
         'DB_PORT': '5432',
         'DB_NAME': 'test_wnba'
     })
+    @patch('src.database.services.metrics.instrument_pool', new=lambda engine: engine)  # Mock engines have no pool events
     @patch('src.database.services.create_engine')
     @patch('src.database.services.sessionmaker')
     def test_database_connection_initialization(self, mock_sessionmaker, mock_create_engine):
@@ -68,6 +69,7 @@ class TestDatabaseConnection:
         'DB_PORT': '5432',
         'DB_NAME': 'test_wnba'
     })
+    @patch('src.database.services.metrics.instrument_pool', new=lambda engine: engine)  # Mock engines have no pool events
     @patch('src.database.services.create_engine')
     @patch('src.database.services.sessionmaker')
     def test_get_session(self, mock_sessionmaker, mock_create_engine):
@@ -90,6 +92,7 @@ class TestDatabaseConnection:
         'DB_PORT': '5432',
         'DB_NAME': 'test_wnba'
     })
+    @patch('src.database.services.metrics.instrument_pool', new=lambda engine: engine)  # Mock engines have no pool events
     @patch('src.database.services.create_engine')
     @patch('src.database.services.sessionmaker')
     def test_get_engine(self, mock_sessionmaker, mock_create_engine):
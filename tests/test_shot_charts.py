@@ -0,0 +1,114 @@
+"""
+Tests for shot chart binning and the shot_chart_bin table.
+
+Test Categories:
+- unit: Hex and square binning, bin centres and key aggregation
+- integration: Shot chart bins built from sample games in SQLite
+"""
+
+import numpy as np
+import pytest
+
+from src.database.models import Play, ShotChartBin
+from src.database.population_services import GamePopulationService
+from src.analytics.shot_charts import (
+    ShotChartService, bin_shots, bin_centers, aggregate_bins, COURT_Y_MAX
+)
+
+
+@pytest.mark.unit
+class TestBinning:
+    """Test grid assignment of shot coordinates"""
+
+    def test_square_bins(self):
+        bx, by = bin_shots(np.array([-250, 0, 249, 250]), np.array([-52, 0, 417, 418]), 'square', 20)
+        assert list(bx) == [0, 12, 24, 24]
+        assert list(by) == [0, 2, 23, 23]
+
+    def test_hex_bins_are_nearest_centre(self):
+        rng = np.random.default_rng(7)
+        x, y = rng.uniform(-250, 250, 2000), rng.uniform(-52, 418, 2000)
+
+        q, r = bin_shots(x, y, 'hex', 15)
+        cx, cy = bin_centers(q, r, 'hex', 15)
+
+        assert np.all(np.hypot(cx - x, cy - y) <= 15 + 1e-9)
+        q2, r2 = bin_shots(cx, cy, 'hex', 15)
+        assert np.array_equal(q, q2) and np.array_equal(r, r2)
+
+    def test_basket_is_hex_origin(self):
+        q, r = bin_shots(np.array([0, 3]), np.array([0, -2]), 'hex', 15)
+        assert list(q) == [0, 0] and list(r) == [0, 0]
+
+    def test_backcourt_shots_clamped(self):
+        _, by = bin_shots(np.array([0]), np.array([800]), 'square', 20)
+        _, limit = bin_shots(np.array([0]), np.array([COURT_Y_MAX]), 'square', 20)
+        assert by[0] == limit[0]
+
+    def test_unknown_grid(self):
+        with pytest.raises(ValueError):
+            bin_shots(np.zeros(1), np.zeros(1), 'triangle', 10)
+        with pytest.raises(ValueError):
+            bin_shots(np.zeros(1), np.zeros(1), 'hex', 0)
+
+    def test_aggregate_bins(self):
+        keys = np.array([[1, 0, 0], [1, 0, 0], [2, 0, 0], [1, 1, 0]])
+        made = np.array([True, False, True, True])
+        points = np.array([2, 0, 3, 2])
+
+        bins = aggregate_bins(keys, made, points)
+
+        assert bins['keys'].tolist() == [[1, 0, 0], [1, 1, 0], [2, 0, 0]]
+        assert list(bins['attempts']) == [2, 1, 1]
+        assert list(bins['made']) == [1, 1, 1]
+        assert list(bins['points']) == [2, 2, 3]
+
+
+@pytest.mark.integration
+class TestShotChartService:
+    """Test building and querying shot chart bins from populated sample games"""
+
+    @pytest.fixture
+    def populated(self, sqlite_session, all_sample_games):
+        population_service = GamePopulationService(sqlite_session)
+        for game_json in all_sample_games:
+            population_service.populate_game(game_json)
+        sqlite_session.commit()
+        return sqlite_session
+
+    def test_totals_match_plays(self, populated):
+        service = ShotChartService(populated)
+        stats = service.build(service.pending_game_ids())
+        assert stats['bins'] == populated.query(ShotChartBin).count()
+        assert service.pending_game_ids() == []
+
+        attempts = populated.query(Play).filter(Play.is_field_goal.is_(True),
+                                                Play.x_legacy.is_not(None)).count()
+        made = populated.query(Play).filter(Play.is_field_goal.is_(True),
+                                            Play.shot_result == 'Made').count()
+        for grid, size in service.grids:
+            chart = service.get_chart(grid, size)
+            assert sum(b['attempts'] for b in chart) == attempts
+            assert sum(b['made'] for b in chart) == made
+
+    def test_precomputed_matches_on_the_fly(self, populated):
+        service = ShotChartService(populated)
+        service.build(service.pending_game_ids())
+        game = populated.query(ShotChartBin).first()
+
+        filters = {'team_id': game.team_id, 'seasons': [game.season]}
+        assert service.get_chart('hex', 15, **filters) == service.compute_chart('hex', 15, **filters)
+        person = service.get_chart('square', 20, person_id=game.person_id)
+        assert person == service.compute_chart('square', 20, person_id=game.person_id)
+        assert service.get_chart('hex', 15, team_id=game.team_id, opponent_team_id=game.team_id) == []
+
+    def test_rebuild_and_clear(self, populated, sample_game_json):
+        game_id = int(sample_game_json['boxscore']['gameId'])
+        service = ShotChartService(populated)
+
+        first = service.build_games([game_id])
+        assert service.build_games([game_id]) == first
+
+        counts = GamePopulationService(populated).clear_game_data(game_id)
+        assert counts['shot_chart_bins'] == first
+        assert populated.query(ShotChartBin).count() == 0
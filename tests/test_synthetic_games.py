@@ -0,0 +1,120 @@
+"""
+Tests for the synthetic game generator.
+
+Test Categories:
+- unit: Game JSON shape, IDs, determinism, roster churn, name variants and old-era games
+- integration: Population and reconciliation of generated games, and streaming into raw_game_data
+"""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.json_extractors import PlayExtractor, BoxscoreExtractor, PersonExtractor
+from src.database.population_services import GamePopulationService
+from src.database.synthetic_games import (
+    SyntheticConfig, SyntheticGameGenerator, stream_to_raw_game_data, FIRST_GAME_NUMBER
+)
+from src.analytics.reconciliation import ReconciliationService
+from src.database.game_utils import parse_game_id
+
+
+def _generate(**overrides):
+    config = SyntheticConfig(**{'games_per_season': 4, 'plays_per_game': 200, **overrides})
+    return list(SyntheticGameGenerator(config).generate())
+
+
+@pytest.mark.unit
+class TestGameShape:
+    """Test the generated JSON"""
+
+    def test_ids_are_synthetic_and_parse(self):
+        games = _generate(seasons=(2023,), playoff_games_per_season=1)
+
+        assert [g['game_id'] for g in games] == [1022350001, 1022350002, 1022350003, 1022350004, 1042350001]
+        for game in games:
+            assert parse_game_id(game['game_id']) == {'season': game['season'], 'game_type': game['game_type']}
+            assert game['game_id'] % 100000 >= FIRST_GAME_NUMBER
+            assert game['game_data']['boxscore']['gameId'] == str(game['game_id'])
+
+    def test_boxscore_matches_plays(self):
+        game = _generate(games_per_season=1)[0]['game_data']
+        box = game['boxscore']
+        plays = PlayExtractor.extract_plays_from_game(game)
+
+        assert len(plays) >= 200
+        assert box['homeTeam']['score'] != box['awayTeam']['score']
+        assert len(box['officials']) == 3
+        for key in ('homeTeam', 'awayTeam'):
+            team = game['postGameData']['postBoxscoreData'][key]
+            assert team['statistics']['points'] == box[key]['score']
+            assert sum(p['statistics']['points'] for p in team['players']) == box[key]['score']
+            assert team['statistics']['points'] == team['starters']['points'] + team['bench']['points']
+            assert len([p for p in team['players'] if p['position']]) == 5
+        rows = BoxscoreExtractor.extract_boxscores_from_game(game)
+        assert {r['box_type'] for r in rows} == {'player', 'starters', 'bench', 'totals'}
+
+    def test_same_seed_same_games(self):
+        assert json.dumps(_generate(seed=3)) == json.dumps(_generate(seed=3))
+        assert json.dumps(_generate(seed=3)) != json.dumps(_generate(seed=4))
+
+    def test_roster_churn_between_seasons(self):
+        games = _generate(seasons=(2023, 2024), teams=2, games_per_season=1, roster_churn=0.25)
+        rosters = [{p['personId'] for p in g['game_data']['boxscore']['homeTeam']['players']
+                    + g['game_data']['boxscore']['awayTeam']['players']} for g in games]
+
+        assert len(rosters[0]) == len(rosters[1]) == 24
+        assert len(rosters[0] - rosters[1]) == 6
+
+    def test_name_variants_keep_person_ids(self):
+        plain = _generate(games_per_season=1, name_variation=0.0)[0]['game_data']
+        varied = _generate(games_per_season=1, name_variation=1.0)[0]['game_data']
+
+        names = lambda game: {p['person_id']: p['person_name'] for p in PersonExtractor.extract_persons_from_game(game)
+                              if p['person_role'] == 'player'}
+        assert names(plain).keys() == names(varied).keys()
+        assert all(names(plain)[pid] != names(varied)[pid] for pid in names(plain))
+
+    def test_old_era_games_only_have_team_totals(self):
+        game = _generate(games_per_season=1, old_era_fraction=1.0)[0]['game_data']
+
+        assert game['postGameData']['postBoxscoreData']['homeTeam']['statistics'] == {'dummyKey': 'dummyValue'}
+        rows = BoxscoreExtractor.extract_boxscores_from_game(game)
+        assert [r['box_type'] for r in rows] == ['totals', 'totals']
+        assert rows[0]['pts'] == game['boxscore']['homeTeam']['score']
+
+
+@pytest.mark.integration
+class TestSyntheticPipeline:
+    """Test generated games through population and storage"""
+
+    def test_populated_games_reconcile(self, sqlite_session):
+        games = _generate(seasons=(2023, 2024), games_per_season=3, name_variation=0.2)
+        service = GamePopulationService(sqlite_session, refresh_season_stats=False)
+        for game in games:
+            service.populate_game(game['game_data'])
+        sqlite_session.commit()
+
+        result = ReconciliationService(sqlite_session).reconcile_games()
+        assert result['games'] == 6
+        assert result['discrepancies'] == []
+
+    def test_stream_to_raw_game_data(self):
+        engine = create_engine('sqlite://')
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE raw_game_data (id INTEGER PRIMARY KEY, game_id INTEGER UNIQUE NOT NULL, "
+                "season INTEGER NOT NULL, game_type VARCHAR(20) NOT NULL, game_url VARCHAR(500) NOT NULL, "
+                "game_data JSON NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            ))
+
+        games = SyntheticGameGenerator(SyntheticConfig(games_per_season=5, plays_per_game=100)).generate()
+        assert stream_to_raw_game_data(engine, games, batch_size=2) == 5
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT game_id, game_type, json_extract(game_data, '$.boxscore.gameId') FROM raw_game_data"
+            )).all()
+        assert [(r[0], r[1]) for r in rows] == [(1022450001 + i, 'regular') for i in range(5)]
+        assert all(str(r[0]) == r[2] for r in rows)
@@ -17,7 +17,10 @@ from typing import Dict, Any
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
-from src.database.models import Base, Arena, Team, Person, Game, TeamGame, PersonGame, Play, Boxscore
+from src.database.models import (
+    Base, Arena, Team, Person, Game, TeamGame, PersonGame, Play, Boxscore,
+    PlayerSeasonStats, TeamSeasonStats
+)
 from src.database.population_services import GamePopulationService, DataValidationService, BulkInsertService
 
 # Test markers for different test categories
@@ -38,7 +41,9 @@ def test_engine():
         TeamGame.__table__,
         PersonGame.__table__,
         Play.__table__,
-        Boxscore.__table__
+        Boxscore.__table__,
+        PlayerSeasonStats.__table__,
+        TeamSeasonStats.__table__
     ]
     
     for table in tables_to_create:
@@ -0,0 +1,228 @@
+"""
+Tests for the populated data validator.
+
+Test Categories:
+- integration: Single-scan and incremental validation against populated SQLite databases
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Game, Play, Boxscore, ValidationRun
+from src.database.population_services import GamePopulationService
+from src.scripts.validate_populated_data import DataValidator, TABLE_SCANS, WATERMARK_MARGIN
+
+
+@pytest.fixture
+def validation_engine(tmp_path, all_sample_games):
+    """File-backed SQLite database so concurrent scans share the data"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'validate.db'}")
+    tables = [table for table in Base.metadata.sorted_tables if table.name != 'raw_game_data']
+    Base.metadata.create_all(engine, tables=tables)
+    with sessionmaker(bind=engine)() as session:
+        service = GamePopulationService(session, refresh_season_stats=False)
+        for game_json in all_sample_games:
+            service.populate_game(game_json)
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.integration
+class TestDataValidator:
+    """Test validation results and scan counts"""
+
+    def test_counts_and_statistics(self, validation_engine):
+        results = DataValidator(engine=validation_engine).validate_all()
+
+        with sessionmaker(bind=validation_engine)() as session:
+            assert results['table_counts']['play'] == session.query(Play).count()
+            assert results['table_counts']['boxscore'] == session.query(Boxscore).count()
+            player_rows = session.query(Boxscore).filter_by(box_type='player').count()
+        assert set(results['table_counts']) == {scan['table'] for scan in TABLE_SCANS}
+        assert results['statistical_summary']['games']['total_games'] == 5
+        assert results['statistical_summary']['plays']['games_with_plays'] == 5
+        assert results['statistical_summary']['boxscores']['total_entries'] == player_rows
+
+        # The sample feeds reference one person missing from their rosters
+        with validation_engine.connect() as conn:
+            orphans = conn.execute(text('''
+                SELECT COUNT(*) FROM play p LEFT JOIN person pe ON p.person_id = pe.person_id
+                WHERE p.person_id IS NOT NULL AND pe.person_id IS NULL
+            ''')).scalar()
+        fk = {issue['check']: issue['count'] for issue in results['foreign_key_issues']}
+        assert fk == ({'Play -> Person (non-null)': orphans} if orphans else {})
+
+    def test_each_table_scanned_once(self, validation_engine):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if 'AS total' in statement:
+                statements.append(statement)
+
+        event.listen(validation_engine, 'before_cursor_execute', record)
+        try:
+            DataValidator(engine=validation_engine, max_workers=4).validate_all()
+        finally:
+            event.remove(validation_engine, 'before_cursor_execute', record)
+        table_scans = [statement for statement in statements if 'AS game_id' not in statement]
+        assert len(table_scans) == len(TABLE_SCANS)
+        # Plus one scan by game of the table with the sample feeds' orphan play person
+        per_game = [statement for statement in statements if 'AS game_id' in statement]
+        assert len(per_game) == 1 and 'FROM play p' in per_game[0]
+
+    def test_detects_violations(self, validation_engine):
+        with validation_engine.begin() as conn:
+            conn.execute(text("UPDATE play SET game_id = 999 WHERE play_id = 1"))
+            conn.execute(text("UPDATE boxscore SET pts = -1 WHERE boxscore_id = 1"))
+            conn.execute(text("UPDATE boxscore SET home_away_team = 'x' WHERE boxscore_id = 2"))
+
+        results = DataValidator(engine=validation_engine, max_workers=1).validate_all()
+        fk = {issue['check']: issue['count'] for issue in results['foreign_key_issues']}
+        quality = {issue['check']: issue for issue in results['data_quality_issues']}
+        assert fk['Play -> Game'] == 1
+        assert quality['Negative statistics']['count'] == 1
+        assert quality['Negative statistics']['severity'] == 'WARNING'
+        assert quality['Invalid home/away team indicators']['count'] == 1
+        assert results['validation_passed'] is False
+
+    def test_failed_scan_reported_as_check_failures(self, validation_engine):
+        with validation_engine.begin() as conn:
+            conn.execute(text("DROP TABLE stint"))
+            conn.execute(text("DROP TABLE possession"))
+            conn.execute(text("ALTER TABLE play RENAME TO play_old"))
+
+        results = DataValidator(engine=validation_engine).validate_all()
+        failed = [issue for issue in results['foreign_key_issues'] if issue['count'] is None]
+        assert {issue['check'] for issue in failed} == {'Play -> Game', 'Play -> Person (non-null)'}
+        assert 'play' not in results['table_counts']
+        assert 'error' in results['statistical_summary']
+
+
+def _orphan_play_games(engine):
+    """Games whose plays reference the sample feeds' person missing from their rosters"""
+    with engine.connect() as conn:
+        return [game_id for (game_id,) in conn.execute(text(
+            "SELECT DISTINCT game_id FROM play WHERE person_id IS NOT NULL "
+            "AND person_id NOT IN (SELECT person_id FROM person) ORDER BY game_id"
+        ))]
+
+
+def _set_negative_points(engine, game_id, pts=-1):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "UPDATE boxscore SET pts = :pts WHERE boxscore_id = "
+            "(SELECT MIN(boxscore_id) FROM boxscore WHERE game_id = :game_id AND box_type = 'player')"
+        ), {'game_id': game_id, 'pts': pts})
+
+
+@pytest.mark.integration
+class TestIncrementalValidation:
+    """Test watermark-scoped validation runs"""
+
+    def test_first_incremental_run_is_full(self, validation_engine):
+        results = DataValidator(engine=validation_engine).validate_all(incremental=True)
+
+        assert results['mode'] == 'full'
+        assert results['games_checked'] == 5
+        with sessionmaker(bind=validation_engine)() as session:
+            run = session.query(ValidationRun).one()
+            newest = session.query(Game.populated_at).order_by(Game.populated_at.desc()).first()[0]
+            assert run.watermark == newest - WATERMARK_MARGIN
+            assert run.games_checked == 5
+            assert run.failed_game_ids == results['failed_game_ids']
+
+    def test_standing_failures_do_not_block_incremental_runs(self, validation_engine):
+        validator = DataValidator(engine=validation_engine, watermark_margin=timedelta(0))
+        results = validator.validate_all()
+
+        # The sample feeds' orphan play person is a standing failure
+        standing = _orphan_play_games(validation_engine)
+        assert standing and results['failed_game_ids'] == standing
+        assert results['validation_passed'] is False
+
+        with sessionmaker(bind=validation_engine)() as session:
+            old_game, new_game = [g for (g,) in session.query(Game.game_id).filter(Game.game_id.notin_(standing))
+                                  .order_by(Game.game_id).limit(2)]
+            session.query(Game).filter(Game.game_id == new_game).update(
+                {Game.populated_at: datetime.now() + timedelta(days=1)}
+            )
+            session.commit()
+            in_scope = session.query(Play).filter(Play.game_id.in_(standing + [new_game])).count()
+        for game_id in (old_game, new_game):
+            _set_negative_points(validation_engine, game_id)
+
+        # The repopulated game and the failed games, not the rest
+        results = validator.validate_all(incremental=True)
+        assert results['mode'] == 'incremental'
+        assert results['games_checked'] == len(standing) + 1
+        assert results['table_counts']['play'] == in_scope
+        assert 'person' not in results['table_counts']
+        quality = {issue['check']: issue['count'] for issue in results['data_quality_issues']}
+        assert quality['Negative statistics'] == 1
+        assert results['failed_game_ids'] == sorted(standing + [new_game])
+
+        # A fixed game is checked once more and then drops out
+        _set_negative_points(validation_engine, new_game, pts=0)
+        results = validator.validate_all(incremental=True)
+        assert results['games_checked'] == len(standing) + 1
+        assert results['failed_game_ids'] == standing
+
+        results = validator.validate_all(incremental=True)
+        assert results['mode'] == 'incremental'
+        assert results['games_checked'] == len(standing)
+        assert results['failed_game_ids'] == standing
+        with sessionmaker(bind=validation_engine)() as session:
+            assert session.query(ValidationRun).count() == 4
+            assert session.query(ValidationRun).filter(ValidationRun.watermark.is_(None)).count() == 0
+
+    def test_errored_run_keeps_previous_watermark(self, validation_engine):
+        validator = DataValidator(engine=validation_engine, watermark_margin=timedelta(0))
+        first = validator.validate_all()
+        with sessionmaker(bind=validation_engine)() as session:
+            watermark = session.query(ValidationRun.watermark).one()[0]
+
+        with validation_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE play RENAME TO play_old"))
+        validator.validate_all(incremental=True)
+        with validation_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE play_old RENAME TO play"))
+
+        results = validator.validate_all(incremental=True)
+        assert results['since'] == watermark
+        assert results['failed_game_ids'] == first['failed_game_ids']
+
+    def test_watermark_margin_rechecks_recent_games(self, validation_engine):
+        DataValidator(engine=validation_engine).validate_all()
+
+        # Games stamped within the margin may have committed after the watermark was read
+        results = DataValidator(engine=validation_engine).validate_all(incremental=True)
+        assert results['mode'] == 'incremental'
+        assert results['games_checked'] == 5
+
+
+@pytest.mark.integration
+class TestReconciliationCheck:
+    """Test the boxscore vs play-by-play check"""
+
+    def test_reconcile_reports_discrepancies(self, validation_engine):
+        results = DataValidator(engine=validation_engine).validate_all(reconcile=True)
+        assert results['reconciliation']['games'] == 5
+        assert not any(issue['check'].startswith('Boxscore vs') for issue in results['data_quality_issues'])
+
+        with validation_engine.begin() as conn:
+            conn.execute(text("UPDATE boxscore SET fgm = fgm + 1 WHERE box_type = 'totals' AND boxscore_id = "
+                              "(SELECT MIN(boxscore_id) FROM boxscore WHERE box_type = 'totals')"))
+
+        results = DataValidator(engine=validation_engine).validate_all(reconcile=True)
+        quality = {issue['check']: issue for issue in results['data_quality_issues']}
+        assert quality['Boxscore vs play-by-play: fgm']['count'] == 1
+        assert quality['Boxscore vs play-by-play: fgm']['severity'] == 'WARNING'
+        assert results['reconciliation']['discrepancies'][0]['level'] == 'team'
+        assert results['validation_passed'] is False
+
+    def test_reconcile_is_skipped_by_default(self, validation_engine):
+        assert 'reconciliation' not in DataValidator(engine=validation_engine).validate_all()